@@ -3,16 +3,37 @@ Job API Endpoints - HTTP layer for job-related operations
 """
 
 from datetime import date
-from typing import List, Optional
+from typing import Callable, List, Optional
 
-from app.core.dependencies import get_search_service
+from app.core.config import settings
+from app.core.dependencies import (
+    get_export_service,
+    get_ingest_service,
+    get_search_service,
+    get_shared_cache,
+)
+from app.core.shared_cache import SharedCache, cache_key
 from app.schemas.job_filter import JobSearchFilter
+from app.services.export import EXPORT_FORMATS, ExportService
+from app.services.ingest import IngestService, iter_json_array, iter_ndjson
 from app.services.search import SearchService
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
 router = APIRouter()
 
 
+def _cached_json(cache: Optional[SharedCache], key: str, compute: Callable):
+    """The result of compute, served as JSON from the shared cache if enabled."""
+    if cache is None:
+        return compute()
+    body = cache.get_or_compute(
+        key, lambda: JSONResponse(jsonable_encoder(compute())).body
+    )
+    return Response(body, media_type="application/json")
+
+
 @router.get("/search")
 def search_jobs(
     query: Optional[str] = None,
@@ -23,10 +44,19 @@ def search_jobs(
     date_to: Optional[date] = None,
     page: int = 1,
     limit: int = 10,
+    include_archived: bool = False,
+    sort: Optional[str] = Query(
+        default=None, pattern="^(newest|oldest|company|relevance)$"
+    ),
+    tag_expr: Optional[str] = None,
     search_service: SearchService = Depends(get_search_service),
+    cache: Optional[SharedCache] = Depends(get_shared_cache),
 ):
     """
-    Search for jobs with various filters
+    Search for jobs with various filters.
+    Archived (expired) postings are only searched with include_archived.
+    Results come in the given sort order, or by id without one.
+    tag_expr combines tag names with AND, OR, NOT and parentheses.
     """
 
     search_params = JobSearchFilter(
@@ -38,17 +68,95 @@ def search_jobs(
         date_to=date_to,
         page=page,
         limit=limit,
+        include_archived=include_archived,
+        sort=sort,
+        tag_expr=tag_expr,
     )
 
-    return search_service.search_jobs(search_params)
+    return _cached_json(
+        cache,
+        cache_key("search", search_params.model_dump()),
+        lambda: search_service.search_jobs(search_params),
+    )
+
+
+@router.get("/export")
+def export_jobs(
+    query: Optional[str] = None,
+    location: Optional[str] = None,
+    tags: List[str] = Query(default=[]),
+    tag_categories: List[str] = Query(default=[]),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    export_service: ExportService = Depends(get_export_service),
+):
+    """
+    Export every job matching the filters as NDJSON or CSV.
+    The file is streamed as it is read, without paging.
+    """
+    search_params = JobSearchFilter(
+        query=query,
+        location=location,
+        tags=tags,
+        tag_categories=tag_categories,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        export_service.export_jobs(search_params, format, settings.EXPORT_BATCH_SIZE),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="jobs.{extension}"'},
+    )
+
+
+@router.post("/bulk")
+async def bulk_upsert_jobs(
+    request: Request,
+    chunk_size: int = Query(
+        default=settings.INGEST_CHUNK_SIZE, ge=1, le=settings.INGEST_MAX_CHUNK_SIZE
+    ),
+    ingest_service: IngestService = Depends(get_ingest_service),
+):
+    """
+    Create or update jobs in bulk, matched by job_id.
+    Accepts NDJSON (application/x-ndjson) or a JSON array, streamed and
+    written in chunked transactions. Returns a status for every record.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        records = iter_ndjson(request.stream())
+    else:
+        records = iter_json_array(request.stream())
+
+    return await ingest_service.ingest_stream(records, chunk_size)
+
+
+@router.get("/{job_id}/similar")
+def get_similar_jobs(
+    job_id: str,
+    limit: int = Query(default=10, ge=1, le=50),
+    search_service: SearchService = Depends(get_search_service),
+):
+    """
+    Get the jobs most like a job, by its tags and title: more like this
+    """
+    return search_service.get_similar_jobs(job_id, limit)
 
 
 @router.get("/{job_id}")
 def get_job(
     job_id: str,
     search_service: SearchService = Depends(get_search_service),
+    cache: Optional[SharedCache] = Depends(get_shared_cache),
 ):
     """
-    Get a specific job by ID
+    Get a specific job by ID, from the archive if it has expired
     """
-    return search_service.get_job_by_id(job_id)
+    return _cached_json(
+        cache,
+        cache_key("job", {"job_id": job_id}),
+        lambda: search_service.get_job_by_id(job_id),
+    )
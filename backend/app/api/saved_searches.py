@@ -0,0 +1,68 @@
+"""
+Saved Search API Endpoints - HTTP layer for saved searches and job alerts
+"""
+
+from app.core.dependencies import get_saved_search_service
+from app.schemas.saved_search import SavedSearchCreate
+from app.services.saved_search import SavedSearchService
+from fastapi import APIRouter, Depends, Query, Response
+
+router = APIRouter()
+
+
+@router.post("", status_code=201)
+def create_saved_search(
+    params: SavedSearchCreate,
+    saved_search_service: SavedSearchService = Depends(get_saved_search_service),
+):
+    """
+    Save a search's filters under a name.
+    Jobs created afterwards that it finds are recorded as its matches.
+    """
+    return saved_search_service.create_saved_search(params)
+
+
+@router.get("")
+def list_saved_searches(
+    saved_search_service: SavedSearchService = Depends(get_saved_search_service),
+):
+    """
+    Get every saved search
+    """
+    return saved_search_service.list_saved_searches()
+
+
+@router.get("/{saved_search_id}")
+def get_saved_search(
+    saved_search_id: int,
+    saved_search_service: SavedSearchService = Depends(get_saved_search_service),
+):
+    """
+    Get a saved search by id
+    """
+    return saved_search_service.get_saved_search(saved_search_id)
+
+
+@router.delete("/{saved_search_id}", status_code=204)
+def delete_saved_search(
+    saved_search_id: int,
+    saved_search_service: SavedSearchService = Depends(get_saved_search_service),
+):
+    """
+    Delete a saved search and its matches
+    """
+    saved_search_service.delete_saved_search(saved_search_id)
+    return Response(status_code=204)
+
+
+@router.get("/{saved_search_id}/matches")
+def get_saved_search_matches(
+    saved_search_id: int,
+    page: int = Query(default=1, ge=1),
+    limit: int = Query(default=10, ge=1, le=100),
+    saved_search_service: SavedSearchService = Depends(get_saved_search_service),
+):
+    """
+    Get the jobs a saved search has matched, most recent match first.
+    """
+    return saved_search_service.get_matches(saved_search_id, page, limit)
@@ -0,0 +1,160 @@
+"""
+Change Feed - Host-local log of changed job ids, read by every worker
+
+Domain events only reach subscribers in the process that made the write.
+In-process indexes need to hear about writes made by the host's other
+workers too, so once install()ed the feed appends the primary key of every
+job named by JOBS_CHANGED / JOB_TAGS_CHANGED to a SQLite file in WAL mode.
+Each reader remembers the last sequence number it applied and asks for the
+ids changed since; the ids say what to reload, not what changed.
+
+The log keeps the newest max_entries rows. A reader that has fallen behind
+the pruned part of the log gets None from changes_since and must rebuild.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.events import JOB_TAGS_CHANGED, JOBS_CHANGED, subscribe, unsubscribe
+from app.core.local_sqlite import LocalSQLite
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO feed_meta (name, value) VALUES ('pruned_through', 0);
+CREATE TABLE IF NOT EXISTS job_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_pk INTEGER NOT NULL,
+    recorded REAL NOT NULL
+);
+"""
+
+# Sequence numbers are never reused, even once pruned
+_LATEST = "SELECT coalesce(max(seq), 0) FROM job_changes"
+
+_PRUNED_THROUGH = "SELECT value FROM feed_meta WHERE name = 'pruned_through'"
+
+# The sequence number the newest max_entries rows start after
+_PRUNE_POINT = "SELECT seq FROM job_changes ORDER BY seq DESC LIMIT 1 OFFSET ?"
+
+
+class ChangeFeed:
+    """
+    Append-only log of changed job primary keys in a host-local SQLite
+    file, shared by every worker process on the host.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1000000,
+        busy_timeout_seconds: float = 1.0,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.installed = False
+        self._db = LocalSQLite(path, _SCHEMA, busy_timeout_seconds)
+        # Rows recorded since the last prune, in this process
+        self._recorded = 0
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Record the jobs named by every job or job tag change."""
+        if not self.installed:
+            subscribe(JOBS_CHANGED, self._on_jobs_changed)
+            subscribe(JOB_TAGS_CHANGED, self._on_job_tags_changed)
+            self.installed = True
+
+    def uninstall(self):
+        """Stop following changes and close this thread's connection."""
+        unsubscribe(JOBS_CHANGED, self._on_jobs_changed)
+        unsubscribe(JOB_TAGS_CHANGED, self._on_job_tags_changed)
+        self.installed = False
+        self.close()
+
+    def close(self):
+        """Close the calling thread's connection, if open."""
+        self._db.close()
+
+    def latest(self) -> int:
+        """Sequence number of the newest entry, 0 for an empty feed."""
+        return self._db.connection().execute(_LATEST).fetchone()[0]
+
+    def record(self, job_pks: Iterable[int]):
+        """Append changed job primary keys to the feed."""
+        now = time.time()
+        rows = [(pk, now) for pk in set(job_pks)]
+        if not rows:
+            return
+        try:
+            conn = self._db.connection()
+            conn.executemany(
+                "INSERT INTO job_changes (job_pk, recorded) VALUES (?, ?)", rows
+            )
+            with self._lock:
+                self._recorded += len(rows)
+                prune = self._recorded >= max(1, self.max_entries // 10)
+                if prune:
+                    self._recorded = 0
+            if prune:
+                self.prune()
+        except sqlite3.Error:
+            logger.exception("Failed to record job changes")
+
+    def changes_since(self, seq: int) -> Optional[Tuple[int, Set[int]]]:
+        """
+        The newest sequence number and the job primary keys changed after
+        seq, or None if entries after seq have been pruned.
+        """
+        conn = self._db.connection()
+        # One read transaction, so the prune point and rows agree
+        conn.execute("BEGIN")
+        try:
+            if conn.execute(_PRUNED_THROUGH).fetchone()[0] > seq:
+                return None
+            latest = seq
+            pks = set()
+            for entry, pk in conn.execute(
+                "SELECT seq, job_pk FROM job_changes WHERE seq > ?", (seq,)
+            ):
+                latest = max(latest, entry)
+                pks.add(pk)
+            return latest, pks
+        finally:
+            conn.execute("COMMIT")
+
+    def prune(self):
+        """Drop all but the newest max_entries entries."""
+        conn = self._db.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(_PRUNE_POINT, (self.max_entries,)).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM job_changes WHERE seq <= ?", row)
+                conn.execute(
+                    "UPDATE feed_meta SET value = ? WHERE name = 'pruned_through'",
+                    row,
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _on_jobs_changed(self, changes):
+        self.record(changes.created | changes.updated | changes.deleted)
+
+    def _on_job_tags_changed(self, diffs):
+        self.record(diff.job_id for diff in diffs)
+
+
+change_feed = ChangeFeed(
+    settings.CHANGE_FEED_PATH, max_entries=settings.CHANGE_FEED_MAX_ENTRIES
+)
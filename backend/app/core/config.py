@@ -16,6 +16,89 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
 
+    # Bulk ingest settings
+    INGEST_CHUNK_SIZE: int = 1000
+    INGEST_MAX_CHUNK_SIZE: int = 10000
+
+    # Export settings
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Prometheus metrics at /metrics
+    METRICS_ENABLED: bool = True
+
+    # Per-request SQL profiling
+    SQL_PROFILING_ENABLED: bool = True
+    SQL_PROFILE_SLOW_REQUEST_MS: float = 500.0
+    SQL_PROFILE_MAX_STATEMENTS: int = 20
+    # Executions of one statement shape that suggest an N+1 pattern
+    SQL_PROFILE_REPEATED_STATEMENTS: int = 5
+
+    # Request tracing; off unless sampled and an exporter is chosen
+    TRACING_SAMPLE_RATE: float = 0.0
+    TRACING_EXPORTER: str = "none"  # "none", "memory" or "json"
+    TRACING_JSON_PATH: str = "logs/traces.jsonl"
+
+    # Slow query log with captured query plans
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_PATH: str = "logs/slow_queries.log"
+    SLOW_QUERY_EXPLAIN: bool = True
+    # EXPLAIN ANALYZE runs each slow SELECT a second time (PostgreSQL only)
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = False
+    # A repeated statement shape is written again, with its count, after this
+    SLOW_QUERY_RELOG_SECONDS: float = 3600.0
+
+    # Monthly job partitions (PostgreSQL, after the partitioning migration)
+    JOB_PARTITION_MAINTENANCE_ENABLED: bool = True
+    JOB_PARTITION_MAINTENANCE_SECONDS: float = 6 * 3600
+    JOB_PARTITION_MONTHS_AHEAD: int = 3
+    # Partitions older than this many months are detached; 0 keeps them all
+    JOB_PARTITION_RETENTION_MONTHS: int = 0
+
+    # Hot/cold tiering: jobs posted more than ARCHIVE_AFTER_DAYS ago move to
+    # the archive tables, which searches read only when asked to. Opt-in, as
+    # it hides older postings from default searches
+    ARCHIVE_ENABLED: bool = False
+    ARCHIVE_AFTER_DAYS: int = 60
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+
+    # Memory-mapped search index snapshot, built by python -m app.indexes.snapshot
+    SEARCH_SNAPSHOT_PATH: str = "snapshots/search.snap"
+
+    # Search and job responses cached in a SQLite file shared by the host's
+    # workers; the TTL bounds staleness after writes outside the managers
+    SHARED_CACHE_ENABLED: bool = True
+    SHARED_CACHE_PATH: str = "cache/responses.sqlite3"
+    SHARED_CACHE_MAX_ENTRIES: int = 10000
+    SHARED_CACHE_TTL_SECONDS: float = 300.0
+
+    # Ids of changed jobs, logged to a SQLite file so in-process indexes in
+    # every worker on the host can follow each other's writes
+    CHANGE_FEED_ENABLED: bool = True
+    CHANGE_FEED_PATH: str = "cache/changes.sqlite3"
+    CHANGE_FEED_MAX_ENTRIES: int = 1000000
+
+    # Distinct company names, locations and position titles interned per
+    # process; past this many values per field, ORM rows stop interning new
+    # ones. The column store still gives every distinct value a code
+    STRING_DICTIONARY_MAX_INTERNED: int = 1000000
+
+    # Columnar in-process copy of the jobs for date, location and category
+    # searches; loaded from the snapshot when it is usable, else the database
+    COLUMN_STORE_ENABLED: bool = True
+    COLUMN_STORE_REFRESH_SECONDS: float = 5.0
+
+    # MinHash LSH index of the jobs' tags and title tokens for similar job
+    # lookups; follows the change feed, so needs it on
+    SIMILAR_JOBS_ENABLED: bool = True
+    SIMILAR_JOBS_REFRESH_SECONDS: float = 5.0
+
+    # New jobs are matched against saved searches in the background, by
+    # the worker process that wrote them
+    SAVED_SEARCH_ALERTS_ENABLED: bool = True
+    SAVED_SEARCH_PERCOLATE_SECONDS: float = 1.0
+
     # CORS settings
     BACKEND_CORS_ORIGINS: List[str] = os.getenv(
         "BACKEND_CORS_ORIGINS", ["http://localhost:5173", "http://127.0.0.1:5173"]
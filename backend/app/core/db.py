@@ -1,7 +1,10 @@
 from app.core.config import settings
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.functions import FunctionElement
 
 # Create a SQLAlchemy base class for models
 Base = declarative_base()
@@ -20,3 +23,65 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT clauses
+_CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def conflict_insert(db: Session, model):
+    """
+    Get an INSERT for the session's dialect that supports ON CONFLICT.
+    Returns None when the dialect has no ON CONFLICT support.
+    """
+    insert = _CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+    return insert(model) if insert else None
+
+
+# Per dialect, the execution options under which every statement of a
+# transaction reads the same snapshot of the database
+_SNAPSHOT_READ_OPTIONS = {
+    "postgresql": {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True},
+}
+
+
+def begin_snapshot_reads(db: Session) -> bool:
+    """
+    Begin a read-only transaction in which every statement sees the same
+    snapshot of the database, where the dialect supports it. Returns False,
+    leaving it as is, if the session is already in a transaction.
+    """
+    if db.in_transaction():
+        return False
+    options = _SNAPSHOT_READ_OPTIONS.get(db.get_bind().dialect.name, {})
+    db.connection(execution_options=options)
+    return True
+
+
+class code_point_order(FunctionElement):
+    """
+    A string expression compared by code point, the order the column store
+    sorts strings in. PostgreSQL's default collation follows the locale, so
+    there the expression gets COLLATE "C"; SQLite's default BINARY
+    collation already compares this way.
+    """
+
+    name = "code_point_order"
+    inherit_cache = True
+
+    def __init__(self, expression):
+        super().__init__(expression)
+        self.type = expression.type
+
+
+@compiles(code_point_order)
+def _compile_code_point_order(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(code_point_order, "postgresql")
+def _compile_code_point_order_postgresql(element, compiler, **kw):
+    return f'{compiler.process(element.clauses, **kw)} COLLATE "C"'
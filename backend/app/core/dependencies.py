@@ -2,10 +2,19 @@
 Dependency Injection - Wire up services and managers
 """
 
+from typing import Optional
+
 from app.core.db import get_db
+from app.core.shared_cache import SharedCache, shared_cache
+from app.indexes.columns import ColumnStore, column_store
+from app.indexes.similar import SimilarJobIndex, similar_jobs
 from app.managers.job_manager import JobManager
 from app.managers.job_tag_manager import JobTagManager
+from app.managers.saved_search_manager import SavedSearchManager
 from app.managers.tag_manager import TagManager
+from app.services.export import ExportService
+from app.services.ingest import IngestService
+from app.services.saved_search import SavedSearchService
 from app.services.search import SearchService
 from app.services.tag_service import TagService
 from fastapi import Depends
@@ -28,14 +37,46 @@ def get_job_tag_manager(db: Session = Depends(get_db)) -> JobTagManager:
     return JobTagManager(db)
 
 
+def get_saved_search_manager(db: Session = Depends(get_db)) -> SavedSearchManager:
+    """Get SavedSearchManager instance with database session."""
+    return SavedSearchManager(db)
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """Get the shared response cache, or None until it follows changes."""
+    return shared_cache if shared_cache.installed else None
+
+
+def get_column_store() -> Optional[ColumnStore]:
+    """Get the in-process column store, or None until it is loaded."""
+    return column_store if column_store.loaded else None
+
+
+def get_similar_job_index() -> Optional[SimilarJobIndex]:
+    """Get the in-process similar job index, or None until it is loaded."""
+    return similar_jobs if similar_jobs.loaded else None
+
+
 # Service Dependencies
 def get_search_service(
     job_manager: JobManager = Depends(get_job_manager),
     tag_manager: TagManager = Depends(get_tag_manager),
     job_tag_manager: JobTagManager = Depends(get_job_tag_manager),
+    column_store: Optional[ColumnStore] = Depends(get_column_store),
+    similar_index: Optional[SimilarJobIndex] = Depends(get_similar_job_index),
 ) -> SearchService:
     """Get SearchService instance with required managers."""
-    return SearchService(job_manager, tag_manager, job_tag_manager)
+    return SearchService(
+        job_manager, tag_manager, job_tag_manager, column_store, similar_index
+    )
+
+
+def get_saved_search_service(
+    saved_search_manager: SavedSearchManager = Depends(get_saved_search_manager),
+    search_service: SearchService = Depends(get_search_service),
+) -> SavedSearchService:
+    """Get SavedSearchService instance with required managers."""
+    return SavedSearchService(saved_search_manager, search_service)
 
 
 def get_tag_service(
@@ -43,3 +84,20 @@ def get_tag_service(
 ) -> TagService:
     """Get TagService instance with required managers."""
     return TagService(tag_manager)
+
+
+def get_ingest_service(
+    job_manager: JobManager = Depends(get_job_manager),
+    tag_manager: TagManager = Depends(get_tag_manager),
+    job_tag_manager: JobTagManager = Depends(get_job_tag_manager),
+) -> IngestService:
+    """Get IngestService instance with required managers."""
+    return IngestService(job_manager, tag_manager, job_tag_manager)
+
+
+def get_export_service(
+    job_manager: JobManager = Depends(get_job_manager),
+    tag_manager: TagManager = Depends(get_tag_manager),
+) -> ExportService:
+    """Get ExportService instance with required managers."""
+    return ExportService(job_manager, tag_manager)
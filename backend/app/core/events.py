@@ -0,0 +1,65 @@
+"""
+Domain Events - In-process publish/subscribe for change notifications
+
+Write paths publish what changed; caches and indexes subscribe and invalidate
+only the affected entries. Events raised inside a transaction are delivered
+after it commits and dropped if it rolls back.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Payload: JobChanges
+JOBS_CHANGED = "jobs_changed"
+# Payload: list of JobTagDiff
+JOB_TAGS_CHANGED = "job_tags_changed"
+
+_PENDING_KEY = "pending_events"
+
+_subscribers: Dict[str, List[Callable[[Any], None]]] = defaultdict(list)
+
+
+def subscribe(name: str, handler: Callable[[Any], None]) -> None:
+    """Register a handler for an event."""
+    if handler not in _subscribers[name]:
+        _subscribers[name].append(handler)
+
+
+def unsubscribe(name: str, handler: Callable[[Any], None]) -> None:
+    """Remove a previously registered handler."""
+    if handler in _subscribers[name]:
+        _subscribers[name].remove(handler)
+
+
+def publish(name: str, payload: Any) -> None:
+    """
+    Deliver an event to its handlers immediately.
+    A failing handler is logged and does not affect the others.
+    """
+    for handler in list(_subscribers.get(name, ())):
+        try:
+            handler(payload)
+        except Exception:
+            logger.exception("Event handler %r failed for %s", handler, name)
+
+
+def publish_after_commit(db: Session, name: str, payload: Any) -> None:
+    """Queue an event to be published once the session's transaction commits."""
+    db.info.setdefault(_PENDING_KEY, []).append((name, payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for name, payload in session.info.pop(_PENDING_KEY, []):
+        publish(name, payload)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
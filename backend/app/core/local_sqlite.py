@@ -0,0 +1,52 @@
+"""
+Local SQLite - Connections to a host-local SQLite file shared by workers
+
+Host-local state that every worker process reads and writes (the shared
+response cache, the change feed) lives in a SQLite file in WAL mode, so
+readers never block the writer. Each thread of each process needs its own
+connection; LocalSQLite hands them out and reopens them after a fork.
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class LocalSQLite:
+    """
+    Per-thread connections to one SQLite file, created along with its
+    directory and schema on first use. Connections are in autocommit mode.
+    """
+
+    def __init__(self, path: str, schema: str, busy_timeout_seconds: float = 1.0):
+        self.path = path
+        self.schema = schema
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened if needed."""
+        # Connections are per thread, and reopened in a forked child
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path, timeout=self.busy_timeout_seconds, isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.schema)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def close(self):
+        """Close the calling thread's connection, if open."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
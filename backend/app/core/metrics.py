@@ -0,0 +1,430 @@
+"""
+Metrics - Prometheus-compatible counters, gauges and histograms
+
+A small in-process registry rendered in the Prometheus text exposition
+format by the /metrics endpoint. Routes are timed by MetricsMiddleware;
+services and managers are timed by the @instrumented class decorator, so
+their code stays free of metric calls. Label children are resolved once at
+decoration time, so recording an observation costs a clock read, a bisect
+and an uncontended lock.
+
+Metrics are per process: with several workers, scrape each one.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.tracing import current_span, start_span
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000, 100000)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """A named metric family with one child per combination of label values."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def labels(self, *values) -> object:
+        """Get the child for the given label values, creating it if needed."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def collect(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for key, child in sorted(self._children.items()):
+            lines.extend(
+                self._render_child(_format_labels(self.labelnames, key), key, child)
+            )
+        return lines
+
+    def _render_child(self, labels: str, key, child) -> List[str]:
+        return [f"{self.name}{labels} {_format_value(child.get())}"]
+
+
+class _Value:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float):
+        self._value = value
+
+    def get(self) -> float:
+        return self._value
+
+
+class _HistogramValue:
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self.labels().dec(amount)
+
+
+class CallbackGauge(_Metric):
+    """A gauge whose value is read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def collect(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            f"{self.name} {_format_value(value)}",
+        ]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _render_child(self, labels: str, key, child) -> List[str]:
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            bucket_labels = _format_labels(
+                self.labelnames + ("le",), key + (_format_value(bound),)
+            )
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render_metrics() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+METHOD_DURATION = Histogram(
+    "app_method_duration_seconds",
+    "Service and manager method latency",
+    ("layer", "class", "method"),
+)
+RESULT_SIZE = Histogram(
+    "app_result_size",
+    "Number of items returned by service and manager methods",
+    ("layer", "class", "method"),
+    buckets=SIZE_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "app_cache_requests_total", "Cache lookups by outcome", ("cache", "result")
+)
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """Count a cache lookup; the hit ratio is hits / all lookups."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _threadpool_statistics():
+    from anyio import to_thread
+
+    return to_thread.current_default_thread_limiter().statistics()
+
+
+THREADPOOL_BUSY = CallbackGauge(
+    "threadpool_busy_threads",
+    "Threadpool workers running sync endpoints and dependencies",
+    lambda: _threadpool_statistics().borrowed_tokens,
+)
+THREADPOOL_QUEUE_DEPTH = CallbackGauge(
+    "threadpool_queue_depth",
+    "Tasks waiting for a free threadpool worker",
+    lambda: _threadpool_statistics().tasks_waiting,
+)
+
+
+def _default_size(result) -> Optional[int]:
+    return len(result) if isinstance(result, (list, tuple, set, dict)) else None
+
+
+def instrumented(
+    layer: str, result_sizes: Optional[Dict[str, Callable[[object], int]]] = None
+):
+    """
+    Class decorator timing every public method into METHOD_DURATION, and
+    opening a "Class.method" span for it when the request is being traced.
+    List, tuple, set and dict results are also sized into RESULT_SIZE;
+    result_sizes overrides how the size is taken for specific methods, or
+    disables sizing for a method when mapped to None.
+    Generator methods are left alone since their work happens on iteration.
+    """
+    result_sizes = result_sizes or {}
+
+    def decorate(cls):
+        for name, method in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(method):
+                continue
+            if inspect.isgeneratorfunction(method) or inspect.isasyncgenfunction(
+                method
+            ):
+                continue
+            setattr(
+                cls,
+                name,
+                _instrument(
+                    method,
+                    f"{cls.__name__}.{name}",
+                    METHOD_DURATION.labels(layer, cls.__name__, name),
+                    _size_observer(
+                        result_sizes.get(name, _default_size),
+                        (layer, cls.__name__, name),
+                    ),
+                ),
+            )
+        return cls
+
+    return decorate
+
+
+def _size_observer(size_of, labels: Tuple[str, ...]):
+    """
+    Build a callback recording result sizes into RESULT_SIZE and returning
+    them, or None.
+    The series is created on the first sized result, so methods that never
+    return a collection do not export empty histograms.
+    """
+    if size_of is None:
+        return None
+
+    histogram = None
+
+    def observe(result) -> Optional[int]:
+        nonlocal histogram
+        size = size_of(result)
+        if size is not None:
+            if histogram is None:
+                histogram = RESULT_SIZE.labels(*labels)
+            histogram.observe(size)
+        return size
+
+    return observe
+
+
+def _instrument(method, span_name: str, duration, observe_size):
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            if current_span() is not None:
+                with start_span(span_name) as span:
+                    return await _call_async(
+                        method, args, kwargs, duration, observe_size, span
+                    )
+            return await _call_async(method, args, kwargs, duration, observe_size)
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if current_span() is not None:
+            with start_span(span_name) as span:
+                return _call(method, args, kwargs, duration, observe_size, span)
+        return _call(method, args, kwargs, duration, observe_size)
+
+    return wrapper
+
+
+def _call(method, args, kwargs, duration, observe_size, span=None):
+    started = time.perf_counter()
+    try:
+        result = method(*args, **kwargs)
+    finally:
+        duration.observe(time.perf_counter() - started)
+    _record_result(observe_size, span, result)
+    return result
+
+
+async def _call_async(method, args, kwargs, duration, observe_size, span=None):
+    started = time.perf_counter()
+    try:
+        result = await method(*args, **kwargs)
+    finally:
+        duration.observe(time.perf_counter() - started)
+    _record_result(observe_size, span, result)
+    return result
+
+
+def _record_result(observe_size, span, result):
+    if observe_size:
+        size = observe_size(result)
+        if span is not None and size is not None:
+            span.set_attribute("result.size", size)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording HTTP latency per route template and the number
+    of requests in flight. Unmatched paths share one label, so arbitrary URLs
+    cannot grow the number of series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, status).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,260 @@
+"""
+Partitions - Monthly range partitions of jobs and job_tags on PostgreSQL
+
+With the partitioning migration applied, jobs and job_tags are partitioned
+by job_posting_date, one partition per month, named like jobs_p2025_06.
+Writers call ensure_partitions for the posting months they are about to
+insert, on their session's connection once it has begun a transaction;
+maintain_partitions (run at startup and then periodically by
+PartitionMaintainer) keeps partitions ready ahead of the calendar and
+detaches those past the retention period. Detached partitions are left in
+place as plain tables, renamed with a _detached_<date> suffix, for
+archiving or dropping.
+
+On any other dialect, or before the migration, every function is a no-op.
+"""
+
+import logging
+import re
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from app.core.config import settings
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# job_tags references jobs, so its partitions are detached first
+PARTITIONED_TABLES = ("jobs", "job_tags")
+
+_PARTITION_NAME = re.compile(r"^(\w+)_p(\d{4})_(\d{2})$")
+
+# Per engine: whether jobs is partitioned, and the months known to exist
+_partitioned: "WeakKeyDictionary[Engine, bool]" = WeakKeyDictionary()
+_known_months: "WeakKeyDictionary[Engine, Set[date]]" = WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month the given number of months after month."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of a table's partition for the month starting at month."""
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_partitioned(engine: Engine) -> bool:
+    """Whether jobs is a partitioned table in the engine's database."""
+    partitioned = _partitioned.get(engine)
+    if partitioned is None:
+        partitioned = False
+        if engine.dialect.name == "postgresql":
+            with engine.connect() as conn:
+                partitioned = bool(
+                    conn.scalar(
+                        text(
+                            "SELECT count(*) FROM pg_partitioned_table p "
+                            "JOIN pg_class c ON c.oid = p.partrelid "
+                            "WHERE c.relname = 'jobs' "
+                            "AND pg_table_is_visible(c.oid)"
+                        )
+                    )
+                )
+        _partitioned[engine] = partitioned
+    return partitioned
+
+
+def existing_months(conn, table: str = "jobs") -> List[date]:
+    """Months that have an attached partition of table, oldest first."""
+    names = conn.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+        ),
+        {"table": table},
+    )
+    months = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match and match.group(1) == table:
+            months.append(date(int(match.group(2)), int(match.group(3)), 1))
+    return sorted(months)
+
+
+def ensure_partitions(
+    bind: Union[Engine, Connection], days: Iterable[date]
+) -> List[date]:
+    """
+    Create the monthly partitions covering the given dates, if missing.
+    Given an engine, runs in its own short transaction, so the lock on the
+    parent tables is not held for the rest of any caller's transaction.
+    Given a connection, runs in its transaction instead: creating a
+    partition needs an ACCESS EXCLUSIVE lock on the parent, which a separate
+    transaction would wait for forever while the caller's own transaction
+    has read the parent. Returns the months created.
+    """
+    engine = bind if isinstance(bind, Engine) else bind.engine
+    if not is_partitioned(engine):
+        return []
+
+    months = {month_start(day) for day in days}
+    known = _known_months.setdefault(engine, set())
+    missing = months - known
+    if not missing:
+        return []
+
+    if isinstance(bind, Engine):
+        with _lock, engine.begin() as conn:
+            existing, created = _create_partitions(conn, missing)
+        known.update(months)
+    else:
+        # The caller's transaction may yet roll back, so only the months
+        # already committed are remembered
+        existing, created = _create_partitions(bind, missing)
+        known.update(existing)
+
+    if created:
+        logger.info("Created job partitions for %s", [str(m) for m in created])
+    return created
+
+
+def _create_partitions(conn, months: Set[date]) -> Tuple[Set[date], List[date]]:
+    """
+    Create the partitions of the given months that do not exist. Returns
+    the months that already existed and those created.
+    """
+    existing = set(existing_months(conn)) & months
+    created = []
+    for month in sorted(months - existing):
+        for table in PARTITIONED_TABLES:
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+                    f"PARTITION OF {table} FOR VALUES "
+                    f"FROM ('{month.isoformat()}') "
+                    f"TO ('{add_months(month, 1).isoformat()}')"
+                )
+            )
+        created.append(month)
+    return existing, created
+
+
+def detach_partitions(engine: Engine, before: date) -> List[str]:
+    """
+    Detach every monthly partition that ends on or before the given date.
+    The job_tags partition goes first, and loses its foreign keys to jobs so
+    the jobs partition can follow; the detached jobs release their job_ids
+    in job_keys. Returns the new names of the detached tables.
+    """
+    if not is_partitioned(engine):
+        return []
+
+    suffix = f"_detached_{date.today():%Y%m%d}"
+    detached = []
+    with _lock, engine.begin() as conn:
+        for month in existing_months(conn):
+            if add_months(month, 1) > before:
+                continue
+            for table in reversed(PARTITIONED_TABLES):
+                name = partition_name(table, month)
+                conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                if table == "jobs":
+                    conn.execute(
+                        text(
+                            f"DELETE FROM job_keys k USING {name} d "
+                            "WHERE k.job_id = d.job_id"
+                        )
+                    )
+                for constraint in conn.scalars(
+                    text(
+                        "SELECT conname FROM pg_constraint "
+                        "WHERE conrelid = CAST(:name AS regclass) "
+                        "AND contype = 'f' "
+                        "AND confrelid = CAST('jobs' AS regclass)"
+                    ),
+                    {"name": name},
+                ):
+                    conn.execute(
+                        text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"')
+                    )
+                conn.execute(text(f"ALTER TABLE {name} RENAME TO {name}{suffix}"))
+                detached.append(name + suffix)
+            _known_months.get(engine, set()).discard(month)
+
+    if detached:
+        logger.info("Detached job partitions %s", detached)
+    return detached
+
+
+def maintain_partitions(
+    engine: Engine,
+    months_ahead: int = settings.JOB_PARTITION_MONTHS_AHEAD,
+    retention_months: int = settings.JOB_PARTITION_RETENTION_MONTHS,
+    today: Optional[date] = None,
+) -> Dict[str, List]:
+    """
+    Create partitions from the current month to months_ahead months out,
+    and detach partitions older than retention_months (0 keeps everything).
+    """
+    if not is_partitioned(engine):
+        return {"created": [], "detached": []}
+
+    current = month_start(today or date.today())
+    created = ensure_partitions(
+        engine, [add_months(current, n) for n in range(months_ahead + 1)]
+    )
+    detached = []
+    if retention_months > 0:
+        detached = detach_partitions(engine, add_months(current, -retention_months))
+    return {"created": created, "detached": detached}
+
+
+class PartitionMaintainer:
+    """
+    Runs maintain_partitions on a daemon thread, once at start and then
+    every interval_seconds, until stopped.
+    """
+
+    def __init__(self, engine: Engine, interval_seconds: float):
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the maintenance thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="partition-maintenance", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the maintenance thread and wait for it to finish."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                maintain_partitions(self.engine)
+            except Exception:
+                logger.exception("Partition maintenance failed")
+            if self._stop.wait(self.interval_seconds):
+                return
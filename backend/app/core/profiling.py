@@ -0,0 +1,160 @@
+"""
+SQL Profiling - Per-request statement counts, DB time and N+1 detection
+
+Engine-wide cursor hooks attribute every statement to the request being
+served, tracked through a context variable (AnyIO copies the context into
+threadpool workers, so sync endpoints are covered). The middleware reports
+the totals in a Server-Timing header and one structured log line per
+request, and flags slow requests, statement-heavy requests and statement
+shapes repeated often enough to suggest an N+1 query pattern.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists differ only in their number of placeholders
+_IN_LIST = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeats with different parameters compare equal."""
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass
+class RequestProfile:
+    """SQL activity recorded while serving one request."""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float):
+        self.statements += 1
+        self.db_seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        """Statement shapes executed at least threshold times."""
+        return {
+            shape: count for shape, count in self.shapes.items() if count >= threshold
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "sql_profile", default=None
+)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """The profile of the request being served, if any."""
+    return _current_profile.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_profile.get() is not None:
+        context._profile_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_profile_started", None)
+    if profile is not None and started is not None:
+        profile.record(statement, time.perf_counter() - started)
+
+
+class SQLProfilingMiddleware:
+    """
+    ASGI middleware that profiles the SQL issued by each HTTP request.
+    Adds a Server-Timing header and logs a JSON summary, at WARNING level
+    when the request is slow, issues too many statements or repeats a
+    statement shape (likely N+1).
+    """
+
+    def __init__(
+        self,
+        app,
+        slow_request_ms: float = settings.SQL_PROFILE_SLOW_REQUEST_MS,
+        max_statements: int = settings.SQL_PROFILE_MAX_STATEMENTS,
+        repeated_statements: int = settings.SQL_PROFILE_REPEATED_STATEMENTS,
+    ):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self.max_statements = max_statements
+        self.repeated_statements = repeated_statements
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self._server_timing(profile)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            self._log(scope, status, profile, time.perf_counter() - started)
+
+    def flags(self, profile: RequestProfile, elapsed_ms: float) -> List[str]:
+        """Reasons the request deserves attention, if any."""
+        flags = []
+        if elapsed_ms >= self.slow_request_ms:
+            flags.append("slow")
+        if profile.statements > self.max_statements:
+            flags.append("too_many_statements")
+        if profile.repeated_shapes(self.repeated_statements):
+            flags.append("n_plus_one")
+        return flags
+
+    def _server_timing(self, profile: RequestProfile) -> bytes:
+        return (
+            f'db;dur={profile.db_seconds * 1000:.3f};desc="{profile.statements} '
+            f'statements"'
+        ).encode("latin-1")
+
+    def _log(self, scope, status, profile: RequestProfile, elapsed: float):
+        elapsed_ms = elapsed * 1000
+        flags = self.flags(profile, elapsed_ms)
+        record = {
+            "event": "sql_profile",
+            "method": scope.get("method"),
+            "path": scope.get("path"),
+            "status": status,
+            "duration_ms": round(elapsed_ms, 3),
+            "db_ms": round(profile.db_seconds * 1000, 3),
+            "statements": profile.statements,
+            "flags": flags,
+        }
+        if "n_plus_one" in flags:
+            record["repeated"] = profile.repeated_shapes(self.repeated_statements)
+        logger.log(
+            logging.WARNING if flags else logging.INFO, json.dumps(record, default=str)
+        )
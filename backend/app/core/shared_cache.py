@@ -0,0 +1,224 @@
+"""
+Shared Cache - Host-local response cache shared by every worker process
+
+Serialized responses are stored in a SQLite database in WAL mode, so each
+uvicorn worker on the host reads and fills the same cache instead of
+warming its own copy. Entries are keyed by a hash of the canonical request
+parameters and tagged with the generation they were computed at.
+
+Write paths publish JOBS_CHANGED / JOB_TAGS_CHANGED; once install()ed, the
+cache bumps the shared generation on each, and entries of older
+generations stop matching in every worker at once. A TTL bounds how stale
+an entry can get after writes that bypass the managers (imports, detached
+partitions). Eviction is least-recently-used beyond max_entries.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.events import JOB_TAGS_CHANGED, JOBS_CHANGED, subscribe, unsubscribe
+from app.core.local_sqlite import LocalSQLite
+from app.core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_meta (name, value) VALUES ('generation', 0);
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    value BLOB NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed ON cache_entries (accessed);
+"""
+
+# The current generation, and the entry for a key if it is current and fresh
+_LOOKUP = """
+SELECT m.value, e.value, e.accessed
+FROM cache_meta m
+LEFT JOIN cache_entries e
+    ON e.key = ? AND e.generation = m.value AND e.created >= ?
+WHERE m.name = 'generation'
+"""
+
+# Only stores values computed at the current generation
+_STORE = """
+INSERT OR REPLACE INTO cache_entries (key, generation, value, created, accessed)
+SELECT ?, value, ?, ?, ? FROM cache_meta
+WHERE name = 'generation' AND value = ?
+"""
+
+_PRUNE_STALE = """
+DELETE FROM cache_entries
+WHERE generation != (SELECT value FROM cache_meta WHERE name = 'generation')
+    OR created < ?
+"""
+
+_PRUNE_LRU = """
+DELETE FROM cache_entries WHERE key IN (
+    SELECT key FROM cache_entries ORDER BY accessed DESC LIMIT -1 OFFSET ?
+)
+"""
+
+# Hits refresh an entry's access time at most this often, to spare writes
+_ACCESS_RESOLUTION_SECONDS = 1.0
+
+
+def cache_key(namespace: str, params: Dict) -> str:
+    """
+    Key for a request: namespace plus a hash of its parameters with empty
+    values dropped, list values sorted and keys in order, so equivalent
+    requests share an entry.
+    """
+    canonical = {
+        name: sorted(value) if isinstance(value, (list, tuple, set)) else value
+        for name, value in params.items()
+        if value not in (None, "", [], (), set())
+    }
+    payload = json.dumps(canonical, sort_keys=True, default=str, separators=(",", ":"))
+    return f"{namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+class SharedCache:
+    """
+    Generation-invalidated, LRU-evicted cache in a host-local SQLite file.
+    Each thread of each process opens its own connection. Cache errors are
+    logged and treated as misses, so the cache never fails a request.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        ttl_seconds: float = 300,
+        busy_timeout_seconds: float = 1.0,
+        name: str = "shared",
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.installed = False
+        self._db = LocalSQLite(path, _SCHEMA, busy_timeout_seconds)
+        # Stores since the last prune, in this process
+        self._stores = 0
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Bump the generation on every job or job tag change."""
+        if not self.installed:
+            subscribe(JOBS_CHANGED, self._on_change)
+            subscribe(JOB_TAGS_CHANGED, self._on_change)
+            self.installed = True
+
+    def uninstall(self):
+        """Stop following changes and close this thread's connection."""
+        unsubscribe(JOBS_CHANGED, self._on_change)
+        unsubscribe(JOB_TAGS_CHANGED, self._on_change)
+        self.installed = False
+        self.close()
+
+    def close(self):
+        """Close the calling thread's connection, if open."""
+        self._db.close()
+
+    def generation(self) -> int:
+        """The current shared generation."""
+        return (
+            self._connection()
+            .execute("SELECT value FROM cache_meta WHERE name = 'generation'")
+            .fetchone()[0]
+        )
+
+    def bump_generation(self):
+        """Invalidate every entry, in every process."""
+        try:
+            self._connection().execute(
+                "UPDATE cache_meta SET value = value + 1 WHERE name = 'generation'"
+            )
+        except sqlite3.Error:
+            logger.exception("Failed to bump the shared cache generation")
+
+    def lookup(self, key: str) -> Tuple[Optional[bytes], Optional[int]]:
+        """
+        The cached value for key, or None, and the current generation to
+        store a freshly computed value at (None if the cache is unusable).
+        """
+        now = time.time()
+        try:
+            conn = self._connection()
+            generation, value, accessed = conn.execute(
+                _LOOKUP, (key, now - self.ttl_seconds)
+            ).fetchone()
+            if value is not None and now - accessed >= _ACCESS_RESOLUTION_SECONDS:
+                conn.execute(
+                    "UPDATE cache_entries SET accessed = ? WHERE key = ?", (now, key)
+                )
+        except sqlite3.Error:
+            logger.exception("Shared cache lookup failed")
+            return None, None
+        return value, generation
+
+    def store(self, key: str, value: bytes, generation: int):
+        """
+        Store a value computed at the given generation. Skipped if the
+        generation has moved on since, as the value may already be stale.
+        """
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute(_STORE, (key, value, now, now, generation))
+            with self._lock:
+                self._stores += 1
+                prune = self._stores >= max(1, self.max_entries // 10)
+                if prune:
+                    self._stores = 0
+            if prune:
+                self.prune()
+        except sqlite3.Error:
+            logger.exception("Shared cache store failed")
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> bytes:
+        """The cached value for key, computing and storing it on a miss."""
+        value, generation = self.lookup(key)
+        record_cache_lookup(self.name, value is not None)
+        if value is None:
+            value = compute()
+            if generation is not None:
+                self.store(key, value, generation)
+        return value
+
+    def prune(self):
+        """Drop stale and expired entries, then the least recently used."""
+        conn = self._connection()
+        conn.execute(_PRUNE_STALE, (time.time() - self.ttl_seconds,))
+        conn.execute(_PRUNE_LRU, (self.max_entries,))
+
+    def clear(self):
+        """Drop every entry."""
+        self._connection().execute("DELETE FROM cache_entries")
+
+    def _on_change(self, changes):
+        self.bump_generation()
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._db.connection()
+
+
+shared_cache = SharedCache(
+    settings.SHARED_CACHE_PATH,
+    max_entries=settings.SHARED_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SHARED_CACHE_TTL_SECONDS,
+)
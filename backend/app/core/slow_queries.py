@@ -0,0 +1,268 @@
+"""
+Slow Query Log - Statements over a time threshold, with their query plans
+
+Engine-wide cursor hooks time every statement. Statements slower than the
+threshold are handed to a background thread, which captures the plan for
+plain SELECTs (EXPLAIN on PostgreSQL, EXPLAIN QUERY PLAN on SQLite) with the
+same bound parameters, and appends a JSON line to a rotating log file.
+EXPLAIN ANALYZE runs the statement again, so it is opt-in; statements that
+lock rows or write, such as SELECT ... FOR UPDATE or a WITH holding an
+UPDATE, are never explained. Entries are deduplicated by statement fingerprint: the
+first occurrence is written with its plan, repeats are only counted and
+written again, with the count, once the relog interval has passed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.profiling import statement_shape
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Set on connections used to run EXPLAIN, so plans are never logged as slow
+_EXPLAIN_CONNECTION = "slow_query_explain"
+
+_EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+# EXPLAIN ANALYZE executes the statement; SQLite has no equivalent
+_ANALYZE_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+# Clauses that make a SELECT lock rows or write
+_NOT_READ_ONLY = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b|\bINTO\b",
+    re.IGNORECASE,
+)
+
+
+def fingerprint(statement: str) -> str:
+    """Short, stable identifier of a statement's shape."""
+    return hashlib.sha1(statement_shape(statement).encode("utf-8")).hexdigest()[:16]
+
+
+def is_plain_select(statement: str) -> bool:
+    """
+    Whether a statement is a SELECT that neither locks rows nor writes.
+    WITH statements are excluded, as their CTEs may modify data.
+    """
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return False
+    return _NOT_READ_ONLY.search(statement) is None
+
+
+def explain(
+    connection, statement: str, parameters, analyze: bool = False
+) -> Optional[List[str]]:
+    """
+    Plan of a plain SELECT, run on the connection with the given DBAPI
+    parameters, one line per plan row. None when the dialect or statement
+    has no plan. With analyze, PostgreSQL executes the statement for
+    actual timings and buffer counts.
+    """
+    prefixes = _ANALYZE_PREFIXES if analyze else _EXPLAIN_PREFIXES
+    prefix = prefixes.get(connection.dialect.name)
+    if prefix is None or not is_plain_select(statement):
+        return None
+
+    rows = connection.exec_driver_sql(prefix + statement, parameters).fetchall()
+    # PostgreSQL returns one text line per row; SQLite returns
+    # (id, parent, notused, detail) rows
+    return [str(row[-1]) for row in rows]
+
+
+class SlowQueryLog:
+    """
+    Records slow statements to a rotating JSON-lines file.
+    install() attaches the cursor hooks to every engine; uninstall() removes
+    them. Plans are captured and entries written off the request path.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold_ms: float,
+        explain: bool = True,
+        explain_analyze: bool = False,
+        relog_seconds: float = 3600,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        max_fingerprints: int = 1000,
+        queue_size: int = 100,
+    ):
+        self.path = path
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.explain_analyze = explain_analyze
+        self.relog_seconds = relog_seconds
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_fingerprints = max_fingerprints
+        self.installed = False
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=queue_size)
+        # fingerprint -> [last written (monotonic), occurrences since]
+        self._seen: "OrderedDict[str, List]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._file_logger: Optional[logging.Logger] = None
+
+    def install(self):
+        """Start timing statements on every engine."""
+        if not self.installed:
+            event.listen(Engine, "before_cursor_execute", self._before)
+            event.listen(Engine, "after_cursor_execute", self._after)
+            self.installed = True
+
+    def uninstall(self):
+        """Stop timing statements, write what is queued and close the log file."""
+        if self.installed:
+            event.remove(Engine, "before_cursor_execute", self._before)
+            event.remove(Engine, "after_cursor_execute", self._after)
+            self.installed = False
+        self.flush()
+        if self._file_logger:
+            for handler in self._file_logger.handlers:
+                handler.close()
+            self._file_logger.handlers.clear()
+            self._file_logger = None
+
+    def flush(self):
+        """Wait until every queued slow statement has been written."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None and not conn.info.get(_EXPLAIN_CONNECTION):
+            context._slow_query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < self.threshold:
+            return
+
+        key = fingerprint(statement)
+        occurrences = self._count(key)
+        if occurrences is None:
+            return
+
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "fingerprint": key,
+            "duration_ms": round(elapsed * 1000, 3),
+            "occurrences": occurrences,
+            "statement": statement,
+            # executemany batches are writes with many parameter sets
+            "parameters": None if executemany else parameters,
+        }
+        self._start_worker()
+        try:
+            self._queue.put_nowait((entry, conn.engine))
+        except queue.Full:
+            logger.warning("Slow query queue full, dropping %s", key)
+
+    def _count(self, key: str) -> Optional[int]:
+        """
+        Count one occurrence of a fingerprint. Returns the occurrences to
+        report if an entry is due, or None while the fingerprint is muted.
+        """
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is None:
+                self._seen[key] = [now, 0]
+                if len(self._seen) > self.max_fingerprints:
+                    self._seen.popitem(last=False)
+                return 1
+
+            self._seen.move_to_end(key)
+            seen[1] += 1
+            if now - seen[0] < self.relog_seconds:
+                return None
+            occurrences = seen[1]
+            self._seen[key] = [now, 0]
+            return occurrences
+
+    def _start_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="slow-query-log", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            entry, engine = self._queue.get()
+            try:
+                if self.explain:
+                    entry["plan"] = self._explain(engine, entry)
+                self._write(entry)
+            except Exception:
+                logger.exception("Failed to record slow query %s", entry["fingerprint"])
+            finally:
+                self._queue.task_done()
+
+    def _explain(self, engine, entry: Dict) -> Optional[List[str]]:
+        """Plan of a slow plain SELECT, run with the same parameters, or None."""
+        if entry["parameters"] is None:
+            return None
+
+        try:
+            with engine.connect() as conn:
+                conn.info[_EXPLAIN_CONNECTION] = True
+                try:
+                    return explain(
+                        conn,
+                        entry["statement"],
+                        entry["parameters"],
+                        analyze=self.explain_analyze,
+                    )
+                finally:
+                    conn.info.pop(_EXPLAIN_CONNECTION, None)
+                    conn.rollback()
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+
+    def _write(self, entry: Dict):
+        if self._file_logger is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backup_count
+            )
+            file_logger = logging.getLogger(f"{__name__}.file.{id(self)}")
+            file_logger.propagate = False
+            file_logger.setLevel(logging.INFO)
+            file_logger.addHandler(handler)
+            self._file_logger = file_logger
+        self._file_logger.info(json.dumps(entry, default=str))
+
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_LOG_PATH,
+    settings.SLOW_QUERY_THRESHOLD_MS,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    explain_analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE,
+    relog_seconds=settings.SLOW_QUERY_RELOG_SECONDS,
+)
@@ -0,0 +1,126 @@
+"""
+String Dictionaries - Interned encodings of repeated job strings
+
+Company names, locations and position titles come from a few thousand
+distinct values, repeated across millions of jobs. Left alone, every ORM
+row, index entry and response holds its own copy of each. A
+StringDictionary gives every distinct value a dense integer code and keeps
+one canonical str object for it.
+
+The module's companies, locations and positions dictionaries are shared by
+every in-memory structure in the process:
+- ORM rows load these columns through InternedString, so they hold the
+  canonical objects
+- the column store encodes the columns with the dictionaries' codes
+- responses are built from the ORM rows' canonical objects
+
+A value is therefore held once per process, however many rows, index
+entries or responses refer to it.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+
+
+class StringDictionary:
+    """
+    Append-only mapping between distinct strings and dense codes 0..n-1.
+    Codes are never reassigned, so arrays of codes stay valid as the
+    dictionary grows. Safe for concurrent use.
+
+    max_interned only caps what intern() adds for ORM rows. code() must
+    give every value the column store encodes a code, so it is unbounded,
+    and the dictionary grows with the distinct values in the data.
+    """
+
+    def __init__(self, name: str, max_interned: Optional[int] = None):
+        self.name = name
+        # intern() stops adding values past this size; code() always adds
+        self.max_interned = max_interned
+        self._codes: Dict[str, int] = {}
+        self._values: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._codes
+
+    @property
+    def values(self) -> List[str]:
+        """Every value, indexed by code. Callers must not modify it."""
+        return self._values
+
+    def code(self, value: Optional[str]) -> int:
+        """
+        The code of a value, assigning the next one if new; -1 for None.
+        Not limited by max_interned.
+        """
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    # The list first: a published code always has its value
+                    self._values.append(value)
+                    code = self._codes[value] = len(self._values) - 1
+        return code
+
+    def encode(self, values: Iterable[Optional[str]]) -> List[int]:
+        """The codes of several values, assigning new ones as needed."""
+        return [self.code(value) for value in values]
+
+    def find(self, value: Optional[str]) -> Optional[int]:
+        """The code of a value, or None if it has none."""
+        return self._codes.get(value)
+
+    def value(self, code: int) -> Optional[str]:
+        """The value of a code; None for -1."""
+        return None if code < 0 else self._values[code]
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """
+        The canonical object equal to value. New values are added while the
+        dictionary is below max_interned, and returned unchanged after that.
+        """
+        if value is None:
+            return None
+        code = self._codes.get(value)
+        if code is None:
+            if self.max_interned is not None and len(self._values) >= self.max_interned:
+                return value
+            code = self.code(value)
+        return self._values[code]
+
+
+companies = StringDictionary("companies", settings.STRING_DICTIONARY_MAX_INTERNED)
+locations = StringDictionary("locations", settings.STRING_DICTIONARY_MAX_INTERNED)
+positions = StringDictionary("positions", settings.STRING_DICTIONARY_MAX_INTERNED)
+
+DICTIONARIES: Dict[str, StringDictionary] = {
+    dictionary.name: dictionary for dictionary in (companies, locations, positions)
+}
+
+
+class InternedString(TypeDecorator):
+    """
+    A String column whose loaded values are interned in one of the shared
+    dictionaries, named by dictionary.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def __init__(self, dictionary: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dictionary = dictionary
+
+    def process_result_value(self, value, dialect):
+        return DICTIONARIES[self.dictionary].intern(value)
@@ -0,0 +1,257 @@
+"""
+Tag Expressions - Boolean queries over job tags
+
+A tag expression combines tag names with AND, OR, NOT and parentheses:
+
+    (Python AND (AWS OR Kubernetes)) AND NOT PHP
+
+NOT binds tightest, then AND, then OR; the keywords are case-insensitive.
+A name is a run of characters other than whitespace, parentheses and double
+quotes, or any text in double quotes ("Machine Learning", "and"). Names
+match tags exactly, like the tags filter, in every category.
+
+parse_tag_expr gives an immutable tree of TagName, Not, And and Or nodes.
+Consumers compile it: the SQL search to EXISTS / NOT EXISTS semi-joins, the
+column store to set operations on tag posting lists, after plan_tag_expr
+has ordered each node's operands by selectivity. Saved search matching
+tests one job's tags with matches_tag_expr, and indexes a search by its
+required_tags.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Collection, Dict, FrozenSet, List, Optional, Tuple, Union
+
+# Bounds the size of the statements and plans an expression compiles to
+MAX_TAG_EXPR_TERMS = 32
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+
+_KEYWORDS = ("AND", "OR", "NOT")
+
+
+class TagExprError(ValueError):
+    """A tag expression that cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class TagName:
+    """Jobs with a tag of this name."""
+
+    name: str
+
+
+@dataclass(frozen=True)
+class Not:
+    """Jobs not matching the operand."""
+
+    operand: "TagExpr"
+
+
+@dataclass(frozen=True)
+class And:
+    """Jobs matching every operand."""
+
+    operands: Tuple["TagExpr", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    """Jobs matching any operand."""
+
+    operands: Tuple["TagExpr", ...]
+
+
+TagExpr = Union[TagName, Not, And, Or]
+
+
+def _tokens(text: str) -> List[Tuple[str, str]]:
+    """(kind, value) tokens, kind being "(", ")", a keyword or "name"."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise TagExprError(f"Unterminated quote at position {position + 1}")
+        opening, closing, quoted, word = match.groups()
+        if opening:
+            tokens.append(("(", opening))
+        elif closing:
+            tokens.append((")", closing))
+        elif quoted is not None:
+            tokens.append(("name", quoted))
+        elif word.upper() in _KEYWORDS:
+            tokens.append((word.upper(), word))
+        else:
+            tokens.append(("name", word))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over the tokens of one expression."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+        self.terms = 0
+
+    def peek(self) -> str:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return "end"
+
+    def take(self, kind: str) -> str:
+        if self.peek() != kind:
+            found = (
+                "the end"
+                if self.peek() == "end"
+                else repr(self.tokens[self.position][1])
+            )
+            raise TagExprError(f"Expected {kind} but found {found}")
+        value = self.tokens[self.position][1]
+        self.position += 1
+        return value
+
+    def expression(self) -> TagExpr:
+        operands = [self.conjunction()]
+        while self.peek() == "OR":
+            self.take("OR")
+            operands.append(self.conjunction())
+        return _combine(Or, operands)
+
+    def conjunction(self) -> TagExpr:
+        operands = [self.unary()]
+        while self.peek() == "AND":
+            self.take("AND")
+            operands.append(self.unary())
+        return _combine(And, operands)
+
+    def unary(self) -> TagExpr:
+        if self.peek() == "NOT":
+            self.take("NOT")
+            operand = self.unary()
+            # NOT NOT x is x
+            return operand.operand if isinstance(operand, Not) else Not(operand)
+        if self.peek() == "(":
+            self.take("(")
+            expr = self.expression()
+            self.take(")")
+            return expr
+        name = self.take("name")
+        self.terms += 1
+        if self.terms > MAX_TAG_EXPR_TERMS:
+            raise TagExprError(
+                f"Tag expressions may name at most {MAX_TAG_EXPR_TERMS} tags"
+            )
+        return TagName(name)
+
+
+def _combine(kind, operands: List[TagExpr]) -> TagExpr:
+    """One And or Or node, with nested nodes of the same kind flattened."""
+    if len(operands) == 1:
+        return operands[0]
+    flat = []
+    for operand in operands:
+        flat.extend(operand.operands if isinstance(operand, kind) else (operand,))
+    return kind(tuple(flat))
+
+
+def parse_tag_expr(text: str) -> TagExpr:
+    """Parse a tag expression, raising TagExprError if it is malformed."""
+    parser = _Parser(_tokens(text))
+    if parser.peek() == "end":
+        raise TagExprError("Empty tag expression")
+    expr = parser.expression()
+    if parser.peek() != "end":
+        raise TagExprError(
+            f"Unexpected {parser.tokens[parser.position][1]!r} after the expression"
+        )
+    return expr
+
+
+def tag_names(expr: TagExpr) -> List[str]:
+    """The distinct tag names in an expression, in order of appearance."""
+    if isinstance(expr, TagName):
+        return [expr.name]
+    operands = (expr.operand,) if isinstance(expr, Not) else expr.operands
+    return list(dict.fromkeys(name for op in operands for name in tag_names(op)))
+
+
+def skeleton(expr: TagExpr, names: Dict[str, int]) -> TagExpr:
+    """
+    The expression with each name replaced by its index in names, so
+    expressions of the same structure share one skeleton.
+    """
+    if isinstance(expr, TagName):
+        return TagName(str(names[expr.name]))
+    if isinstance(expr, Not):
+        return Not(skeleton(expr.operand, names))
+    return type(expr)(tuple(skeleton(op, names) for op in expr.operands))
+
+
+def plan_tag_expr(
+    expr: TagExpr, tag_count: Callable[[str], int], total: int
+) -> Tuple[TagExpr, int]:
+    """
+    The expression with the operands of every node ordered for evaluation,
+    and an estimate of the jobs it matches, given the jobs per tag name and
+    in all. AND operands run most selective first, so intersections start
+    small and stop early once empty, with negations last; OR operands run
+    largest first.
+    """
+    if isinstance(expr, TagName):
+        return expr, min(total, tag_count(expr.name))
+    if isinstance(expr, Not):
+        operand, size = plan_tag_expr(expr.operand, tag_count, total)
+        return Not(operand), total - size
+    planned = [plan_tag_expr(op, tag_count, total) for op in expr.operands]
+    if isinstance(expr, Or):
+        planned.sort(key=lambda item: -item[1])
+        return Or(tuple(op for op, _ in planned)), min(
+            total, sum(size for _, size in planned)
+        )
+    positives = sorted(
+        (item for item in planned if not isinstance(item[0], Not)),
+        key=lambda item: item[1],
+    )
+    # The negation removing the most jobs goes first
+    negatives = sorted(
+        (item for item in planned if isinstance(item[0], Not)),
+        key=lambda item: item[1],
+    )
+    size = min(size for _, size in planned)
+    return And(tuple(op for op, _ in positives + negatives)), size
+
+
+def matches_tag_expr(expr: TagExpr, names: Collection[str]) -> bool:
+    """Whether a job with tags of the given names matches the expression."""
+    if isinstance(expr, TagName):
+        return expr.name in names
+    if isinstance(expr, Not):
+        return not matches_tag_expr(expr.operand, names)
+    if isinstance(expr, And):
+        return all(matches_tag_expr(op, names) for op in expr.operands)
+    return any(matches_tag_expr(op, names) for op in expr.operands)
+
+
+def required_tags(expr: TagExpr) -> Optional[FrozenSet[str]]:
+    """
+    Names of which every matching job has at least one, as few as can be
+    found, or None if a job with none of its tags can match.
+    """
+    if isinstance(expr, TagName):
+        return frozenset((expr.name,))
+    if isinstance(expr, Not):
+        return None
+    required = [required_tags(op) for op in expr.operands]
+    if isinstance(expr, And):
+        return min(
+            (names for names in required if names is not None),
+            key=len,
+            default=None,
+        )
+    if any(names is None for names in required):
+        return None
+    return frozenset().union(*required)
@@ -0,0 +1,293 @@
+"""
+Tracing - Lightweight nested spans across the API, service and manager layers
+
+A sampled request gets a root span from TracingMiddleware; services and
+managers open child spans through the @instrumented decorator, and every SQL
+statement becomes a "db.statement" span. The current span lives in a context
+variable, which AnyIO copies into the threadpool that runs sync endpoints
+and dependencies, so nesting follows the request through the dependency
+graph. When a request is not sampled there is no current span and every
+hook returns after a single context variable lookup.
+
+Finished traces are handed to a pluggable exporter: InMemoryExporter for
+tests and local inspection, JsonFileExporter for one JSON line per trace.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+from app.core.profiling import statement_shape
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_ATTRIBUTE_LIMIT = 500
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_time",
+        "duration_ms",
+        "attributes",
+        "error",
+        "_started",
+        "_trace",
+    )
+
+    def __init__(self, name: str, trace: "_Trace", parent: Optional["Span"]):
+        self.name = name
+        self.trace_id = trace.trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else trace.parent_id
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self.attributes: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+        self._trace = trace
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def finish(self):
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self._trace.spans.append(self)
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _Trace:
+    """Spans of one trace, collected until its root span finishes."""
+
+    __slots__ = ("trace_id", "parent_id", "spans")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.spans: List[Span] = []
+
+
+class SpanExporter:
+    """Receives every finished trace. Subclass to send spans elsewhere."""
+
+    def export(self, spans: List[Span]):
+        raise NotImplementedError
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the most recent traces in memory."""
+
+    def __init__(self, max_traces: int = 1000):
+        self.traces: deque = deque(maxlen=max_traces)
+
+    def export(self, spans: List[Span]):
+        self.traces.append([span.to_dict() for span in spans])
+
+
+class JsonFileExporter(SpanExporter):
+    """Appends each trace to a file as one JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        line = json.dumps([span.to_dict() for span in spans], default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+
+class Tracer:
+    """Sampling decisions and the exporter for finished traces."""
+
+    def __init__(self, sample_rate: float = 0.0, exporter: SpanExporter = None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def should_sample(self) -> bool:
+        return self.exporter is not None and random.random() < self.sample_rate
+
+    def export(self, trace: _Trace):
+        try:
+            self.exporter.export(trace.spans)
+        except Exception:
+            logger.exception("Span exporter failed for trace %s", trace.trace_id)
+
+
+def _build_exporter(name: str, path: str) -> Optional[SpanExporter]:
+    if name == "memory":
+        return InMemoryExporter()
+    if name == "json":
+        return JsonFileExporter(path)
+    return None
+
+
+tracer = Tracer(
+    settings.TRACING_SAMPLE_RATE,
+    _build_exporter(settings.TRACING_EXPORTER, settings.TRACING_JSON_PATH),
+)
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """The active span, or None when the request is not being traced."""
+    return _current_span.get()
+
+
+def set_attribute(key: str, value: Any):
+    """Set an attribute on the active span, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[key] = value
+
+
+@contextmanager
+def start_span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Open a child of the active span for the duration of the block.
+    Yields None, doing nothing else, when there is no active span.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    span = Span(name, parent._trace, parent)
+    span.attributes.update(attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        span.finish()
+
+
+@contextmanager
+def start_trace(
+    name: str, trace_id: Optional[str] = None, parent_id: Optional[str] = None
+) -> Iterator[Span]:
+    """Open a root span; the whole trace is exported when it finishes."""
+    trace = _Trace(trace_id or f"{random.getrandbits(128):032x}", parent_id)
+    span = Span(name, trace, None)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        span.finish()
+        tracer.export(trace)
+
+
+def _parse_traceparent(value: str) -> Optional[Dict[str, Any]]:
+    """Parse a W3C traceparent header: version-trace_id-parent_id-flags."""
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return {"trace_id": parts[1], "parent_id": parts[2], "sampled": sampled}
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a root span for sampled HTTP requests.
+    A W3C traceparent header with the sampled flag forces sampling and
+    continues the caller's trace.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or tracer.exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                parent = _parse_traceparent(value.decode("latin-1"))
+                break
+
+        if not (parent and parent["sampled"]) and not tracer.should_sample():
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        with start_trace(
+            f"{scope['method']} {scope['path']}",
+            trace_id=parent["trace_id"] if parent else None,
+            parent_id=parent["parent_id"] if parent else None,
+        ) as span:
+            span.set_attribute("http.method", scope["method"])
+            span.set_attribute("http.path", scope["path"])
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.set_attribute("http.route", route)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany):
+    parent = _current_span.get()
+    if parent is None or context is None:
+        return
+    span = Span("db.statement", parent._trace, parent)
+    span.attributes["db.statement"] = statement_shape(statement)[
+        :_STATEMENT_ATTRIBUTE_LIMIT
+    ]
+    span.attributes["db.executemany"] = executemany
+    context._trace_span = span
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _finish_statement_span(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            span.attributes["db.rowcount"] = cursor.rowcount
+        span.finish()
@@ -212,9 +212,14 @@ def generate_mock_jobs(num_jobs=500):
     """Generate mock job data"""
     tags_data = load_tags()
     jobs = []
+    seen_job_ids = set()
 
     for i in range(num_jobs):
+        # Random 10-digit IDs can collide; redraw until unique
         job_id = generate_job_id()
+        while job_id in seen_job_ids:
+            job_id = generate_job_id()
+        seen_job_ids.add(job_id)
         company_name = generate_company_name()
 
         job = {
@@ -0,0 +1,392 @@
+"""
+Dataset Generator - Parallel, deterministic mock data for benchmark-scale datasets
+
+Jobs are generated in shards across a process pool. Every shard owns its own
+``random.Random`` seeded from ``(seed, shard_index)``, so the output depends only
+on the seed and shard size - never on the number of workers or scheduling order.
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import time
+from bisect import bisect
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from app.data.db_reset_and_import import load_tags
+
+# Job ids are 10-digit strings, like the ones produced by generate_job_id
+JOB_ID_SPACE = 10**10
+
+DEFAULT_SHARD_SIZE = 250_000
+DEFAULT_ZIPF_EXPONENT = 1.1
+DEFAULT_WINDOW_DAYS = 60
+
+COMPANY_PREFIXES = [
+    "Tech",
+    "Data",
+    "Cloud",
+    "Digital",
+    "Cyber",
+    "AI",
+    "Web",
+    "App",
+    "Code",
+    "Dev",
+    "Quantum",
+    "Blue",
+    "Bright",
+    "Smart",
+    "Next",
+    "Open",
+    "Hyper",
+    "Nova",
+    "Core",
+    "Peak",
+]
+
+COMPANY_SUFFIXES = [
+    "Solutions",
+    "Technologies",
+    "Innovations",
+    "Systems",
+    "Labs",
+    "Works",
+    "Studio",
+    "Group",
+    "Team",
+    "Inc",
+    "Networks",
+    "Software",
+    "Analytics",
+    "Dynamics",
+    "Ventures",
+]
+
+LOCATIONS = [
+    "Remote",
+    "San Francisco, CA",
+    "New York, NY",
+    "Seattle, WA",
+    "Austin, TX",
+    "Boston, MA",
+    "Los Angeles, CA",
+    "Chicago, IL",
+    "Denver, CO",
+    "Atlanta, GA",
+    "Washington, DC",
+    "San Jose, CA",
+    "San Diego, CA",
+    "Portland, OR",
+    "Dallas, TX",
+    "Miami, FL",
+    "Raleigh, NC",
+    "Minneapolis, MN",
+    "Phoenix, AZ",
+    "Pittsburgh, PA",
+]
+
+POSITION_PREFIXES = ["Senior", "Lead", "Principal", "Staff", "Junior", "Associate"]
+POSITION_DOMAINS = [
+    "Software",
+    "Web",
+    "Data",
+    "Cloud",
+    "UI/UX",
+    "DevOps",
+    "Frontend",
+    "Backend",
+    "Full Stack",
+    "Product",
+]
+POSITION_TITLES = [
+    "Engineer",
+    "Developer",
+    "Analyst",
+    "Designer",
+    "Architect",
+    "Consultant",
+    "Manager",
+    "Specialist",
+]
+
+# (minimum, maximum, probability of the category being present)
+TAG_COUNTS = {
+    "role": (1, 1, 1.0),
+    "technology": (1, 3, 1.0),
+    "skill": (1, 4, 1.0),
+    "methodology": (1, 3, 0.7),
+    "tool": (1, 2, 0.6),
+}
+
+
+def zipf_cum_weights(size: int, exponent: float) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..size, usable with bisect."""
+    return list(accumulate(1.0 / (rank**exponent) for rank in range(1, size + 1)))
+
+
+def job_id_permutation(seed: int) -> Tuple[int, int]:
+    """
+    Seeded affine permutation (multiplier, offset) of the job ID space.
+
+    The multiplier is coprime with 10**10, so distinct indexes always map to
+    distinct IDs while still looking random.
+    """
+    rng = random.Random(f"job-id:{seed}")
+    multiplier = rng.randrange(JOB_ID_SPACE) | 1
+    while multiplier % 5 == 0:
+        multiplier += 2
+    return multiplier, rng.randrange(JOB_ID_SPACE)
+
+
+def job_id_for_index(index: int, permutation: Tuple[int, int]) -> str:
+    """Map a global job index to its unique 10-digit job ID."""
+    multiplier, offset = permutation
+    return f"{(multiplier * index + offset) % JOB_ID_SPACE:010d}"
+
+
+def build_pools(tags_data: Dict[str, List[str]], seed: int) -> Dict:
+    """
+    Build the value pools and their popularity ranking.
+
+    The ranking (which company or tag is the most popular) is a seeded shuffle,
+    so the skew is realistic but not tied to the alphabetical order of the pools.
+    """
+    rng = random.Random(f"pools:{seed}")
+
+    companies = [f"{p} {s}" for p in COMPANY_PREFIXES for s in COMPANY_SUFFIXES]
+    rng.shuffle(companies)
+
+    tags = {}
+    for category, names in tags_data.items():
+        ranked = list(names)
+        rng.shuffle(ranked)
+        tags[category] = ranked
+
+    return {
+        "companies": companies,
+        "locations": list(LOCATIONS),
+        "tags": tags,
+    }
+
+
+class _ShardGenerator:
+    """Generates the jobs of one shard from its own seeded random stream."""
+
+    def __init__(self, pools: Dict, exponent: float, seed: int, shard_index: int):
+        self.rng = random.Random(f"shard:{seed}:{shard_index}")
+        self.companies = pools["companies"]
+        self.locations = pools["locations"]
+        self.tags = pools["tags"]
+        self.company_weights = zipf_cum_weights(len(self.companies), exponent)
+        self.location_weights = zipf_cum_weights(len(self.locations), exponent)
+        self.tag_weights = {
+            category: zipf_cum_weights(len(names), exponent)
+            for category, names in self.tags.items()
+        }
+
+    def _pick(self, values: List[str], cum_weights: List[float]) -> str:
+        return values[bisect(cum_weights, self.rng.random() * cum_weights[-1])]
+
+    def _pick_many(
+        self, values: List[str], cum_weights: List[float], count: int
+    ) -> List[str]:
+        count = min(count, len(values))
+        picked = []
+        while len(picked) < count:
+            value = self._pick(values, cum_weights)
+            if value not in picked:
+                picked.append(value)
+        return picked
+
+    def _position(self) -> str:
+        rng = self.rng
+        domain = rng.choice(POSITION_DOMAINS)
+        title = rng.choice(POSITION_TITLES)
+        if rng.random() < 0.7:
+            return f"{rng.choice(POSITION_PREFIXES)} {domain} {title}"
+        return f"{domain} {title}"
+
+    def _tags(self) -> Dict[str, List[str]]:
+        selected = {}
+        for category, (low, high, probability) in TAG_COUNTS.items():
+            names = self.tags.get(category)
+            if not names or self.rng.random() >= probability:
+                continue
+            count = self.rng.randint(low, high)
+            selected[category] = self._pick_many(
+                names, self.tag_weights[category], count
+            )
+        return selected
+
+    def job(self, job_id: str, anchor: date, window_days: int) -> Dict:
+        rng = self.rng
+        posting_date = anchor - timedelta(days=rng.randint(1, window_days))
+        return {
+            "job_position": self._position(),
+            "job_link": f"https://example.com/jobs/{rng.getrandbits(40):010x}",
+            "job_id": job_id,
+            "company_name": self._pick(self.companies, self.company_weights),
+            "company_profile": f"https://example.com/companies/{rng.getrandbits(40):010x}",
+            "job_location": self._pick(self.locations, self.location_weights),
+            "job_posting_date": posting_date.isoformat(),
+            "tags": self._tags(),
+        }
+
+
+def shard_path(output_dir: str, shard_index: int) -> str:
+    """Path of the JSONL file for a shard."""
+    return os.path.join(output_dir, f"jobs-{shard_index:05d}.jsonl")
+
+
+def generate_shard(spec: Dict) -> Tuple[str, int]:
+    """Generate one shard and write it as JSONL. Returns (path, job count)."""
+    generator = _ShardGenerator(
+        spec["pools"], spec["exponent"], spec["seed"], spec["shard_index"]
+    )
+    anchor = date.fromisoformat(spec["anchor_date"])
+    permutation = job_id_permutation(spec["seed"])
+    start, stop = spec["start"], spec["stop"]
+    path = shard_path(spec["output_dir"], spec["shard_index"])
+
+    with open(path, "w", buffering=1024 * 1024) as f:
+        for index in range(start, stop):
+            job = generator.job(
+                job_id_for_index(index, permutation), anchor, spec["window_days"]
+            )
+            f.write(json.dumps(job, separators=(",", ":")))
+            f.write("\n")
+
+    return path, stop - start
+
+
+def generate_dataset(
+    num_jobs: int,
+    output_dir: str,
+    seed: int = 42,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    workers: Optional[int] = None,
+    anchor_date: Optional[date] = None,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    exponent: float = DEFAULT_ZIPF_EXPONENT,
+) -> Dict:
+    """
+    Generate ``num_jobs`` jobs into sharded JSONL files under ``output_dir``.
+
+    Output is reproducible for a given seed, shard size and anchor date.
+    A ``manifest.json`` describing the run is written next to the shards.
+    """
+    anchor_date = anchor_date or datetime.now().date()
+    os.makedirs(output_dir, exist_ok=True)
+
+    pools = build_pools(load_tags(), seed)
+    num_shards = max(1, math.ceil(num_jobs / shard_size))
+    specs = [
+        {
+            "pools": pools,
+            "exponent": exponent,
+            "seed": seed,
+            "shard_index": shard_index,
+            "start": shard_index * shard_size,
+            "stop": min(num_jobs, (shard_index + 1) * shard_size),
+            "anchor_date": anchor_date.isoformat(),
+            "window_days": window_days,
+            "output_dir": output_dir,
+        }
+        for shard_index in range(num_shards)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or num_shards == 1:
+        results = [generate_shard(spec) for spec in specs]
+    else:
+        with Pool(processes=min(workers, num_shards)) as pool:
+            results = pool.map(generate_shard, specs, chunksize=1)
+
+    manifest = {
+        "num_jobs": num_jobs,
+        "seed": seed,
+        "shard_size": shard_size,
+        "anchor_date": anchor_date.isoformat(),
+        "window_days": window_days,
+        "zipf_exponent": exponent,
+        "shards": [
+            {"path": os.path.basename(path), "jobs": count} for path, count in results
+        ],
+    }
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def iter_dataset(output_dir: str):
+    """Yield jobs from a generated dataset, shard by shard."""
+    with open(os.path.join(output_dir, "manifest.json"), "r") as f:
+        manifest = json.load(f)
+
+    for shard in manifest["shards"]:
+        with open(os.path.join(output_dir, shard["path"]), "r") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generate a sharded, reproducible mock job dataset"
+    )
+    parser.add_argument("--jobs", type=int, default=100_000, help="Number of jobs")
+    parser.add_argument(
+        "--output-dir", default="mock_dataset", help="Directory for JSONL shards"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="Jobs per shard"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--anchor-date",
+        type=date.fromisoformat,
+        default=None,
+        help="Posting dates are generated before this date (default: today)",
+    )
+    parser.add_argument(
+        "--window-days",
+        type=int,
+        default=DEFAULT_WINDOW_DAYS,
+        help="Posting dates fall within this many days of the anchor date",
+    )
+    parser.add_argument(
+        "--zipf-exponent",
+        type=float,
+        default=DEFAULT_ZIPF_EXPONENT,
+        help="Popularity skew for companies, locations and tags",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = generate_dataset(
+        args.jobs,
+        args.output_dir,
+        seed=args.seed,
+        shard_size=args.shard_size,
+        workers=args.workers,
+        anchor_date=args.anchor_date,
+        window_days=args.window_days,
+        exponent=args.zipf_exponent,
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"Generated {result['num_jobs']} jobs in {len(result['shards'])} shards "
+        f"under {args.output_dir} in {elapsed:.1f}s"
+    )
+    sys.exit(0)
@@ -0,0 +1 @@
+# Indexes package: in-memory search structures built from the database
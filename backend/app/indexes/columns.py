@@ -0,0 +1,1094 @@
+"""
+Column Store - In-process columnar copy of the jobs for vectorized search
+
+The filterable fields of every hot job are held in NumPy arrays, one entry
+per job in id order:
+
+    ids               int32 primary keys, ascending
+    days              int32 posting dates as proleptic Gregorian ordinals
+    location_codes,
+    company_codes,
+    position_codes    int32 codes in the process-wide string dictionaries
+                      of app.core.strings (-1 when unset)
+    category_bits     uint8, bit i set when the job has a tag in the i-th
+                      TagCategory (see CATEGORY_BITS)
+
+Text, date range, location and category filters evaluate as boolean masks
+over whole columns; a text pattern is matched once against each distinct
+value, not once per job. SQL only loads the page of jobs a search returns.
+Loaded from a snapshot whose codes agree with the dictionaries, the first
+five columns are views of its memory map.
+
+Tag filters run on per-tag posting lists: the ascending base rows of each
+tag's jobs. A tag expression is planned with the lists' sizes, so an AND
+intersects its smallest operands first and stops once nothing is left,
+then evaluated as set operations on sorted row arrays, through a bitmap
+when the rows involved are dense. The result is one more mask.
+
+Sorted searches never sort every match. Each row gets an int64 key that
+orders it as the SQL search does, id tiebreak included, and the first page
+is selected from the matches' keys. For date and company orders the base
+also keeps its rows in sort order, built on first use, like the indexes the
+SQL search reads; when matches are dense, walking that order finds the page
+after a few chunks.
+
+Writes leave the base columns untouched: a changed job's base row is masked
+out and its current values go to a small delta of the same layout, which is
+folded into a new base once it outgrows max(MIN_COMPACT_ROWS, 2% of the
+base). catch_up reads the change feed to learn which jobs to reload. Every
+change swaps in a new _Version, so a search never sees one half-applied.
+"""
+
+import logging
+import os
+import threading
+from array import array
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from app.core import strings
+from app.core.change_feed import ChangeFeed, change_feed
+from app.core.strings import StringDictionary
+from app.core.tag_expr import And, Not, Or, TagExpr, TagName, plan_tag_expr
+from app.indexes.snapshot import IndexSnapshot
+from app.indexes.tokens import like_regex
+from app.managers.job_manager import (
+    SORT_COMPANY,
+    SORT_NEWEST,
+    SORT_OLDEST,
+    SORT_RELEVANCE,
+    SORTS,
+    JobManager,
+)
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.tag_manager import TagManager
+from app.models.tag import TagCategory
+
+logger = logging.getLogger(__name__)
+
+# Bit of each tag category in category_bits
+CATEGORY_BITS: Dict[str, int] = {
+    category.value: 1 << i for i, category in enumerate(TagCategory)
+}
+
+# Category filters may name a category by value or, as SQL allows, by name
+_CATEGORY_LOOKUP: Dict[str, int] = {
+    **{category.name: CATEGORY_BITS[category.value] for category in TagCategory},
+    **CATEGORY_BITS,
+}
+
+# The delta is compacted into the base beyond the larger of these
+MIN_COMPACT_ROWS = 10000
+COMPACT_FRACTION = 0.02
+
+# Rows scanned at a time when collecting the first matches of a mask
+_CHUNK_ROWS = 65536
+
+# Pattern lookup tables kept per store, keyed by (dictionary, pattern, size)
+_MAX_PATTERN_TABLES = 256
+
+# A pattern matching at most this many codes is tested with one comparison
+# per code; past it, a table lookup per row is cheaper
+_MAX_COMPARED_CODES = 8
+
+# Sort keys: the id in the low bits, then the posting date, then the rank
+# of a relevance or company order. Date ordinals stay below 2**22.
+_ID_BITS = 31
+_DAY_BITS = 22
+_MAX_ID = (1 << _ID_BITS) - 1
+_MAX_DAY = date.max.toordinal()
+
+# Row order each sort walks: oldest reads newest's backwards, relevance
+# walks it until enough rows of the best relevance rank are found
+_ROW_ORDERS = {
+    SORT_NEWEST: SORT_NEWEST,
+    SORT_OLDEST: SORT_NEWEST,
+    SORT_COMPANY: SORT_COMPANY,
+    SORT_RELEVANCE: SORT_NEWEST,
+}
+
+# A row order is walked when at least this many times the rows wanted
+# match; sparser matches are gathered and their keys selected from
+_WALK_FACTOR = 8
+
+# Set operations on rows go through a bitmap once the rows probed or
+# united number more than 1/_DENSE_FACTOR of the rows searched; sparser
+# probes binary search the posting list
+_DENSE_FACTOR = 32
+
+# Code columns, and the shared dictionary each is encoded with
+_CODE_COLUMNS = (
+    ("location_codes", strings.locations),
+    ("company_codes", strings.companies),
+    ("position_codes", strings.positions),
+)
+
+
+@dataclass(frozen=True)
+class _Columns:
+    """Parallel column arrays, in ascending id order."""
+
+    ids: np.ndarray
+    days: np.ndarray
+    location_codes: np.ndarray
+    company_codes: np.ndarray
+    position_codes: np.ndarray
+    category_bits: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def empty(cls) -> "_Columns":
+        int32 = np.empty(0, dtype=np.int32)
+        return cls(int32, int32, int32, int32, int32, np.empty(0, dtype=np.uint8))
+
+    def take(self, rows: np.ndarray) -> "_Columns":
+        """The given rows, in the given order."""
+        return _Columns(
+            *(getattr(self, name)[rows] for name in self.__dataclass_fields__)
+        )
+
+    def concat(self, other: "_Columns") -> "_Columns":
+        """The rows of both, in id order."""
+        merged = _Columns(
+            *(
+                np.concatenate((getattr(self, name), getattr(other, name)))
+                for name in self.__dataclass_fields__
+            )
+        )
+        return merged.take(np.argsort(merged.ids, kind="stable"))
+
+
+@dataclass(frozen=True)
+class _Version:
+    """One consistent state of the store."""
+
+    base: _Columns
+    # Which base rows are current; None when all of them are
+    live: Optional[np.ndarray]
+    # Jobs written since the base was built
+    delta: _Columns
+    # tag id -> ascending rows of its jobs, in the base and in the delta
+    postings: Dict[int, np.ndarray] = field(default_factory=dict)
+    delta_postings: Dict[int, np.ndarray] = field(default_factory=dict)
+    # Base rows in a sort's order, by sort; filled in on first use
+    row_orders: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+# (day, location, company and position codes, category bits, tag ids)
+_DeltaRow = Tuple[int, int, int, int, int, Tuple[int, ...]]
+
+
+@dataclass(frozen=True)
+class _CodeMatch:
+    """The codes of one code column whose values match a pattern."""
+
+    column: str
+    # Indexed by code; one extra False entry for -1 (unset)
+    table: np.ndarray
+    # The codes set in table
+    matches: np.ndarray
+
+    def mask(self, columns: _Columns) -> np.ndarray:
+        codes = getattr(columns, self.column)
+        # A gather from the table costs several comparisons per row
+        if len(self.matches) > _MAX_COMPARED_CODES:
+            return self.table[codes]
+        mask = np.zeros(len(codes), dtype=bool)
+        for code in self.matches:
+            mask |= codes == code
+        return mask
+
+
+@dataclass(frozen=True)
+class _Criteria:
+    """A search's filters, resolved against the string dictionaries."""
+
+    first_day: Optional[int] = None
+    last_day: Optional[int] = None
+    # A row must match at least one _CodeMatch of every group
+    pattern_groups: Tuple[Tuple[_CodeMatch, ...], ...] = ()
+    category_bits: int = 0
+
+    def mask(self, columns: _Columns) -> Optional[np.ndarray]:
+        """Rows of columns that match, or None if there are no filters."""
+        mask = None
+        if self.first_day is not None:
+            mask = columns.days >= self.first_day
+        if self.last_day is not None:
+            mask = _and(mask, columns.days <= self.last_day)
+        for group in self.pattern_groups:
+            matched = np.zeros(len(columns), dtype=bool)
+            for match in group:
+                if len(match.matches):
+                    matched |= match.mask(columns)
+            mask = _and(mask, matched)
+        if self.category_bits:
+            mask = _and(mask, (columns.category_bits & self.category_bits) != 0)
+        return mask
+
+
+def _and(mask: Optional[np.ndarray], other: np.ndarray) -> np.ndarray:
+    if mask is None:
+        return other
+    mask &= other
+    return mask
+
+
+def _first_ids(ids: np.ndarray, mask: Optional[np.ndarray], count: int) -> np.ndarray:
+    """The first count ids where mask is set, without collecting every match."""
+    if mask is None:
+        return ids[:count]
+    found = []
+    for start in range(0, len(mask), _CHUNK_ROWS):
+        if count <= 0:
+            break
+        rows = np.flatnonzero(mask[start : start + _CHUNK_ROWS])[:count]
+        found.append(ids[start + rows])
+        count -= len(rows)
+    return np.concatenate(found) if found else ids[:0]
+
+
+def _walk(
+    order: np.ndarray,
+    mask: Optional[np.ndarray],
+    count: int,
+    total: int,
+    counted: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    The first count rows of order where mask is set, of total set rows.
+    With counted, the walk goes on until count rows it selects are found,
+    and returns every set row on the way. Scans order in chunks sized to
+    find them in about one pass.
+    """
+    if mask is None and counted is None:
+        return order[:count]
+    found = []
+    start = 0
+    chunk = max(_CHUNK_ROWS // 16, 2 * count * len(order) // max(total, 1))
+    while count > 0 and start < len(order):
+        rows = order[start : start + chunk]
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if counted is None:
+            rows = rows[:count]
+            count -= len(rows)
+        else:
+            count -= int(np.count_nonzero(counted(rows)))
+        found.append(rows)
+        start += chunk
+        chunk *= 2
+    return np.concatenate(found) if found else order[:0]
+
+
+def _top_k(keys: np.ndarray, count: int) -> np.ndarray:
+    """
+    Positions of the count smallest keys, smallest first. A selection, then
+    a sort of just the selected keys.
+    """
+    if count < len(keys):
+        top = np.argpartition(keys, count - 1)[:count]
+    else:
+        top = np.arange(len(keys))
+    return top[np.argsort(keys[top])]
+
+
+def _contains(members: np.ndarray, rows: np.ndarray, size: int) -> np.ndarray:
+    """Which of rows are in members, both ascending rows below size."""
+    if not len(members):
+        return np.zeros(len(rows), dtype=bool)
+    if len(rows) * _DENSE_FACTOR > size:
+        bitmap = np.zeros(size, dtype=bool)
+        bitmap[members] = True
+        return bitmap[rows]
+    found = np.minimum(np.searchsorted(members, rows), len(members) - 1)
+    return members[found] == rows
+
+
+def _as_mask(rows: np.ndarray, size: int) -> np.ndarray:
+    """A set of rows as a boolean mask of size rows."""
+    if rows.dtype == bool:
+        return rows
+    mask = np.zeros(size, dtype=bool)
+    mask[rows] = True
+    return mask
+
+
+def _evaluate(
+    expr: TagExpr, rows_of: Callable[[str], np.ndarray], size: int
+) -> np.ndarray:
+    """
+    The rows, of size rows, matching a planned tag expression, given the
+    ascending rows of each tag name. Sparse results are ascending rows,
+    dense ones a boolean mask the caller may modify.
+    """
+    if isinstance(expr, TagName):
+        return rows_of(expr.name)
+    if isinstance(expr, Not):
+        operand = _evaluate(expr.operand, rows_of, size)
+        if operand.dtype == bool:
+            return np.logical_not(operand, out=operand)
+        mask = np.ones(size, dtype=bool)
+        mask[operand] = False
+        return mask
+    if isinstance(expr, Or):
+        operands = [_evaluate(op, rows_of, size) for op in expr.operands]
+        if (
+            any(rows.dtype == bool for rows in operands)
+            or sum(len(rows) for rows in operands) * _DENSE_FACTOR > size
+        ):
+            mask = np.zeros(size, dtype=bool)
+            for rows in operands:
+                if rows.dtype == bool:
+                    mask |= rows
+                else:
+                    mask[rows] = True
+            return mask
+        return np.unique(np.concatenate(operands))
+    # Positive operands come first, the smallest leading; a negation after
+    # them removes its operand's rows
+    result = None
+    for op in expr.operands:
+        if result is not None and result.dtype != bool and not len(result):
+            break
+        negated = result is not None and isinstance(op, Not)
+        rows = _evaluate(op.operand if negated else op, rows_of, size)
+        if result is None:
+            result = rows
+        elif result.dtype == bool:
+            if rows.dtype == bool:
+                result &= ~rows if negated else rows
+            elif negated:
+                result[rows] = False
+            elif len(rows) * _DENSE_FACTOR > size:
+                # Compressing many rows by a mask costs more than a scatter
+                narrowed = np.zeros(size, dtype=bool)
+                narrowed[rows] = result[rows]
+                result = narrowed
+            else:
+                result = rows[result[rows]]
+        else:
+            found = (
+                rows[result] if rows.dtype == bool else _contains(rows, result, size)
+            )
+            result = result[~found if negated else found]
+    return result
+
+
+def _remap(
+    postings: Dict[int, np.ndarray], new_rows: np.ndarray
+) -> Dict[int, np.ndarray]:
+    """Postings with row r renumbered new_rows[r]; rows mapped to -1 dropped."""
+    remapped = {}
+    for tag_id, rows in postings.items():
+        rows = new_rows[rows]
+        remapped[tag_id] = rows[rows >= 0]
+    return remapped
+
+
+def _postings(
+    tag_column: List[np.ndarray], row_column: List[np.ndarray]
+) -> Dict[int, np.ndarray]:
+    """Ascending rows per tag id, from parallel chunks of tag ids and rows."""
+    if not tag_column:
+        return {}
+    tag_ids = np.concatenate(tag_column)
+    rows = np.concatenate(row_column)
+    order = np.lexsort((rows, tag_ids))
+    tag_ids, rows = tag_ids[order], rows[order]
+    starts = np.flatnonzero(np.diff(tag_ids)) + 1
+    return {
+        int(group[0]): group_rows
+        for group, group_rows in zip(np.split(tag_ids, starts), np.split(rows, starts))
+        if len(group)
+    }
+
+
+def _adopt(
+    codes: memoryview, values: List[str], dictionary: StringDictionary
+) -> np.ndarray:
+    """
+    Codes of another dictionary (such as a snapshot's, listed by values)
+    translated to dictionary's. Zero-copy when both assign the same codes.
+    """
+    codes = np.frombuffer(codes, dtype=np.int32)
+    translated = dictionary.encode(values)
+    if translated == list(range(len(values))):
+        return codes
+    # -1 (unset) picks the appended last entry
+    return np.array(translated + [-1], dtype=np.int32)[codes]
+
+
+class ColumnStore:
+    """
+    Columnar copy of the hot jobs' filterable fields, kept current through
+    the change feed. Searches may run on any thread; loading and catching
+    up serialize on a lock.
+    """
+
+    def __init__(self, change_feed: ChangeFeed):
+        self.change_feed = change_feed
+        # Feed position the columns reflect
+        self.change_seq: Optional[int] = None
+        # Set when the feed was pruned past change_seq; a reload is needed
+        self.stale = False
+        # tag id -> its category's bit
+        self._tag_bits: Dict[int, int] = {}
+        # tag name -> ids of the tags of that name, in any category
+        self._tag_ids: Dict[str, Tuple[int, ...]] = {}
+        # Jobs changed since the base was built, by pk
+        self._delta: Dict[int, _DeltaRow] = {}
+        self._version: Optional[_Version] = None
+        # Kept referenced while its memory map backs the base columns
+        self._snapshot: Optional[IndexSnapshot] = None
+        self._pattern_tables: Dict[Tuple[str, str, int], _CodeMatch] = {}
+        # Rank of each company code in value order, with -1 (unset) last
+        self._company_ranks = np.zeros(1, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the store holds columns to search."""
+        return self._version is not None
+
+    def __len__(self) -> int:
+        version = self._version
+        if version is None:
+            return 0
+        base = (
+            len(version.base)
+            if version.live is None
+            else int(np.count_nonzero(version.live))
+        )
+        return base + len(version.delta)
+
+    def load(
+        self,
+        job_manager: JobManager,
+        tag_manager: TagManager,
+        job_tag_manager: JobTagManager,
+        batch_size: int = 10000,
+    ):
+        """Build the columns from every hot job in the database."""
+        with self._lock:
+            # Read first, so changes made during the load are replayed
+            change_seq = self.change_feed.latest()
+
+            ids, days = array("i"), array("i")
+            locations, companies, positions = array("i"), array("i"), array("i")
+            for batch in job_manager.iter_index_rows(batch_size):
+                for pk, posting_date, position, company, location in batch:
+                    ids.append(pk)
+                    days.append(posting_date.toordinal())
+                    locations.append(strings.locations.code(location))
+                    companies.append(strings.companies.code(company))
+                    positions.append(strings.positions.code(position))
+            ids = np.frombuffer(ids, dtype=np.int32)
+
+            self._set_tags(self._tags_of(tag_manager))
+            tag_bits = self._tag_bits
+            bits_by_tag = np.zeros(max(tag_bits, default=0) + 1, dtype=np.uint8)
+            for tag_id, bit in tag_bits.items():
+                bits_by_tag[tag_id] = bit
+            bits = np.zeros(len(ids), dtype=np.uint8)
+            tag_column, row_column = [], []
+            for batch in job_tag_manager.iter_tag_postings(batch_size):
+                pairs = np.array(batch, dtype=np.int64).reshape(-1, 2)
+                rows = np.searchsorted(ids, pairs[:, 1])
+                # Skip jobs and tags created after they were read; the feed
+                # brings those in
+                found = (rows < len(ids)) & (pairs[:, 0] < len(bits_by_tag))
+                found[found] = ids[rows[found]] == pairs[found, 1]
+                np.bitwise_or.at(bits, rows[found], bits_by_tag[pairs[found, 0]])
+                tag_column.append(pairs[found, 0])
+                row_column.append(rows[found].astype(np.int32))
+
+            base = _Columns(
+                ids,
+                *(
+                    np.frombuffer(column, dtype=np.int32)
+                    for column in (days, locations, companies, positions)
+                ),
+                bits,
+            )
+            self._install(
+                base, _postings(tag_column, row_column), change_seq, snapshot=None
+            )
+
+    def load_snapshot(self, snapshot: IndexSnapshot) -> bool:
+        """
+        Take the base columns from a snapshot without copying them. Returns
+        False, loading nothing, if the snapshot was built without a change
+        feed position or the feed no longer reaches back to it.
+        """
+        if snapshot.change_seq is None:
+            return False
+        if self.change_feed.changes_since(snapshot.change_seq) is None:
+            return False
+
+        with self._lock:
+            ids = np.frombuffer(snapshot.section("ids"), dtype=np.int32)
+            self._set_tags(snapshot.header["tags"])
+            bits = np.zeros(len(ids), dtype=np.uint8)
+            postings = {}
+            for tag_id, _name, category in snapshot.header["tags"]:
+                tagged = np.frombuffer(snapshot.tag_postings(tag_id), dtype=np.int32)
+                rows = np.searchsorted(ids, tagged)
+                # Skip postings naming jobs the snapshot does not hold
+                found = rows < len(ids)
+                found[found] = ids[rows[found]] == tagged[found]
+                rows = rows[found].astype(np.int32)
+                bits[rows] |= CATEGORY_BITS[category]
+                postings[tag_id] = rows
+
+            base = _Columns(
+                ids,
+                np.frombuffer(snapshot.section("days"), dtype=np.int32),
+                _adopt(
+                    snapshot.section("location_codes"),
+                    snapshot.locations,
+                    strings.locations,
+                ),
+                _adopt(
+                    snapshot.section("company_codes"),
+                    snapshot.companies,
+                    strings.companies,
+                ),
+                _adopt(
+                    snapshot.section("position_codes"),
+                    snapshot.positions,
+                    strings.positions,
+                ),
+                bits,
+            )
+            self._install(base, postings, snapshot.change_seq, snapshot)
+        return True
+
+    def load_columns(
+        self,
+        ids: np.ndarray,
+        days: np.ndarray,
+        location_codes: np.ndarray,
+        company_codes: np.ndarray,
+        position_codes: np.ndarray,
+        category_bits: np.ndarray,
+        change_seq: int,
+        tags: Sequence[Tuple[int, str, str]] = (),
+        postings: Optional[Dict[int, np.ndarray]] = None,
+    ):
+        """
+        Take prebuilt column arrays in the documented layout, ids ascending,
+        reflecting the change feed up to change_seq, with the (id, name,
+        category) of tags and each tag's ascending rows.
+        """
+        base = _Columns(
+            *(
+                np.asarray(column, dtype=np.int32)
+                for column in (ids, days, location_codes, company_codes, position_codes)
+            ),
+            np.asarray(category_bits, dtype=np.uint8),
+        )
+        postings = {
+            tag_id: np.asarray(rows, dtype=np.int32)
+            for tag_id, rows in (postings or {}).items()
+        }
+        # Tags not given are read on the first catch_up that needs them
+        with self._lock:
+            self._set_tags(tags)
+            self._install(base, postings, change_seq, None)
+
+    def catch_up(
+        self,
+        job_manager: JobManager,
+        tag_manager: TagManager,
+        job_tag_manager: JobTagManager,
+    ) -> bool:
+        """
+        Reload the jobs changed since the columns were last brought up to
+        date. Returns whether the store is current; False if it was never
+        loaded or has fallen too far behind the feed to catch up.
+        """
+        if self._version is None or self.stale:
+            return False
+        # Nothing new is the common case, and needs no lock
+        changes = self.change_feed.changes_since(self.change_seq)
+        if changes is not None and changes[0] == self.change_seq:
+            return True
+
+        with self._lock:
+            changes = self.change_feed.changes_since(self.change_seq)
+            if changes is None:
+                logger.warning("Column store fell behind the change feed")
+                self.stale = True
+                return False
+            latest, pks = changes
+            if pks:
+                self._reload(pks, job_manager, tag_manager, job_tag_manager)
+            self.change_seq = latest
+        return True
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        location: Optional[str] = None,
+        tag_categories: Optional[Sequence[str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 10,
+        offset: int = 0,
+        sort: Optional[str] = None,
+        tags: Optional[Sequence[str]] = None,
+        tag_expr: Optional[TagExpr] = None,
+    ) -> Tuple[int, List[int]]:
+        """
+        The number of jobs matching the filters, and the primary keys of a
+        page of them in the sort order or by id, as the SQL search returns
+        them.
+        """
+        version = self._version
+        if version is None:
+            raise RuntimeError("Column store is not loaded")
+        if sort is not None and sort not in SORTS:
+            raise ValueError(f"Unknown sort order: {sort}")
+        if sort == SORT_RELEVANCE and not query:
+            sort = SORT_NEWEST
+
+        pattern_groups = []
+        query_matches = {}
+        if query:
+            # Position, company or location, like the SQL search
+            query_matches = {
+                column: self._pattern_match(column, dictionary, query)
+                for column, dictionary in _CODE_COLUMNS
+            }
+            pattern_groups.append(tuple(query_matches.values()))
+        if location:
+            pattern_groups.append(
+                (self._pattern_match("location_codes", strings.locations, location),)
+            )
+        criteria = _Criteria(
+            first_day=date_from.toordinal() if date_from else None,
+            last_day=date_to.toordinal() if date_to else None,
+            pattern_groups=tuple(pattern_groups),
+            category_bits=self._bits_of(tag_categories or ()),
+        )
+        # No job has a tag in a category that does not exist
+        if tag_categories and not criteria.category_bits:
+            return 0, []
+        base_mask = criteria.mask(version.base)
+        delta_mask = criteria.mask(version.delta)
+        # Any of tags, and tag_expr
+        tag_filters = [TagName(name) for name in dict.fromkeys(tags or ())]
+        if len(tag_filters) > 1:
+            tag_filters = [Or(tuple(tag_filters))]
+        # As in SQL, one tag must have both a name in tags and a category in
+        # tag_categories, so those names only count that category's tags
+        category_tags = []
+        if tag_filters and criteria.category_bits:
+            category_tags = [(tag_filters.pop(), criteria.category_bits)]
+        if tag_expr is not None:
+            tag_filters.append(tag_expr)
+        if tag_filters:
+            expr = tag_filters[0] if len(tag_filters) == 1 else And(tuple(tag_filters))
+            category_tags.append((expr, 0))
+        for expr, category_bits in category_tags:
+            base_mask = _and(
+                base_mask,
+                self._tag_mask(
+                    expr, version.postings, len(version.base), category_bits
+                ),
+            )
+            delta_mask = _and(
+                delta_mask,
+                self._tag_mask(
+                    expr, version.delta_postings, len(version.delta), category_bits
+                ),
+            )
+        if version.live is not None:
+            base_mask = _and(base_mask, version.live)
+
+        base_total, delta_total = (
+            len(columns) if mask is None else int(np.count_nonzero(mask))
+            for columns, mask in (
+                (version.base, base_mask),
+                (version.delta, delta_mask),
+            )
+        )
+        total = base_total + delta_total
+        end = offset + limit
+        if sort is not None:
+            page = self._sorted_ids(
+                version, base_mask, base_total, delta_mask, sort, query_matches, end
+            )
+            return total, page[offset:end].tolist()
+        page = _first_ids(version.base.ids, base_mask, end)
+        delta_page = _first_ids(version.delta.ids, delta_mask, end)
+        if len(delta_page):
+            page = np.sort(np.concatenate((page, delta_page)))
+        return total, page[offset:end].tolist()
+
+    def _sorted_ids(
+        self,
+        version: _Version,
+        base_mask: Optional[np.ndarray],
+        base_total: int,
+        delta_mask: Optional[np.ndarray],
+        sort: str,
+        query_matches: Dict[str, _CodeMatch],
+        count: int,
+    ) -> np.ndarray:
+        """The ids of the first count matching jobs in sort order."""
+        if count <= 0:
+            return version.base.ids[:0]
+        base, delta = version.base, version.delta
+        if sort in _ROW_ORDERS and base_total >= _WALK_FACTOR * count:
+            order = self._row_order(version, _ROW_ORDERS[sort])
+            if sort == SORT_OLDEST:
+                order = order[::-1]
+            counted = None
+            if sort == SORT_RELEVANCE:
+                counted = self._best_ranked(base, query_matches)
+            rows = _walk(order, base_mask, count, base_total, counted)
+        else:
+            rows = (
+                np.arange(len(base)) if base_mask is None else np.flatnonzero(base_mask)
+            )
+        delta_rows = (
+            np.arange(len(delta)) if delta_mask is None else np.flatnonzero(delta_mask)
+        )
+        keys = np.concatenate(
+            (
+                self._sort_keys(base, rows, sort, query_matches),
+                self._sort_keys(delta, delta_rows, sort, query_matches),
+            )
+        )
+        ids = np.concatenate((base.ids[rows], delta.ids[delta_rows]))
+        return ids[_top_k(keys, count)]
+
+    def _tag_mask(
+        self,
+        expr: TagExpr,
+        postings: Dict[int, np.ndarray],
+        size: int,
+        category_bits: int = 0,
+    ) -> np.ndarray:
+        """
+        Which of size rows, with the given postings, match a tag expression.
+        Given category bits, a name only stands for the tags of its name in
+        those categories.
+        """
+        tag_ids, tag_bits = self._tag_ids, self._tag_bits
+
+        def ids_of(name: str) -> Sequence[int]:
+            ids = tag_ids.get(name, ())
+            if category_bits:
+                ids = [tag_id for tag_id in ids if tag_bits[tag_id] & category_bits]
+            return ids
+
+        def rows_of(name: str) -> np.ndarray:
+            lists = [postings[tag_id] for tag_id in ids_of(name) if tag_id in postings]
+            if len(lists) == 1:
+                return lists[0]
+            return np.unique(np.concatenate(lists)) if lists else np.empty(0, np.int32)
+
+        def tag_count(name: str) -> int:
+            return sum(len(postings.get(tag_id, ())) for tag_id in ids_of(name))
+
+        plan, _ = plan_tag_expr(expr, tag_count, size)
+        return _as_mask(_evaluate(plan, rows_of, size), size)
+
+    def _best_ranked(
+        self, columns: _Columns, query_matches: Dict[str, _CodeMatch]
+    ) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """
+        Which of some rows have the best relevance rank any value matches,
+        or None if only the last rank can. Every row ranked ahead of the
+        first count such rows, newest first, is newer than the last of them.
+        """
+        for column in ("position_codes", "company_codes"):
+            match = query_matches[column]
+            if len(match.matches):
+                table, codes = match.table, getattr(columns, column)
+                return lambda rows: table[codes[rows]]
+        return None
+
+    def _sort_keys(
+        self,
+        columns: _Columns,
+        rows: np.ndarray,
+        sort: str,
+        query_matches: Dict[str, _CodeMatch],
+    ) -> np.ndarray:
+        """
+        int64 keys of the given rows, ascending in sort order, matching the
+        SQL search's ORDER BY.
+        """
+        ids = columns.ids[rows].astype(np.int64)
+        if sort == SORT_OLDEST:
+            return (columns.days[rows].astype(np.int64) << _ID_BITS) | (_MAX_ID - ids)
+        if sort == SORT_COMPANY:
+            ranks = self._company_ranks_of(strings.companies)
+            return (ranks[columns.company_codes[rows]] << _ID_BITS) | ids
+        keys = ((_MAX_DAY - columns.days[rows]).astype(np.int64) << _ID_BITS) | ids
+        if sort == SORT_RELEVANCE:
+            # Position matches, then company matches, then the rest
+            position = query_matches["position_codes"].table[
+                columns.position_codes[rows]
+            ]
+            company = query_matches["company_codes"].table[columns.company_codes[rows]]
+            rank = np.where(position, 0, np.where(company, 1, 2)).astype(np.int64)
+            keys |= rank << (_ID_BITS + _DAY_BITS)
+        return keys
+
+    def _row_order(self, version: _Version, sort: str) -> np.ndarray:
+        """The version's base rows in sort order, built on first use."""
+        order = version.row_orders.get(sort)
+        if order is None:
+            base = version.base
+            keys = self._sort_keys(base, np.arange(len(base)), sort, {})
+            order = np.argsort(keys).astype(np.int32)
+            # Rows added to the dictionaries later only reach the delta, so
+            # the order holds for the version's lifetime
+            version.row_orders[sort] = order
+        return order
+
+    def _company_ranks_of(self, dictionary: StringDictionary) -> np.ndarray:
+        """
+        Rank of every code in the dictionary's value order, by code point as
+        the SQL company sort compares (see code_point_order); -1 (unset)
+        ranks last. A value added
+        later lands between existing ones without reordering them.
+        """
+        ranks = self._company_ranks
+        values = dictionary.values
+        size = len(values)
+        if len(ranks) != size + 1:
+            ranks = np.empty(size + 1, dtype=np.int64)
+            ranks[sorted(range(size), key=values.__getitem__)] = np.arange(size)
+            ranks[size] = size
+            self._company_ranks = ranks
+        return ranks
+
+    def _install(
+        self,
+        base: _Columns,
+        postings: Dict[int, np.ndarray],
+        change_seq: int,
+        snapshot: Optional[IndexSnapshot],
+    ):
+        """Replace the store's contents. Called with the lock held."""
+        self._delta = {}
+        self._snapshot = snapshot
+        self.change_seq = change_seq
+        self.stale = False
+        self._version = _Version(base, None, _Columns.empty(), postings)
+
+    def _reload(
+        self,
+        pks: Set[int],
+        job_manager: JobManager,
+        tag_manager: TagManager,
+        job_tag_manager: JobTagManager,
+    ):
+        """Replace the rows of the given jobs. Called with the lock held."""
+        pairs = job_tag_manager.find_tag_pairs(pks)
+        if any(tag_id not in self._tag_bits for tag_id, _ in pairs):
+            self._set_tags(self._tags_of(tag_manager))
+        bits: Dict[int, int] = {}
+        tag_ids: Dict[int, List[int]] = {}
+        for tag_id, job_id in pairs:
+            bits[job_id] = bits.get(job_id, 0) | self._tag_bits.get(tag_id, 0)
+            tag_ids.setdefault(job_id, []).append(tag_id)
+
+        delta = dict(self._delta)
+        for pk in pks:
+            delta.pop(pk, None)
+        # Deleted jobs have no row, and stay out of the delta
+        for (
+            pk,
+            posting_date,
+            position,
+            company,
+            location,
+        ) in job_manager.find_index_rows(pks):
+            delta[pk] = (
+                posting_date.toordinal(),
+                strings.locations.code(location),
+                strings.companies.code(company),
+                strings.positions.code(position),
+                bits.get(pk, 0),
+                tuple(tag_ids.get(pk, ())),
+            )
+
+        version = self._version
+        base = version.base
+        live = (
+            np.ones(len(base), dtype=bool) if version.live is None else version.live
+        ).copy()
+        changed = np.fromiter(pks, dtype=np.int32, count=len(pks))
+        rows = np.searchsorted(base.ids, changed)
+        found = rows < len(base)
+        found[found] = base.ids[rows[found]] == changed[found]
+        live[rows[found]] = False
+
+        delta_columns, delta_postings = self._delta_columns(delta)
+        postings = version.postings
+        if len(delta) > max(MIN_COMPACT_ROWS, COMPACT_FRACTION * len(base)):
+            kept = np.flatnonzero(live)
+            merged = base.take(kept).concat(delta_columns)
+            # Renumber both sets of postings as rows of the merged base
+            base_rows = np.full(len(base), -1, dtype=np.int32)
+            base_rows[kept] = np.searchsorted(merged.ids, base.ids[kept])
+            delta_rows = np.searchsorted(merged.ids, delta_columns.ids).astype(np.int32)
+            postings = _remap(postings, base_rows)
+            for tag_id, rows in _remap(delta_postings, delta_rows).items():
+                if tag_id in postings:
+                    rows = np.sort(np.concatenate((postings[tag_id], rows)))
+                postings[tag_id] = rows
+            base, live, delta = merged, None, {}
+            delta_columns, delta_postings = _Columns.empty(), {}
+        self._delta = delta
+        self._version = _Version(base, live, delta_columns, postings, delta_postings)
+
+    def _delta_columns(
+        self, delta: Dict[int, _DeltaRow]
+    ) -> Tuple[_Columns, Dict[int, np.ndarray]]:
+        """The delta's columns, and its postings."""
+        pks = sorted(delta)
+        rows = np.array([delta[pk][:5] for pk in pks], dtype=np.int32).reshape(-1, 5)
+        tag_column, row_column = [], []
+        for row, pk in enumerate(pks):
+            tag_ids = delta[pk][5]
+            tag_column.append(np.array(tag_ids, dtype=np.int64))
+            row_column.append(np.full(len(tag_ids), row, dtype=np.int32))
+        columns = _Columns(
+            np.array(pks, dtype=np.int32),
+            *(rows[:, i].copy() for i in range(4)),
+            rows[:, 4].astype(np.uint8),
+        )
+        return columns, _postings(tag_column, row_column)
+
+    def _tags_of(self, tag_manager: TagManager) -> List[Tuple[int, str, str]]:
+        return [
+            (tag.id, tag.name, tag.category.value) for tag in tag_manager.find_all()
+        ]
+
+    def _set_tags(self, tags: Sequence[Tuple[int, str, str]]):
+        """Take the (id, name, category) of every tag."""
+        tag_ids: Dict[str, Tuple[int, ...]] = {}
+        for tag_id, name, _category in tags:
+            tag_ids[name] = tag_ids.get(name, ()) + (tag_id,)
+        self._tag_bits = {
+            tag_id: CATEGORY_BITS[category] for tag_id, _name, category in tags
+        }
+        self._tag_ids = tag_ids
+
+    def _bits_of(self, categories: Sequence[str]) -> int:
+        bits = 0
+        for category in categories:
+            bits |= _CATEGORY_LOOKUP.get(category, 0)
+        return bits
+
+    def _pattern_match(
+        self, column: str, dictionary: StringDictionary, pattern: str
+    ) -> _CodeMatch:
+        """The codes of column whose values match ILIKE '%pattern%'."""
+        # Codes in use never exceed the dictionary's size when a search starts
+        values = dictionary.values
+        size = len(values)
+        key = (dictionary.name, pattern, size)
+        match = self._pattern_tables.get(key)
+        if match is None:
+            regex = like_regex(pattern)
+            table = np.zeros(size + 1, dtype=bool)
+            table[:size] = [regex.search(value) is not None for value in values[:size]]
+            match = _CodeMatch(column, table, np.flatnonzero(table).astype(np.int32))
+            if len(self._pattern_tables) >= _MAX_PATTERN_TABLES:
+                self._pattern_tables.clear()
+            self._pattern_tables[key] = match
+        return match
+
+
+class ColumnStoreWorker:
+    """
+    Loads a column store on a daemon thread, from the snapshot when it is
+    usable and from the database otherwise, then catches it up every
+    interval_seconds and reloads it if it falls behind the change feed.
+    """
+
+    def __init__(
+        self,
+        store: ColumnStore,
+        session_factory,
+        snapshot_path: Optional[str],
+        interval_seconds: float,
+    ):
+        self.store = store
+        self.session_factory = session_factory
+        self.snapshot_path = snapshot_path
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the loading thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="column-store", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the loading thread and wait for it to finish."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def refresh(self):
+        """Load the store if needed, then catch it up."""
+        db = self.session_factory()
+        try:
+            managers = (JobManager(db), TagManager(db), JobTagManager(db))
+            if not self.store.loaded or self.store.stale:
+                if not self._load_snapshot():
+                    self.store.load(*managers)
+                logger.info("Column store loaded %d jobs", len(self.store))
+            self.store.catch_up(*managers)
+        finally:
+            db.close()
+
+    def _load_snapshot(self) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        snapshot = None
+        try:
+            snapshot = IndexSnapshot(self.snapshot_path)
+            if self.store.load_snapshot(snapshot):
+                return True
+        except Exception:
+            # A bad snapshot must not keep the store from loading
+            logger.exception(
+                "Could not load search snapshot %s; loading from the database",
+                self.snapshot_path,
+            )
+        if snapshot is not None:
+            snapshot.close()
+        return False
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Column store refresh failed")
+            if self._stop.wait(self.interval_seconds):
+                return
+
+
+column_store = ColumnStore(change_feed)
@@ -0,0 +1,273 @@
+"""
+Percolator - Reverse index matching new jobs against saved searches
+
+Testing every saved search against every new job costs one evaluation per
+search per job. The percolator instead files each search under keys that
+every job it matches must have, the first of these it has:
+- tag names: the names in its tags filter, or the fewest names its tag
+  expression requires one of
+- one trigram of its location pattern, or of its text query
+- its tag categories
+- its date bounds
+A search with none of these, such as a one-word query of two letters, is
+filed as unkeyed.
+
+A job's candidates are the searches filed under its tag names, the
+trigrams of its location and text, its tag categories, the date bounds
+around its posting date, and the unkeyed ones. Only those are tested in
+full, against the same semantics as the SQL search.
+"""
+
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from app.core.tag_expr import TagExpr, matches_tag_expr, required_tags
+from app.indexes.tokens import like_regex, like_trigrams, trigrams
+from app.models.tag import TagCategory
+
+# Category filters may name a category by value or, as SQL allows, by name
+_CATEGORY_VALUES: Dict[str, str] = {
+    **{category.name: category.value for category in TagCategory},
+    **{category.value: category.value for category in TagCategory},
+}
+
+# Key kinds in the percolator's buckets
+_TAG = "tag"
+_LOCATION = "location"
+_QUERY = "query"
+_CATEGORY = "category"
+
+# Above every search id, for bisecting (date, search id) entries
+_MAX = float("inf")
+
+
+@dataclass(frozen=True)
+class PercolatedJob:
+    """The fields of a job that saved searches filter on."""
+
+    pk: int
+    posting_date: date
+    position: str
+    company: str
+    location: Optional[str]
+    # (name, category value) of each of its tags
+    tags: FrozenSet[Tuple[str, str]]
+
+    @classmethod
+    def from_job(cls, job) -> "PercolatedJob":
+        """The fields of a Job loaded with its tags."""
+        return cls(
+            job.id,
+            job.job_posting_date,
+            job.job_position,
+            job.company_name,
+            job.job_location,
+            frozenset(
+                (relation.tag.name, relation.tag.category.value)
+                for relation in job.tag_relations
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class SearchCriteria:
+    """A saved search's filters, compiled to test one job at a time."""
+
+    query: Optional[str] = None
+    location: Optional[str] = None
+    tags: FrozenSet[str] = frozenset()
+    # Category values; None when the search has no category filter
+    categories: Optional[FrozenSet[str]] = None
+    tag_expr: Optional[TagExpr] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    query_regex: Optional["re.Pattern"] = field(default=None, compare=False)
+    location_regex: Optional["re.Pattern"] = field(default=None, compare=False)
+
+    @classmethod
+    def compile(
+        cls,
+        query: Optional[str] = None,
+        location: Optional[str] = None,
+        tags: Optional[Sequence[str]] = None,
+        tag_categories: Optional[Sequence[str]] = None,
+        tag_expr: Optional[TagExpr] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> "SearchCriteria":
+        """Criteria for filters as the search endpoint takes them."""
+        return cls(
+            query=query or None,
+            location=location or None,
+            tags=frozenset(tags or ()),
+            categories=(
+                frozenset(
+                    _CATEGORY_VALUES[category]
+                    for category in tag_categories
+                    if category in _CATEGORY_VALUES
+                )
+                if tag_categories
+                else None
+            ),
+            tag_expr=tag_expr,
+            date_from=date_from,
+            date_to=date_to,
+            query_regex=like_regex(query) if query else None,
+            location_regex=like_regex(location) if location else None,
+        )
+
+    def matches(self, job: PercolatedJob) -> bool:
+        """Whether the search finds the job."""
+        if self.date_from and job.posting_date < self.date_from:
+            return False
+        if self.date_to and job.posting_date > self.date_to:
+            return False
+        # As in SQL, one tag must have both a name in tags and a category in
+        # categories
+        if (self.tags or self.categories is not None) and not any(
+            (not self.tags or name in self.tags)
+            and (self.categories is None or category in self.categories)
+            for name, category in job.tags
+        ):
+            return False
+        names = {name for name, _ in job.tags}
+        if self.tag_expr is not None and not matches_tag_expr(self.tag_expr, names):
+            return False
+        if self.location_regex and not _search(self.location_regex, job.location):
+            return False
+        if self.query_regex and not any(
+            _search(self.query_regex, value)
+            for value in (job.position, job.company, job.location)
+        ):
+            return False
+        return True
+
+
+def _search(regex: "re.Pattern", value: Optional[str]) -> bool:
+    return value is not None and regex.search(value) is not None
+
+
+class Percolator:
+    """
+    Saved searches filed by the keys their matches must have. Not safe for
+    concurrent use; PercolatorWorker owns one.
+    """
+
+    def __init__(self):
+        self._criteria: Dict[int, SearchCriteria] = {}
+        # search id -> the bucket keys it is filed under
+        self._keys: Dict[int, List[Tuple[str, str]]] = {}
+        self._buckets: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+        # (date_to, search id) of searches filed by their upper bound, and
+        # (date_from, search id) of those with only a lower bound
+        self._ends: List[Tuple[date, int]] = []
+        self._starts: List[Tuple[date, int]] = []
+        self._unkeyed: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._criteria)
+
+    def __contains__(self, search_id: int) -> bool:
+        return search_id in self._criteria
+
+    def add(self, search_id: int, criteria: SearchCriteria):
+        """File a saved search, replacing any with the same id."""
+        self.remove(search_id)
+        self._criteria[search_id] = criteria
+        keys = self._keys_of(criteria)
+        if keys is not None:
+            self._keys[search_id] = keys
+            for key in keys:
+                self._buckets[key].add(search_id)
+        elif criteria.date_to is not None:
+            insort(self._ends, (criteria.date_to, search_id))
+        elif criteria.date_from is not None:
+            insort(self._starts, (criteria.date_from, search_id))
+        else:
+            self._unkeyed.add(search_id)
+
+    def remove(self, search_id: int):
+        """Drop a saved search, if filed."""
+        criteria = self._criteria.pop(search_id, None)
+        if criteria is None:
+            return
+        keys = self._keys.pop(search_id, None)
+        if keys is not None:
+            for key in keys:
+                bucket = self._buckets[key]
+                bucket.discard(search_id)
+                if not bucket:
+                    del self._buckets[key]
+        elif criteria.date_to is not None:
+            self._discard(self._ends, (criteria.date_to, search_id))
+        elif criteria.date_from is not None:
+            self._discard(self._starts, (criteria.date_from, search_id))
+        else:
+            self._unkeyed.discard(search_id)
+
+    def candidates(self, job: PercolatedJob) -> Set[int]:
+        """The searches that might match a job: a superset of those that do."""
+        keys = [(_TAG, name) for name, _ in job.tags]
+        keys += [(_CATEGORY, category) for _, category in job.tags]
+        keys += [(_LOCATION, trigram) for trigram in trigrams(job.location)]
+        text = set().union(
+            *(trigrams(value) for value in (job.position, job.company, job.location))
+        )
+        keys += [(_QUERY, trigram) for trigram in text]
+
+        found = set(self._unkeyed)
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket:
+                found |= bucket
+        day = job.posting_date
+        found.update(
+            search_id for _, search_id in self._ends[bisect_left(self._ends, (day,)) :]
+        )
+        found.update(
+            search_id
+            for _, search_id in self._starts[: bisect_right(self._starts, (day, _MAX))]
+        )
+        return found
+
+    def match(self, job: PercolatedJob) -> List[int]:
+        """Ids of the saved searches that find a job, ascending."""
+        return sorted(
+            search_id
+            for search_id in self.candidates(job)
+            if self._criteria[search_id].matches(job)
+        )
+
+    def _keys_of(self, criteria: SearchCriteria) -> Optional[List[Tuple[str, str]]]:
+        """
+        The bucket keys to file a search under, or None to file it by date
+        or as unkeyed. A search that can match nothing gets no keys.
+        """
+        names = [criteria.tags] if criteria.tags else []
+        if criteria.tag_expr is not None:
+            required = required_tags(criteria.tag_expr)
+            if required is not None:
+                names.append(required)
+        if names:
+            return [(_TAG, name) for name in sorted(min(names, key=len))]
+        for kind, pattern in ((_LOCATION, criteria.location), (_QUERY, criteria.query)):
+            candidates = like_trigrams(pattern)
+            if candidates:
+                # The least used trigram keeps buckets even
+                trigram = min(
+                    sorted(candidates),
+                    key=lambda trigram: len(self._buckets.get((kind, trigram), ())),
+                )
+                return [(kind, trigram)]
+        if criteria.categories is not None:
+            return [(_CATEGORY, category) for category in sorted(criteria.categories)]
+        return None
+
+    def _discard(self, entries: List[Tuple[date, int]], entry: Tuple[date, int]):
+        index = bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
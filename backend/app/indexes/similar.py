@@ -0,0 +1,515 @@
+"""
+Similar Jobs - MinHash LSH index over the jobs' tags and title tokens
+
+A job's features are its tags and the tokens of its position title, and two
+jobs are as similar as the Jaccard index of their feature sets. Scoring
+every job against the one asked about is a pass over all of them, so the
+index only scores the jobs likely to be similar:
+- each job gets a MinHash signature, the minimum of each of NUM_HASHES hash
+  functions over its features; two signatures agree in a position with
+  probability equal to the jobs' Jaccard index
+- the signature is cut into BANDS bands of BAND_ROWS positions, and each
+  band is hashed to a bucket key. Jobs sharing a bucket in any band are
+  candidates, so a pair with Jaccard index s is found with probability
+  1 - (1 - s^BAND_ROWS)^BANDS: about 0.48 at s = 0.2, 0.78 at 0.3 and
+  0.99 at 0.5
+- candidates are ranked by their exact Jaccard index
+
+Each band's buckets are one sorted uint64 array of key << 32 | (MAX_ID - pk)
+entries, so a bucket is a contiguous range with its newest job first. At
+most MAX_BUCKET_JOBS are read from each, which bounds the work for common
+feature sets.
+
+Like the column store, the index follows the change feed: a changed job's
+base row is masked out, and its features and bucket keys go to a small
+delta. The delta is merged into the base once it outgrows
+max(MIN_COMPACT_ROWS, 2% of the base); merging rehashes nothing. Every
+change swaps in a new _Version, so a lookup never sees one half-applied.
+"""
+
+import logging
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from app.core.change_feed import ChangeFeed, change_feed
+from app.core.strings import StringDictionary
+from app.indexes.columns import COMPACT_FRACTION, MIN_COMPACT_ROWS
+from app.indexes.tokens import tokenize
+from app.managers.job_manager import JobManager
+from app.managers.job_tag_manager import JobTagManager
+
+logger = logging.getLogger(__name__)
+
+BANDS = 16
+BAND_ROWS = 2
+NUM_HASHES = BANDS * BAND_ROWS
+
+# Jobs read from each matching bucket, newest first
+MAX_BUCKET_JOBS = 256
+
+# Jobs hashed at once while loading
+HASH_BATCH = 10000
+
+MAX_ID = 2**31 - 1
+_LOW = np.uint64(0xFFFFFFFF)
+_SHIFT = np.uint64(32)
+
+# Multiply-shift hash functions of 32-bit features, h(x) = (a * x + b) >> 32
+# over 64 bits, and of a band's minimums into its bucket key. Fixed, so
+# every worker buckets a job the same way
+_random = np.random.default_rng(0x5EED)
+_A = _random.integers(0, 2**63, NUM_HASHES, dtype=np.uint64) * np.uint64(2) + 1
+_B = _random.integers(0, 2**63, NUM_HASHES, dtype=np.uint64)
+_C = _random.integers(0, 2**63, BAND_ROWS, dtype=np.uint64) * np.uint64(2) + 1
+
+# Title tokens get dense codes, so features never collide
+_tokens = StringDictionary("title tokens")
+
+# pk -> (features, bucket keys; None without features)
+_DeltaJob = Tuple[np.ndarray, Optional[np.ndarray]]
+
+
+def title_features(position: Optional[str]) -> List[int]:
+    """The features of a position title's tokens."""
+    return [(_tokens.code(token) << 1) | 1 for token in tokenize(position)]
+
+
+def job_features(position: Optional[str], tag_ids: Iterable[int]) -> np.ndarray:
+    """A job's features, as sorted distinct uint32: its tags and title tokens."""
+    values = [tag_id << 1 for tag_id in tag_ids] + title_features(position)
+    return np.unique(np.array(values, dtype=np.uint32))
+
+
+def jaccard(features: np.ndarray, other: np.ndarray) -> float:
+    """The Jaccard index of two sorted distinct feature arrays."""
+    shared = len(np.intersect1d(features, other, assume_unique=True))
+    union = len(features) + len(other) - shared
+    return shared / union if union else 0.0
+
+
+def bucket_keys(features: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    The (jobs, BANDS) uint32 bucket keys of jobs whose features are
+    consecutive runs of the given lengths. Every job needs a feature.
+    """
+    values = features.astype(np.uint64)
+    hashed = (_A[:, None] * values[None, :] + _B[:, None]) >> _SHIFT
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    signatures = np.minimum.reduceat(hashed, starts, axis=1).T
+    bands = signatures.reshape(-1, BANDS, BAND_ROWS) * _C
+    return (bands.sum(axis=2) >> _SHIFT).astype(np.uint32)
+
+
+def _entries(keys: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """(BANDS, jobs) bucket entries of jobs, unsorted."""
+    newest_first = (MAX_ID - ids.astype(np.int64)).astype(np.uint64)
+    return ((keys.astype(np.uint64) << _SHIFT) | newest_first[:, None]).T
+
+
+def _gather(offsets: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Indexes of the given rows' features, in row order, and their lengths."""
+    lengths = offsets[rows + 1] - offsets[rows]
+    ends = np.cumsum(lengths)
+    index = np.arange(ends[-1] if len(ends) else 0, dtype=np.int64)
+    index += np.repeat(offsets[rows] - (ends - lengths), lengths)
+    return index, lengths
+
+
+def _bucket_ids(buckets: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Ids of the newest MAX_BUCKET_JOBS jobs in each band's matching bucket."""
+    found = []
+    for band, key in enumerate(keys.astype(np.uint64)):
+        entries = buckets[band]
+        start = np.searchsorted(entries, key << _SHIFT)
+        end = np.searchsorted(entries, (key + np.uint64(1)) << _SHIFT)
+        found.append(entries[start : min(end, start + MAX_BUCKET_JOBS)])
+    entries = np.concatenate(found)
+    return np.unique(MAX_ID - (entries & _LOW).astype(np.int64))
+
+
+@dataclass(frozen=True)
+class _Version:
+    """Base arrays, the mask of their live rows, and the delta's buckets."""
+
+    # int32 primary keys, ascending
+    ids: np.ndarray
+    # Row i's features are features[offsets[i] : offsets[i + 1]]
+    offsets: np.ndarray
+    features: np.ndarray
+    # (BANDS, jobs with features) sorted bucket entries
+    buckets: np.ndarray
+    # None while every base row is live
+    live: Optional[np.ndarray]
+    delta: Dict[int, _DeltaJob]
+    delta_buckets: np.ndarray
+
+
+def _empty_buckets() -> np.ndarray:
+    return np.zeros((BANDS, 0), dtype=np.uint64)
+
+
+def _base_buckets(
+    ids: np.ndarray, offsets: np.ndarray, features: np.ndarray
+) -> np.ndarray:
+    """Hash every base row with features into sorted bucket entries."""
+    rows = np.flatnonzero(np.diff(offsets))
+    buckets = np.empty((BANDS, len(rows)), dtype=np.uint64)
+    for start in range(0, len(rows), HASH_BATCH):
+        batch = rows[start : start + HASH_BATCH]
+        index, lengths = _gather(offsets, batch)
+        keys = bucket_keys(features[index], lengths)
+        buckets[:, start : start + len(batch)] = _entries(keys, ids[batch])
+    buckets.sort(axis=1)
+    return buckets
+
+
+def _delta_buckets(delta: Dict[int, _DeltaJob]) -> np.ndarray:
+    keyed = [(pk, keys) for pk, (_, keys) in delta.items() if keys is not None]
+    if not keyed:
+        return _empty_buckets()
+    ids = np.array([pk for pk, _ in keyed], dtype=np.int32)
+    buckets = _entries(np.stack([keys for _, keys in keyed]), ids)
+    buckets.sort(axis=1)
+    return buckets
+
+
+class SimilarJobIndex:
+    """
+    MinHash LSH index of the hot jobs' features, kept current through the
+    change feed. Lookups may run on any thread; loading and catching up
+    serialize on a lock.
+    """
+
+    def __init__(self, change_feed: ChangeFeed):
+        self.change_feed = change_feed
+        # Feed position the index reflects
+        self.change_seq: Optional[int] = None
+        # Set when the feed was pruned past change_seq; a reload is needed
+        self.stale = False
+        self._version: Optional[_Version] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index holds jobs to look up."""
+        return self._version is not None
+
+    def __len__(self) -> int:
+        version = self._version
+        if version is None:
+            return 0
+        base = (
+            len(version.ids)
+            if version.live is None
+            else int(np.count_nonzero(version.live))
+        )
+        return base + len(version.delta)
+
+    def load(
+        self,
+        job_manager: JobManager,
+        job_tag_manager: JobTagManager,
+        batch_size: int = 10000,
+    ):
+        """Build the index from every hot job in the database."""
+        with self._lock:
+            # Read first, so changes made during the load are replayed
+            change_seq = self.change_feed.latest()
+
+            ids = array("i")
+            # Title features by position, which few values cover
+            titles: Dict[Optional[str], List[int]] = {}
+            row_column, feature_column = [array("q")], [array("I")]
+            for batch in job_manager.iter_index_rows(batch_size):
+                for pk, _posting_date, position, _company, _location in batch:
+                    tokens = titles.get(position)
+                    if tokens is None:
+                        tokens = titles[position] = title_features(position)
+                    row_column[0].extend([len(ids)] * len(tokens))
+                    feature_column[0].extend(tokens)
+                    ids.append(pk)
+            ids = np.frombuffer(ids, dtype=np.int32)
+            row_column = [np.frombuffer(row_column[0], dtype=np.int64)]
+            feature_column = [np.frombuffer(feature_column[0], dtype=np.uint32)]
+
+            for batch in job_tag_manager.iter_tag_postings(batch_size):
+                pairs = np.array(batch, dtype=np.int64).reshape(-1, 2)
+                rows = np.searchsorted(ids, pairs[:, 1])
+                # Skip jobs created after they were read; the feed brings
+                # those in
+                found = rows < len(ids)
+                found[found] = ids[rows[found]] == pairs[found, 1]
+                row_column.append(rows[found])
+                feature_column.append((pairs[found, 0] << 1).astype(np.uint32))
+
+            rows = np.concatenate(row_column)
+            features = np.concatenate(feature_column)
+            order = np.lexsort((features, rows))
+            offsets = np.searchsorted(rows[order], np.arange(len(ids) + 1))
+            self._install(ids, offsets.astype(np.int64), features[order], change_seq)
+
+    def load_features(
+        self,
+        ids: np.ndarray,
+        offsets: np.ndarray,
+        features: np.ndarray,
+        change_seq: int,
+    ):
+        """
+        Build the index from jobs' features: ascending ids, and each job's
+        sorted distinct uint32 features cut at offsets, reflecting the
+        change feed up to change_seq.
+        """
+        with self._lock:
+            self._install(ids, offsets, features, change_seq)
+
+    def catch_up(self, job_manager: JobManager, job_tag_manager: JobTagManager) -> bool:
+        """
+        Rehash the jobs changed since the index was last brought up to
+        date. Returns whether the index is current; False if it was never
+        loaded or has fallen too far behind the feed to catch up.
+        """
+        if self._version is None or self.stale:
+            return False
+        # Nothing new is the common case, and needs no lock
+        changes = self.change_feed.changes_since(self.change_seq)
+        if changes is not None and changes[0] == self.change_seq:
+            return True
+
+        with self._lock:
+            changes = self.change_feed.changes_since(self.change_seq)
+            if changes is None:
+                logger.warning("Similar job index fell behind the change feed")
+                self.stale = True
+                return False
+            latest, pks = changes
+            if pks:
+                self._reload(pks, job_manager, job_tag_manager)
+            self.change_seq = latest
+        return True
+
+    def similar(
+        self, features: np.ndarray, limit: int = 10, exclude: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        The (pk, Jaccard index) of the jobs most similar to the given
+        features, most similar first, then newest first. Only jobs sharing
+        a feature are returned; exclude is left out.
+        """
+        version = self._version
+        if version is None:
+            raise RuntimeError("Similar job index is not loaded")
+        if not len(features):
+            return []
+        keys = bucket_keys(features, np.array([len(features)]))[0]
+
+        # Base rows replaced by the delta are no longer live
+        ids = _bucket_ids(version.buckets, keys)
+        rows = np.searchsorted(version.ids, ids)
+        if version.live is not None:
+            rows = rows[version.live[rows]]
+        if exclude is not None:
+            rows = rows[version.ids[rows] != exclude]
+        index, lengths = _gather(version.offsets, rows)
+        owners = np.repeat(np.arange(len(rows)), lengths)
+        shared = np.bincount(
+            owners,
+            weights=np.isin(version.features[index], features),
+            minlength=len(rows),
+        )
+        pks = version.ids[rows].astype(np.int64)
+        scores = shared / (len(features) + lengths - shared)
+
+        delta_pks = [
+            pk
+            for pk in _bucket_ids(version.delta_buckets, keys).tolist()
+            if pk != exclude
+        ]
+        if delta_pks:
+            delta_scores = [jaccard(features, version.delta[pk][0]) for pk in delta_pks]
+            pks = np.concatenate((pks, delta_pks))
+            scores = np.concatenate((scores, delta_scores))
+
+        order = np.lexsort((-pks, -scores))
+        order = order[scores[order] > 0][:limit]
+        return [(int(pks[i]), float(scores[i])) for i in order]
+
+    def _install(
+        self,
+        ids: np.ndarray,
+        offsets: np.ndarray,
+        features: np.ndarray,
+        change_seq: int,
+    ):
+        """Swap in new base arrays with no delta. Called with the lock held."""
+        buckets = _base_buckets(ids, offsets, features)
+        self.change_seq = change_seq
+        self.stale = False
+        self._version = _Version(
+            ids, offsets, features, buckets, None, {}, _empty_buckets()
+        )
+
+    def _reload(
+        self,
+        pks: Set[int],
+        job_manager: JobManager,
+        job_tag_manager: JobTagManager,
+    ):
+        """Rehash the given jobs. Called with the lock held."""
+        tag_ids: Dict[int, List[int]] = {}
+        for tag_id, job_id in job_tag_manager.find_tag_pairs(pks):
+            tag_ids.setdefault(job_id, []).append(tag_id)
+
+        version = self._version
+        delta = dict(version.delta)
+        for pk in pks:
+            delta.pop(pk, None)
+        # Deleted jobs have no row, and stay out of the delta
+        changed = {
+            pk: job_features(position, tag_ids.get(pk, ()))
+            for pk, _posting_date, position, _company, _location in (
+                job_manager.find_index_rows(pks)
+            )
+        }
+        keyed = [pk for pk, features in changed.items() if len(features)]
+        keys = {}
+        if keyed:
+            keys = dict(
+                zip(
+                    keyed,
+                    bucket_keys(
+                        np.concatenate([changed[pk] for pk in keyed]),
+                        np.array([len(changed[pk]) for pk in keyed]),
+                    ),
+                )
+            )
+        for pk, features in changed.items():
+            delta[pk] = (features, keys.get(pk))
+
+        live = (
+            np.ones(len(version.ids), dtype=bool)
+            if version.live is None
+            else version.live
+        ).copy()
+        pks = np.fromiter(pks, dtype=np.int32, count=len(pks))
+        rows = np.searchsorted(version.ids, pks)
+        found = rows < len(version.ids)
+        found[found] = version.ids[rows[found]] == pks[found]
+        live[rows[found]] = False
+
+        delta_buckets = _delta_buckets(delta)
+        if len(delta) > max(MIN_COMPACT_ROWS, COMPACT_FRACTION * len(version.ids)):
+            self._version = self._compact(version, live, delta, delta_buckets)
+        else:
+            self._version = _Version(
+                version.ids,
+                version.offsets,
+                version.features,
+                version.buckets,
+                live,
+                delta,
+                delta_buckets,
+            )
+
+    def _compact(
+        self,
+        version: _Version,
+        live: np.ndarray,
+        delta: Dict[int, _DeltaJob],
+        delta_buckets: np.ndarray,
+    ) -> _Version:
+        """Merge the delta into the live base rows, without rehashing."""
+        kept = np.flatnonzero(live)
+        delta_pks = sorted(delta)
+        delta_features = [delta[pk][0] for pk in delta_pks]
+        base_index, base_lengths = _gather(version.offsets, kept)
+        delta_lengths = np.array([len(f) for f in delta_features], dtype=np.int64)
+
+        # Rows of both, in id order
+        ids = np.concatenate((version.ids[kept], np.array(delta_pks, dtype=np.int32)))
+        order = np.argsort(ids, kind="stable")
+        runs = [version.features[base_index]] + delta_features
+        flat = np.concatenate(runs).astype(np.uint32)
+        lengths = np.concatenate((base_lengths, delta_lengths))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        index, lengths = _gather(offsets, order)
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+
+        # Drop dead entries from each band and insert the delta's in order
+        merged = []
+        for band in range(BANDS):
+            entries = version.buckets[band]
+            rows = np.searchsorted(
+                version.ids, MAX_ID - (entries & _LOW).astype(np.int64)
+            )
+            entries = entries[live[rows]]
+            added = delta_buckets[band]
+            merged.append(np.insert(entries, np.searchsorted(entries, added), added))
+        return _Version(
+            ids[order],
+            offsets,
+            flat[index],
+            np.stack(merged),
+            None,
+            {},
+            _empty_buckets(),
+        )
+
+
+class SimilarJobIndexWorker:
+    """
+    Loads a similar job index on a daemon thread, then catches it up every
+    interval_seconds and reloads it if it falls behind the change feed.
+    """
+
+    def __init__(
+        self, index: SimilarJobIndex, session_factory, interval_seconds: float
+    ):
+        self.index = index
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the loading thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="similar-jobs", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the loading thread and wait for it to finish."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def refresh(self):
+        """Load the index if needed, then catch it up."""
+        db = self.session_factory()
+        try:
+            managers = (JobManager(db), JobTagManager(db))
+            if not self.index.loaded or self.index.stale:
+                self.index.load(*managers)
+                logger.info("Similar job index loaded %d jobs", len(self.index))
+            self.index.catch_up(*managers)
+        finally:
+            db.close()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Similar job index refresh failed")
+            if self._stop.wait(self.interval_seconds):
+                return
+
+
+similar_jobs = SimilarJobIndex(change_feed)
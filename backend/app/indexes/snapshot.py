@@ -0,0 +1,384 @@
+"""
+Index Snapshot - Offline-built, memory-mapped search structures
+
+build_snapshot reads the hot jobs and their tags once and writes the search
+structures to a binary file; IndexSnapshot maps that file read-only. Every
+worker opening the same file shares its pages through the OS page cache,
+so opening is near-instant and the arrays cost no memory per worker.
+
+File layout, in the byte order recorded in the header:
+
+    b"JOBSNAP1", header offset (uint64), header length (uint64)
+    sections: flat int32 / int64 arrays, each 8-byte aligned
+    header: JSON with the section offsets and the string dictionaries
+
+Sections:
+
+    ids, days            job ids ascending, and their posting dates as
+                         proleptic Gregorian ordinals
+    location_codes,
+    company_codes,
+    position_codes       per job, the index of its location, company and
+                         position in the header's dictionaries (-1 when
+                         unset)
+    date_ids, date_days  job ids ordered by (posting date, id), and their
+                         posting dates, for date range lookups
+    <family>_offsets,
+    <family>_postings    ascending job id lists in CSR form for the tags,
+                         locations, companies and tokens families: the
+                         list of key i is postings[offsets[i]:offsets[i + 1]]
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from app.core.db import begin_snapshot_reads
+from app.indexes.tokens import tokenize
+from app.managers.job_manager import JobManager
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.tag_manager import TagManager
+
+MAGIC = b"JOBSNAP1"
+VERSION = 2
+ALIGNMENT = 8
+
+# Magic, header offset, header length
+_PREAMBLE = struct.Struct("<8sQQ")
+
+_EMPTY = memoryview(array("i"))
+
+
+def _code(dictionary: Dict[str, int], value: Optional[str]) -> int:
+    """Dictionary code of a value, assigning the next one if new."""
+    if value is None:
+        return -1
+    code = dictionary.get(value)
+    if code is None:
+        code = dictionary[value] = len(dictionary)
+    return code
+
+
+def _csr(lists: Iterable[array]):
+    """Offsets and concatenated postings of a sequence of id lists."""
+    offsets = array("q", [0])
+    postings = array("i")
+    for ids in lists:
+        postings.extend(ids)
+        offsets.append(len(postings))
+    return offsets, postings
+
+
+def _group(codes: array, ids: array, size: int) -> List[array]:
+    """Ids of each dictionary code, in id order."""
+    groups = [array("i") for _ in range(size)]
+    for code, pk in zip(codes, ids):
+        if code >= 0:
+            groups[code].append(pk)
+    return groups
+
+
+def build_snapshot(
+    job_manager: JobManager,
+    tag_manager: TagManager,
+    job_tag_manager: JobTagManager,
+    path: str,
+    batch_size: int = 10000,
+    change_seq: Optional[int] = None,
+) -> Dict:
+    """
+    Build a snapshot of every hot job and write it to path. The file is
+    written alongside and renamed into place, so workers that have the old
+    snapshot open keep reading it undisturbed. change_seq, the change feed
+    position read before the build started, tells loaders which changes
+    the snapshot may have missed. The managers should share a session, so
+    that the jobs, tags and postings are read in one transaction. Returns
+    build statistics.
+    """
+    started = time.perf_counter()
+    built_at = datetime.utcnow()
+
+    # One snapshot for every read, so postings only name jobs and tags read
+    db = job_manager.db
+    began = begin_snapshot_reads(db)
+    try:
+        ids, days = array("i"), array("i")
+        location_codes, company_codes = array("i"), array("i")
+        position_codes = array("i")
+        locations: Dict[str, int] = {}
+        companies: Dict[str, int] = {}
+        positions: Dict[str, int] = {}
+        tokens: Dict[str, array] = {}
+        for batch in job_manager.iter_index_rows(batch_size):
+            for pk, posting_date, position, company, location in batch:
+                ids.append(pk)
+                days.append(posting_date.toordinal())
+                location_codes.append(_code(locations, location))
+                company_codes.append(_code(companies, company))
+                position_codes.append(_code(positions, position))
+                for token in dict.fromkeys(
+                    tokenize(position) + tokenize(company) + tokenize(location)
+                ):
+                    tokens.setdefault(token, array("i")).append(pk)
+
+        # A stable sort keeps ids ascending within each day
+        order = sorted(range(len(ids)), key=days.__getitem__)
+        date_ids = array("i", (ids[i] for i in order))
+        date_days = array("i", (days[i] for i in order))
+        del order
+
+        tags = tag_manager.find_all()
+        tag_lists = {tag.id: array("i") for tag in tags}
+        job_ids = np.frombuffer(ids, dtype=np.int32)
+        for batch in job_tag_manager.iter_tag_postings(batch_size):
+            pairs = np.array(batch, dtype=np.int64).reshape(-1, 2)
+            rows = np.searchsorted(job_ids, pairs[:, 1])
+            # Without a consistent snapshot, skip jobs and tags created
+            # after they were read
+            found = rows < len(job_ids)
+            found[found] = job_ids[rows[found]] == pairs[found, 1]
+            for tag_id, job_id in pairs[found].tolist():
+                if tag_id in tag_lists:
+                    tag_lists[tag_id].append(job_id)
+        del job_ids
+    finally:
+        if began:
+            db.rollback()
+
+    token_keys = sorted(tokens)
+    sections = {
+        "ids": ids,
+        "days": days,
+        "location_codes": location_codes,
+        "company_codes": company_codes,
+        "position_codes": position_codes,
+        "date_ids": date_ids,
+        "date_days": date_days,
+    }
+    for family, lists in (
+        ("tags", (tag_lists[tag.id] for tag in tags)),
+        ("locations", _group(location_codes, ids, len(locations))),
+        ("companies", _group(company_codes, ids, len(companies))),
+        ("tokens", (tokens[token] for token in token_keys)),
+    ):
+        sections[f"{family}_offsets"], sections[f"{family}_postings"] = _csr(lists)
+
+    header = {
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "built_at": built_at.isoformat(),
+        "jobs": len(ids),
+        "max_id": max(ids, default=0),
+        "change_seq": change_seq,
+        "tags": [[tag.id, tag.name, tag.category.value] for tag in tags],
+        "locations": list(locations),
+        "companies": list(companies),
+        "positions": list(positions),
+        "tokens": token_keys,
+    }
+    size = _write(path, sections, header)
+
+    return {
+        "path": path,
+        "jobs": len(ids),
+        "tags": len(tags),
+        "locations": len(locations),
+        "companies": len(companies),
+        "positions": len(positions),
+        "tokens": len(token_keys),
+        "bytes": size,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _write(path: str, sections: Dict[str, array], header: Dict) -> int:
+    """Write sections and header to path atomically. Returns the file size."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    partial = f"{path}.partial"
+    with open(partial, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, 0, 0))
+        offsets = {}
+        for name, values in sections.items():
+            f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            offsets[name] = [f.tell(), len(values), values.typecode]
+            values.tofile(f)
+        payload = json.dumps({**header, "sections": offsets}).encode("utf-8")
+        header_offset = f.tell()
+        f.write(payload)
+        size = f.tell()
+        f.seek(0)
+        f.write(_PREAMBLE.pack(MAGIC, header_offset, len(payload)))
+    os.replace(partial, path)
+    return size
+
+
+class IndexSnapshot:
+    """
+    Read-only view of a snapshot file. Arrays are memoryviews over the
+    mapping, so nothing is copied into the process until it is read.
+    Posting lists are ascending job ids; missing keys give an empty list.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, header_offset, header_length = _PREAMBLE.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a job index snapshot")
+            header = json.loads(
+                self._mmap[header_offset : header_offset + header_length]
+            )
+            if header["version"] != VERSION or header["byteorder"] != sys.byteorder:
+                raise ValueError(
+                    f"{path} has version {header['version']} "
+                    f"({header['byteorder']}-endian); rebuild it"
+                )
+        except Exception:
+            self._mmap.close()
+            raise
+
+        self.header = header
+        self.built_at = datetime.fromisoformat(header["built_at"])
+        self.change_seq: Optional[int] = header.get("change_seq")
+        self.locations: List[str] = header["locations"]
+        self.companies: List[str] = header["companies"]
+        self.positions: List[str] = header["positions"]
+        buffer = memoryview(self._mmap)
+        self._sections = {
+            name: buffer[offset : offset + count * array(typecode).itemsize].cast(
+                typecode
+            )
+            for name, (offset, count, typecode) in header["sections"].items()
+        }
+        buffer.release()
+
+        self._tag_index = {tag[0]: i for i, tag in enumerate(header["tags"])}
+        self._location_index = {value: i for i, value in enumerate(self.locations)}
+        self._company_index = {value: i for i, value in enumerate(self.companies)}
+        self._token_index = {value: i for i, value in enumerate(header["tokens"])}
+
+    def __len__(self) -> int:
+        return self.header["jobs"]
+
+    def __enter__(self) -> "IndexSnapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the arrays and unmap the file."""
+        for view in self._sections.values():
+            view.release()
+        self._sections.clear()
+        self._mmap.close()
+
+    def section(self, name: str) -> memoryview:
+        """A section's array, e.g. "ids" or "days"."""
+        return self._sections[name]
+
+    def tag_ids(
+        self,
+        names: Optional[Iterable[str]] = None,
+        categories: Optional[Iterable[str]] = None,
+    ) -> List[int]:
+        """Ids of the tags with any of the names, in any of the categories."""
+        names = set(names) if names else None
+        categories = set(categories) if categories else None
+        return [
+            tag_id
+            for tag_id, name, category in self.header["tags"]
+            if (names is None or name in names)
+            and (categories is None or category in categories)
+        ]
+
+    def tag_postings(self, tag_id: int) -> memoryview:
+        """Ids of the jobs with a tag."""
+        return self._postings("tags", self._tag_index.get(tag_id))
+
+    def location_postings(self, location: str) -> memoryview:
+        """Ids of the jobs with exactly this location."""
+        return self._postings("locations", self._location_index.get(location))
+
+    def company_postings(self, company: str) -> memoryview:
+        """Ids of the jobs with exactly this company name."""
+        return self._postings("companies", self._company_index.get(company))
+
+    def token_postings(self, token: str) -> memoryview:
+        """Ids of the jobs whose position, company or location has the token."""
+        return self._postings("tokens", self._token_index.get(token))
+
+    def posted_between(
+        self, date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> memoryview:
+        """Ids of the jobs posted in an inclusive date range, by date then id."""
+        days = self._sections["date_days"]
+        start = bisect.bisect_left(days, date_from.toordinal()) if date_from else 0
+        end = bisect.bisect_right(days, date_to.toordinal()) if date_to else len(days)
+        return self._sections["date_ids"][start:end]
+
+    def _postings(self, family: str, index: Optional[int]) -> memoryview:
+        if index is None:
+            return _EMPTY
+        offsets = self._sections[f"{family}_offsets"]
+        return self._sections[f"{family}_postings"][offsets[index] : offsets[index + 1]]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.core.change_feed import change_feed
+    from app.core.config import settings
+    from app.core.db import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Build or inspect a memory-mapped search index snapshot"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Snapshot the jobs in the database")
+    build.add_argument("--output", default=settings.SEARCH_SNAPSHOT_PATH)
+    build.add_argument("--batch-size", type=int, default=10000)
+    info = commands.add_parser("info", help="Describe a snapshot file")
+    info.add_argument("path", nargs="?", default=settings.SEARCH_SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        change_seq = change_feed.latest() if settings.CHANGE_FEED_ENABLED else None
+        db = SessionLocal()
+        try:
+            stats = build_snapshot(
+                JobManager(db),
+                TagManager(db),
+                JobTagManager(db),
+                args.output,
+                args.batch_size,
+                change_seq,
+            )
+        finally:
+            db.close()
+        print(
+            f"Wrote {stats['path']}: {stats['jobs']} jobs, {stats['tags']} tags, "
+            f"{stats['locations']} locations, {stats['companies']} companies, "
+            f"{stats['positions']} positions, "
+            f"{stats['tokens']} tokens, {stats['bytes'] / 1e6:.1f} MB "
+            f"in {stats['seconds']:.1f}s"
+        )
+    else:
+        with IndexSnapshot(args.path) as snapshot:
+            print(f"{snapshot.path}: {len(snapshot)} jobs, built {snapshot.built_at}")
+            for name, (offset, count, typecode) in snapshot.header["sections"].items():
+                size = array(typecode).itemsize
+                print(f"  {name:<20} {count:>12} x {size} bytes")
@@ -0,0 +1,47 @@
+"""
+Tokens - Text normalization shared by the in-memory indexes
+"""
+
+import re
+from typing import List, Optional, Set
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_WILDCARDS = re.compile(r"[%_]")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric tokens of a text, in order, without duplicates."""
+    if not text:
+        return []
+    return list(dict.fromkeys(_TOKEN.findall(text.lower())))
+
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    """The distinct three-character substrings of a lowercased text."""
+    if not text:
+        return set()
+    text = text.lower()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def like_trigrams(pattern: Optional[str]) -> Set[str]:
+    """
+    Trigrams every text matching ILIKE '%pattern%' contains: those of the
+    pattern's literal runs between % and _ wildcards.
+    """
+    if not pattern:
+        return set()
+    return set().union(*(trigrams(run) for run in _WILDCARDS.split(pattern)))
+
+
+def like_regex(value: str) -> "re.Pattern":
+    """
+    Case-insensitive regex matching what ILIKE '%value%' matches, with %
+    and _ in value keeping their wildcard meaning.
+    """
+    pattern = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in value
+    )
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
@@ -1,10 +1,95 @@
-from app.api import jobs, tags
+from contextlib import asynccontextmanager
+
+from app.api import jobs, saved_searches, tags
+from app.core.change_feed import change_feed
 from app.core.config import settings
+from app.core.db import SessionLocal, engine
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.partitions import PartitionMaintainer
+from app.core.profiling import SQLProfilingMiddleware
+from app.core.shared_cache import shared_cache
+from app.core.slow_queries import slow_query_log
+from app.core.tracing import TracingMiddleware
+from app.indexes.columns import ColumnStoreWorker, column_store
+from app.indexes.similar import SimilarJobIndexWorker, similar_jobs
+from app.services.archive import ArchiveWorker
+from app.services.saved_search import PercolatorWorker
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Log slow statements with their query plans
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        slow_query_log.install()
+    # Create upcoming and detach expired job partitions in the background
+    maintainer = None
+    if settings.JOB_PARTITION_MAINTENANCE_ENABLED:
+        maintainer = PartitionMaintainer(
+            engine, settings.JOB_PARTITION_MAINTENANCE_SECONDS
+        )
+        maintainer.start()
+    # Move expired postings to the archive tier in the background
+    archiver = None
+    if settings.ARCHIVE_ENABLED:
+        archiver = ArchiveWorker(SessionLocal, settings.ARCHIVE_INTERVAL_SECONDS)
+        archiver.start()
+    # Serve search and job responses from the cache shared by all workers
+    if settings.SHARED_CACHE_ENABLED:
+        shared_cache.install()
+    # Log changed jobs for the in-process indexes of every worker
+    if settings.CHANGE_FEED_ENABLED:
+        change_feed.install()
+    # Filter searches in memory once the column store has loaded; it follows
+    # the change feed, so needs it on
+    column_loader = None
+    if settings.COLUMN_STORE_ENABLED and settings.CHANGE_FEED_ENABLED:
+        column_loader = ColumnStoreWorker(
+            column_store,
+            SessionLocal,
+            settings.SEARCH_SNAPSHOT_PATH,
+            settings.COLUMN_STORE_REFRESH_SECONDS,
+        )
+        column_loader.start()
+    # Look up similar jobs in memory once the LSH index has loaded
+    similar_loader = None
+    if settings.SIMILAR_JOBS_ENABLED and settings.CHANGE_FEED_ENABLED:
+        similar_loader = SimilarJobIndexWorker(
+            similar_jobs, SessionLocal, settings.SIMILAR_JOBS_REFRESH_SECONDS
+        )
+        similar_loader.start()
+    # Match the jobs this worker creates against the saved searches
+    percolator = None
+    if settings.SAVED_SEARCH_ALERTS_ENABLED:
+        percolator = PercolatorWorker(
+            SessionLocal, settings.SAVED_SEARCH_PERCOLATE_SECONDS
+        )
+        percolator.start()
+    yield
+    if percolator:
+        percolator.stop()
+    if similar_loader:
+        similar_loader.stop()
+    if column_loader:
+        column_loader.stop()
+    if change_feed.installed:
+        change_feed.uninstall()
+    if shared_cache.installed:
+        shared_cache.uninstall()
+    if archiver:
+        archiver.stop()
+    if maintainer:
+        maintainer.stop()
+    if slow_query_log.installed:
+        slow_query_log.uninstall()
+
 
 app = FastAPI(
-    title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    title=settings.PROJECT_NAME,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -16,9 +101,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Attribute SQL statements and DB time to each request
+if settings.SQL_PROFILING_ENABLED:
+    app.add_middleware(SQLProfilingMiddleware)
+
+# Route latency and in-flight requests for /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Root spans for sampled requests
+app.add_middleware(TracingMiddleware)
+
 # Include API routes
 app.include_router(jobs.router, prefix=f"{settings.API_V1_STR}/jobs", tags=["jobs"])
 app.include_router(tags.router, prefix=f"{settings.API_V1_STR}/tags", tags=["tags"])
+app.include_router(
+    saved_searches.router,
+    prefix=f"{settings.API_V1_STR}/saved-searches",
+    tags=["saved-searches"],
+)
 
 
 @app.get("/")
@@ -29,3 +130,10 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -7,6 +7,7 @@ between the business logic (services) and the database models.
 
 from .job_manager import JobManager
 from .job_tag_manager import JobTagManager
+from .saved_search_manager import SavedSearchManager
 from .tag_manager import TagManager
 
-__all__ = ["JobManager", "TagManager", "JobTagManager"]
+__all__ = ["JobManager", "TagManager", "JobTagManager", "SavedSearchManager"]
@@ -2,16 +2,354 @@
 Job Manager - Database access layer for Job operations
 """
 
-from datetime import date
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 
-from app.models.job import Job
-from app.models.job_tag import JobTag
+from app.core.db import code_point_order, conflict_insert
+from app.core.events import JOBS_CHANGED, publish_after_commit
+from app.core.metrics import instrumented
+from app.core.partitions import ensure_partitions, is_partitioned
+from app.core.tag_expr import And, Not, TagExpr, TagName, skeleton, tag_names
+from app.models.archived_job import ArchivedJob
+from app.models.archived_job_tag import ArchivedJobTag
+from app.models.job import Job, compute_content_hash
+from app.models.job_tag import JobTag, job_posting_date_of
 from app.models.tag import Tag
-from sqlalchemy import or_
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Row,
+    Select,
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.orm import Session, joinedload
 
+# Columns written by bulk_upsert; id and created_at are left to the database
+UPSERT_COLUMNS = (
+    "job_position",
+    "job_link",
+    "company_name",
+    "company_profile",
+    "job_location",
+    "job_posting_date",
+    "tags",
+    "content_hash",
+    "updated_at",
+)
 
+# Columns read by iter_by_filters
+EXPORT_COLUMNS = (
+    Job.id,
+    Job.job_id,
+    Job.job_position,
+    Job.job_link,
+    Job.company_name,
+    Job.job_location,
+    Job.job_posting_date,
+)
+
+# Columns copied to the archive tables, which have the same names
+ARCHIVE_JOB_COLUMNS = tuple(column.name for column in Job.__table__.columns)
+ARCHIVE_JOB_TAG_COLUMNS = tuple(column.name for column in JobTag.__table__.columns)
+
+# Columns read by iter_index_rows
+INDEX_COLUMNS = (
+    Job.id,
+    Job.job_posting_date,
+    Job.job_position,
+    Job.company_name,
+    Job.job_location,
+)
+
+# Per-job statuses returned by bulk_upsert
+JOB_CREATED = "created"
+JOB_UPDATED = "updated"
+JOB_UNCHANGED = "unchanged"
+
+# Sort orders of find_by_filters; without one, jobs come in id order
+SORT_NEWEST = "newest"
+SORT_OLDEST = "oldest"
+SORT_COMPANY = "company"
+# Position matches of the text query first, then company, then location
+# matches, newest first within each; newest without a query
+SORT_RELEVANCE = "relevance"
+SORTS = (SORT_NEWEST, SORT_OLDEST, SORT_COMPANY, SORT_RELEVANCE)
+
+# Statement kinds built by _search_statement
+SEARCH_FIND = "find"
+SEARCH_COUNT = "count"
+SEARCH_EXPORT = "export"
+# Across the hot and archive tiers
+SEARCH_FIND_ALL = "find_all"
+SEARCH_COUNT_ALL = "count_all"
+
+# (kind, filter shape, sort) -> statement. Without tag expressions there
+# are at most 5 * 2**6 * 5 shapes; each tag expression structure adds more,
+# so the cache is emptied once it holds _MAX_SEARCH_STATEMENTS
+_search_statements: Dict[Tuple[str, Tuple, Optional[str]], Select] = {}
+_MAX_SEARCH_STATEMENTS = 4096
+
+
+def _search_params(
+    query: Optional[str],
+    location: Optional[str],
+    tags: Optional[List[str]],
+    tag_categories: Optional[List[str]],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    tag_expr: Optional[TagExpr] = None,
+) -> Tuple[Tuple, Dict]:
+    """
+    Bound parameter values for the given filters, and the filter shape:
+    the names of the filters in use, which selects the statement. A tag
+    expression's names are bound as tag_expr_0, tag_expr_1, ... and its
+    skeleton ends the shape.
+    """
+    params = {}
+    if query:
+        params["query_pattern"] = f"%{query}%"
+    if location:
+        params["location_pattern"] = f"%{location}%"
+    if tags:
+        params["tags"] = list(tags)
+    if tag_categories:
+        params["tag_categories"] = list(tag_categories)
+    if date_from:
+        params["date_from"] = date_from
+    if date_to:
+        params["date_to"] = date_to
+    shape = tuple(params)
+    if tag_expr is not None:
+        names = {name: i for i, name in enumerate(tag_names(tag_expr))}
+        params.update((f"tag_expr_{i}", name) for name, i in names.items())
+        shape += (skeleton(tag_expr, names),)
+    return shape, params
+
+
+def _search_criteria(shape: Tuple, job_model=Job, job_tag_model=JobTag) -> List:
+    """
+    WHERE criteria for a filter shape, with every value a bound parameter.
+    Filters the hot tier by default, or the archive tier given its models.
+    """
+    criteria = []
+    if "query_pattern" in shape:
+        pattern = bindparam("query_pattern")
+        criteria.append(
+            or_(
+                job_model.job_position.ilike(pattern),
+                job_model.company_name.ilike(pattern),
+                job_model.job_location.ilike(pattern),
+            )
+        )
+
+    if "location_pattern" in shape:
+        criteria.append(job_model.job_location.ilike(bindparam("location_pattern")))
+
+    # A semi-join keeps one row per job, so no DISTINCT is needed
+    if "tags" in shape or "tag_categories" in shape:
+        tag_filter = select(job_tag_model.job_id).join(
+            Tag, Tag.id == job_tag_model.tag_id
+        )
+        if "tags" in shape:
+            tag_filter = tag_filter.where(
+                Tag.name.in_(bindparam("tags", expanding=True))
+            )
+        if "tag_categories" in shape:
+            tag_filter = tag_filter.where(
+                Tag.category.in_(bindparam("tag_categories", expanding=True))
+            )
+        # Repeat the date range on job_tags, so only its partitions (or index
+        # entries) within the range are read
+        if "date_from" in shape:
+            tag_filter = tag_filter.where(
+                job_tag_model.job_posting_date >= bindparam("date_from")
+            )
+        if "date_to" in shape:
+            tag_filter = tag_filter.where(
+                job_tag_model.job_posting_date <= bindparam("date_to")
+            )
+        criteria.append(job_model.id.in_(tag_filter))
+
+    # A tag expression's skeleton ends the shape
+    if shape and not isinstance(shape[-1], str):
+        criteria.append(_tag_expr_criterion(shape[-1], job_model, job_tag_model))
+
+    if "date_from" in shape:
+        criteria.append(job_model.job_posting_date >= bindparam("date_from"))
+
+    if "date_to" in shape:
+        criteria.append(job_model.job_posting_date <= bindparam("date_to"))
+
+    return criteria
+
+
+def _has_tag(names: List[TagName], job_model, job_tag_model) -> ColumnElement:
+    """
+    EXISTS semi-join for a job having a tag with any of the names, which
+    are skeleton indexes of the bound tag_expr_<i> values. Correlating on
+    the posting date as well lets PostgreSQL read only the job's job_tags
+    partition.
+    """
+    return (
+        select(job_tag_model.id)
+        .where(
+            job_tag_model.job_id == job_model.id,
+            job_tag_model.job_posting_date == job_model.job_posting_date,
+            job_tag_model.tag_id.in_(
+                select(Tag.id).where(
+                    Tag.name.in_([bindparam(f"tag_expr_{tag.name}") for tag in names])
+                )
+            ),
+        )
+        .exists()
+    )
+
+
+def _tag_expr_criterion(expr: TagExpr, job_model, job_tag_model) -> ColumnElement:
+    """
+    WHERE criterion of a tag expression skeleton: one EXISTS per tag, or
+    per OR of tags, and NOT EXISTS for negations. A semi-join never repeats
+    a job, so no JOIN or DISTINCT is needed.
+    """
+    if isinstance(expr, TagName):
+        return _has_tag([expr], job_model, job_tag_model)
+    if isinstance(expr, Not):
+        return ~_tag_expr_criterion(expr.operand, job_model, job_tag_model)
+    if isinstance(expr, And):
+        return and_(
+            *(_tag_expr_criterion(op, job_model, job_tag_model) for op in expr.operands)
+        )
+    names = [op for op in expr.operands if isinstance(op, TagName)]
+    others = [op for op in expr.operands if not isinstance(op, TagName)]
+    return or_(
+        *([_has_tag(names, job_model, job_tag_model)] if names else []),
+        *(_tag_expr_criterion(op, job_model, job_tag_model) for op in others),
+    )
+
+
+def _sort_keys(
+    sort: Optional[str], shape: Tuple, job_model=Job
+) -> List[Tuple[str, ColumnElement, bool]]:
+    """
+    (label, expression, descending) keys of a sort order, ending with the
+    id tiebreak that makes it total. Date and company orders match an index
+    (ix_jobs_posting_date_id, read backwards for oldest, or
+    ix_jobs_company_name_id), so a page is read in index order. Companies
+    compare by code point, as the column store ranks them. Relevance
+    ranks only the matching rows, and LIMIT keeps just the top of them.
+    """
+    if sort == SORT_RELEVANCE and "query_pattern" not in shape:
+        sort = SORT_NEWEST
+    keys = []
+    if sort == SORT_RELEVANCE:
+        pattern = bindparam("query_pattern")
+        rank = case(
+            (job_model.job_position.ilike(pattern), 0),
+            (job_model.company_name.ilike(pattern), 1),
+            else_=2,
+        )
+        keys.append(("relevance", rank, False))
+    if sort in (SORT_NEWEST, SORT_RELEVANCE):
+        keys.append(("posting_date", job_model.job_posting_date, True))
+    elif sort == SORT_OLDEST:
+        keys.append(("posting_date", job_model.job_posting_date, False))
+    elif sort == SORT_COMPANY:
+        keys.append(("company_name", code_point_order(job_model.company_name), False))
+    keys.append(("id", job_model.id, sort == SORT_OLDEST))
+    return keys
+
+
+def _order_by(keys: List[Tuple[str, ColumnElement, bool]]) -> List[ColumnElement]:
+    return [expression.desc() if desc else expression for _, expression, desc in keys]
+
+
+def _search_statement(kind: str, shape: Tuple, sort: Optional[str] = None) -> Select:
+    """
+    The search statement of a kind for a filter shape and sort order, built
+    on first use. Reusing one statement object per shape lets SQLAlchemy
+    find its compiled form in the engine's cache without rebuilding the
+    query each search.
+    """
+    key = (kind, shape, sort)
+    stmt = _search_statements.get(key)
+    if stmt is not None:
+        return stmt
+
+    criteria = _search_criteria(shape)
+    if kind in (SEARCH_FIND_ALL, SEARCH_COUNT_ALL):
+        archived_criteria = _search_criteria(shape, ArchivedJob, ArchivedJobTag)
+
+    if kind == SEARCH_COUNT:
+        stmt = select(func.count(Job.id)).where(*criteria)
+    elif kind == SEARCH_COUNT_ALL:
+        stmt = select(
+            select(func.count(Job.id)).where(*criteria).scalar_subquery()
+            + select(func.count(ArchivedJob.id))
+            .where(*archived_criteria)
+            .scalar_subquery()
+        )
+    elif kind == SEARCH_FIND_ALL:
+        # One page of (id, archived) pairs; archived jobs keep their ids, so
+        # both tiers interleave as if they were one table
+        keys = _sort_keys(sort, shape)
+        archived_keys = _sort_keys(sort, shape, ArchivedJob)
+        page = union_all(
+            select(
+                literal(False).label("archived"),
+                *(expression.label(label) for label, expression, _ in keys),
+            ).where(*criteria),
+            select(
+                literal(True), *(expression for _, expression, _ in archived_keys)
+            ).where(*archived_criteria),
+        ).subquery()
+        stmt = (
+            select(page.c.id, page.c.archived)
+            .order_by(
+                *_order_by([(label, page.c[label], desc) for label, _, desc in keys])
+            )
+            .limit(bindparam("limit"))
+            .offset(bindparam("offset"))
+        )
+    elif kind == SEARCH_EXPORT:
+        stmt = select(*EXPORT_COLUMNS).where(*criteria).order_by(Job.id)
+    else:
+        stmt = (
+            select(Job)
+            .options(joinedload(Job.tag_relations).joinedload(JobTag.tag))
+            .where(*criteria)
+            .order_by(*_order_by(_sort_keys(sort, shape)))
+            .limit(bindparam("limit"))
+            .offset(bindparam("offset"))
+        )
+    if len(_search_statements) >= _MAX_SEARCH_STATEMENTS:
+        _search_statements.clear()
+    return _search_statements.setdefault(key, stmt)
+
+
+@dataclass(frozen=True)
+class JobChanges:
+    """Primary keys of jobs created, updated or deleted by a write."""
+
+    created: FrozenSet[int] = field(default_factory=frozenset)
+    updated: FrozenSet[int] = field(default_factory=frozenset)
+    deleted: FrozenSet[int] = field(default_factory=frozenset)
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+
+@instrumented("manager")
 class JobManager:
     """
     Handles all database operations for Job entities.
@@ -30,6 +368,17 @@ class JobManager:
             .first()
         )
 
+    def find_archived_by_id(self, job_id: str) -> Optional[ArchivedJob]:
+        """Find an archived job by its job_id."""
+        return (
+            self.db.query(ArchivedJob)
+            .options(
+                joinedload(ArchivedJob.tag_relations).joinedload(ArchivedJobTag.tag)
+            )
+            .filter(ArchivedJob.job_id == job_id)
+            .first()
+        )
+
     def find_by_filters(
         self,
         query: Optional[str] = None,
@@ -40,18 +389,115 @@ class JobManager:
         date_to: Optional[date] = None,
         limit: int = 10,
         offset: int = 0,
-    ) -> List[Job]:
-        """Find jobs based on various filters."""
-        base_query = self.db.query(Job).options(
-            joinedload(Job.tag_relations).joinedload(JobTag.tag)
+        include_archived: bool = False,
+        sort: Optional[str] = None,
+        tag_expr: Optional[TagExpr] = None,
+    ) -> List[Union[Job, ArchivedJob]]:
+        """
+        Find jobs based on various filters, in the hot tier only unless
+        include_archived is set, in one of the SORTS orders or by id.
+        """
+        if sort is not None and sort not in SORTS:
+            raise ValueError(f"Unknown sort order: {sort}")
+        shape, params = _search_params(
+            query, location, tags, tag_categories, date_from, date_to, tag_expr
         )
+        params["limit"] = limit
+        params["offset"] = offset
+        if not include_archived:
+            return (
+                self.db.scalars(_search_statement(SEARCH_FIND, shape, sort), params)
+                .unique()
+                .all()
+            )
+
+        page = self.db.execute(
+            _search_statement(SEARCH_FIND_ALL, shape, sort), params
+        ).all()
+        jobs = {}
+        for model, job_tag_model, archived in (
+            (Job, JobTag, False),
+            (ArchivedJob, ArchivedJobTag, True),
+        ):
+            pks = [pk for pk, in_archive in page if in_archive == archived]
+            if not pks:
+                continue
+            for job in self.db.scalars(
+                select(model)
+                .options(joinedload(model.tag_relations).joinedload(job_tag_model.tag))
+                .where(model.id.in_(pks))
+            ).unique():
+                jobs[archived, job.id] = job
+        # A job archived between the two reads is left out of this page
+        return [jobs[archived, pk] for pk, archived in page if (archived, pk) in jobs]
 
-        # Apply filters
-        filtered_query = self._apply_filters(
-            base_query, query, location, tags, tag_categories, date_from, date_to
+    def iter_by_filters(
+        self,
+        query: Optional[str] = None,
+        location: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        tag_categories: Optional[List[str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[List[Row]]:
+        """
+        Stream every job matching the filters in batches, ordered by id.
+        Rows are plain column tuples read through a server-side cursor, so
+        nothing accumulates in the session however many jobs match.
+        """
+        shape, params = _search_params(
+            query, location, tags, tag_categories, date_from, date_to
+        )
+        result = self.db.execute(
+            _search_statement(SEARCH_EXPORT, shape),
+            params,
+            execution_options={"yield_per": batch_size},
+        )
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    def iter_index_rows(self, batch_size: int = 10000) -> Iterator[List[Row]]:
+        """
+        Stream the searchable columns of every hot job in batches, ordered
+        by id, for building in-memory indexes.
+        """
+        result = self.db.execute(
+            select(*INDEX_COLUMNS).order_by(Job.id),
+            execution_options={"yield_per": batch_size},
         )
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
 
-        return filtered_query.limit(limit).offset(offset).all()
+    def find_index_rows(self, pks: Iterable[int]) -> List[Row]:
+        """The searchable columns of the given hot jobs, ordered by id."""
+        pks = list(pks)
+        if not pks:
+            return []
+        return self.db.execute(
+            select(*INDEX_COLUMNS).where(Job.id.in_(pks)).order_by(Job.id)
+        ).all()
+
+    def find_by_pks(self, pks: List[int]) -> List[Job]:
+        """
+        Load hot jobs with their tags by primary key, in the given order.
+        Keys of jobs that no longer exist are skipped.
+        """
+        if not pks:
+            return []
+        jobs = {
+            job.id: job
+            for job in self.db.scalars(
+                select(Job)
+                .options(joinedload(Job.tag_relations).joinedload(JobTag.tag))
+                .where(Job.id.in_(pks))
+            ).unique()
+        }
+        return [jobs[pk] for pk in pks if pk in jobs]
 
     def count_by_filters(
         self,
@@ -61,35 +507,211 @@ class JobManager:
         tag_categories: Optional[List[str]] = None,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
+        include_archived: bool = False,
+        tag_expr: Optional[TagExpr] = None,
     ) -> int:
         """Count jobs that match the given filters."""
-        base_query = self.db.query(Job)
-
-        # Apply filters
-        filtered_query = self._apply_filters(
-            base_query, query, location, tags, tag_categories, date_from, date_to
+        shape, params = _search_params(
+            query, location, tags, tag_categories, date_from, date_to, tag_expr
         )
-
-        return filtered_query.count()
+        kind = SEARCH_COUNT_ALL if include_archived else SEARCH_COUNT
+        return self.db.scalar(_search_statement(kind, shape), params)
 
     def create(self, job_data: Dict) -> Job:
         """Create a new job."""
+        self._ensure_partitions([job_data["job_posting_date"]])
         job = Job(**job_data)
         self.db.add(job)
+        self.db.flush()
+        self._delete_archived([job.job_id])
+        publish_after_commit(
+            self.db, JOBS_CHANGED, JobChanges(created=frozenset({job.id}))
+        )
         self.db.commit()
         self.db.refresh(job)
         return job
 
+    def bulk_upsert(
+        self, rows: List[Dict], commit: bool = True
+    ) -> Dict[str, Tuple[int, str]]:
+        """
+        Insert or update many jobs by job_id, skipping unchanged ones.
+        One lookup fetches the stored content hashes; only new jobs and jobs
+        whose hash differs are written, with one INSERT ... ON CONFLICT
+        (job_id) DO UPDATE RETURNING. Unchanged jobs keep their updated_at.
+        Every row must carry job_id and all UPSERT_COLUMNS except updated_at.
+        Returns a mapping of job_id to (primary key, status), where status is
+        "created", "updated" or "unchanged".
+        """
+        if not rows:
+            return {}
+
+        existing = {
+            job_id: (pk, content_hash)
+            for job_id, pk, content_hash in self.db.execute(
+                select(Job.job_id, Job.id, Job.content_hash).where(
+                    Job.job_id.in_([row["job_id"] for row in rows])
+                )
+            )
+        }
+
+        today = datetime.utcnow().date()
+        results = {}
+        pending = []
+        for row in rows:
+            content_hash = compute_content_hash(
+                row["job_position"],
+                row["company_name"],
+                row.get("job_location"),
+                row["job_posting_date"],
+                row.get("tags"),
+            )
+            stored = existing.get(row["job_id"])
+            if stored and stored[1] == content_hash:
+                results[row["job_id"]] = (stored[0], JOB_UNCHANGED)
+            else:
+                pending.append(
+                    {**row, "content_hash": content_hash, "updated_at": today}
+                )
+
+        if pending:
+            self._ensure_partitions(row["job_posting_date"] for row in pending)
+            self._write_upserts(pending, existing, results)
+
+        changes = JobChanges(
+            created=frozenset(
+                pk for pk, status in results.values() if status == JOB_CREATED
+            ),
+            updated=frozenset(
+                pk for pk, status in results.values() if status == JOB_UPDATED
+            ),
+        )
+        if changes.created:
+            self._delete_archived(
+                job_id
+                for job_id, (pk, status) in results.items()
+                if status == JOB_CREATED
+            )
+        if changes.updated:
+            self._sync_job_tag_dates(changes.updated)
+        if changes:
+            publish_after_commit(self.db, JOBS_CHANGED, changes)
+
+        if commit:
+            self.db.commit()
+
+        return results
+
+    def _ensure_partitions(self, days: Iterable[date]):
+        """
+        Create the partitions of the given posting dates, if missing. Once
+        the session has begun a transaction, which may hold locks on jobs,
+        the partitions are created in it rather than beside it.
+        """
+        if self.db.in_transaction():
+            ensure_partitions(self.db.connection(), days)
+        else:
+            ensure_partitions(self.db.get_bind(), days)
+
+    def _sync_job_tag_dates(self, job_pks: Iterable[int]):
+        """
+        Copy the posting dates of the given jobs to their job_tags rows.
+        On PostgreSQL with partitioning the foreign key cascades the change,
+        and no row matches here.
+        """
+        posting_date = job_posting_date_of(JobTag.job_id)
+        self.db.execute(
+            update(JobTag)
+            .where(
+                JobTag.job_id.in_(list(job_pks)),
+                JobTag.job_posting_date != posting_date,
+            )
+            .values(job_posting_date=posting_date),
+            execution_options={"synchronize_session": False},
+        )
+
+    def _delete_archived(self, job_ids: Iterable[str]):
+        """
+        Delete the archived copies of the given job_ids, with their tags.
+        A job posted again under an archived job_id supersedes the archived
+        copy, so the two tiers never hold the same job_id.
+        """
+        archived = select(ArchivedJob.id).where(ArchivedJob.job_id.in_(list(job_ids)))
+        self.db.execute(
+            delete(ArchivedJobTag).where(ArchivedJobTag.job_id.in_(archived)),
+            execution_options={"synchronize_session": False},
+        )
+        self.db.execute(
+            delete(ArchivedJob).where(ArchivedJob.id.in_(archived)),
+            execution_options={"synchronize_session": False},
+        )
+
+    def _write_upserts(self, rows: List[Dict], existing: Dict, results: Dict):
+        """Write new and changed rows, recording their status in results."""
+        table = Job.__table__
+        # A partitioned jobs table has no unique index on job_id alone to
+        # arbitrate ON CONFLICT; the lookup has already split the rows
+        stmt = None
+        if not is_partitioned(self.db.get_bind()):
+            stmt = conflict_insert(self.db, table)
+        if stmt is not None:
+            # The WHERE guards against a concurrent writer having stored the
+            # same content since the hash lookup
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["job_id"],
+                set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+                where=table.c.content_hash.is_distinct_from(stmt.excluded.content_hash),
+            ).returning(table.c.job_id, table.c.id)
+            for job_id, pk in self.db.execute(stmt, rows):
+                results[job_id] = (
+                    pk,
+                    JOB_UPDATED if job_id in existing else JOB_CREATED,
+                )
+            # Rows skipped by the WHERE return nothing
+            skipped = [row["job_id"] for row in rows if row["job_id"] not in results]
+            if skipped:
+                for job_id, pk in self.db.execute(
+                    select(Job.job_id, Job.id).where(Job.job_id.in_(skipped))
+                ):
+                    results[job_id] = (pk, JOB_UNCHANGED)
+            return
+
+        new_rows = [row for row in rows if row["job_id"] not in existing]
+        if new_rows:
+            stmt = insert(table).returning(table.c.job_id, table.c.id)
+            for job_id, pk in self.db.execute(stmt, new_rows):
+                results[job_id] = (pk, JOB_CREATED)
+
+        changed_rows = [
+            {**row, "id": existing[row["job_id"]][0]}
+            for row in rows
+            if row["job_id"] in existing
+        ]
+        if changed_rows:
+            self.db.execute(update(Job), changed_rows)
+            for row in changed_rows:
+                results[row["job_id"]] = (row["id"], JOB_UPDATED)
+
     def update(self, job_id: str, job_data: Dict) -> Optional[Job]:
         """Update an existing job."""
         job = self.find_by_id(job_id)
         if not job:
             return None
 
+        if "job_posting_date" in job_data:
+            self._ensure_partitions([job_data["job_posting_date"]])
+
         for key, value in job_data.items():
             if hasattr(job, key):
                 setattr(job, key, value)
 
+        if "job_posting_date" in job_data:
+            self.db.flush()
+            self._sync_job_tag_dates([job.id])
+
+        publish_after_commit(
+            self.db, JOBS_CHANGED, JobChanges(updated=frozenset({job.id}))
+        )
         self.db.commit()
         self.db.refresh(job)
         return job
@@ -100,50 +722,60 @@ class JobManager:
         if not job:
             return False
 
+        publish_after_commit(
+            self.db, JOBS_CHANGED, JobChanges(deleted=frozenset({job.id}))
+        )
         self.db.delete(job)
         self.db.commit()
         return True
 
-    def _apply_filters(
-        self,
-        query,
-        text_query: Optional[str] = None,
-        location: Optional[str] = None,
-        tags: Optional[List[str]] = None,
-        tag_categories: Optional[List[str]] = None,
-        date_from: Optional[date] = None,
-        date_to: Optional[date] = None,
-    ):
-        """Apply various filters to the query."""
-        # Text search in job position and company name
-        if text_query:
-            query = query.filter(
-                or_(
-                    Job.job_position.ilike(f"%{text_query}%"),
-                    Job.company_name.ilike(f"%{text_query}%"),
-                    Job.job_location.ilike(f"%{text_query}%"),
-                )
-            )
-
-        # Location filter
-        if location:
-            query = query.filter(Job.job_location.ilike(f"%{location}%"))
-
-        # Tag filters
-        if tags or tag_categories:
-            query = query.join(JobTag).join(Tag)
-
-            if tags:
-                query = query.filter(Tag.name.in_(tags))
-
-            if tag_categories:
-                query = query.filter(Tag.category.in_(tag_categories))
+    def archive_before(self, cutoff: date, batch_size: int = 1000) -> List[int]:
+        """
+        Move up to batch_size jobs posted before cutoff, oldest first, and
+        their job_tags rows to the archive tables, in one committed
+        transaction. Jobs locked by a concurrent writer are skipped until a
+        later batch. Returns the primary keys of the jobs moved.
+        """
+        rows = self.db.execute(
+            select(Job.id, Job.job_id)
+            .where(Job.job_posting_date < cutoff)
+            .order_by(Job.job_posting_date, Job.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            self.db.rollback()
+            return []
 
-        # Date range filters
-        if date_from:
-            query = query.filter(Job.job_posting_date >= date_from)
-
-        if date_to:
-            query = query.filter(Job.job_posting_date <= date_to)
+        pks = [pk for pk, _ in rows]
+        self._delete_archived(job_id for _, job_id in rows)
+        self.db.execute(
+            insert(ArchivedJob).from_select(
+                [*ARCHIVE_JOB_COLUMNS, "archived_at"],
+                select(
+                    *(Job.__table__.c[name] for name in ARCHIVE_JOB_COLUMNS),
+                    literal(datetime.utcnow(), DateTime),
+                ).where(Job.id.in_(pks)),
+            )
+        )
+        self.db.execute(
+            insert(ArchivedJobTag).from_select(
+                ARCHIVE_JOB_TAG_COLUMNS,
+                select(
+                    *(JobTag.__table__.c[name] for name in ARCHIVE_JOB_TAG_COLUMNS)
+                ).where(JobTag.job_id.in_(pks)),
+            )
+        )
+        self.db.execute(
+            delete(JobTag).where(JobTag.job_id.in_(pks)),
+            execution_options={"synchronize_session": False},
+        )
+        self.db.execute(
+            delete(Job).where(Job.id.in_(pks)),
+            execution_options={"synchronize_session": False},
+        )
 
-        return query.distinct(Job.id)
+        # Gone from the hot tier, which is what searches and caches read
+        publish_after_commit(self.db, JOBS_CHANGED, JobChanges(deleted=frozenset(pks)))
+        self.db.commit()
+        return pks
@@ -2,12 +2,35 @@
 JobTag Manager - Database access layer for JobTag operations
 """
 
-from typing import Dict, List
-
-from app.models.job_tag import JobTag
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+from app.core.db import conflict_insert
+from app.core.events import JOB_TAGS_CHANGED, publish_after_commit
+from app.core.metrics import instrumented
+from app.models.job_tag import JobTag, job_posting_date_of
+from sqlalchemy import Row, bindparam, delete, func, insert, select, tuple_
 from sqlalchemy.orm import Session
 
 
+@dataclass(frozen=True)
+class JobTagDiff:
+    """Tag IDs added to and removed from a job by an update."""
+
+    job_id: int
+    added: FrozenSet[int] = field(default_factory=frozenset)
+    removed: FrozenSet[int] = field(default_factory=frozenset)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+    @property
+    def affected_tag_ids(self) -> FrozenSet[int]:
+        """Tags whose job lists change."""
+        return self.added | self.removed
+
+
+@instrumented("manager")
 class JobTagManager:
     """
     Handles all database operations for JobTag entities.
@@ -47,6 +70,49 @@ class JobTagManager:
         """Find all job-tag relationships for a specific tag."""
         return self.db.query(JobTag).filter(JobTag.tag_id == tag_id).all()
 
+    def iter_tag_postings(self, batch_size: int = 10000) -> Iterator[List[Row]]:
+        """
+        Stream every (tag_id, job_id) pair in batches, ordered by tag and
+        then job, through a server-side cursor.
+        """
+        result = self.db.execute(
+            select(JobTag.tag_id, JobTag.job_id)
+            # Deleting a job through the ORM leaves its relations unlinked
+            .where(JobTag.job_id.isnot(None)).order_by(JobTag.tag_id, JobTag.job_id),
+            execution_options={"yield_per": batch_size},
+        )
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    def find_tag_pairs(self, job_ids: Iterable[int]) -> List[Row]:
+        """The (tag_id, job_id) pairs of the given jobs."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        return self.db.execute(
+            select(JobTag.tag_id, JobTag.job_id).where(JobTag.job_id.in_(job_ids))
+        ).all()
+
+    def find_jobs_sharing_tags(self, tag_ids: Iterable[int], limit: int) -> List[int]:
+        """
+        Ids of the jobs with the most of the given tags, most first and
+        newest first among equals.
+        """
+        tag_ids = list(tag_ids)
+        if not tag_ids:
+            return []
+        return list(
+            self.db.scalars(
+                select(JobTag.job_id)
+                .where(JobTag.tag_id.in_(tag_ids))
+                .group_by(JobTag.job_id)
+                .order_by(func.count(JobTag.tag_id).desc(), JobTag.job_id.desc())
+                .limit(limit)
+            )
+        )
+
     def bulk_create(self, relations: List[Dict]) -> List[JobTag]:
         """Create multiple job-tag relationships in bulk."""
         job_tags = []
@@ -63,16 +129,100 @@ class JobTagManager:
 
         return job_tags
 
-    def update_job_tags(self, job_id: int, tag_ids: List[int]) -> List[JobTag]:
-        """Update job-tag relationships by replacing all existing ones."""
-        # Remove existing relationships
-        self.delete_relations(job_id)
-
-        # Create new relationships
-        if tag_ids:
-            return self.create_relations(job_id, tag_ids)
-
-        return []
+    def insert_relations(
+        self, relations: Iterable[Tuple[int, int]], commit: bool = True
+    ) -> List[int]:
+        """
+        Insert (job_id, tag_id) relationships with one multi-row INSERT.
+        SQLAlchemy pages very large inputs into batches of multi-row VALUES.
+        Each row's job_posting_date is read from its job within the INSERT.
+        Existing pairs are skipped, and no objects are loaded or refreshed.
+        Pass commit=False to leave the transaction to the caller.
+        Returns the IDs of the inserted relationships.
+        """
+        rows = [
+            {"job_id": job_id, "tag_id": tag_id, "job_pk": job_id}
+            for job_id, tag_id in dict.fromkeys(relations)
+        ]
+        if not rows:
+            return []
+
+        # Core-level insert on the table skips ORM bulk-persistence overhead
+        table = JobTag.__table__
+        stmt = conflict_insert(self.db, table)
+        if stmt is not None:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=["job_id", "tag_id", "job_posting_date"]
+            )
+        else:
+            stmt = insert(table)
+        stmt = stmt.values(job_posting_date=job_posting_date_of(bindparam("job_pk")))
+
+        ids = list(self.db.scalars(stmt.returning(table.c.id), rows))
+
+        if commit:
+            self.db.commit()
+
+        return ids
+
+    def update_job_tags(
+        self, job_id: int, tag_ids: List[int], commit: bool = True
+    ) -> JobTagDiff:
+        """
+        Update job-tag relationships to exactly the given tags.
+        Only the difference is written; see update_tags_for_jobs.
+        """
+        return self.update_tags_for_jobs({job_id: tag_ids}, commit=commit)[0]
+
+    def update_tags_for_jobs(
+        self, tag_ids_by_job: Dict[int, Iterable[int]], commit: bool = True
+    ) -> List[JobTagDiff]:
+        """
+        Set the tags of several jobs, writing only what changed.
+        Runs one SELECT for the current relationships, then at most one DELETE
+        and one INSERT, all in a single transaction. The non-empty diffs are
+        published as JOB_TAGS_CHANGED once the transaction commits.
+        Returns one diff per job, in input order.
+        """
+        wanted = {job_id: set(tag_ids) for job_id, tag_ids in tag_ids_by_job.items()}
+        if not wanted:
+            return []
+
+        existing = {job_id: set() for job_id in wanted}
+        stmt = select(JobTag.job_id, JobTag.tag_id).where(
+            JobTag.job_id.in_(list(wanted))
+        )
+        for job_id, tag_id in self.db.execute(stmt):
+            existing[job_id].add(tag_id)
+
+        diffs = [
+            JobTagDiff(
+                job_id=job_id,
+                added=frozenset(tag_ids - existing[job_id]),
+                removed=frozenset(existing[job_id] - tag_ids),
+            )
+            for job_id, tag_ids in wanted.items()
+        ]
+
+        removed = [(d.job_id, tag_id) for d in diffs for tag_id in d.removed]
+        if removed:
+            self.db.execute(
+                delete(JobTag).where(tuple_(JobTag.job_id, JobTag.tag_id).in_(removed)),
+                execution_options={"synchronize_session": False},
+            )
+
+        added = [(d.job_id, tag_id) for d in diffs for tag_id in d.added]
+        if added:
+            self.insert_relations(added, commit=False)
+
+        changed = [diff for diff in diffs if diff]
+        if changed:
+            publish_after_commit(self.db, JOB_TAGS_CHANGED, changed)
+
+        if commit:
+            self.db.commit()
+
+        return diffs
 
     def exists(self, job_id: int, tag_id: int) -> bool:
         """Check if a specific job-tag relationship exists."""
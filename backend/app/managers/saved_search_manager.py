@@ -0,0 +1,138 @@
+"""
+Saved Search Manager - Database access layer for saved searches and matches
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.db import conflict_insert
+from app.core.metrics import instrumented
+from app.models.saved_search import SavedSearch
+from app.models.saved_search_match import SavedSearchMatch
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.orm import Session
+
+
+@instrumented("manager")
+class SavedSearchManager:
+    """
+    Handles all database operations for SavedSearch entities and the jobs
+    each has matched.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, fields: Dict) -> SavedSearch:
+        """Create a saved search from its name and filters."""
+        saved_search = SavedSearch(**fields)
+        self.db.add(saved_search)
+        self.db.commit()
+        self.db.refresh(saved_search)
+        return saved_search
+
+    def find_by_id(self, saved_search_id: int) -> Optional[SavedSearch]:
+        """Find a saved search by its id."""
+        return self.db.get(SavedSearch, saved_search_id)
+
+    def find_all(self, after_id: int = 0) -> List[SavedSearch]:
+        """Every saved search with an id above after_id, ordered by id."""
+        return list(
+            self.db.scalars(
+                select(SavedSearch)
+                .where(SavedSearch.id > after_id)
+                .order_by(SavedSearch.id)
+            )
+        )
+
+    def version(self) -> Tuple[int, int]:
+        """
+        (count, highest id) of the saved searches. Searches are only created
+        and deleted, so this changes whenever the set of searches does.
+        """
+        count, max_id = self.db.execute(
+            select(func.count(SavedSearch.id), func.max(SavedSearch.id))
+        ).one()
+        return count, max_id or 0
+
+    def delete(self, saved_search_id: int) -> bool:
+        """Delete a saved search and its matches."""
+        self.db.execute(
+            delete(SavedSearchMatch).where(
+                SavedSearchMatch.saved_search_id == saved_search_id
+            )
+        )
+        deleted = self.db.execute(
+            delete(SavedSearch).where(SavedSearch.id == saved_search_id)
+        ).rowcount
+        self.db.commit()
+        return deleted > 0
+
+    def add_matches(
+        self, matches: Iterable[Tuple[int, int]], commit: bool = True
+    ) -> int:
+        """
+        Record (saved search id, job primary key) matches, skipping pairs
+        already recorded. Returns how many were new.
+        """
+        wanted = set(matches)
+        if not wanted:
+            return 0
+        now = datetime.utcnow()
+        rows = [
+            {"saved_search_id": search_id, "job_id": job_id, "matched_at": now}
+            for search_id, job_id in sorted(wanted)
+        ]
+
+        insert = conflict_insert(self.db, SavedSearchMatch)
+        if insert is not None:
+            added = self.db.execute(
+                insert.values(rows)
+                .on_conflict_do_nothing(index_elements=["saved_search_id", "job_id"])
+                .returning(SavedSearchMatch.id)
+            ).all()
+        else:
+            # Fallback for dialects without ON CONFLICT
+            existing = set(
+                self.db.execute(
+                    select(
+                        SavedSearchMatch.saved_search_id, SavedSearchMatch.job_id
+                    ).where(
+                        tuple_(
+                            SavedSearchMatch.saved_search_id, SavedSearchMatch.job_id
+                        ).in_(list(wanted))
+                    )
+                ).all()
+            )
+            added = [
+                row
+                for row in rows
+                if (row["saved_search_id"], row["job_id"]) not in existing
+            ]
+            self.db.add_all(SavedSearchMatch(**row) for row in added)
+
+        if commit:
+            self.db.commit()
+        return len(added)
+
+    def find_matches(
+        self, saved_search_id: int, limit: int = 10, offset: int = 0
+    ) -> List[int]:
+        """Primary keys of a page of the jobs a search matched, newest first."""
+        return list(
+            self.db.scalars(
+                select(SavedSearchMatch.job_id)
+                .where(SavedSearchMatch.saved_search_id == saved_search_id)
+                .order_by(SavedSearchMatch.id.desc())
+                .limit(limit)
+                .offset(offset)
+            )
+        )
+
+    def count_matches(self, saved_search_id: int) -> int:
+        """Count the jobs a search has matched."""
+        return self.db.scalar(
+            select(func.count(SavedSearchMatch.id)).where(
+                SavedSearchMatch.saved_search_id == saved_search_id
+            )
+        )
@@ -2,12 +2,16 @@
 Tag Manager - Database access layer for Tag operations
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from app.core.db import conflict_insert
+from app.core.metrics import instrumented
 from app.models.tag import Tag, TagCategory
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
 
+@instrumented("manager")
 class TagManager:
     """
     Handles all database operations for Tag entities.
@@ -25,6 +29,20 @@ class TagManager:
         """Find a tag by its name."""
         return self.db.query(Tag).filter(Tag.name == name).first()
 
+    def find_by_name_and_category(
+        self, name: str, category: TagCategory
+    ) -> Optional[Tag]:
+        """Find a tag by its unique name and category combination."""
+        return (
+            self.db.query(Tag)
+            .filter(Tag.name == name, Tag.category == category)
+            .first()
+        )
+
+    def find_all(self) -> List[Tag]:
+        """Get every tag, ordered by id."""
+        return self.db.query(Tag).order_by(Tag.id).all()
+
     def find_all_categories(self) -> List[TagCategory]:
         """Get all available tag categories."""
         return [category for category in TagCategory]
@@ -61,13 +79,85 @@ class TagManager:
 
         return tags_by_job
 
+    def get_tag_names_for_jobs(
+        self, job_ids: List[int]
+    ) -> Dict[int, Dict[str, List[str]]]:
+        """
+        Get tag names for multiple jobs, grouped by job ID and category.
+        Reads plain columns, so no Tag objects are loaded into the session.
+        """
+        from app.models.job_tag import JobTag
+
+        results = self.db.execute(
+            select(JobTag.job_id, Tag.category, Tag.name)
+            .join(Tag, JobTag.tag_id == Tag.id)
+            .where(JobTag.job_id.in_(job_ids))
+        )
+
+        tags_by_job = {}
+        for job_id, category, name in results:
+            tags_by_job.setdefault(job_id, {}).setdefault(category.value, []).append(
+                name
+            )
+
+        return tags_by_job
+
     def find_by_names(self, names: List[str]) -> List[Tag]:
         """Find tags by their names."""
         return self.db.query(Tag).filter(Tag.name.in_(names)).all()
 
     def get_or_create(self, name: str, category: TagCategory) -> Tag:
         """Get an existing tag or create a new one if it doesn't exist."""
-        tag = self.find_by_name(name)
+        tag = self.find_by_name_and_category(name, category)
         if tag:
             return tag
         return self.create(name, category)
+
+    def bulk_get_or_create(
+        self, pairs: Iterable[Tuple[str, TagCategory]], commit: bool = True
+    ) -> Dict[Tuple[str, TagCategory], int]:
+        """
+        Get or create many tags at once, keyed by (name, category).
+        Issues one INSERT ... ON CONFLICT DO NOTHING RETURNING for new tags and
+        one lookup for the tags that already existed.
+        Returns a mapping of (name, category) to tag ID.
+        """
+        wanted = {(name, TagCategory(category)) for name, category in pairs}
+        if not wanted:
+            return {}
+
+        rows = [{"name": name, "category": category} for name, category in wanted]
+        tag_ids = {}
+
+        insert = conflict_insert(self.db, Tag)
+        if insert is not None:
+            stmt = (
+                insert.values(rows)
+                .on_conflict_do_nothing(index_elements=["name", "category"])
+                .returning(Tag.id, Tag.name, Tag.category)
+            )
+            for tag_id, name, category in self.db.execute(stmt):
+                tag_ids[(name, category)] = tag_id
+
+        # Tags that already existed (or every tag, without ON CONFLICT support)
+        missing = wanted - tag_ids.keys()
+        if missing:
+            stmt = select(Tag.id, Tag.name, Tag.category).where(
+                tuple_(Tag.name, Tag.category).in_(list(missing))
+            )
+            for tag_id, name, category in self.db.execute(stmt):
+                tag_ids[(name, category)] = tag_id
+
+        # Fallback for dialects without ON CONFLICT: plain insert of the rest
+        missing = wanted - tag_ids.keys()
+        if missing:
+            tags = [Tag(name=name, category=category) for name, category in missing]
+            self.db.add_all(tags)
+            self.db.flush()
+            for tag in tags:
+                tag_ids[(tag.name, tag.category)] = tag.id
+
+        if commit:
+            self.db.commit()
+
+        return tag_ids
@@ -3,7 +3,20 @@
 # Import models in the correct order to avoid circular dependencies
 from app.models.job import Job
 from app.models.job_tag import JobTag
+from app.models.archived_job import ArchivedJob
+from app.models.archived_job_tag import ArchivedJobTag
 from app.models.tag import Tag, TagCategory
+from app.models.saved_search import SavedSearch
+from app.models.saved_search_match import SavedSearchMatch
 
 # Export all models
-__all__ = ["Job", "Tag", "TagCategory", "JobTag"]
+__all__ = [
+    "Job",
+    "Tag",
+    "TagCategory",
+    "JobTag",
+    "ArchivedJob",
+    "ArchivedJobTag",
+    "SavedSearch",
+    "SavedSearchMatch",
+]
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from app.core.db import Base, code_point_order
+from app.core.strings import InternedString
+from sqlalchemy import JSON, Column, Date, DateTime, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+
+class ArchivedJob(Base):
+    """
+    A job moved out of the jobs table once its posting aged past the
+    archive cutoff. Keeps the job's columns, including its primary key, so
+    hot and archived jobs share one id sequence.
+    """
+
+    __tablename__ = "jobs_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    job_id = Column(String(50), unique=True, index=True, nullable=False)
+    job_position = Column(InternedString("positions", 255), nullable=False)
+    job_link = Column(String(512), nullable=False)
+    company_name = Column(InternedString("companies", 255), nullable=False)
+    company_profile = Column(String(512))
+    job_location = Column(InternedString("locations", 255))
+    job_posting_date = Column(Date, nullable=False)
+    tags = Column(JSON)
+    content_hash = Column(String(64))
+    created_at = Column(Date)
+    updated_at = Column(Date)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Named like Job.tag_relations, so either can be formatted the same way
+    tag_relations = relationship("ArchivedJobTag", back_populates="job")
+
+    __table_args__ = (
+        Index("ix_jobs_archive_posting_date_id", job_posting_date.desc(), id),
+        Index("ix_jobs_archive_company_name_id", code_point_order(company_name), id),
+    )
@@ -0,0 +1,40 @@
+from app.core.db import Base
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+
+
+class ArchivedJobTag(Base):
+    """
+    A job_tags row moved to the archive along with its job.
+    """
+
+    __tablename__ = "job_tags_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    job_id = Column(Integer, ForeignKey("jobs_archive.id"), nullable=False)
+    tag_id = Column(Integer, ForeignKey("tags.id"), nullable=False)
+    job_posting_date = Column(Date, nullable=False)
+    created_at = Column(DateTime)
+
+    job = relationship("ArchivedJob", back_populates="tag_relations")
+    # Tags are shared with the hot tier; Tag.job_relations lists hot jobs only
+    tag = relationship("Tag")
+
+    __table_args__ = (
+        UniqueConstraint("job_id", "tag_id", name="unique_archived_job_tag"),
+        # Tag filters over archived jobs
+        Index(
+            "ix_job_tags_archive_tag_id_job_id",
+            "tag_id",
+            "job_id",
+            "job_posting_date",
+        ),
+    )
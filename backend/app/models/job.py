@@ -1,24 +1,100 @@
-from datetime import datetime
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Dict, List, Optional, Union
 
-from app.core.db import Base
-from sqlalchemy import JSON, Column, Date, Integer, String
+from app.core.db import Base, code_point_order
+from app.core.strings import InternedString
+from sqlalchemy import DDL, JSON, Column, Date, Index, Integer, String, event
 from sqlalchemy.orm import relationship
 
 
+def compute_content_hash(
+    job_position: str,
+    company_name: str,
+    job_location: Optional[str],
+    job_posting_date: Union[date, str],
+    tags: Optional[Dict[str, List[str]]],
+) -> str:
+    """
+    Stable SHA-256 over the fields that define a posting's content.
+    Tags are hashed as sorted "category:name" pairs, so ordering in the
+    source feed does not matter.
+    """
+    if isinstance(job_posting_date, date):
+        job_posting_date = job_posting_date.isoformat()
+
+    tag_pairs = sorted(
+        f"{getattr(category, 'value', category)}:{name}"
+        for category, names in (tags or {}).items()
+        for name in names
+    )
+    payload = json.dumps(
+        [job_position, company_name, job_location, job_posting_date, tag_pairs],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Columns searched with ILIKE '%text%'
+TRIGRAM_COLUMNS = ("job_position", "company_name", "job_location")
+
+
 class Job(Base):
     __tablename__ = "jobs"
 
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(String(50), unique=True, index=True, nullable=False)
-    job_position = Column(String(255), nullable=False)
+    job_position = Column(InternedString("positions", 255), nullable=False)
     job_link = Column(String(512), nullable=False)
-    company_name = Column(String(255), nullable=False)
+    company_name = Column(InternedString("companies", 255), nullable=False)
     company_profile = Column(String(512))
-    job_location = Column(String(255))
+    job_location = Column(InternedString("locations", 255))
     job_posting_date = Column(Date, nullable=False)
     tags = Column(JSON)  # Store tags as JSON for flexibility
+    content_hash = Column(String(64))  # See compute_content_hash
     created_at = Column(Date, default=datetime.utcnow)
     updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Use string for model name to avoid circular imports
     tag_relations = relationship("JobTag", back_populates="job")
+
+    __table_args__ = (
+        # Date range filters and newest-first listings
+        Index("ix_jobs_posting_date_id", job_posting_date.desc(), id),
+        # Searches sorted by company
+        Index("ix_jobs_company_name_id", code_point_order(company_name), id),
+        # Trigram indexes serve the '%text%' ILIKE filters (PostgreSQL only)
+        *(
+            Index(
+                f"ix_jobs_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in TRIGRAM_COLUMNS
+        ),
+        # Archived jobs keep their ids, so SQLite must not hand them out again
+        {"sqlite_autoincrement": True},
+    )
+
+
+# The trigram indexes need the pg_trgm extension
+event.listen(
+    Job.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+@event.listens_for(Job, "before_insert")
+@event.listens_for(Job, "before_update")
+def _set_content_hash(mapper, connection, job: Job) -> None:
+    job.content_hash = compute_content_hash(
+        job.job_position,
+        job.company_name,
+        job.job_location,
+        job.job_posting_date,
+        job.tags,
+    )
@@ -1,7 +1,18 @@
 from datetime import datetime
 
 from app.core.db import Base
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, UniqueConstraint
+from app.models.job import Job
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    event,
+    select,
+)
 from sqlalchemy.orm import relationship
 
 
@@ -11,14 +22,34 @@ class JobTag(Base):
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id"))
     tag_id = Column(Integer, ForeignKey("tags.id"))
+    # Copy of the job's posting date: the partition key on PostgreSQL, and
+    # what lets tag filters skip postings outside a date range
+    job_posting_date = Column(Date, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Define relationships with explicit foreign_keys to avoid ambiguity
     job = relationship("Job", foreign_keys=[job_id], back_populates="tag_relations")
     tag = relationship("Tag", foreign_keys=[tag_id], back_populates="job_relations")
 
-    # Composite unique constraint to prevent duplicate job-tag relationships
+    # Composite unique constraint to prevent duplicate job-tag relationships;
+    # job_posting_date follows from job_id, but a unique index on a
+    # partitioned table must include the partition key. Its index also
+    # serves lookups by job_id
     __table_args__ = (
-        UniqueConstraint("job_id", "tag_id", name="unique_job_tag"),
+        UniqueConstraint("job_id", "tag_id", "job_posting_date", name="unique_job_tag"),
+        # Tag filters: tag_id -> job_ids without touching the table
+        Index("ix_job_tags_tag_id_job_id", "tag_id", "job_id", "job_posting_date"),
         {"sqlite_autoincrement": True},
     )
+
+
+def job_posting_date_of(job_id) -> object:
+    """SQL expression for the posting date of a job, by primary key."""
+    return select(Job.job_posting_date).where(Job.id == job_id).scalar_subquery()
+
+
+@event.listens_for(JobTag, "before_insert")
+def _set_job_posting_date(mapper, connection, job_tag: JobTag) -> None:
+    # Read from the jobs table as part of the INSERT itself
+    if job_tag.job_posting_date is None:
+        job_tag.job_posting_date = job_posting_date_of(job_tag.job_id)
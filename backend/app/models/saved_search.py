@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from app.core.db import Base
+from sqlalchemy import JSON, Column, Date, DateTime, Integer, String
+from sqlalchemy.orm import relationship
+
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    # The search filters, as JobSearchFilter takes them
+    query = Column(String(255))
+    location = Column(String(255))
+    tags = Column(JSON)
+    tag_categories = Column(JSON)
+    tag_expr = Column(String(1000))
+    date_from = Column(Date)
+    date_to = Column(Date)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    matches = relationship(
+        "SavedSearchMatch",
+        back_populates="saved_search",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
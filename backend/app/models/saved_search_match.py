@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from app.core.db import Base
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+
+
+class SavedSearchMatch(Base):
+    __tablename__ = "saved_search_matches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    saved_search_id = Column(
+        Integer, ForeignKey("saved_searches.id", ondelete="CASCADE"), nullable=False
+    )
+    # Primary key of the matched job. Not a foreign key: jobs move to the
+    # archive tier, keeping their ids, and job partitions are detached
+    job_id = Column(Integer, nullable=False)
+    matched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    saved_search = relationship("SavedSearch", back_populates="matches")
+
+    __table_args__ = (
+        # A job matches a search once, however often it is percolated
+        UniqueConstraint("saved_search_id", "job_id", name="unique_saved_search_job"),
+        # A search's matches, newest first
+        Index("ix_saved_search_matches_search_id_id", "saved_search_id", "id"),
+    )
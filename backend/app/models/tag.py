@@ -1,7 +1,7 @@
 import enum
 
 from app.core.db import Base
-from sqlalchemy import Column, Enum, Integer, String, UniqueConstraint
+from sqlalchemy import Column, Enum, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 
@@ -27,4 +27,6 @@ class Tag(Base):
     # Unique constraint on name and category combination
     __table_args__ = (
         UniqueConstraint("name", "category", name="unique_name_category"),
+        # Category filters: category -> tag ids without touching the table
+        Index("ix_tags_category_id", "category", "id"),
     )
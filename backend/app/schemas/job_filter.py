@@ -14,3 +14,7 @@ class JobSearchFilter(BaseModel):
     page: int = 1
     limit: int = 10
     match_all_tags: bool = False  # Default to OR logic (match any tag)
+    include_archived: bool = False  # Default to the hot tier only
+    # Boolean tag query, e.g. "Python AND (AWS OR GCP) AND NOT PHP"
+    tag_expr: Optional[str] = None
+    sort: Optional[str] = None  # newest, oldest, company or relevance; id order
@@ -0,0 +1,16 @@
+from datetime import date
+from typing import Dict, List, Optional
+
+from app.models.tag import TagCategory
+from pydantic import BaseModel, Field
+
+
+class JobIngestRecord(BaseModel):
+    job_id: str = Field(min_length=1, max_length=50)
+    job_position: str = Field(min_length=1, max_length=255)
+    job_link: str = Field(min_length=1, max_length=512)
+    company_name: str = Field(min_length=1, max_length=255)
+    company_profile: Optional[str] = Field(default=None, max_length=512)
+    job_location: Optional[str] = Field(default=None, max_length=255)
+    job_posting_date: date
+    tags: Dict[TagCategory, List[str]] = {}  # Tag names grouped by category
@@ -0,0 +1,16 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SavedSearchCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+    # The filters of JobSearchFilter that select jobs
+    query: Optional[str] = Field(default=None, max_length=255)
+    location: Optional[str] = Field(default=None, max_length=255)
+    tags: Optional[List[str]] = None
+    tag_categories: Optional[List[str]] = None
+    tag_expr: Optional[str] = Field(default=None, max_length=1000)
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
@@ -0,0 +1,97 @@
+"""
+Archive Service - Business logic for moving expired jobs to the archive tier
+"""
+
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import instrumented
+from app.managers.job_manager import JobManager
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+@instrumented(
+    "service", result_sizes={"archive_expired": lambda result: result["archived"]}
+)
+class ArchiveService:
+    """
+    Handles moving jobs past the archive age out of the hot tier.
+    Jobs move in batches of one transaction each, so locks stay short and
+    an interrupted run loses at most the batch in flight.
+    Uses JobManager for all database interactions.
+    """
+
+    def __init__(self, job_manager: JobManager):
+        self.job_manager = job_manager
+
+    def archive_expired(
+        self,
+        max_age_days: int = settings.ARCHIVE_AFTER_DAYS,
+        batch_size: int = settings.ARCHIVE_BATCH_SIZE,
+        today: Optional[date] = None,
+    ) -> Dict:
+        """
+        Archive every job posted more than max_age_days ago.
+        Returns the cutoff date and the number of jobs and batches moved.
+        """
+        cutoff = (today or date.today()) - timedelta(days=max_age_days)
+        archived = batches = 0
+        while True:
+            pks = self.job_manager.archive_before(cutoff, batch_size)
+            archived += len(pks)
+            batches += bool(pks)
+            # A short batch means nothing else is due, or only locked jobs
+            # are, which the next run picks up
+            if len(pks) < batch_size:
+                break
+
+        if archived:
+            logger.info("Archived %d jobs posted before %s", archived, cutoff)
+        return {"cutoff": cutoff, "archived": archived, "batches": batches}
+
+
+class ArchiveWorker:
+    """
+    Runs ArchiveService.archive_expired on a daemon thread, with a session
+    of its own, once at start and then every interval_seconds, until
+    stopped.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], interval_seconds: float):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the archiving thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="job-archiver", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the archiving thread and wait for it to finish."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            db = self.session_factory()
+            try:
+                ArchiveService(JobManager(db)).archive_expired()
+            except Exception:
+                logger.exception("Job archiving failed")
+            finally:
+                db.close()
+            if self._stop.wait(self.interval_seconds):
+                return
@@ -0,0 +1,99 @@
+"""
+Export Service - Business logic for streaming search results as files
+"""
+
+import csv
+import io
+import json
+from typing import Dict, Iterator, List
+
+from app.managers.job_manager import JobManager
+from app.managers.tag_manager import TagManager
+from app.models.tag import TagCategory
+from app.schemas.job_filter import JobSearchFilter
+
+EXPORT_FIELDS = (
+    "job_id",
+    "job_position",
+    "job_link",
+    "company_name",
+    "job_location",
+    "job_posting_date",
+)
+
+# Media type and file extension for each export format
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+class ExportService:
+    """
+    Handles business logic for exporting every job that matches a filter.
+    Jobs are read in batches and serialized one batch at a time, so memory
+    use does not depend on the size of the export.
+    Uses managers for all database interactions.
+    """
+
+    def __init__(self, job_manager: JobManager, tag_manager: TagManager):
+        self.job_manager = job_manager
+        self.tag_manager = tag_manager
+
+    def export_jobs(
+        self, params: JobSearchFilter, format: str, batch_size: int
+    ) -> Iterator[str]:
+        """
+        Stream matching jobs as NDJSON lines or CSV rows.
+        Yields one string per batch of jobs.
+        """
+        serialize = self._to_csv if format == "csv" else self._to_ndjson
+        if format == "csv":
+            yield self._csv_lines([self._csv_header()])
+
+        # Dependencies are torn down before a streamed body is sent, so the
+        # session is reopened by the first query and closed here when done
+        try:
+            for batch in self.job_manager.iter_by_filters(
+                query=params.query,
+                location=params.location,
+                tags=params.tags,
+                tag_categories=params.tag_categories,
+                date_from=params.date_from,
+                date_to=params.date_to,
+                batch_size=batch_size,
+            ):
+                tags_by_job = self.tag_manager.get_tag_names_for_jobs(
+                    [row.id for row in batch]
+                )
+                yield serialize(batch, tags_by_job)
+        finally:
+            self.job_manager.db.close()
+
+    def _to_ndjson(self, batch, tags_by_job: Dict[int, Dict[str, List[str]]]) -> str:
+        lines = []
+        for row in batch:
+            job = {field: getattr(row, field) for field in EXPORT_FIELDS}
+            job["job_posting_date"] = row.job_posting_date.isoformat()
+            job["tags"] = tags_by_job.get(row.id, {})
+            lines.append(json.dumps(job, ensure_ascii=False))
+        return "\n".join(lines) + "\n"
+
+    def _to_csv(self, batch, tags_by_job: Dict[int, Dict[str, List[str]]]) -> str:
+        rows = []
+        for row in batch:
+            tags = tags_by_job.get(row.id, {})
+            rows.append(
+                [getattr(row, field) for field in EXPORT_FIELDS]
+                + ["; ".join(tags.get(category.value, [])) for category in TagCategory]
+            )
+        return self._csv_lines(rows)
+
+    def _csv_header(self) -> List[str]:
+        """CSV columns: job fields, then one column of tags per category."""
+        return list(EXPORT_FIELDS) + [category.value for category in TagCategory]
+
+    def _csv_lines(self, rows: List[List]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
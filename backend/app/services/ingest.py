@@ -0,0 +1,344 @@
+"""
+Ingest Service - Business logic for bulk job upserts from partner feeds
+"""
+
+import codecs
+import json
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from app.core.metrics import instrumented
+from app.managers.job_manager import JOB_UNCHANGED, JobManager
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.tag_manager import TagManager
+from app.models.tag import TagCategory
+from app.schemas.job_ingest import JobIngestRecord
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+# (index in the feed, parsed record or None, parse error or None)
+RawRecord = Tuple[int, Optional[Dict], Optional[str]]
+
+
+def _parse_record(text: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """Parse one JSON record, returning (record, None) or (None, error)."""
+    try:
+        value = json.loads(text)
+    except ValueError as e:
+        return None, f"Malformed JSON: {e}"
+    if not isinstance(value, dict):
+        return None, "Record must be a JSON object"
+    return value, None
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[RawRecord]:
+    """Parse newline-delimited JSON from a byte stream, one record per line."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    index = 0
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                yield (index, *_parse_record(line))
+                index += 1
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        yield (index, *_parse_record(buffer))
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[RawRecord]:
+    """
+    Parse a JSON array of records from a byte stream incrementally.
+    Elements are yielded as soon as they are complete, so the whole body is
+    never held in memory. A syntax error ends the stream with an error record.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stream = chunks.__aiter__()
+    buffer = ""
+    position = 0
+    index = 0
+    exhausted = False
+
+    async def fill():
+        nonlocal buffer, position, exhausted
+        try:
+            text = text_decoder.decode(await stream.__anext__())
+        except StopAsyncIteration:
+            exhausted = True
+            text = text_decoder.decode(b"", final=True)
+        buffer = buffer[position:] + text
+        position = 0
+
+    def skip(characters: str):
+        nonlocal position
+        while position < len(buffer) and buffer[position] in characters:
+            position += 1
+
+    # Opening bracket
+    skip(" \t\r\n")
+    while position >= len(buffer) and not exhausted:
+        await fill()
+        skip(" \t\r\n")
+    if position >= len(buffer) or buffer[position] != "[":
+        yield index, None, "Request body must be a JSON array"
+        return
+    position += 1
+
+    # The last token read: the opening bracket, a comma or an element
+    last = "["
+    while True:
+        skip(" \t\r\n")
+        if position >= len(buffer):
+            if exhausted:
+                yield index, None, "Malformed JSON: unterminated array"
+                return
+            await fill()
+            continue
+
+        character = buffer[position]
+        if last == "element":
+            # Exactly one comma separates elements
+            if character == "]":
+                return
+            if character != ",":
+                yield index, None, "Malformed JSON: Expecting ',' delimiter"
+                return
+            position += 1
+            last = ","
+            continue
+        if character == "]" and last == "[":
+            return
+        if character in ",]":
+            yield index, None, "Malformed JSON: Expecting value"
+            return
+
+        try:
+            value, position_after = decoder.raw_decode(buffer, position)
+        except ValueError as e:
+            if exhausted:
+                yield index, None, f"Malformed JSON: {e}"
+                return
+            # Element not complete yet: read more and retry
+            await fill()
+            continue
+
+        position = position_after
+        last = "element"
+        if isinstance(value, dict):
+            yield index, value, None
+        else:
+            yield index, None, "Record must be a JSON object"
+        index += 1
+
+
+@instrumented(
+    "service",
+    result_sizes={
+        "ingest": lambda report: report["total"],
+        "ingest_stream": lambda report: report["total"],
+    },
+)
+class IngestService:
+    """
+    Handles business logic for bulk job upserts.
+    Records are validated one at a time and written in chunked transactions.
+    Uses managers for all database interactions.
+    """
+
+    def __init__(
+        self,
+        job_manager: JobManager,
+        tag_manager: TagManager,
+        job_tag_manager: JobTagManager,
+    ):
+        self.job_manager = job_manager
+        self.tag_manager = tag_manager
+        self.job_tag_manager = job_tag_manager
+
+    def ingest(self, records: Iterable[RawRecord], chunk_size: int) -> Dict:
+        """Ingest parsed records synchronously. Returns the ingest report."""
+        report = self._new_report()
+        chunk = {}
+        for index, raw, error in records:
+            record = self._accept(report, index, raw, error)
+            if record is None:
+                continue
+            if self._must_flush(chunk, record.job_id, chunk_size):
+                self._record(report, self.ingest_chunk(list(chunk.values())))
+                chunk = {}
+            chunk[record.job_id] = (index, record)
+
+        if chunk:
+            self._record(report, self.ingest_chunk(list(chunk.values())))
+        return self._finish(report)
+
+    async def ingest_stream(
+        self, records: AsyncIterator[RawRecord], chunk_size: int
+    ) -> Dict:
+        """
+        Ingest records from an async stream.
+        Each full chunk is written in the threadpool before more of the stream
+        is read, so memory stays bounded by the chunk size.
+        Returns the ingest report.
+        """
+        report = self._new_report()
+        chunk = {}
+        async for index, raw, error in records:
+            record = self._accept(report, index, raw, error)
+            if record is None:
+                continue
+            if self._must_flush(chunk, record.job_id, chunk_size):
+                self._record(
+                    report,
+                    await run_in_threadpool(self.ingest_chunk, list(chunk.values())),
+                )
+                chunk = {}
+            chunk[record.job_id] = (index, record)
+
+        if chunk:
+            self._record(
+                report, await run_in_threadpool(self.ingest_chunk, list(chunk.values()))
+            )
+        return self._finish(report)
+
+    def ingest_chunk(self, chunk: List[Tuple[int, JobIngestRecord]]) -> List[Dict]:
+        """
+        Upsert one chunk of validated records, with their tags, in a single
+        transaction. On a database error the whole chunk is rolled back and
+        every record in it is reported as failed.
+        """
+        # Managers share the request's session, so one commit covers all writes
+        db = self.job_manager.db
+        try:
+            statuses = self._write_chunk(chunk)
+            db.commit()
+            return statuses
+        except SQLAlchemyError as e:
+            db.rollback()
+            return [
+                self._status(
+                    index, record.job_id, "error", [str(getattr(e, "orig", None) or e)]
+                )
+                for index, record in chunk
+            ]
+
+    def _write_chunk(self, chunk: List[Tuple[int, JobIngestRecord]]) -> List[Dict]:
+        tag_pairs = {record.job_id: self._tag_pairs(record) for _, record in chunk}
+        upserted = self.job_manager.bulk_upsert(
+            [self._job_row(record, tag_pairs[record.job_id]) for _, record in chunk],
+            commit=False,
+        )
+
+        # Unchanged jobs already carry the same tags, so only the rest are synced
+        changed = {
+            job_id: pairs
+            for job_id, pairs in tag_pairs.items()
+            if upserted[job_id][1] != JOB_UNCHANGED
+        }
+        if changed:
+            tag_ids = self.tag_manager.bulk_get_or_create(
+                (pair for pairs in changed.values() for pair in pairs), commit=False
+            )
+            self.job_tag_manager.update_tags_for_jobs(
+                {
+                    upserted[job_id][0]: [tag_ids[pair] for pair in pairs]
+                    for job_id, pairs in changed.items()
+                },
+                commit=False,
+            )
+
+        return [
+            self._status(index, record.job_id, upserted[record.job_id][1])
+            for index, record in chunk
+        ]
+
+    def _accept(
+        self, report: Dict, index: int, raw: Optional[Dict], error: Optional[str]
+    ) -> Optional[JobIngestRecord]:
+        """Validate one raw record, reporting it as failed if invalid."""
+        job_id = raw.get("job_id") if isinstance(raw, dict) else None
+        if error is not None:
+            self._record(report, [self._status(index, job_id, "error", [error])])
+            return None
+        try:
+            return JobIngestRecord.model_validate(raw)
+        except ValidationError as e:
+            errors = [
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            ]
+            self._record(report, [self._status(index, job_id, "error", errors)])
+            return None
+
+    def _must_flush(
+        self, chunk: Dict[str, Tuple[int, JobIngestRecord]], job_id: str, size: int
+    ) -> bool:
+        """
+        A chunk is written when full, or before a repeated job_id so that a
+        later record for the same job is applied after the earlier one.
+        """
+        return len(chunk) >= size or job_id in chunk
+
+    def _tag_pairs(self, record: JobIngestRecord) -> List[Tuple[str, TagCategory]]:
+        pairs = []
+        for category, names in record.tags.items():
+            for name in names:
+                name = name.strip()
+                if name and (name, category) not in pairs:
+                    pairs.append((name, category))
+        return pairs
+
+    def _job_row(
+        self, record: JobIngestRecord, tag_pairs: List[Tuple[str, TagCategory]]
+    ) -> Dict:
+        tags = {}
+        for name, category in tag_pairs:
+            tags.setdefault(category.value, []).append(name)
+
+        return {
+            "job_id": record.job_id,
+            "job_position": record.job_position,
+            "job_link": record.job_link,
+            "company_name": record.company_name,
+            "company_profile": record.company_profile,
+            "job_location": record.job_location,
+            "job_posting_date": record.job_posting_date,
+            "tags": tags,
+        }
+
+    def _status(
+        self,
+        index: int,
+        job_id: Optional[str],
+        status: str,
+        errors: Optional[List[str]] = None,
+    ) -> Dict:
+        result = {"index": index, "job_id": job_id, "status": status}
+        if errors:
+            result["errors"] = errors
+        return result
+
+    def _new_report(self) -> Dict:
+        return {
+            "total": 0,
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "results": [],
+        }
+
+    def _record(self, report: Dict, statuses: List[Dict]):
+        for status in statuses:
+            report["total"] += 1
+            report["failed" if status["status"] == "error" else status["status"]] += 1
+            report["results"].append(status)
+
+    def _finish(self, report: Dict) -> Dict:
+        report["results"].sort(key=lambda status: status["index"])
+        return report
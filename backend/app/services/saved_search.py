@@ -0,0 +1,255 @@
+"""
+Saved Search Service - Business logic for saved searches and job alerts
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from app.core.events import JOB_TAGS_CHANGED, JOBS_CHANGED, subscribe, unsubscribe
+from app.core.metrics import instrumented
+from app.core.tag_expr import TagExprError, parse_tag_expr
+from app.indexes.percolator import PercolatedJob, Percolator, SearchCriteria
+from app.managers.job_manager import JobManager
+from app.managers.saved_search_manager import SavedSearchManager
+from app.models.saved_search import SavedSearch
+from app.schemas.saved_search import SavedSearchCreate
+from app.services.search import SearchService
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def criteria_of(saved_search: SavedSearch) -> SearchCriteria:
+    """The compiled filters of a saved search."""
+    return SearchCriteria.compile(
+        query=saved_search.query,
+        location=saved_search.location,
+        tags=saved_search.tags,
+        tag_categories=saved_search.tag_categories,
+        tag_expr=(
+            parse_tag_expr(saved_search.tag_expr) if saved_search.tag_expr else None
+        ),
+        date_from=saved_search.date_from,
+        date_to=saved_search.date_to,
+    )
+
+
+@instrumented(
+    "service",
+    result_sizes={"get_matches": lambda response: len(response["items"])},
+)
+class SavedSearchService:
+    """
+    Handles business logic for saved searches and the jobs they match.
+    Uses SavedSearchManager for storage and SearchService for job responses.
+    """
+
+    def __init__(
+        self, saved_search_manager: SavedSearchManager, search_service: SearchService
+    ):
+        self.saved_search_manager = saved_search_manager
+        self.search_service = search_service
+
+    def create_saved_search(self, params: SavedSearchCreate) -> Dict:
+        """
+        Save a search. New jobs it finds are recorded as its matches.
+        Raises HTTPException if its tag expression is malformed.
+        """
+        if params.tag_expr is not None:
+            try:
+                parse_tag_expr(params.tag_expr)
+            except TagExprError as e:
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid tag expression: {e}"
+                )
+        saved_search = self.saved_search_manager.create(params.model_dump())
+        return self._format_saved_search(saved_search)
+
+    def list_saved_searches(self) -> List[Dict]:
+        """Get every saved search, oldest first."""
+        return [
+            self._format_saved_search(saved_search)
+            for saved_search in self.saved_search_manager.find_all()
+        ]
+
+    def get_saved_search(self, saved_search_id: int) -> Dict:
+        """
+        Get a saved search by id.
+        Raises HTTPException if it does not exist.
+        """
+        return self._format_saved_search(self._find_or_404(saved_search_id))
+
+    def delete_saved_search(self, saved_search_id: int) -> None:
+        """
+        Delete a saved search and its matches.
+        Raises HTTPException if it does not exist.
+        """
+        if not self.saved_search_manager.delete(saved_search_id):
+            raise HTTPException(
+                status_code=404, detail=f"Saved search {saved_search_id} not found"
+            )
+
+    def get_matches(self, saved_search_id: int, page: int = 1, limit: int = 10) -> Dict:
+        """
+        Get a page of the jobs a saved search has matched, most recent match
+        first. Matched jobs since archived or deleted are left out.
+        Raises HTTPException if the search does not exist.
+        """
+        self._find_or_404(saved_search_id)
+        total = self.saved_search_manager.count_matches(saved_search_id)
+        pks = self.saved_search_manager.find_matches(
+            saved_search_id, limit=limit, offset=(page - 1) * limit
+        )
+        return {
+            "items": self.search_service.get_jobs_by_pks(pks),
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pages": (total + limit - 1) // limit,
+        }
+
+    def _find_or_404(self, saved_search_id: int) -> SavedSearch:
+        saved_search = self.saved_search_manager.find_by_id(saved_search_id)
+        if not saved_search:
+            raise HTTPException(
+                status_code=404, detail=f"Saved search {saved_search_id} not found"
+            )
+        return saved_search
+
+    def _format_saved_search(self, saved_search: SavedSearch) -> Dict:
+        """Format a saved search for API response."""
+        return {
+            "id": saved_search.id,
+            "name": saved_search.name,
+            **{
+                name: getattr(saved_search, name)
+                for name in SavedSearchCreate.model_fields
+                if name != "name"
+            },
+            "created_at": saved_search.created_at,
+        }
+
+
+class PercolatorWorker:
+    """
+    Matches jobs created, or given new tags, in this process against every
+    saved search, and records the matches. Writes queue the jobs' primary
+    keys through domain events; a daemon thread with a session of its own
+    percolates them every interval_seconds, after bringing its Percolator
+    up to date with the saved searches table. Each job is percolated by
+    the worker process that wrote it.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: float,
+        percolator: Optional[Percolator] = None,
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.percolator = percolator or Percolator()
+        # (count, highest id) of the saved searches the percolator holds
+        self._version = (0, 0)
+        self._pending: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def install(self):
+        """Queue the jobs named by job and job tag changes."""
+        subscribe(JOBS_CHANGED, self._on_jobs_changed)
+        subscribe(JOB_TAGS_CHANGED, self._on_job_tags_changed)
+
+    def uninstall(self):
+        """Stop queueing changed jobs."""
+        unsubscribe(JOBS_CHANGED, self._on_jobs_changed)
+        unsubscribe(JOB_TAGS_CHANGED, self._on_job_tags_changed)
+
+    def start(self):
+        """Follow changes and start the percolating thread."""
+        if self._thread is None:
+            self.install()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="saved-search-percolator", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the percolating thread, after a last pass, and wait for it."""
+        if self._thread is not None:
+            self.uninstall()
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def queue(self, job_pks: Iterable[int]):
+        """Queue jobs to be percolated."""
+        with self._lock:
+            self._pending.update(job_pks)
+
+    def percolate_pending(self) -> int:
+        """Percolate the queued jobs. Returns the number of new matches."""
+        with self._lock:
+            pks, self._pending = self._pending, set()
+        if not pks:
+            return 0
+        try:
+            added = self._percolate(pks)
+        except Exception:
+            # Matches are recorded idempotently, so the next pass retries
+            self.queue(pks)
+            raise
+        if added:
+            logger.info("Recorded %d saved search matches for %d jobs", added, len(pks))
+        return added
+
+    def _percolate(self, pks: Set[int]) -> int:
+        db = self.session_factory()
+        try:
+            saved_search_manager = SavedSearchManager(db)
+            self._sync(saved_search_manager)
+            matches = [
+                (search_id, job.id)
+                for job in JobManager(db).find_by_pks(sorted(pks))
+                for search_id in self.percolator.match(PercolatedJob.from_job(job))
+            ]
+            return saved_search_manager.add_matches(matches)
+        finally:
+            db.close()
+
+    def _sync(self, saved_search_manager: SavedSearchManager):
+        """Bring the percolator up to date with the saved searches table."""
+        version = saved_search_manager.version()
+        if version == self._version:
+            return
+        count, _ = self._version
+        # Searches are only created and deleted: if the new ones account for
+        # the change in count, none were deleted
+        created = saved_search_manager.find_all(after_id=self._version[1])
+        if count + len(created) != version[0]:
+            self.percolator = Percolator()
+            created = saved_search_manager.find_all()
+        for saved_search in created:
+            self.percolator.add(saved_search.id, criteria_of(saved_search))
+        self._version = version
+
+    def _on_jobs_changed(self, changes):
+        self.queue(changes.created)
+
+    def _on_job_tags_changed(self, diffs):
+        # JobManager.create tags a job after creating it
+        self.queue(diff.job_id for diff in diffs if diff.added)
+
+    def _run(self):
+        while True:
+            stopping = self._stop.wait(self.interval_seconds)
+            try:
+                self.percolate_pending()
+            except Exception:
+                logger.exception("Saved search percolation failed")
+            if stopping:
+                return
@@ -2,16 +2,34 @@
 Search Service - Business logic for job search operations
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
+from app.core.metrics import instrumented
+from app.core.tag_expr import TagExpr, TagExprError, parse_tag_expr
+from app.core.tracing import current_span
+from app.indexes.columns import ColumnStore
+from app.indexes.similar import SimilarJobIndex, jaccard, job_features
 from app.managers.job_manager import JobManager
 from app.managers.job_tag_manager import JobTagManager
 from app.managers.tag_manager import TagManager
+from app.models.archived_job import ArchivedJob
 from app.models.job import Job
 from app.schemas.job_filter import JobSearchFilter
 from fastapi import HTTPException
 
+# Jobs sharing the most tags that are scored while the similar job index loads
+SIMILAR_SQL_CANDIDATES = 1000
 
+
+@instrumented(
+    "service",
+    result_sizes={
+        "search_jobs": lambda response: len(response["items"]),
+        "get_job_by_id": None,
+        "get_similar_jobs": lambda response: len(response["items"]),
+    },
+)
 class SearchService:
     """
     Handles business logic for job search operations.
@@ -23,19 +41,96 @@ class SearchService:
         job_manager: JobManager,
         tag_manager: TagManager,
         job_tag_manager: JobTagManager,
+        column_store: Optional[ColumnStore] = None,
+        similar_index: Optional[SimilarJobIndex] = None,
     ):
         self.job_manager = job_manager
         self.tag_manager = tag_manager
         self.job_tag_manager = job_tag_manager
+        self.column_store = column_store
+        self.similar_index = similar_index
 
     def search_jobs(self, params: JobSearchFilter) -> Dict:
         """
         Search for jobs based on provided filters.
         Returns paginated results with metadata.
         """
+        span = current_span()
+        if span is not None:
+            span.set_attribute("search.filters", self._filter_shape(params))
+            span.set_attribute("search.page", params.page)
+            span.set_attribute("search.include_archived", params.include_archived)
+            span.set_attribute("search.sort", params.sort or "id")
+
+        tag_expr = self._parse_tag_expr(params.tag_expr)
+
         # Calculate offset for pagination
         offset = (params.page - 1) * params.limit
 
+        if self._use_column_store(params):
+            # Filter in memory; SQL only loads the page
+            total, pks = self.column_store.search(
+                query=params.query,
+                location=params.location,
+                tag_categories=params.tag_categories,
+                date_from=params.date_from,
+                date_to=params.date_to,
+                limit=params.limit,
+                offset=offset,
+                sort=params.sort,
+                tags=params.tags,
+                tag_expr=tag_expr,
+            )
+            jobs = self.job_manager.find_by_pks(pks)
+            path = "columns"
+        else:
+            total, jobs = self._search_sql(params, tag_expr, offset)
+            path = "sql"
+
+        if span is not None:
+            span.set_attribute("search.total", total)
+            span.set_attribute("search.path", path)
+
+        # Enrich jobs with tags and format response
+        formatted_jobs = self._build_job_responses(jobs)
+
+        return {
+            "items": formatted_jobs,
+            "total": total,
+            "page": params.page,
+            "limit": params.limit,
+            "pages": self._calculate_pages(total, params.limit),
+        }
+
+    def _use_column_store(self, params: JobSearchFilter) -> bool:
+        """
+        Whether the column store can answer a search: it holds the hot tier's
+        text columns, dates and tags, and must be current.
+        """
+        if self.column_store is None:
+            return False
+        if params.include_archived:
+            return False
+        return self.column_store.catch_up(
+            self.job_manager, self.tag_manager, self.job_tag_manager
+        )
+
+    def _parse_tag_expr(self, text: Optional[str]) -> Optional[TagExpr]:
+        """
+        Parse a search's tag expression, if any.
+        Raises HTTPException if it is malformed.
+        """
+        if text is None:
+            return None
+        try:
+            return parse_tag_expr(text)
+        except TagExprError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid tag expression: {e}")
+
+    def _search_sql(
+        self, params: JobSearchFilter, tag_expr: Optional[TagExpr], offset: int
+    ):
+        """Count matching jobs and load a page of them in SQL."""
         # Get total count
         total = self.job_manager.count_by_filters(
             query=params.query,
@@ -44,6 +139,8 @@ class SearchService:
             tag_categories=params.tag_categories,
             date_from=params.date_from,
             date_to=params.date_to,
+            include_archived=params.include_archived,
+            tag_expr=tag_expr,
         )
 
         # Get paginated jobs
@@ -56,37 +153,107 @@ class SearchService:
             date_to=params.date_to,
             limit=params.limit,
             offset=offset,
+            include_archived=params.include_archived,
+            sort=params.sort,
+            tag_expr=tag_expr,
         )
+        return total, jobs
 
-        # Enrich jobs with tags and format response
-        formatted_jobs = self._build_job_responses(jobs)
-
-        return {
-            "items": formatted_jobs,
-            "total": total,
-            "page": params.page,
-            "limit": params.limit,
-            "pages": self._calculate_pages(total, params.limit),
-        }
+    def get_jobs_by_pks(self, pks: List[int]) -> List[Dict]:
+        """
+        Get hot jobs by primary key, in the given order.
+        Jobs that no longer exist are skipped.
+        """
+        return self._build_job_responses(self.job_manager.find_by_pks(pks))
 
     def get_job_by_id(self, job_id: str) -> Dict:
         """
-        Get a specific job by its ID.
+        Get a specific job by its ID, falling back to the archive.
+        Raises HTTPException if job not found.
+        """
+        return self._format_job_response(self._find_job_or_404(job_id))
+
+    def get_similar_jobs(self, job_id: str, limit: int = 10) -> Dict:
+        """
+        Get the hot jobs whose tags and title tokens are most like a job's,
+        most similar first, with their Jaccard similarity.
         Raises HTTPException if job not found.
         """
+        job = self._find_job_or_404(job_id)
+        tag_ids = [relation.tag_id for relation in job.tag_relations]
+        features = job_features(job.job_position, tag_ids)
+
+        if self._use_similar_index():
+            matches = self.similar_index.similar(features, limit, exclude=job.id)
+            path = "lsh"
+        else:
+            matches = self._similar_sql(features, tag_ids, job.id, limit)
+            path = "sql"
+        span = current_span()
+        if span is not None:
+            span.set_attribute("similar.path", path)
+
+        similarity = dict(matches)
+        jobs = self.job_manager.find_by_pks([pk for pk, _ in matches])
+        return {
+            "job_id": job_id,
+            "items": [
+                {
+                    **self._format_job_response(similar),
+                    "similarity": round(similarity[similar.id], 4),
+                }
+                for similar in jobs
+            ],
+        }
+
+    def _find_job_or_404(self, job_id: str) -> Union[Job, ArchivedJob]:
         job = self.job_manager.find_by_id(job_id)
+        if not job:
+            job = self.job_manager.find_archived_by_id(job_id)
         if not job:
             raise HTTPException(
                 status_code=404, detail=f"Job with ID {job_id} not found"
             )
+        return job
 
-        return self._format_job_response(job)
+    def _use_similar_index(self) -> bool:
+        """Whether the similar job index is loaded and current."""
+        if self.similar_index is None:
+            return False
+        return self.similar_index.catch_up(self.job_manager, self.job_tag_manager)
 
-    def _build_job_responses(self, jobs: List[Job]) -> List[Dict]:
+    def _similar_sql(
+        self, features: np.ndarray, tag_ids: List[int], exclude: int, limit: int
+    ) -> List[Tuple[int, float]]:
+        """
+        Score the jobs sharing the most of a job's tags by exact similarity,
+        while the similar job index loads. Jobs sharing only title tokens
+        are not found.
+        """
+        pks = [
+            pk
+            for pk in self.job_tag_manager.find_jobs_sharing_tags(
+                tag_ids, SIMILAR_SQL_CANDIDATES
+            )
+            if pk != exclude
+        ]
+        tags_by_job: Dict[int, List[int]] = {}
+        for tag_id, job_pk in self.job_tag_manager.find_tag_pairs(pks):
+            tags_by_job.setdefault(job_pk, []).append(tag_id)
+        matches = [
+            (pk, jaccard(features, job_features(position, tags_by_job.get(pk, ()))))
+            for pk, _posting_date, position, _company, _location in (
+                self.job_manager.find_index_rows(pks)
+            )
+        ]
+        matches.sort(key=lambda match: (-match[1], -match[0]))
+        return [match for match in matches if match[1] > 0][:limit]
+
+    def _build_job_responses(self, jobs: List[Union[Job, ArchivedJob]]) -> List[Dict]:
         """Build formatted job responses with tags."""
         return [self._format_job_response(job) for job in jobs]
 
-    def _format_job_response(self, job: Job) -> Dict:
+    def _format_job_response(self, job: Union[Job, ArchivedJob]) -> Dict:
         """Format a single job for API response."""
         # Build tags dictionary grouped by category
         tags_by_category = {}
@@ -107,6 +274,23 @@ class SearchService:
             "tags": tags_by_category,
         }
 
+    def _filter_shape(self, params: JobSearchFilter) -> str:
+        """Names of the filters in use, e.g. "query+tags", for tracing."""
+        names = [
+            name
+            for name in (
+                "query",
+                "location",
+                "tags",
+                "tag_categories",
+                "tag_expr",
+                "date_from",
+                "date_to",
+            )
+            if getattr(params, name)
+        ]
+        return "+".join(names) or "none"
+
     def _calculate_pages(self, total: int, limit: int) -> int:
         """Calculate total number of pages."""
         return (total + limit - 1) // limit
@@ -4,11 +4,13 @@ Tag Service - Business logic for tag operations
 
 from typing import List
 
+from app.core.metrics import instrumented
 from app.managers.tag_manager import TagManager
 from app.models.tag import TagCategory
 from fastapi import HTTPException
 
 
+@instrumented("service")
 class TagService:
     """
     Handles business logic for tag operations.
@@ -0,0 +1,7 @@
+"""
+Benchmarks - Performance measurements for the job board backend
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.job_tag_writes``
+from the backend directory. Benchmarks default to a throwaway SQLite database
+and accept ``--database-url`` to run against PostgreSQL.
+"""
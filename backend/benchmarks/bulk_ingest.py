@@ -0,0 +1,113 @@
+"""
+Bulk Ingest Benchmark - Throughput of IngestService chunked upserts
+
+Generates a synthetic feed with the dataset generator, ingests it once
+(inserts), again unchanged (skipped by content hash) and once more with a
+fraction of postings edited, and reports jobs per second.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+from app.data.generate_dataset import generate_dataset, iter_dataset
+from app.managers.job_manager import JobManager
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.tag_manager import TagManager
+from app.services.ingest import IngestService
+from benchmarks.common import (
+    create_benchmark_engine,
+    create_benchmark_session_factory,
+    stopwatch,
+    write_results,
+)
+
+
+def feed(dataset_dir: str, change_every: int = 0):
+    """
+    Yield the dataset as raw ingest records.
+    With change_every, every n-th posting gets an edited title.
+    """
+    for index, job in enumerate(iter_dataset(dataset_dir)):
+        if change_every and index % change_every == 0:
+            job = {**job, "job_position": job["job_position"] + " (Updated)"}
+        yield index, job, None
+
+
+def ingest(session_factory, dataset_dir: str, chunk_size: int, change_every=0):
+    db = session_factory()
+    try:
+        service = IngestService(JobManager(db), TagManager(db), JobTagManager(db))
+        return service.ingest(feed(dataset_dir, change_every), chunk_size)
+    finally:
+        db.close()
+
+
+def run(database_url=None, num_jobs=20000, chunk_size=1000, seed=42, change_every=100):
+    """Ingest the same feed three times and time every pass."""
+    dataset_dir = os.path.join(tempfile.mkdtemp(prefix="job-board-feed-"), "feed")
+    generate_dataset(num_jobs, dataset_dir, seed=seed, anchor_date=date(2025, 6, 1))
+
+    engine = create_benchmark_engine(database_url)
+    session_factory = create_benchmark_session_factory(engine)
+
+    timings = {}
+    reports = {}
+    passes = (("initial", 0), ("repeat", 0), ("changed", change_every))
+    for name, every in passes:
+        with stopwatch(timings, name):
+            reports[name] = ingest(session_factory, dataset_dir, chunk_size, every)
+
+    results = {
+        "dialect": engine.dialect.name,
+        "jobs": num_jobs,
+        "chunk_size": chunk_size,
+        "passes": {
+            name: {
+                "seconds": round(seconds, 3),
+                "jobs_per_second": round(num_jobs / seconds) if seconds else None,
+                "created": reports[name]["created"],
+                "updated": reports[name]["updated"],
+                "unchanged": reports[name]["unchanged"],
+                "failed": reports[name]["failed"],
+            }
+            for name, seconds in timings.items()
+        },
+    }
+    engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark bulk job ingest")
+    parser.add_argument("--database-url", default=None, help="Target database URL")
+    parser.add_argument("--jobs", type=int, default=20000, help="Jobs in the feed")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Jobs per chunk")
+    parser.add_argument(
+        "--change-every",
+        type=int,
+        default=100,
+        help="Edit every n-th posting in the last pass",
+    )
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(
+        args.database_url, args.jobs, args.chunk_size, change_every=args.change_every
+    )
+
+    print(f"{results['jobs']} jobs on {results['dialect']}")
+    for name, stats in results["passes"].items():
+        print(
+            f"  {name:<8} {stats['seconds']:>8.2f}s "
+            f"{stats['jobs_per_second']:>8} jobs/s "
+            f"(created {stats['created']}, updated {stats['updated']}, "
+            f"unchanged {stats['unchanged']}, failed {stats['failed']})"
+        )
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
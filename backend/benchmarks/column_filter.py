@@ -0,0 +1,153 @@
+"""
+Column Filter Benchmark - Vectorized search over the in-process column store
+
+Loads a ColumnStore with synthetic columns for a given number of jobs (no
+database involved) and times ColumnStore.search for each filter shape the
+store answers: a date range, a location or text pattern, tag categories,
+tags and boolean tag expressions, and their combinations, unsorted and in
+each sort order. Every search counts all
+matches and collects the first page, so each is one full pass over the
+columns. Reports milliseconds per search.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+from app.core import strings
+from app.core.change_feed import ChangeFeed
+from app.core.tag_expr import parse_tag_expr
+from app.indexes.columns import CATEGORY_BITS, ColumnStore
+from benchmarks.common import write_results
+
+ANCHOR = date(2025, 6, 1)
+
+# Synthetic tags, most popular first; the i-th is on about 40% / (i + 1)
+# of the jobs
+TAG_NAMES = ["Python", "AWS", "SQL", "Kubernetes", "Docker", "PHP"] + [
+    f"Tag {i}" for i in range(6, 48)
+]
+
+SCENARIOS = {
+    "no filters": {},
+    "last 7 days": {"date_from": date(2025, 5, 25)},
+    "one month": {"date_from": date(2025, 4, 1), "date_to": date(2025, 4, 30)},
+    "location": {"location": "berlin"},
+    "text": {"query": "platform"},
+    "text + dates": {"query": "senior data", "date_from": date(2025, 5, 1)},
+    "category": {"tag_categories": ["tool"]},
+    "two categories": {"tag_categories": ["skill", "methodology"]},
+    "location + category + dates": {
+        "location": "remote",
+        "tag_categories": ["technology"],
+        "date_from": date(2025, 5, 1),
+    },
+    "newest": {"sort": "newest"},
+    "oldest + category": {"tag_categories": ["tool"], "sort": "oldest"},
+    "company + dates": {"date_from": date(2025, 5, 25), "sort": "company"},
+    "newest + location": {"location": "berlin", "sort": "newest"},
+    "relevance": {"query": "platform", "sort": "relevance"},
+    "any of two tags": {"tags": ["Kubernetes", "Tag 20"]},
+    "tag AND tag": {"tag_expr": parse_tag_expr('Python AND "Tag 40"')},
+    "tag expression": {
+        "tag_expr": parse_tag_expr("Python AND (AWS OR Kubernetes) AND NOT PHP")
+    },
+    "negated tags + dates": {
+        "tag_expr": parse_tag_expr("NOT (Python OR SQL)"),
+        "date_from": date(2025, 5, 25),
+    },
+    "tag expression + newest": {
+        "tag_expr": parse_tag_expr("Docker AND NOT AWS"),
+        "sort": "newest",
+    },
+}
+
+
+def synthetic_store(num_jobs: int, seed_value: int = 42) -> ColumnStore:
+    """A column store over num_jobs random jobs posted in the last 60 days."""
+    rng = np.random.default_rng(seed_value)
+    location_codes = strings.locations.encode(
+        [f"City {i}" for i in range(2000)] + ["Berlin, Germany", "Remote"]
+    )
+    company_codes = strings.companies.encode([f"Company {i}" for i in range(50000)])
+    position_codes = strings.positions.encode(
+        [
+            f"{level} {domain} {title}"
+            for level in ("Junior", "Senior", "Staff")
+            for domain in ("Data", "Backend", "Frontend", "Platform")
+            for title in ("Engineer", "Developer", "Analyst", "Manager")
+        ]
+    )
+    feed = ChangeFeed(
+        os.path.join(tempfile.mkdtemp(prefix="job-board-feed-"), "changes.sqlite3")
+    )
+    store = ColumnStore(feed)
+    store.load_columns(
+        ids=np.arange(1, num_jobs + 1, dtype=np.int32),
+        days=ANCHOR.toordinal() - rng.integers(0, 60, num_jobs, dtype=np.int32),
+        location_codes=np.append(location_codes, -1)[
+            rng.integers(0, len(location_codes) + 1, num_jobs)
+        ],
+        company_codes=np.array(company_codes, dtype=np.int32)[
+            rng.integers(0, len(company_codes), num_jobs)
+        ],
+        position_codes=np.array(position_codes, dtype=np.int32)[
+            rng.integers(0, len(position_codes), num_jobs)
+        ],
+        category_bits=rng.integers(
+            0, max(CATEGORY_BITS.values()) * 2, num_jobs, dtype=np.uint8
+        ),
+        change_seq=feed.latest(),
+        tags=[(i, name, "technology") for i, name in enumerate(TAG_NAMES)],
+        postings={
+            i: np.flatnonzero(rng.random(num_jobs) < 0.4 / (i + 1))
+            for i in range(len(TAG_NAMES))
+        },
+    )
+    return store
+
+
+def run(num_jobs=5000000, iterations=20):
+    """Time every scenario iterations times."""
+    store = synthetic_store(num_jobs)
+    results = {"jobs": num_jobs, "iterations": iterations, "scenarios": {}}
+    for name, filters in SCENARIOS.items():
+        store.search(**filters)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            total, _ = store.search(**filters, limit=20)
+        elapsed = time.perf_counter() - started
+        results["scenarios"][name] = {
+            "ms": round(elapsed / iterations * 1e3, 2),
+            "matches": total,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark vectorized searches over the column store"
+    )
+    parser.add_argument("--jobs", type=int, default=5000000, help="Jobs in the store")
+    parser.add_argument(
+        "--iterations", type=int, default=20, help="Searches per scenario"
+    )
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.jobs, args.iterations)
+
+    for name, result in results["scenarios"].items():
+        print(
+            f"  {name:<32} {result['ms']:>8.2f} ms/search "
+            f"{result['matches']:>10} matches"
+        )
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
@@ -0,0 +1,81 @@
+"""
+Shared helpers for benchmarks
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from app.core.db import Base
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+def create_benchmark_engine(database_url: Optional[str] = None):
+    """
+    Create an engine for a benchmark run.
+    Without a URL, a fresh SQLite file in a temporary directory is used.
+    """
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="job-board-bench-"), "bench.db")
+        database_url = f"sqlite:///{path}"
+
+    connect_args = {}
+    if database_url.startswith("sqlite"):
+        connect_args["check_same_thread"] = False
+
+    engine = create_engine(database_url, connect_args=connect_args)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def create_benchmark_session_factory(engine):
+    """Create a session factory matching the application's settings."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@contextmanager
+def stopwatch(results: Dict, key: str):
+    """Record the elapsed wall time of the block in seconds under results[key]."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        results[key] = time.perf_counter() - started
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def git_revision() -> Optional[str]:
+    """Current git commit, used to label benchmark results."""
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            or None
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, results: Dict):
+    """Write benchmark results as JSON, labelled with the git revision."""
+    payload = {"revision": git_revision(), **results}
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, default=str)
+    print(f"Results written to {path}")
@@ -0,0 +1,105 @@
+"""
+Export Benchmark - Throughput and peak memory of streaming job export
+
+Loads a synthetic feed, exports every job in each format, and reports rows
+per second and peak traced memory (measured in a second pass). Peak memory
+should stay flat as the number of jobs grows.
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import date
+
+from app.data.generate_dataset import generate_dataset
+from app.managers.job_manager import JobManager
+from app.managers.tag_manager import TagManager
+from app.schemas.job_filter import JobSearchFilter
+from app.services.export import ExportService
+from benchmarks.bulk_ingest import ingest
+from benchmarks.common import (
+    create_benchmark_engine,
+    create_benchmark_session_factory,
+    stopwatch,
+    write_results,
+)
+
+
+def export(session_factory, format: str, batch_size: int) -> int:
+    """Drain one export, returning the number of characters written."""
+    db = session_factory()
+    service = ExportService(JobManager(db), TagManager(db))
+    return sum(
+        len(chunk)
+        for chunk in service.export_jobs(JobSearchFilter(), format, batch_size)
+    )
+
+
+def traced_peak(session_factory, format: str, batch_size: int) -> int:
+    """Peak traced memory in bytes while draining one export."""
+    tracemalloc.start()
+    try:
+        export(session_factory, format, batch_size)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(database_url=None, num_jobs=20000, batch_size=1000, seed=42):
+    """Load num_jobs jobs and time a full export in every format."""
+    dataset_dir = os.path.join(tempfile.mkdtemp(prefix="job-board-feed-"), "feed")
+    generate_dataset(num_jobs, dataset_dir, seed=seed, anchor_date=date(2025, 6, 1))
+
+    engine = create_benchmark_engine(database_url)
+    session_factory = create_benchmark_session_factory(engine)
+    ingest(session_factory, dataset_dir, chunk_size=1000)
+
+    timings = {}
+    formats = {}
+    for format in ("ndjson", "csv"):
+        with stopwatch(timings, format):
+            size = export(session_factory, format, batch_size)
+        # Tracing slows allocation down, so memory is measured in its own pass
+        peak = traced_peak(session_factory, format, batch_size)
+        formats[format] = {
+            "seconds": round(timings[format], 3),
+            "rows_per_second": round(num_jobs / timings[format]),
+            "megabytes": round(size / 2**20, 2),
+            "peak_traced_megabytes": round(peak / 2**20, 2),
+        }
+
+    results = {
+        "dialect": engine.dialect.name,
+        "jobs": num_jobs,
+        "batch_size": batch_size,
+        "formats": formats,
+    }
+    engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark streaming job export")
+    parser.add_argument("--database-url", default=None, help="Target database URL")
+    parser.add_argument("--jobs", type=int, default=20000, help="Jobs to export")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per batch")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.database_url, args.jobs, args.batch_size)
+
+    print(f"{results['jobs']} jobs on {results['dialect']}")
+    for format, stats in results["formats"].items():
+        print(
+            f"  {format:<7} {stats['seconds']:>8.2f}s "
+            f"{stats['rows_per_second']:>8} rows/s "
+            f"{stats['megabytes']:>8.2f} MB, "
+            f"peak {stats['peak_traced_megabytes']:.2f} MB"
+        )
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
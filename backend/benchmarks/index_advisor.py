@@ -0,0 +1,210 @@
+"""
+Index Advisor - Query plans for the search filter mix
+
+Seeds a database with the synthetic dataset, runs every search scenario
+from the search latency benchmark once while capturing its SQL, and
+EXPLAINs each statement with its bound parameters. Reports, per scenario,
+the tables read by a sequential (full table) scan and the indexes used,
+then lists the indexes on the search tables that no plan used.
+
+Unique-constraint indexes are left out of the unused list: they exist to
+enforce integrity, not to serve searches.
+"""
+
+import os
+import re
+import sys
+import tempfile
+from typing import Dict, List, Set
+
+from app.core.slow_queries import explain
+from app.data.generate_dataset import generate_dataset
+from benchmarks.common import (
+    create_benchmark_engine,
+    create_benchmark_session_factory,
+    write_results,
+)
+from benchmarks.search_latency import (
+    ANCHOR_DATE,
+    WINDOW_DAYS,
+    filter_values,
+    scenarios,
+    search,
+    seed,
+)
+from sqlalchemy import event, inspect
+
+SEARCH_TABLES = ("jobs", "tags", "job_tags")
+
+# Plan lines reading a whole table, by dialect. SQLite reports "SCAN jobs"
+# for a table scan and "SCAN jobs USING INDEX ..." for a full index scan.
+_SEQ_SCANS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"^SCAN (\w+)$"),
+}
+# SQLAlchemy aliases repeated tables as jobs_1, tags_1, ...
+_ALIAS_SUFFIX = re.compile(r"_\d+$")
+
+
+def search_indexes(engine) -> Set[str]:
+    """Names of the non-unique-constraint indexes on the search tables."""
+    inspector = inspect(engine)
+    return {
+        index["name"]
+        for table in SEARCH_TABLES
+        for index in inspector.get_indexes(table)
+        if "duplicates_constraint" not in index
+    }
+
+
+def seq_scans(dialect: str, plan: List[str]) -> List[str]:
+    """Search tables read by a sequential scan in a plan."""
+    pattern = _SEQ_SCANS.get(dialect)
+    if pattern is None:
+        return []
+    tables = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match:
+            table = _ALIAS_SUFFIX.sub("", match.group(1))
+            if table in SEARCH_TABLES and table not in tables:
+                tables.append(table)
+    return tables
+
+
+def used_indexes(plan: List[str], indexes: Set[str]) -> List[str]:
+    """Known indexes mentioned anywhere in a plan."""
+    words = set(re.findall(r"\w+", " ".join(plan)))
+    return sorted(indexes & words)
+
+
+def capture(engine, session_factory, params: Dict) -> List:
+    """Run one search and return its (statement, parameters) pairs."""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        search(session_factory, params)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return captured
+
+
+def advise(engine, session_factory, plan) -> Dict:
+    """EXPLAIN every scenario of a search plan against a seeded database."""
+    dialect = engine.dialect.name
+    indexes = search_indexes(engine)
+    used: Set[str] = set()
+    report = {"dialect": dialect, "scenarios": {}, "seq_scans": {}}
+
+    for name, params, deep_page in plan:
+        if deep_page:
+            # 90% of the way through the result set
+            pages = search(session_factory, params)["pages"]
+            params = {**params, "page": max(1, pages * 9 // 10)}
+
+        plans = []
+        with engine.connect() as conn:
+            for statement, parameters in capture(engine, session_factory, params):
+                lines = explain(conn, statement, parameters)
+                if lines is not None:
+                    plans.append(lines)
+            conn.rollback()
+
+        scanned = []
+        scenario_indexes = set()
+        for lines in plans:
+            scanned.extend(t for t in seq_scans(dialect, lines) if t not in scanned)
+            scenario_indexes.update(used_indexes(lines, indexes))
+        used |= scenario_indexes
+
+        report["scenarios"][name] = {
+            "seq_scans": scanned,
+            "indexes": sorted(scenario_indexes),
+            "plans": plans,
+        }
+        for table in scanned:
+            report["seq_scans"].setdefault(table, []).append(name)
+
+    report["unused_indexes"] = sorted(indexes - used)
+    return report
+
+
+def run(database_url=None, num_jobs=20_000, seed_value=42, only=None):
+    """Seed num_jobs synthetic jobs into an empty database and advise."""
+    dataset_dir = os.path.join(tempfile.mkdtemp(prefix="job-board-feed-"), "feed")
+    generate_dataset(
+        num_jobs,
+        dataset_dir,
+        seed=seed_value,
+        anchor_date=ANCHOR_DATE,
+        window_days=WINDOW_DAYS,
+    )
+    plan = scenarios(filter_values(dataset_dir))
+    if only:
+        plan = [scenario for scenario in plan if scenario[0] in only]
+
+    engine = create_benchmark_engine(database_url)
+    session_factory = create_benchmark_session_factory(engine)
+    try:
+        seed(session_factory, dataset_dir, 0, num_jobs)
+        # Fresh statistics, so plans reflect the seeded data
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+        report = advise(engine, session_factory, plan)
+    finally:
+        engine.dispose()
+
+    report["jobs"] = num_jobs
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Report sequential scans and unused indexes for job searches"
+    )
+    parser.add_argument(
+        "--database-url", default=None, help="Empty database (default: temp SQLite)"
+    )
+    parser.add_argument("--jobs", type=int, default=20_000, help="Jobs to seed")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        default=None,
+        help="Only run the named scenario (repeatable)",
+    )
+    parser.add_argument("--plans", action="store_true", help="Print every query plan")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    report = run(args.database_url, args.jobs, only=args.scenario)
+
+    for name, scenario in report["scenarios"].items():
+        scans = ", ".join(scenario["seq_scans"]) or "-"
+        print(f"  {name:<48} seq scans: {scans}")
+        if args.plans:
+            for lines in scenario["plans"]:
+                for line in lines:
+                    print(f"      {line}")
+                print()
+
+    print("\nSequential scans:")
+    for table, names in sorted(report["seq_scans"].items()):
+        print(f"  {table:<10} {len(names)} scenarios")
+    if not report["seq_scans"]:
+        print("  none")
+
+    print("\nUnused indexes:")
+    for index in report["unused_indexes"]:
+        print(f"  {index}")
+    if not report["unused_indexes"]:
+        print("  none")
+
+    if args.output:
+        write_results(args.output, report)
+    sys.exit(0)
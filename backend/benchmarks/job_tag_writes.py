@@ -0,0 +1,165 @@
+"""
+Job-Tag Write Benchmark - Compare JobTagManager write paths
+
+Measures relationship throughput for:
+- create_relations: one call per job, commit and refresh per row
+- bulk_create: one call, commit and refresh per row
+- insert_relations: one INSERT ... RETURNING, no refresh
+"""
+
+import random
+import sys
+from datetime import date
+
+from app.managers.job_tag_manager import JobTagManager
+from app.models.job import Job
+from app.models.job_tag import JobTag
+from app.models.tag import Tag, TagCategory
+from benchmarks.common import (
+    create_benchmark_engine,
+    create_benchmark_session_factory,
+    stopwatch,
+    write_results,
+)
+from sqlalchemy import insert
+
+
+def seed(session_factory, num_jobs: int, num_tags: int):
+    """Insert jobs and tags to relate. Returns (job IDs, tag IDs)."""
+    db = session_factory()
+    try:
+        db.execute(
+            insert(Job),
+            [
+                {
+                    "job_id": f"BENCH{i:08d}",
+                    "job_position": "Benchmark Engineer",
+                    "job_link": f"https://example.com/jobs/{i}",
+                    "company_name": "Bench Corp",
+                    "job_location": "Remote",
+                    "job_posting_date": date.today(),
+                }
+                for i in range(num_jobs)
+            ],
+        )
+        db.execute(
+            insert(Tag),
+            [
+                {"name": f"tag-{i}", "category": TagCategory.TECHNOLOGY}
+                for i in range(num_tags)
+            ],
+        )
+        db.commit()
+        job_ids = [row[0] for row in db.query(Job.id).order_by(Job.id)]
+        tag_ids = [row[0] for row in db.query(Tag.id).order_by(Tag.id)]
+        return job_ids, tag_ids
+    finally:
+        db.close()
+
+
+def build_relations(job_ids, tag_ids, tags_per_job: int, rng: random.Random):
+    """Pick distinct tags for every job."""
+    return {
+        job_id: rng.sample(tag_ids, min(tags_per_job, len(tag_ids)))
+        for job_id in job_ids
+    }
+
+
+def clear_relations(session_factory):
+    db = session_factory()
+    try:
+        db.query(JobTag).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_create_relations(manager: JobTagManager, relations):
+    for job_id, tag_ids in relations.items():
+        manager.create_relations(job_id, tag_ids)
+
+
+def run_bulk_create(manager: JobTagManager, relations):
+    manager.bulk_create(
+        [
+            {"job_id": job_id, "tag_id": tag_id}
+            for job_id, tag_ids in relations.items()
+            for tag_id in tag_ids
+        ]
+    )
+
+
+def run_insert_relations(manager: JobTagManager, relations):
+    manager.insert_relations(
+        (job_id, tag_id) for job_id, tag_ids in relations.items() for tag_id in tag_ids
+    )
+
+
+METHODS = {
+    "create_relations": run_create_relations,
+    "bulk_create": run_bulk_create,
+    "insert_relations": run_insert_relations,
+}
+
+
+def run(database_url=None, num_jobs=2000, num_tags=50, tags_per_job=6, seed_value=42):
+    """Run every write path against the same relationships."""
+    engine = create_benchmark_engine(database_url)
+    session_factory = create_benchmark_session_factory(engine)
+    job_ids, tag_ids = seed(session_factory, num_jobs, num_tags)
+    relations = build_relations(
+        job_ids, tag_ids, tags_per_job, random.Random(seed_value)
+    )
+    total_rows = sum(len(tag_ids) for tag_ids in relations.values())
+
+    timings = {}
+    for name, method in METHODS.items():
+        clear_relations(session_factory)
+        db = session_factory()
+        try:
+            with stopwatch(timings, name):
+                method(JobTagManager(db), relations)
+        finally:
+            db.close()
+
+    results = {
+        "dialect": engine.dialect.name,
+        "jobs": num_jobs,
+        "relations": total_rows,
+        "methods": {
+            name: {
+                "seconds": round(seconds, 4),
+                "rows_per_second": round(total_rows / seconds) if seconds else None,
+            }
+            for name, seconds in timings.items()
+        },
+    }
+    engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark JobTagManager writes")
+    parser.add_argument("--database-url", default=None, help="Target database URL")
+    parser.add_argument("--jobs", type=int, default=2000, help="Number of jobs")
+    parser.add_argument("--tags", type=int, default=50, help="Number of tags")
+    parser.add_argument(
+        "--tags-per-job", type=int, default=6, help="Relationships per job"
+    )
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.database_url, args.jobs, args.tags, args.tags_per_job)
+
+    print(f"{results['relations']} relationships on {results['dialect']}")
+    for name, stats in results["methods"].items():
+        print(
+            f"  {name:<18} {stats['seconds']:>9.3f}s "
+            f"{stats['rows_per_second']:>10} rows/s"
+        )
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
@@ -0,0 +1,400 @@
+"""
+Load Replay - Replay a request log against the in-process ASGI app
+
+Requests from a recorded or synthetic log of /jobs/search, /jobs/{id} and
+/tags/* calls are sent to app.main:app through httpx's ASGI transport, so no
+server or network is involved. Requests are replayed either closed-loop (a
+fixed number of concurrent clients) or open-loop at a fixed arrival rate.
+
+Reports throughput, latency histograms per endpoint, error rates, database
+connection pool saturation and how busy the threadpool that runs the sync
+endpoints is.
+
+A log is NDJSON with one request per line:
+
+    {"method": "GET", "path": "/api/v1/jobs/search?query=Engineer"}
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import date
+from itertools import islice
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+import httpx
+from anyio import to_thread
+from app.core.db import get_db
+from app.data.generate_dataset import generate_dataset, iter_dataset
+from app.main import app
+from app.models.tag import TagCategory
+from benchmarks.common import (
+    create_benchmark_engine,
+    create_benchmark_session_factory,
+    percentile,
+    write_results,
+)
+from benchmarks.search_latency import FILTERS, filter_values, seed
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Share of each endpoint in a synthetic log
+SYNTHETIC_MIX = (("search", 0.7), ("job_detail", 0.2), ("tags", 0.1))
+
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+
+def endpoint(path: str) -> str:
+    """Group a request path by the route it hits."""
+    path = path.split("?", 1)[0]
+    if path.endswith("/jobs/search"):
+        return "search"
+    if "/jobs/" in path:
+        return "job_detail"
+    if "/tags/" in path:
+        return "tags"
+    return "other"
+
+
+def synthetic_log(dataset_dir: str, num_requests: int, seed: int = 42) -> List[Dict]:
+    """
+    Build a request log from a generated dataset: searches over random
+    filter combinations and pages, lookups of existing (and a few unknown)
+    job ids, and tag listings.
+    """
+    rng = random.Random(f"log:{seed}")
+    values = filter_values(dataset_dir)
+    job_ids = [job["job_id"] for job in islice(iter_dataset(dataset_dir), 10_000)]
+    kinds = [kind for kind, _ in SYNTHETIC_MIX]
+    weights = [weight for _, weight in SYNTHETIC_MIX]
+
+    log = []
+    for _ in range(num_requests):
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "search":
+            params = {"page": rng.choice((1, 1, 1, 2, 3, 10))}
+            for name in FILTERS:
+                if rng.random() < 0.3:
+                    params.update(values[name])
+            path = f"/api/v1/jobs/search?{urlencode(params, doseq=True)}"
+        elif kind == "job_detail":
+            job_id = rng.choice(job_ids) if rng.random() < 0.98 else "0000000000"
+            path = f"/api/v1/jobs/{job_id}"
+        elif rng.random() < 0.2:
+            path = "/api/v1/tags/categories"
+        else:
+            path = f"/api/v1/tags/by-category/{rng.choice(list(TagCategory)).value}"
+        log.append({"method": "GET", "path": path})
+    return log
+
+
+def read_log(path: str) -> List[Dict]:
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_log(path: str, log: List[Dict]):
+    with open(path, "w") as f:
+        for entry in log:
+            f.write(json.dumps(entry) + "\n")
+
+
+class _Sampler:
+    """Periodically samples pool checkouts and threadpool usage."""
+
+    def __init__(self, engine):
+        self.pool = engine.pool
+        self.limiter = to_thread.current_default_thread_limiter()
+        self.checked_out = []
+        self.threads_busy = []
+        self.threads_waiting = []
+
+    def capacity(self) -> Optional[int]:
+        """Connections the pool can hand out, or None if it is unbounded."""
+        size = getattr(self.pool, "size", None)
+        overflow = getattr(self.pool, "_max_overflow", None)
+        if size is None or overflow is None or overflow < 0:
+            return None
+        return size() + overflow
+
+    def sample(self):
+        if hasattr(self.pool, "checkedout"):
+            self.checked_out.append(self.pool.checkedout())
+        statistics = self.limiter.statistics()
+        self.threads_busy.append(statistics.borrowed_tokens)
+        self.threads_waiting.append(statistics.tasks_waiting)
+
+    async def run(self, stop: asyncio.Event):
+        while not stop.is_set():
+            self.sample()
+            await asyncio.sleep(SAMPLE_INTERVAL_SECONDS)
+
+    def report(self) -> Dict:
+        capacity = self.capacity()
+        checked_out = self.checked_out or [0]
+        saturated = (
+            sum(1 for value in checked_out if value >= capacity) / len(checked_out)
+            if capacity
+            else None
+        )
+        return {
+            "pool": {
+                "capacity": capacity,
+                "max_checked_out": max(checked_out),
+                "mean_checked_out": round(sum(checked_out) / len(checked_out), 2),
+                "saturated_fraction": saturated,
+            },
+            "threadpool": {
+                "limit": int(self.limiter.total_tokens),
+                "max_busy": max(self.threads_busy, default=0),
+                "mean_busy": round(
+                    sum(self.threads_busy) / max(len(self.threads_busy), 1), 2
+                ),
+                "max_waiting": max(self.threads_waiting, default=0),
+            },
+        }
+
+
+def histogram(samples: List[float]) -> Dict[str, int]:
+    """Count latencies into HISTOGRAM_BUCKETS_MS, plus an overflow bucket."""
+    counts = Counter()
+    for sample in samples:
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if sample <= bound:
+                counts[f"<={bound}ms"] += 1
+                break
+        else:
+            counts[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] += 1
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS]
+    labels.append(f">{HISTOGRAM_BUCKETS_MS[-1]}ms")
+    return {label: counts[label] for label in labels}
+
+
+async def replay(
+    log: List[Dict], concurrency: int, rate: Optional[float] = None
+) -> Dict:
+    """
+    Send every request in the log to the app.
+    With rate, requests start at fixed intervals (open loop) and concurrency
+    caps how many are in flight; otherwise concurrency clients send requests
+    back to back (closed loop). Returns per-request outcomes.
+    """
+    outcomes = []
+    limit = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://loadtest", timeout=None
+    ) as client:
+
+        async def send(entry: Dict, scheduled: float):
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(entry["method"], entry["path"])
+                    status = response.status_code
+                except Exception as e:
+                    status = type(e).__name__
+                finished = time.perf_counter()
+            outcomes.append(
+                {
+                    "endpoint": endpoint(entry["path"]),
+                    "status": status,
+                    "latency_ms": (finished - started) * 1000,
+                    # Time spent waiting for a free client slot
+                    "queued_ms": (started - scheduled) * 1000,
+                }
+            )
+
+        started = time.perf_counter()
+        if rate:
+            tasks = []
+            for position, entry in enumerate(log):
+                scheduled = started + position / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(send(entry, scheduled)))
+            await asyncio.gather(*tasks)
+        else:
+            entries = iter(log)
+
+            async def client_loop():
+                for entry in entries:
+                    await send(entry, time.perf_counter())
+
+            await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+    return {"outcomes": outcomes, "seconds": time.perf_counter() - started}
+
+
+def summarize(outcomes: List[Dict], seconds: float) -> Dict:
+    by_endpoint = defaultdict(list)
+    for outcome in outcomes:
+        by_endpoint[outcome["endpoint"]].append(outcome)
+    by_endpoint["all"] = outcomes
+
+    summary = {}
+    for name, group in sorted(by_endpoint.items()):
+        latencies = [outcome["latency_ms"] for outcome in group]
+        statuses = Counter(str(outcome["status"]) for outcome in group)
+        errors = sum(
+            count
+            for status, count in statuses.items()
+            if not status.isdigit() or int(status) >= 500
+        )
+        summary[name] = {
+            "requests": len(group),
+            "throughput_rps": round(len(group) / seconds, 1) if seconds else None,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "max_queued_ms": round(max(o["queued_ms"] for o in group), 3),
+            "error_rate": round(errors / len(group), 4),
+            "statuses": dict(statuses),
+            "histogram": histogram(latencies),
+        }
+    return summary
+
+
+async def _measure(log: List[Dict], engine, concurrency: int, rate: Optional[float]):
+    sampler = _Sampler(engine)
+    stop = asyncio.Event()
+    sampling = asyncio.create_task(sampler.run(stop))
+    try:
+        result = await replay(log, concurrency, rate)
+    finally:
+        stop.set()
+        await sampling
+    return result, sampler.report()
+
+
+def run(
+    database_url=None,
+    num_jobs=20000,
+    log_path=None,
+    num_requests=2000,
+    concurrency=16,
+    rate=None,
+    seed_value=42,
+    save_log=None,
+):
+    """
+    Replay a log against the app backed by the given database.
+    Unless a recorded log is replayed against an existing database, the
+    database (a temporary SQLite file by default, otherwise an empty one) is
+    seeded with num_jobs synthetic jobs. Without a log, a synthetic one is
+    generated from the same jobs.
+    """
+    engine = create_benchmark_engine(database_url)
+    session_factory = create_benchmark_session_factory(engine)
+
+    dataset_dir = None
+    if database_url is None or log_path is None:
+        dataset_dir = os.path.join(tempfile.mkdtemp(prefix="job-board-feed-"), "feed")
+        generate_dataset(
+            num_jobs, dataset_dir, seed=seed_value, anchor_date=date(2025, 6, 1)
+        )
+        seed(session_factory, dataset_dir, 0, num_jobs)
+
+    log = (
+        read_log(log_path)
+        if log_path
+        else synthetic_log(dataset_dir, num_requests, seed_value)
+    )
+    if save_log:
+        write_log(save_log, log)
+
+    def get_benchmark_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    original_overrides = app.dependency_overrides.copy()
+    app.dependency_overrides[get_db] = get_benchmark_db
+    try:
+        result, resources = asyncio.run(_measure(log, engine, concurrency, rate))
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(original_overrides)
+        engine.dispose()
+
+    return {
+        "dialect": engine.dialect.name,
+        "requests": len(log),
+        "concurrency": concurrency,
+        "rate": rate,
+        "seconds": round(result["seconds"], 3),
+        "endpoints": summarize(result["outcomes"], result["seconds"]),
+        **resources,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Replay a request log against the in-process app"
+    )
+    parser.add_argument("--database-url", default=None, help="Target database URL")
+    parser.add_argument("--jobs", type=int, default=20000, help="Jobs to seed")
+    parser.add_argument("--log", default=None, help="NDJSON request log to replay")
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Synthetic log length"
+    )
+    parser.add_argument("--save-log", default=None, help="Write the replayed log")
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Requests in flight at once"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Arrival rate in requests per second (default: closed loop)",
+    )
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(
+        args.database_url,
+        args.jobs,
+        args.log,
+        args.requests,
+        args.concurrency,
+        args.rate,
+        save_log=args.save_log,
+    )
+
+    print(
+        f"{results['requests']} requests on {results['dialect']} in "
+        f"{results['seconds']:.2f}s (concurrency {results['concurrency']}, "
+        f"rate {results['rate'] or 'closed loop'})"
+    )
+    for name, stats in results["endpoints"].items():
+        print(
+            f"  {name:<11} {stats['requests']:>6} req {stats['throughput_rps']:>8} rps "
+            f"p50 {stats['p50_ms']:>8.2f}ms p95 {stats['p95_ms']:>8.2f}ms "
+            f"p99 {stats['p99_ms']:>8.2f}ms errors {stats['error_rate']:.2%}"
+        )
+    pool, threads = results["pool"], results["threadpool"]
+    print(
+        f"  pool: max {pool['max_checked_out']}/{pool['capacity']} checked out, "
+        f"saturated {pool['saturated_fraction'] or 0:.1%} of samples"
+    )
+    print(
+        f"  threadpool: max {threads['max_busy']}/{threads['limit']} busy, "
+        f"max {threads['max_waiting']} waiting"
+    )
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
@@ -0,0 +1,88 @@
+"""
+Search Builder Benchmark - Python-side cost of building and running searches
+
+Runs JobManager.count_by_filters and find_by_filters for every filter
+combination against a tiny database, so SQL execution time is negligible
+and the measurement is dominated by statement construction, compilation
+and result processing. Reports microseconds per search for each scenario.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from app.data.generate_dataset import generate_dataset
+from app.managers.job_manager import JobManager
+from benchmarks.common import (
+    create_benchmark_engine,
+    create_benchmark_session_factory,
+    write_results,
+)
+from benchmarks.search_latency import filter_values, scenarios, seed
+
+
+def search(manager: JobManager, params):
+    filters = {key: value for key, value in params.items() if key != "page"}
+    manager.count_by_filters(**filters)
+    manager.find_by_filters(**filters, limit=10, offset=0)
+
+
+def run(num_jobs=200, iterations=500, seed_value=42):
+    """Time every scenario (deep pages excluded) iterations times."""
+    dataset_dir = os.path.join(tempfile.mkdtemp(prefix="job-board-feed-"), "feed")
+    generate_dataset(
+        num_jobs, dataset_dir, seed=seed_value, anchor_date=date(2025, 6, 1)
+    )
+
+    engine = create_benchmark_engine()
+    session_factory = create_benchmark_session_factory(engine)
+    seed(session_factory, dataset_dir, 0, num_jobs)
+
+    db = session_factory()
+    manager = JobManager(db)
+    results = {"jobs": num_jobs, "iterations": iterations, "scenarios": {}}
+    try:
+        for name, params, deep_page in scenarios(filter_values(dataset_dir)):
+            if deep_page:
+                continue
+            search(manager, params)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                search(manager, params)
+                # Keep the identity map from short-circuiting object loading
+                db.expunge_all()
+            elapsed = time.perf_counter() - started
+            results["scenarios"][name] = round(elapsed / iterations * 1e6, 1)
+    finally:
+        db.close()
+        engine.dispose()
+
+    per_search = list(results["scenarios"].values())
+    results["mean_us"] = round(sum(per_search) / len(per_search), 1)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark Python-side cost of job searches"
+    )
+    parser.add_argument("--jobs", type=int, default=200, help="Jobs in the database")
+    parser.add_argument(
+        "--iterations", type=int, default=500, help="Searches per scenario"
+    )
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.jobs, args.iterations)
+
+    for name, micros in results["scenarios"].items():
+        print(f"  {name:<48} {micros:>9.1f} us/search")
+    print(f"  {'mean':<48} {results['mean_us']:>9.1f} us/search")
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
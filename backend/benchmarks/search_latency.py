@@ -0,0 +1,247 @@
+"""
+Search Latency Benchmark - SearchService.search_jobs across dataset sizes
+
+Seeds a database with the synthetic dataset generator in growing prefixes
+(10k, 100k, 1M jobs by default) and, at each size, times every combination
+of the filters JobManager.find_by_filters supports, plus deep pages of the
+unfiltered and tag-filtered searches. Every request runs in a fresh session,
+as it would behind the API. Reports p50/p95/p99 latency and SQL statements
+per request.
+"""
+
+import os
+import sys
+import tempfile
+from collections import Counter
+from datetime import date, timedelta
+from itertools import combinations, islice
+from typing import Dict, List, Tuple
+
+from app.data.generate_dataset import generate_dataset, iter_dataset
+from app.managers.job_manager import JobManager
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.tag_manager import TagManager
+from app.schemas.job_filter import JobSearchFilter
+from app.services.ingest import IngestService
+from app.services.search import SearchService
+from benchmarks.common import (
+    create_benchmark_engine,
+    create_benchmark_session_factory,
+    percentile,
+    stopwatch,
+    write_results,
+)
+from sqlalchemy import event
+
+ANCHOR_DATE = date(2025, 6, 1)
+WINDOW_DAYS = 60
+PAGE_LIMIT = 10
+
+# Filters in the order they appear in scenario names
+FILTERS = ("query", "location", "tags", "tag_categories", "date_range")
+
+
+def filter_values(dataset_dir: str, sample_size: int = 1000) -> Dict[str, Dict]:
+    """
+    Pick realistic filter values from the head of the dataset: the most
+    common title word, location and tags, and the last two weeks of postings.
+    """
+    words, locations, tags, categories = Counter(), Counter(), Counter(), Counter()
+    for job in islice(iter_dataset(dataset_dir), sample_size):
+        words.update(job["job_position"].split()[-1:])
+        locations[job["job_location"]] += 1
+        for category, names in job["tags"].items():
+            categories[category] += len(names)
+            tags.update(names)
+
+    return {
+        "query": {"query": words.most_common(1)[0][0]},
+        "location": {"location": locations.most_common(1)[0][0].split(",")[0]},
+        "tags": {"tags": [name for name, _ in tags.most_common(2)]},
+        "tag_categories": {"tag_categories": [categories.most_common(1)[0][0]]},
+        "date_range": {
+            "date_from": ANCHOR_DATE - timedelta(days=14),
+            "date_to": ANCHOR_DATE,
+        },
+    }
+
+
+def scenarios(values: Dict[str, Dict]) -> List[Tuple[str, Dict, bool]]:
+    """
+    Every combination of filters, named like "query+tags", plus deep pages.
+    Returns (name, search parameters, deep page) tuples.
+    """
+    result = []
+    for size in range(len(FILTERS) + 1):
+        for names in combinations(FILTERS, size):
+            params = {}
+            for name in names:
+                params.update(values[name])
+            result.append(("+".join(names) or "match_all", params, False))
+
+    result.append(("match_all+deep_page", {}, True))
+    result.append(("tags+deep_page", dict(values["tags"]), True))
+    return result
+
+
+def seed(session_factory, dataset_dir: str, start: int, stop: int):
+    """Ingest dataset records [start, stop) into the database."""
+    records = (
+        (index, job, None)
+        for index, job in islice(enumerate(iter_dataset(dataset_dir)), start, stop)
+    )
+    db = session_factory()
+    try:
+        service = IngestService(JobManager(db), TagManager(db), JobTagManager(db))
+        report = service.ingest(records, chunk_size=5000)
+    finally:
+        db.close()
+    if report["failed"]:
+        raise RuntimeError(f"{report['failed']} records failed to ingest")
+
+
+def search(session_factory, params: Dict) -> Dict:
+    db = session_factory()
+    try:
+        service = SearchService(JobManager(db), TagManager(db), JobTagManager(db))
+        return service.search_jobs(JobSearchFilter(limit=PAGE_LIMIT, **params))
+    finally:
+        db.close()
+
+
+def measure(
+    session_factory, engine, params: Dict, deep_page: bool, repeat: int, warmup: int
+) -> Dict:
+    """Time one scenario. Returns latency percentiles in milliseconds."""
+    if deep_page:
+        # 90% of the way through the result set
+        pages = search(session_factory, params)["pages"]
+        params = {**params, "page": max(1, pages * 9 // 10)}
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for _ in range(warmup):
+        search(session_factory, params)
+
+    samples = []
+    timings = {}
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for _ in range(repeat):
+            with stopwatch(timings, "request"):
+                response = search(session_factory, params)
+            samples.append(timings["request"] * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "queries_per_request": len(statements) / repeat,
+        "total": response["total"],
+        "page": params.get("page", 1),
+    }
+
+
+def run(
+    database_url=None,
+    sizes=(10_000, 100_000, 1_000_000),
+    repeat=20,
+    warmup=2,
+    seed_value=42,
+    only=None,
+):
+    """
+    Seed each dataset size in turn and time every scenario against it.
+    The database must start empty; each size adds jobs to the previous one.
+    """
+    sizes = sorted(sizes)
+    dataset_dir = os.path.join(tempfile.mkdtemp(prefix="job-board-feed-"), "feed")
+    generate_dataset(
+        sizes[-1],
+        dataset_dir,
+        seed=seed_value,
+        anchor_date=ANCHOR_DATE,
+        window_days=WINDOW_DAYS,
+    )
+    plan = scenarios(filter_values(dataset_dir))
+    if only:
+        plan = [scenario for scenario in plan if scenario[0] in only]
+
+    engine = create_benchmark_engine(database_url)
+    session_factory = create_benchmark_session_factory(engine)
+
+    results = {
+        "dialect": engine.dialect.name,
+        "repeat": repeat,
+        "limit": PAGE_LIMIT,
+        "sizes": {},
+    }
+    seeded = 0
+    for size in sizes:
+        timings = {}
+        with stopwatch(timings, "seed"):
+            seed(session_factory, dataset_dir, seeded, size)
+        seeded = size
+        print(f"{size} jobs seeded in {timings['seed']:.1f}s", file=sys.stderr)
+
+        results["sizes"][str(size)] = {
+            name: measure(session_factory, engine, params, deep_page, repeat, warmup)
+            for name, params, deep_page in plan
+        }
+
+    engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark job search latency")
+    parser.add_argument(
+        "--database-url", default=None, help="Target database URL (must be empty)"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="10000,100000,1000000",
+        help="Comma-separated dataset sizes",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Timed runs per scenario"
+    )
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed runs first")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        default=None,
+        help="Only run the named scenario (repeatable), e.g. query+tags",
+    )
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(
+        args.database_url,
+        [int(size) for size in args.sizes.split(",")],
+        args.repeat,
+        args.warmup,
+        only=args.scenario,
+    )
+
+    for size, stats_by_scenario in results["sizes"].items():
+        print(f"{size} jobs on {results['dialect']}")
+        for name, stats in stats_by_scenario.items():
+            print(
+                f"  {name:<48} p50 {stats['p50_ms']:>9.2f}ms "
+                f"p95 {stats['p95_ms']:>9.2f}ms p99 {stats['p99_ms']:>9.2f}ms "
+                f"{stats['queries_per_request']:>5.1f} queries "
+                f"({stats['total']} matches)"
+            )
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
@@ -0,0 +1,137 @@
+"""
+Similar Jobs Benchmark - MinHash LSH lookups against a brute-force scan
+
+Loads a SimilarJobIndex with synthetic features for a given number of jobs
+(no database involved): two to seven tags each, drawn from 300 tags the
+i-th of which is on about 1 / (i + 1) as many jobs as the first, plus the
+title tokens of one of 48 position titles. Times the load, then looks up
+the ten most similar jobs of sampled jobs, and compares each with an exact
+scan of every job's features. Reports milliseconds per lookup and recall:
+the summed similarity of the jobs found over that of the true top ten.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from app.core.change_feed import ChangeFeed
+from app.indexes.similar import SimilarJobIndex, title_features
+from benchmarks.common import percentile, write_results
+
+NUM_TAGS = 300
+
+TITLES = [
+    f"{level} {domain} {title}"
+    for level in ("Junior", "Senior", "Staff")
+    for domain in ("Data", "Backend", "Frontend", "Platform")
+    for title in ("Engineer", "Developer", "Analyst", "Manager")
+]
+
+
+def synthetic_features(num_jobs: int, seed_value: int = 42):
+    """Ids, offsets and features of num_jobs random jobs."""
+    rng = np.random.default_rng(seed_value)
+    weights = 1 / np.arange(1, NUM_TAGS + 1)
+    counts = rng.integers(2, 8, num_jobs)
+    rows = np.repeat(np.arange(num_jobs, dtype=np.int64), counts)
+    tags = rng.choice(NUM_TAGS, len(rows), p=weights / weights.sum())
+
+    titles = [np.array(title_features(title), dtype=np.int64) for title in TITLES]
+    chosen = rng.integers(0, len(TITLES), num_jobs)
+    lengths = np.array([len(tokens) for tokens in titles])[chosen]
+    title_rows = np.repeat(np.arange(num_jobs, dtype=np.int64), lengths)
+    title_tokens = np.concatenate([titles[i] for i in chosen])
+
+    # Duplicate tags of a job collapse into one feature
+    pairs = np.unique(
+        np.concatenate(
+            (
+                (rows << 32) | (tags.astype(np.int64) << 1),
+                (title_rows << 32) | title_tokens,
+            )
+        )
+    )
+    job_rows = pairs >> 32
+    features = (pairs & 0xFFFFFFFF).astype(np.uint32)
+    offsets = np.searchsorted(job_rows, np.arange(num_jobs + 1)).astype(np.int64)
+    return np.arange(1, num_jobs + 1, dtype=np.int32), offsets, features
+
+
+def exact_top(ids, offsets, features, row, limit):
+    """Similarities of the limit most similar jobs, by scanning every job."""
+    query = features[offsets[row] : offsets[row + 1]]
+    lengths = np.diff(offsets)
+    owners = np.repeat(np.arange(len(ids)), lengths)
+    shared = np.bincount(owners, weights=np.isin(features, query), minlength=len(ids))
+    scores = shared / (len(query) + lengths - shared)
+    scores[row] = 0
+    return np.sort(scores)[::-1][:limit]
+
+
+def run(num_jobs=1000000, lookups=200, limit=10):
+    """Load the index, then time lookups and brute-force scans."""
+    ids, offsets, features = synthetic_features(num_jobs)
+    feed = ChangeFeed(
+        os.path.join(tempfile.mkdtemp(prefix="job-board-feed-"), "changes.sqlite3")
+    )
+    index = SimilarJobIndex(feed)
+    started = time.perf_counter()
+    index.load_features(ids, offsets, features, feed.latest())
+    load_seconds = time.perf_counter() - started
+
+    rng = np.random.default_rng(7)
+    rows = rng.integers(0, num_jobs, lookups)
+    samples, found_total, best_total, scans = [], 0.0, 0.0, []
+    for i, row in enumerate(rows):
+        query = features[offsets[row] : offsets[row + 1]]
+        started = time.perf_counter()
+        found = index.similar(query, limit, exclude=int(ids[row]))
+        samples.append((time.perf_counter() - started) * 1e3)
+        # Scanning is slow; a few dozen give the recall
+        if i < 50:
+            started = time.perf_counter()
+            best = exact_top(ids, offsets, features, row, limit)
+            scans.append((time.perf_counter() - started) * 1e3)
+            found_total += sum(score for _, score in found)
+            best_total += best.sum()
+
+    return {
+        "jobs": num_jobs,
+        "lookups": lookups,
+        "load_seconds": round(load_seconds, 2),
+        "bucket_bytes_per_job": round(index._version.buckets.nbytes / num_jobs, 1),
+        "lookup_ms": {
+            "p50": round(percentile(samples, 50), 2),
+            "p95": round(percentile(samples, 95), 2),
+            "p99": round(percentile(samples, 99), 2),
+        },
+        "scan_ms": round(sum(scans) / len(scans), 2),
+        "recall": round(found_total / best_total, 4) if best_total else None,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark similar job lookups against a brute-force scan"
+    )
+    parser.add_argument("--jobs", type=int, default=1000000, help="Jobs indexed")
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups timed")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.jobs, args.lookups)
+
+    print(f"  load                {results['load_seconds']:>8.2f} s")
+    print(f"  buckets             {results['bucket_bytes_per_job']:>8.1f} bytes/job")
+    for name, value in results["lookup_ms"].items():
+        print(f"  lookup {name:<12} {value:>8.2f} ms")
+    print(f"  brute-force scan    {results['scan_ms']:>8.2f} ms")
+    print(f"  recall              {results['recall']:>8.4f}")
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
@@ -0,0 +1,159 @@
+"""
+String Memory Benchmark - Memory held by loaded company, location and position strings
+
+Fills a SQLite table with the three string columns of a number of
+synthetic jobs, made by the mock data import's generate_job_position,
+generate_company_name and generate_location, then loads every row twice
+and keeps the rows in memory, as a cache or index would:
+- plain: the columns as String, so every row holds freshly decoded copies
+- interned: the columns as InternedString, so rows share the dictionaries'
+  canonical objects
+
+tracemalloc measures the memory still allocated once the rows are loaded,
+including the dictionaries themselves. Reports MB per run and the top
+allocation sites of each.
+"""
+
+import gc
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+from app.core import strings
+from app.core.strings import InternedString
+from app.data.db_reset_and_import import (
+    generate_company_name,
+    generate_job_position,
+    generate_location,
+)
+from benchmarks.common import write_results
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+
+FIELDS = {
+    "job_position": "positions",
+    "company_name": "companies",
+    "job_location": "locations",
+}
+
+
+def string_table(metadata: MetaData, name: str, interned: bool) -> Table:
+    """A table of the string columns, optionally loaded through InternedString."""
+    return Table(
+        name,
+        metadata,
+        Column("id", Integer, primary_key=True),
+        *(
+            Column(
+                field,
+                InternedString(dictionary, 255) if interned else String(255),
+            )
+            for field, dictionary in FIELDS.items()
+        ),
+    )
+
+
+def synthetic_rows(num_jobs: int, seed_value: int = 42):
+    """Yield (id, position, company, location) for num_jobs random jobs."""
+    # The import script's generators draw from the global random state
+    random.seed(seed_value)
+    for pk in range(1, num_jobs + 1):
+        yield pk, generate_job_position(), generate_company_name(), generate_location()
+
+
+def fill_database(engine, table: Table, num_jobs: int, batch_size: int = 50000):
+    """Insert num_jobs synthetic rows into table."""
+    fields = ["id", *FIELDS]
+    batch = []
+    with engine.begin() as conn:
+        for row in synthetic_rows(num_jobs):
+            batch.append(dict(zip(fields, row)))
+            if len(batch) >= batch_size:
+                conn.execute(table.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(table.insert(), batch)
+
+
+def measure(engine, table: Table, top: int = 3):
+    """Load every row of table and report the memory they hold."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    with engine.connect() as conn:
+        rows = conn.execute(select(table)).all()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sites = after.compare_to(before, "lineno")[:top]
+    result = {
+        "rows": len(rows),
+        "mb": round(current / 1e6, 1),
+        "peak_mb": round(peak / 1e6, 1),
+        "distinct_objects": len(
+            {id(value) for row in rows for value in row[1:] if value is not None}
+        ),
+        "top_sites": [
+            {"site": str(stat.traceback), "mb": round(stat.size_diff / 1e6, 1)}
+            for stat in sites
+        ],
+    }
+    del rows
+    return result
+
+
+def run(num_jobs=1000000):
+    """Load the same rows as plain and interned strings."""
+    path = os.path.join(tempfile.mkdtemp(prefix="job-board-strings-"), "strings.db")
+    engine = create_engine(f"sqlite:///{path}")
+    metadata = MetaData()
+    plain = string_table(metadata, "job_strings", interned=False)
+    metadata.create_all(engine)
+    fill_database(engine, plain, num_jobs)
+
+    # The same table, read through the shared dictionaries
+    interned = string_table(MetaData(), "job_strings", interned=True)
+
+    results = {
+        "jobs": num_jobs,
+        "plain": measure(engine, plain),
+        "interned": measure(engine, interned),
+        "dictionary_sizes": {
+            name: len(dictionary) for name, dictionary in strings.DICTIONARIES.items()
+        },
+    }
+    results["saved_mb"] = round(results["plain"]["mb"] - results["interned"]["mb"], 1)
+    engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark memory held by plain and interned job strings"
+    )
+    parser.add_argument("--jobs", type=int, default=1000000, help="Rows to load")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.jobs)
+
+    for name in ("plain", "interned"):
+        result = results[name]
+        print(
+            f"  {name:<10} {result['mb']:>8.1f} MB held "
+            f"({result['peak_mb']:.1f} MB peak, "
+            f"{result['distinct_objects']} distinct string objects)"
+        )
+        for site in result["top_sites"]:
+            print(f"      {site['mb']:>8.1f} MB  {site['site']}")
+    print(f"  saved      {results['saved_mb']:>8.1f} MB")
+    print(f"  dictionaries: {results['dictionary_sizes']}")
+
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(0)
@@ -0,0 +1,29 @@
+"""Add content_hash to jobs
+
+Revision ID: 2a46dbe8e0ff
+Revises: 7b735e1961a1
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2a46dbe8e0ff"
+down_revision: Union[str, None] = "7b735e1961a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep a NULL hash; the next ingest of each job fills it in
+    op.add_column(
+        "jobs", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "content_hash")
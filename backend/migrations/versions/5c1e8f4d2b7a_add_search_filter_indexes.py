@@ -0,0 +1,60 @@
+"""Add indexes for search filters
+
+Revision ID: 5c1e8f4d2b7a
+Revises: 2a46dbe8e0ff
+Create Date: 2026-10-19 10:02:17.530842
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e8f4d2b7a"
+down_revision: Union[str, None] = "2a46dbe8e0ff"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns searched with ILIKE '%text%'
+TRIGRAM_COLUMNS = ("job_position", "company_name", "job_location")
+
+
+def upgrade() -> None:
+    # Tag filters look up job ids by tag id; lookups by job_id are already
+    # served by the unique_job_tag (job_id, tag_id) index
+    op.create_index("ix_job_tags_tag_id_job_id", "job_tags", ["tag_id", "job_id"])
+
+    # Category filters look up tag ids by category
+    op.create_index("ix_tags_category_id", "tags", ["category", "id"])
+
+    # Date range filters and newest-first listings
+    op.create_index(
+        "ix_jobs_posting_date_id",
+        "jobs",
+        [sa.text("job_posting_date DESC"), "id"],
+    )
+
+    # A B-tree index cannot serve a leading wildcard; on PostgreSQL a
+    # trigram GIN index can
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f"ix_jobs_{column}_trgm",
+                "jobs",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for column in TRIGRAM_COLUMNS:
+            op.drop_index(f"ix_jobs_{column}_trgm", table_name="jobs")
+
+    op.drop_index("ix_jobs_posting_date_id", table_name="jobs")
+    op.drop_index("ix_tags_category_id", table_name="tags")
+    op.drop_index("ix_job_tags_tag_id_job_id", table_name="job_tags")
@@ -0,0 +1,242 @@
+"""Partition jobs and job_tags by posting month
+
+Revision ID: 8d2f4c6a9e13
+Revises: 5c1e8f4d2b7a
+Create Date: 2026-10-19 11:24:05.917264
+
+On every dialect, job_tags gets a copy of its job's posting date, which
+becomes part of the unique_job_tag constraint.
+
+On PostgreSQL, jobs and job_tags are then rebuilt as tables partitioned by
+RANGE (job_posting_date), one partition per month from the oldest posting
+to three months ahead (app.core.partitions creates later ones). Unique
+indexes on a partitioned table must include the partition key, so:
+- the primary keys become (id, job_posting_date), and job_tags references
+  jobs by (job_id, job_posting_date) with ON UPDATE CASCADE, so a changed
+  posting date moves the job's tags along with it;
+- job_id uniqueness, which no partitioned index can enforce, is kept by a
+  trigger-maintained job_keys table.
+
+The data is copied within the migration's transaction; run it in a
+maintenance window.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2f4c6a9e13"
+down_revision: Union[str, None] = "5c1e8f4d2b7a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ("job_position", "company_name", "job_location")
+
+# Monthly partitions covering every stored posting and the next three months
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    partition_month date;
+    last_month date;
+BEGIN
+    -- least() and greatest() ignore the NULLs of an empty table
+    SELECT date_trunc('month', least(min(job_posting_date), current_date)),
+           date_trunc('month', greatest(max(job_posting_date),
+                                        current_date + interval '3 months'))
+      INTO partition_month, last_month
+      FROM jobs_unpartitioned;
+    WHILE partition_month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF jobs FOR VALUES FROM (%L) TO (%L)',
+            'jobs_p' || to_char(partition_month, 'YYYY_MM'),
+            partition_month,
+            CAST(partition_month + interval '1 month' AS date)
+        );
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF job_tags FOR VALUES FROM (%L) TO (%L)',
+            'job_tags_p' || to_char(partition_month, 'YYYY_MM'),
+            partition_month,
+            CAST(partition_month + interval '1 month' AS date)
+        );
+        partition_month := partition_month + interval '1 month';
+    END LOOP;
+END $$
+"""
+
+JOB_KEYS_TRIGGER = """
+CREATE FUNCTION job_keys_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    -- A row moving partitions fires DELETE then INSERT, not UPDATE
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO job_keys (job_id) VALUES (NEW.job_id);
+    ELSIF TG_OP = 'DELETE' THEN
+        DELETE FROM job_keys WHERE job_id = OLD.job_id;
+    ELSIF NEW.job_id IS DISTINCT FROM OLD.job_id THEN
+        UPDATE job_keys SET job_id = NEW.job_id WHERE job_id = OLD.job_id;
+    END IF;
+    RETURN NULL;
+END $$
+"""
+
+
+def upgrade() -> None:
+    op.add_column("job_tags", sa.Column("job_posting_date", sa.Date(), nullable=True))
+    op.execute(
+        "UPDATE job_tags SET job_posting_date = "
+        "(SELECT jobs.job_posting_date FROM jobs WHERE jobs.id = job_tags.job_id)"
+    )
+    op.drop_index("ix_job_tags_tag_id_job_id", table_name="job_tags")
+    with op.batch_alter_table("job_tags") as batch_op:
+        batch_op.alter_column("job_posting_date", nullable=False)
+        batch_op.drop_constraint("unique_job_tag", type_="unique")
+        batch_op.create_unique_constraint(
+            "unique_job_tag", ["job_id", "tag_id", "job_posting_date"]
+        )
+    op.create_index(
+        "ix_job_tags_tag_id_job_id",
+        "job_tags",
+        ["tag_id", "job_id", "job_posting_date"],
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        _partition()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _unpartition()
+
+    op.drop_index("ix_job_tags_tag_id_job_id", table_name="job_tags")
+    with op.batch_alter_table("job_tags") as batch_op:
+        batch_op.drop_constraint("unique_job_tag", type_="unique")
+        batch_op.create_unique_constraint("unique_job_tag", ["job_id", "tag_id"])
+        batch_op.drop_column("job_posting_date")
+    op.create_index("ix_job_tags_tag_id_job_id", "job_tags", ["tag_id", "job_id"])
+
+
+def _partition() -> None:
+    op.rename_table("job_tags", "job_tags_unpartitioned")
+    op.rename_table("jobs", "jobs_unpartitioned")
+    op.execute(
+        "CREATE TABLE jobs (LIKE jobs_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (job_posting_date)"
+    )
+    op.execute(
+        "CREATE TABLE job_tags (LIKE job_tags_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (job_posting_date)"
+    )
+    op.execute(CREATE_PARTITIONS)
+
+    # Load before indexing; LIKE keeps the column order
+    op.execute("INSERT INTO jobs SELECT * FROM jobs_unpartitioned")
+    op.execute("INSERT INTO job_tags SELECT * FROM job_tags_unpartitioned")
+
+    # The id sequences would be dropped with the tables that own them
+    op.execute("ALTER SEQUENCE jobs_id_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE job_tags_id_seq OWNED BY NONE")
+    op.drop_table("job_tags_unpartitioned")
+    op.drop_table("jobs_unpartitioned")
+    op.execute("ALTER SEQUENCE jobs_id_seq OWNED BY jobs.id")
+    op.execute("ALTER SEQUENCE job_tags_id_seq OWNED BY job_tags.id")
+
+    op.create_primary_key("jobs_pkey", "jobs", ["id", "job_posting_date"])
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+    op.create_index("ix_jobs_job_id", "jobs", ["job_id"])
+    _create_job_search_indexes()
+
+    op.create_primary_key("job_tags_pkey", "job_tags", ["id", "job_posting_date"])
+    op.create_index("ix_job_tags_id", "job_tags", ["id"])
+    op.create_unique_constraint(
+        "unique_job_tag", "job_tags", ["job_id", "tag_id", "job_posting_date"]
+    )
+    op.create_index(
+        "ix_job_tags_tag_id_job_id",
+        "job_tags",
+        ["tag_id", "job_id", "job_posting_date"],
+    )
+    op.create_foreign_key(
+        "job_tags_job_id_fkey",
+        "job_tags",
+        "jobs",
+        ["job_id", "job_posting_date"],
+        ["id", "job_posting_date"],
+        onupdate="CASCADE",
+    )
+    op.create_foreign_key(
+        "job_tags_tag_id_fkey", "job_tags", "tags", ["tag_id"], ["id"]
+    )
+
+    op.create_table(
+        "job_keys",
+        sa.Column("job_id", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.execute("INSERT INTO job_keys (job_id) SELECT job_id FROM jobs")
+    op.execute(JOB_KEYS_TRIGGER)
+    op.execute(
+        "CREATE TRIGGER job_keys_sync "
+        "AFTER INSERT OR DELETE OR UPDATE OF job_id ON jobs "
+        "FOR EACH ROW EXECUTE FUNCTION job_keys_sync()"
+    )
+
+
+def _unpartition() -> None:
+    op.execute("DROP TRIGGER job_keys_sync ON jobs")
+    op.execute("DROP FUNCTION job_keys_sync()")
+    op.drop_table("job_keys")
+
+    op.rename_table("job_tags", "job_tags_partitioned")
+    op.rename_table("jobs", "jobs_partitioned")
+    op.execute("CREATE TABLE jobs (LIKE jobs_partitioned INCLUDING DEFAULTS)")
+    op.execute("CREATE TABLE job_tags (LIKE job_tags_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO jobs SELECT * FROM jobs_partitioned")
+    op.execute("INSERT INTO job_tags SELECT * FROM job_tags_partitioned")
+
+    op.execute("ALTER SEQUENCE jobs_id_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE job_tags_id_seq OWNED BY NONE")
+    # Dropping a partitioned table drops its attached partitions
+    op.drop_table("job_tags_partitioned")
+    op.drop_table("jobs_partitioned")
+    op.execute("ALTER SEQUENCE jobs_id_seq OWNED BY jobs.id")
+    op.execute("ALTER SEQUENCE job_tags_id_seq OWNED BY job_tags.id")
+
+    op.create_primary_key("jobs_pkey", "jobs", ["id"])
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+    op.create_index("ix_jobs_job_id", "jobs", ["job_id"], unique=True)
+    _create_job_search_indexes()
+
+    op.create_primary_key("job_tags_pkey", "job_tags", ["id"])
+    op.create_index("ix_job_tags_id", "job_tags", ["id"])
+    op.create_unique_constraint(
+        "unique_job_tag", "job_tags", ["job_id", "tag_id", "job_posting_date"]
+    )
+    op.create_index(
+        "ix_job_tags_tag_id_job_id",
+        "job_tags",
+        ["tag_id", "job_id", "job_posting_date"],
+    )
+    op.create_foreign_key(
+        "job_tags_job_id_fkey", "job_tags", "jobs", ["job_id"], ["id"]
+    )
+    op.create_foreign_key(
+        "job_tags_tag_id_fkey", "job_tags", "tags", ["tag_id"], ["id"]
+    )
+
+
+def _create_job_search_indexes() -> None:
+    """The search indexes of revision 5c1e8f4d2b7a."""
+    op.create_index(
+        "ix_jobs_posting_date_id",
+        "jobs",
+        [sa.text("job_posting_date DESC"), "id"],
+    )
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"ix_jobs_{column}_trgm",
+            "jobs",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
@@ -0,0 +1,36 @@
+"""Add indexes for sorting searches by company
+
+Revision ID: b3f9d27e4c18
+Revises: e4a7c2b9d851
+Create Date: 2026-10-19 16:21:05.718240
+
+Searches sorted by company order by (company_name, id), comparing names by
+code point; with these indexes the first page is read in index order
+instead of sorting every match.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f9d27e4c18"
+down_revision: Union[str, None] = "e4a7c2b9d851"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Companies sort by code point, as the in-memory column store ranks
+    # them; PostgreSQL's default collation follows the locale
+    company = "company_name"
+    if op.get_bind().dialect.name == "postgresql":
+        company = sa.text('company_name COLLATE "C"')
+    op.create_index("ix_jobs_company_name_id", "jobs", [company, "id"])
+    op.create_index("ix_jobs_archive_company_name_id", "jobs_archive", [company, "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_archive_company_name_id", table_name="jobs_archive")
+    op.drop_index("ix_jobs_company_name_id", table_name="jobs")
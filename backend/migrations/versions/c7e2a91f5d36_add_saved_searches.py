@@ -0,0 +1,69 @@
+"""Add saved searches and their matches
+
+Revision ID: c7e2a91f5d36
+Revises: b3f9d27e4c18
+Create Date: 2026-10-19 18:42:13.506127
+
+New jobs are matched against saved searches as they are written; each
+match is recorded once per (search, job).
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2a91f5d36"
+down_revision: Union[str, None] = "b3f9d27e4c18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "saved_searches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("query", sa.String(length=255), nullable=True),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("tag_categories", sa.JSON(), nullable=True),
+        sa.Column("tag_expr", sa.String(length=1000), nullable=True),
+        sa.Column("date_from", sa.Date(), nullable=True),
+        sa.Column("date_to", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_saved_searches_id", "saved_searches", ["id"])
+
+    op.create_table(
+        "saved_search_matches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("saved_search_id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("matched_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["saved_search_id"], ["saved_searches.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "saved_search_id", "job_id", name="unique_saved_search_job"
+        ),
+    )
+    op.create_index("ix_saved_search_matches_id", "saved_search_matches", ["id"])
+    op.create_index(
+        "ix_saved_search_matches_search_id_id",
+        "saved_search_matches",
+        ["saved_search_id", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_saved_search_matches_search_id_id", table_name="saved_search_matches"
+    )
+    op.drop_index("ix_saved_search_matches_id", table_name="saved_search_matches")
+    op.drop_table("saved_search_matches")
+    op.drop_index("ix_saved_searches_id", table_name="saved_searches")
+    op.drop_table("saved_searches")
@@ -0,0 +1,93 @@
+"""Add archive tables for expired jobs
+
+Revision ID: e4a7c2b9d851
+Revises: 8d2f4c6a9e13
+Create Date: 2026-10-19 13:08:41.274519
+
+Archived jobs keep their primary keys. PostgreSQL sequences never reuse a
+value, but SQLite reuses the highest rowid once it is deleted, so on SQLite
+jobs is rebuilt with AUTOINCREMENT.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7c2b9d851"
+down_revision: Union[str, None] = "8d2f4c6a9e13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("job_id", sa.String(length=50), nullable=False),
+        sa.Column("job_position", sa.String(length=255), nullable=False),
+        sa.Column("job_link", sa.String(length=512), nullable=False),
+        sa.Column("company_name", sa.String(length=255), nullable=False),
+        sa.Column("company_profile", sa.String(length=512), nullable=True),
+        sa.Column("job_location", sa.String(length=255), nullable=True),
+        sa.Column("job_posting_date", sa.Date(), nullable=False),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.Date(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_jobs_archive_job_id", "jobs_archive", ["job_id"], unique=True)
+    op.create_index(
+        "ix_jobs_archive_posting_date_id",
+        "jobs_archive",
+        [sa.text("job_posting_date DESC"), "id"],
+    )
+
+    op.create_table(
+        "job_tags_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.Column("job_posting_date", sa.Date(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs_archive.id"]),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("job_id", "tag_id", name="unique_archived_job_tag"),
+    )
+    op.create_index(
+        "ix_job_tags_archive_tag_id_job_id",
+        "job_tags_archive",
+        ["tag_id", "job_id", "job_posting_date"],
+    )
+
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild_sqlite_jobs(autoincrement=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild_sqlite_jobs(autoincrement=False)
+
+    op.drop_index("ix_job_tags_archive_tag_id_job_id", table_name="job_tags_archive")
+    op.drop_table("job_tags_archive")
+    op.drop_index("ix_jobs_archive_posting_date_id", table_name="jobs_archive")
+    op.drop_index("ix_jobs_archive_job_id", table_name="jobs_archive")
+    op.drop_table("jobs_archive")
+
+
+def _rebuild_sqlite_jobs(autoincrement: bool) -> None:
+    with op.batch_alter_table(
+        "jobs", recreate="always", table_kwargs={"sqlite_autoincrement": autoincrement}
+    ):
+        pass
+    # The copied index loses its DESC
+    op.drop_index("ix_jobs_posting_date_id", table_name="jobs")
+    op.create_index(
+        "ix_jobs_posting_date_id",
+        "jobs",
+        [sa.text("job_posting_date DESC"), "id"],
+    )
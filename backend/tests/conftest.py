@@ -1,10 +1,14 @@
 import os
+import shutil
 import sys
+import tempfile
+from datetime import date
 
 import pytest
 from app.core.db import Base, get_db
 from app.main import app
-from app.models.job_tag import JobTag
+from app.models import Job, JobTag, Tag
+from app.models.tag import TagCategory
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -12,10 +16,58 @@ from sqlalchemy.orm import sessionmaker
 # Add the root directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+# Test databases live outside the source tree and are removed after the run
+TEST_DB_DIR = tempfile.mkdtemp(prefix="job-board-tests-")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Remove the test databases"""
+    shutil.rmtree(TEST_DB_DIR, ignore_errors=True)
+
+
+# Filter combinations the in-memory searches are compared with SQL on,
+# over the jobs fixture
+FILTERS = [
+    {},
+    {"location": "remote"},
+    {"location": "Berlin"},
+    {"location": "%in"},
+    {"location": "Nowhere"},
+    {"tag_categories": ["technology"]},
+    {"tag_categories": ["skill", "role"]},
+    {"tag_categories": ["TECHNOLOGY"]},
+    {"tag_categories": ["bogus"]},
+    {"date_from": date(2025, 5, 3)},
+    {"date_to": date(2025, 5, 4)},
+    {"date_from": date(2025, 5, 2), "date_to": date(2025, 5, 5)},
+    {"location": "Remote", "tag_categories": ["technology"]},
+    {"location": "Berlin", "date_from": date(2025, 5, 4)},
+    {"query": "engineer"},
+    {"query": "globex"},
+    {"query": "remote"},
+    {"query": "Data%Engineer", "tag_categories": ["skill"]},
+    {"query": "acme", "location": "remote", "date_to": date(2025, 5, 6)},
+    {"tags": ["Python"]},
+    {"tags": ["Python", "Mentoring"]},
+    {"tags": ["Nothing"]},
+    {"tags": ["Mentoring"], "tag_categories": ["technology"]},
+    {"tags": ["Python"], "tag_categories": ["skill"]},
+    {"tags": ["Python", "Mentoring"], "tag_categories": ["skill", "role"]},
+    {"tags": ["Python"], "tag_categories": ["technology"], "tag_expr": "Mentoring"},
+    {"tag_expr": "Python AND Mentoring"},
+    {"tag_expr": "Python AND NOT Mentoring"},
+    {"tag_expr": "NOT Python"},
+    {"tag_expr": "NOT (Python OR Nothing)"},
+    {"tag_expr": "Mentoring OR (NOT Python AND NOT Mentoring)"},
+    {"tag_expr": "Nothing AND Python"},
+    {"tags": ["Mentoring"], "tag_expr": "NOT Python", "location": "remote"},
+    {"query": "engineer", "tag_expr": "Python OR Mentoring"},
+]
+
 
 def create_test_engine(db_name="test.db"):
-    """Create a test database engine"""
-    database_url = f"sqlite:///./test_{db_name}"
+    """Create a test database engine, in this run's temporary directory"""
+    database_url = f"sqlite:///{os.path.join(TEST_DB_DIR, 'test_' + db_name)}"
     engine = create_engine(database_url, connect_args={"check_same_thread": False})
     return engine
 
@@ -109,3 +161,40 @@ def refresh_objects(db_session, objects):
     """Refresh database objects to get their IDs"""
     for obj in objects:
         db_session.refresh(obj)
+
+
+@pytest.fixture
+def jobs(db_session):
+    """
+    Create eight jobs across locations, dates and tag categories, on the
+    requesting module's db_session. Returns their primary keys
+    """
+    python = Tag(name="Python", category=TagCategory.TECHNOLOGY)
+    mentoring = Tag(name="Mentoring", category=TagCategory.SKILL)
+    # Tag names are only unique within a category
+    python_skill = Tag(name="Python", category=TagCategory.SKILL)
+    locations = ["Remote", "Berlin, Germany", None, "Remote (EU)"]
+    jobs = []
+    for i in range(8):
+        job = Job(
+            job_id=f"COL{i:03d}",
+            job_position="Data Engineer" if i % 3 else "Product Manager",
+            job_link=f"https://example.com/col{i}",
+            company_name="Acme" if i < 4 else "Globex",
+            job_location=locations[i % 4],
+            job_posting_date=date(2025, 5, 1 + i),
+        )
+        job.tag_relations = [
+            JobTag(tag=tag)
+            for tag, wanted in (
+                (python, i % 2 == 0),
+                (mentoring, i % 3 == 0),
+                (python_skill, i in (2, 5)),
+            )
+            if wanted
+        ]
+        db_session.add(job)
+        db_session.flush()
+        jobs.append(job)
+    db_session.commit()
+    return [job.id for job in jobs]
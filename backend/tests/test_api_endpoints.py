@@ -1,8 +1,16 @@
+import csv
+import io
+import json
 from datetime import date, timedelta
 
 import pytest
+from app.core import events
+from app.core.db import get_db
+from app.core.dependencies import get_shared_cache
+from app.core.shared_cache import SharedCache
 from app.main import app
-from app.models import Job, JobTag, Tag
+from app.managers.job_manager import JobChanges, JobManager
+from app.models import ArchivedJob, ArchivedJobTag, Job, JobTag, Tag
 from app.models.tag import TagCategory
 
 from .conftest import (
@@ -15,6 +23,12 @@ from .conftest import (
 client, engine, TestingSessionLocal = create_test_client_with_db("api.db")
 
 
+def archive_before(cutoff):
+    """Archive jobs in the database the client is using"""
+    db = next(app.dependency_overrides[get_db]())
+    JobManager(db).archive_before(cutoff)
+
+
 @pytest.fixture
 def sample_data():
     """Create sample data for testing"""
@@ -95,6 +109,8 @@ def sample_data():
         yield jobs, tags
 
         # Cleanup: remove all data
+        db.query(ArchivedJobTag).delete()
+        db.query(ArchivedJob).delete()
         db.query(JobTag).delete()
         db.query(Job).delete()
         db.query(Tag).delete()
@@ -209,6 +225,63 @@ class TestJobSearchEndpoints:
         assert len(data["items"]) == 1
         assert data["items"][0]["job_id"] == "API001"
 
+    def test_search_jobs_sorted(self, sample_data):
+        """Test searching jobs in each sort order"""
+        orders = {
+            sort: [
+                job["job_id"]
+                for job in client.get(f"/api/v1/jobs/search?sort={sort}").json()[
+                    "items"
+                ]
+            ]
+            for sort in ("newest", "oldest", "company", "relevance")
+        }
+
+        assert orders["newest"] == ["API001", "API003", "API002"]
+        assert orders["oldest"] == ["API002", "API003", "API001"]
+        assert orders["company"] == ["API003", "API001", "API002"]
+        assert orders["relevance"] == orders["newest"]
+
+        response = client.get("/api/v1/jobs/search?query=dev&sort=relevance")
+        assert [job["job_id"] for job in response.json()["items"]] == [
+            "API001",
+            "API003",
+            "API002",
+        ]
+
+    def test_search_jobs_invalid_sort(self, sample_data):
+        """Test that an unknown sort order is a validation error"""
+        response = client.get("/api/v1/jobs/search?sort=salary")
+        assert response.status_code == 422
+
+    def test_search_jobs_tag_expr(self, sample_data):
+        """Test searching jobs with a boolean tag expression"""
+        response = client.get(
+            "/api/v1/jobs/search",
+            params={"tag_expr": "(python OR docker) AND NOT kubernetes"},
+        )
+        assert response.status_code == 200
+        assert [job["job_id"] for job in response.json()["items"]] == ["API001"]
+
+        response = client.get(
+            "/api/v1/jobs/search", params={"tag_expr": "NOT backend OR python"}
+        )
+        assert response.json()["total"] == 3
+
+    def test_search_jobs_invalid_tag_expr(self, sample_data):
+        """Test that a malformed tag expression is a bad request"""
+        response = client.get(
+            "/api/v1/jobs/search", params={"tag_expr": "python AND (docker"}
+        )
+        assert response.status_code == 400
+        assert "Invalid tag expression" in response.json()["detail"]
+
+    def test_search_jobs_reports_sql_timing(self, sample_data):
+        """Test that search responses carry the SQL profile"""
+        response = client.get("/api/v1/jobs/search?tags=python")
+        assert response.status_code == 200
+        assert 'desc="2 statements"' in response.headers["server-timing"]
+
     def test_search_jobs_no_results(self, sample_data):
         """Test searching jobs with no matching results"""
         response = client.get("/api/v1/jobs/search?query=Nonexistent")
@@ -247,6 +320,42 @@ class TestJobSearchEndpoints:
         assert len(data["items"]) == 0  # No items on page 100
         assert data["page"] == 100
 
+    def test_search_include_archived(self, sample_data):
+        """Test that archived jobs are searched only when asked for"""
+        archive_before(date.today())
+
+        hot = client.get("/api/v1/jobs/search").json()
+        both = client.get("/api/v1/jobs/search?include_archived=true").json()
+
+        assert hot["total"] == 2
+        assert both["total"] == 3
+        assert {job["job_id"] for job in both["items"]} - {
+            job["job_id"] for job in hot["items"]
+        } == {"API002"}
+
+    def test_search_served_from_shared_cache(self, sample_data, tmp_path):
+        """Test that cached searches are reused until a write bumps the generation"""
+        cache = SharedCache(str(tmp_path / "responses.sqlite3"))
+        cache.install()
+        app.dependency_overrides[get_shared_cache] = lambda: cache
+        try:
+            first = client.get("/api/v1/jobs/search?tags=python&tags=django")
+            # A write that bypasses the managers publishes no event
+            db = next(app.dependency_overrides[get_db]())
+            db.query(JobTag).delete()
+            db.commit()
+            # Equivalent parameters, served without reading the database
+            cached = client.get("/api/v1/jobs/search?tags=django&tags=python")
+            events.publish(events.JOBS_CHANGED, JobChanges(deleted=frozenset({0})))
+            fresh = client.get("/api/v1/jobs/search?tags=python&tags=django")
+        finally:
+            cache.uninstall()
+
+        assert first.status_code == 200
+        assert cached.json() == first.json()
+        assert first.json()["total"] > 0
+        assert fresh.json()["total"] == 0
+
 
 class TestJobDetailEndpoints:
     """Test individual job detail endpoints"""
@@ -270,12 +379,104 @@ class TestJobDetailEndpoints:
         assert "detail" in data
         assert "not found" in data["detail"].lower()
 
+    def test_get_archived_job_by_id(self, sample_data):
+        """Test that an archived job is still served by its ID"""
+        archive_before(date.today() + timedelta(days=1))
+
+        response = client.get("/api/v1/jobs/API001")
+        assert response.status_code == 200
+        assert response.json()["job_position"] == "Senior Python Developer"
+        assert response.json()["tags"]
+
+    def test_get_similar_jobs(self, sample_data):
+        """Test that jobs sharing a tag are scored by tags and title tokens"""
+        response = client.get("/api/v1/jobs/API002/similar")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["job_id"] == "API002"
+        assert data["items"] == []
+
+        db = next(app.dependency_overrides[get_db]())
+        react = db.query(Tag).filter(Tag.name == "react").one()
+        api001 = db.query(Job).filter(Job.job_id == "API001").one()
+        db.add(
+            JobTag(
+                job_id=api001.id,
+                tag_id=react.id,
+                job_posting_date=api001.job_posting_date,
+            )
+        )
+        db.commit()
+
+        items = client.get("/api/v1/jobs/API002/similar").json()["items"]
+        assert [item["job_id"] for item in items] == ["API001"]
+        # The react tag and the "developer" token, of ten features in all
+        assert items[0]["similarity"] == 0.2
+
+    def test_get_similar_jobs_not_found(self, sample_data):
+        """Test similar jobs of a non-existent job"""
+        assert client.get("/api/v1/jobs/NONEXISTENT/similar").status_code == 404
+        assert client.get("/api/v1/jobs/API001/similar?limit=0").status_code == 422
+
     def test_get_job_by_id_empty_database(self):
         """Test getting a job when database is empty"""
         response = client.get("/api/v1/jobs/ANY_ID")
         assert response.status_code == 404
 
 
+class TestJobExportEndpoints:
+    """Test streaming job export endpoints"""
+
+    def test_export_ndjson(self, sample_data):
+        """Test exporting all jobs as NDJSON with their tags"""
+        response = client.get("/api/v1/jobs/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "jobs.ndjson" in response.headers["content-disposition"]
+
+        jobs = [json.loads(line) for line in response.text.splitlines()]
+        assert [job["job_id"] for job in jobs] == ["API001", "API002", "API003"]
+        assert sorted(jobs[0]["tags"]["technology"]) == ["django", "python"]
+        assert jobs[0]["tags"]["skill"] == ["backend"]
+        assert jobs[0]["job_posting_date"] == date.today().isoformat()
+
+    def test_export_applies_search_filters(self, sample_data):
+        """Test that export uses the same filters as search"""
+        response = client.get(
+            "/api/v1/jobs/export?tags=python&tags=react&location=New York"
+        )
+
+        jobs = [json.loads(line) for line in response.text.splitlines()]
+        assert [job["job_id"] for job in jobs] == ["API002"]
+
+    def test_export_csv(self, sample_data):
+        """Test exporting jobs as CSV with one column per tag category"""
+        response = client.get("/api/v1/jobs/export?format=csv&query=Developer")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["job_id"] for row in rows] == ["API001", "API002"]
+        assert rows[1]["skill"] == "frontend"
+        assert rows[1]["role"] == ""
+
+    def test_export_empty_result(self, sample_data):
+        """Test that an export with no matches is empty"""
+        assert client.get("/api/v1/jobs/export?query=Nope").text == ""
+
+        response = client.get("/api/v1/jobs/export?format=csv&query=Nope")
+        assert response.text.splitlines() == [
+            "job_id,job_position,job_link,company_name,job_location,"
+            "job_posting_date,role,technology,skill,methodology,tool"
+        ]
+
+    def test_export_invalid_format(self, sample_data):
+        """Test that an unknown format is rejected"""
+        response = client.get("/api/v1/jobs/export?format=xml")
+        assert response.status_code == 422
+
+
 class TestTagEndpoints:
     """Test tag-related API endpoints"""
 
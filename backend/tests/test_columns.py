@@ -0,0 +1,373 @@
+from array import array
+from datetime import date
+
+import numpy as np
+import pytest
+from app.core.change_feed import ChangeFeed
+from app.core.strings import StringDictionary
+from app.core.tag_expr import parse_tag_expr
+from app.indexes import columns
+from app.indexes.columns import ColumnStore, ColumnStoreWorker, _adopt, like_regex
+from app.indexes.snapshot import IndexSnapshot, build_snapshot
+from app.managers.job_manager import SORTS, JobManager
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.tag_manager import TagManager
+from app.models.tag import TagCategory
+from app.schemas.job_filter import JobSearchFilter
+from app.services.search import SearchService
+from sqlalchemy.orm import sessionmaker
+from tests.conftest import FILTERS, create_test_db_session, create_test_engine
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session"""
+    engine = create_test_engine("columns.db")
+    yield from create_test_db_session(engine)
+
+
+@pytest.fixture
+def feed(tmp_path):
+    """Create a change feed following this process's writes"""
+    feed = ChangeFeed(str(tmp_path / "changes.sqlite3"), max_entries=100)
+    feed.install()
+    yield feed
+    feed.uninstall()
+
+
+def managers(db_session):
+    """The managers a column store loads through"""
+    return JobManager(db_session), TagManager(db_session), JobTagManager(db_session)
+
+
+def loaded_store(db_session, feed):
+    """A column store loaded from the session's database"""
+    store = ColumnStore(feed)
+    store.load(*managers(db_session))
+    return store
+
+
+def parsed(filters):
+    """Filters with their tag expression parsed, as the managers take them"""
+    if "tag_expr" in filters:
+        return {**filters, "tag_expr": parse_tag_expr(filters["tag_expr"])}
+    return filters
+
+
+def assert_matches_sql(store, db_session, limit=3):
+    """Check every filter combination and sort order against the SQL search"""
+    job_manager = JobManager(db_session)
+    for filters in map(parsed, FILTERS):
+        expected_total = job_manager.count_by_filters(**filters)
+        for sort in (None, *SORTS):
+            for offset in range(0, expected_total + 1, limit):
+                expected = [
+                    job.id
+                    for job in job_manager.find_by_filters(
+                        **filters, limit=limit, offset=offset, sort=sort
+                    )
+                ]
+                total, pks = store.search(
+                    **filters, limit=limit, offset=offset, sort=sort
+                )
+                assert (total, pks) == (expected_total, expected), (filters, sort)
+
+
+class TestLikeRegex:
+    """Test cases for matching ILIKE patterns in memory"""
+
+    def test_substring_case_insensitive(self):
+        """Test that the value matches anywhere, ignoring case"""
+        assert like_regex("remote").search("Fully REMOTE")
+        assert not like_regex("remote").search("Berlin")
+
+    def test_wildcards(self):
+        """Test that % and _ keep their LIKE meaning and the rest is literal"""
+        assert like_regex("Ber%ny").search("Berlin, Germany")
+        assert like_regex("B_rlin").search("Berlin")
+        assert not like_regex("B.rlin").search("Berlin")
+
+
+class TestAdoptCodes:
+    """Test cases for taking over another dictionary's codes"""
+
+    def test_same_codes_are_not_copied(self):
+        """Test that codes already agreeing are used in place"""
+        dictionary = StringDictionary("test")
+        source = array("i", [1, -1, 0])
+
+        adopted = _adopt(memoryview(source), ["Remote", "Berlin"], dictionary)
+        assert adopted.tolist() == [1, -1, 0]
+        assert np.shares_memory(adopted, np.frombuffer(source, dtype=np.int32))
+
+    def test_different_codes_are_translated(self):
+        """Test that codes are translated where the dictionaries disagree"""
+        dictionary = StringDictionary("test")
+        dictionary.encode(["Paris", "Berlin"])
+        codes = memoryview(array("i", [1, -1, 0]))
+
+        adopted = _adopt(codes, ["Remote", "Berlin"], dictionary)
+        assert [dictionary.value(code) for code in adopted] == [
+            "Berlin",
+            None,
+            "Remote",
+        ]
+
+
+class TestChangeFeed:
+    """Test cases for the host-local change feed"""
+
+    def test_records_published_changes(self, db_session, jobs, feed):
+        """Test that job and job tag changes are logged by primary key"""
+        start = feed.latest()
+        JobManager(db_session).update("COL001", {"job_position": "Staff Engineer"})
+        JobTagManager(db_session).update_job_tags(jobs[2], [])
+
+        latest, pks = feed.changes_since(start)
+        assert latest > start
+        assert pks == {jobs[1], jobs[2]}
+        assert feed.changes_since(latest) == (latest, set())
+
+    def test_pruned_entries_cannot_be_read(self, tmp_path):
+        """Test that a reader behind the pruned part of the log gets None"""
+        feed = ChangeFeed(str(tmp_path / "changes.sqlite3"), max_entries=3)
+        for pk in range(1, 11):
+            feed.record([pk])
+
+        assert feed.changes_since(0) is None
+        latest = feed.latest()
+        assert feed.changes_since(latest - 1) == (latest, {10})
+        feed.close()
+
+
+class TestColumnStore:
+    """Test cases for the columnar in-memory search"""
+
+    def test_load_matches_sql(self, db_session, jobs, feed):
+        """Test that searches over columns loaded from the database match SQL"""
+        store = loaded_store(db_session, feed)
+
+        assert store.loaded
+        assert len(store) == 8
+        assert_matches_sql(store, db_session)
+
+    def test_location_table_lookup_matches_sql(
+        self, db_session, jobs, feed, monkeypatch
+    ):
+        """Test that locations matching many codes are looked up per row"""
+        monkeypatch.setattr(columns, "_MAX_COMPARED_CODES", 0)
+        store = loaded_store(db_session, feed)
+
+        assert_matches_sql(store, db_session)
+
+    def test_sorted_row_order_walk_matches_sql(
+        self, db_session, jobs, feed, monkeypatch
+    ):
+        """Test that sorted pages found by walking a row order match SQL"""
+        monkeypatch.setattr(columns, "_WALK_FACTOR", 0)
+        store = loaded_store(db_session, feed)
+
+        assert_matches_sql(store, db_session)
+        assert set(store._version.row_orders) == {"newest", "company"}
+
+    def test_sparse_tag_postings_match_sql(self, db_session, jobs, feed, monkeypatch):
+        """Test that tag set operations without bitmaps match SQL"""
+        monkeypatch.setattr(columns, "_DENSE_FACTOR", 0)
+        store = loaded_store(db_session, feed)
+
+        assert_matches_sql(store, db_session)
+
+    def test_tag_postings(self, db_session, jobs, feed):
+        """Test that each tag's postings are the ascending rows of its jobs"""
+        store = loaded_store(db_session, feed)
+        version = store._version
+        python_ids = store._tag_ids["Python"]
+
+        assert len(python_ids) == 2
+        rows = np.unique(
+            np.concatenate([version.postings[tag_id] for tag_id in python_ids])
+        )
+        assert version.base.ids[rows].tolist() == [jobs[i] for i in (0, 2, 4, 5, 6)]
+
+    def test_unknown_sort(self, db_session, jobs, feed):
+        """Test that an unknown sort order is rejected"""
+        store = loaded_store(db_session, feed)
+
+        with pytest.raises(ValueError):
+            store.search(sort="salary")
+
+    def test_snapshot_matches_sql(self, db_session, jobs, feed, tmp_path):
+        """Test that columns mapped from a snapshot match SQL"""
+        path = str(tmp_path / "search.snap")
+        build_snapshot(*managers(db_session), path)
+        store = ColumnStore(feed)
+        snapshot = IndexSnapshot(path)
+        assert not store.load_snapshot(snapshot)
+
+        build_snapshot(*managers(db_session), path, change_seq=feed.latest())
+        snapshot.close()
+        snapshot = IndexSnapshot(path)
+        assert store.load_snapshot(snapshot)
+        assert store.change_seq == snapshot.change_seq
+        assert_matches_sql(store, db_session)
+
+    def test_snapshot_postings_of_missing_jobs(self, db_session, jobs, feed, tmp_path):
+        """Test that snapshot postings naming jobs it lacks are skipped"""
+        path = str(tmp_path / "search.snap")
+        JobManager(db_session).delete("COL003")
+        build_snapshot(*managers(db_session), path, change_seq=feed.latest())
+        with IndexSnapshot(path) as snapshot:
+            tag_id = snapshot.header["tags"][0][0]
+            tagged = list(snapshot.tag_postings(tag_id))
+            offset = snapshot.header["sections"]["tags_postings"][0]
+        assert len(tagged) >= 2
+        # A deleted job, and one past the last
+        with open(path, "r+b") as f:
+            f.seek(offset)
+            f.write(array("i", [jobs[3]] + tagged[1:-1] + [jobs[7] + 1]).tobytes())
+
+        store = ColumnStore(feed)
+        snapshot = IndexSnapshot(path)
+        assert store.load_snapshot(snapshot)
+        version = store._version
+        assert version.base.ids[version.postings[tag_id]].tolist() == tagged[1:-1]
+
+    def test_catch_up_follows_writes(self, db_session, jobs, feed):
+        """Test that created, updated, retagged and deleted jobs are reloaded"""
+        store = loaded_store(db_session, feed)
+        job_manager, tag_manager, job_tag_manager = managers(db_session)
+
+        job_manager.update(
+            "COL001",
+            {"job_location": "Lisbon", "job_posting_date": date(2025, 6, 1)},
+        )
+        job_tag_manager.update_job_tags(jobs[0], [])
+        job_manager.delete("COL005")
+        created = job_manager.create(
+            {
+                "job_id": "COL100",
+                "job_position": "Data Engineer",
+                "job_link": "https://example.com/col100",
+                "company_name": "Initech",
+                "job_location": "Lisbon",
+                "job_posting_date": date(2025, 5, 2),
+            }
+        )
+        tool = tag_manager.create("Docker", TagCategory.TOOL)
+        job_tag_manager.update_job_tags(created.id, [tool.id])
+
+        assert store.catch_up(*managers(db_session))
+        assert store.change_seq == feed.latest()
+        assert len(store) == 8
+        assert store.search(location="lisbon") == (2, sorted([jobs[1], created.id]))
+        assert store.search(tag_categories=["tool"]) == (1, [created.id])
+        assert store.search(tag_expr=parse_tag_expr("Docker OR Nothing")) == (
+            1,
+            [created.id],
+        )
+        assert_matches_sql(store, db_session)
+
+    def test_compaction(self, db_session, jobs, feed, monkeypatch):
+        """Test that an outgrown delta is folded into the base columns"""
+        monkeypatch.setattr(columns, "MIN_COMPACT_ROWS", 1)
+        store = loaded_store(db_session, feed)
+        job_manager = JobManager(db_session)
+
+        job_manager.update("COL002", {"job_location": "Berlin"})
+        store.catch_up(*managers(db_session))
+        assert len(store._version.delta) == 1
+
+        job_manager.update("COL003", {"job_location": "Berlin"})
+        store.catch_up(*managers(db_session))
+        assert len(store._version.delta) == 0
+        assert store._version.live is None
+        assert_matches_sql(store, db_session)
+
+    def test_stale_after_falling_behind_the_feed(self, db_session, jobs, tmp_path):
+        """Test that a store behind the pruned feed stops answering"""
+        feed = ChangeFeed(str(tmp_path / "changes.sqlite3"), max_entries=2)
+        store = loaded_store(db_session, feed)
+        feed.record([jobs[0], jobs[1], jobs[2]])
+        feed.record([jobs[3], jobs[4], jobs[5]])
+
+        assert not store.catch_up(*managers(db_session))
+        assert store.stale
+        feed.close()
+
+    def test_not_loaded(self, feed):
+        """Test that an empty store neither catches up nor searches"""
+        store = ColumnStore(feed)
+
+        assert not store.loaded
+        assert not store.catch_up(None, None, None)
+        with pytest.raises(RuntimeError):
+            store.search()
+
+
+class TestColumnStoreWorker:
+    """Test cases for loading the column store in the background"""
+
+    def test_refresh_loads_snapshot_or_database(self, db_session, jobs, feed, tmp_path):
+        """Test that the worker prefers a usable snapshot to the database"""
+        session_factory = sessionmaker(bind=db_session.get_bind())
+        path = str(tmp_path / "search.snap")
+
+        store = ColumnStore(feed)
+        ColumnStoreWorker(store, session_factory, path, 60).refresh()
+        assert store._snapshot is None
+        assert len(store) == 8
+
+        job_manager, tag_manager, job_tag_manager = managers(db_session)
+        build_snapshot(
+            job_manager, tag_manager, job_tag_manager, path, change_seq=feed.latest()
+        )
+        store = ColumnStore(feed)
+        ColumnStoreWorker(store, session_factory, path, 60).refresh()
+        assert store._snapshot is not None
+        assert len(store) == 8
+
+    def test_refresh_falls_back_from_a_bad_snapshot(
+        self, db_session, jobs, feed, tmp_path
+    ):
+        """Test that an unreadable snapshot is skipped for the database"""
+        path = tmp_path / "search.snap"
+        path.write_bytes(b"\0" * 64)
+
+        store = ColumnStore(feed)
+        worker = ColumnStoreWorker(
+            store, sessionmaker(bind=db_session.get_bind()), str(path), 60
+        )
+        worker.refresh()
+        assert store._snapshot is None
+        assert len(store) == 8
+
+
+class TestSearchServiceColumns:
+    """Test cases for searches answered by the column store"""
+
+    def test_column_path_matches_sql(self, db_session, jobs, feed):
+        """Test that the service returns the same responses on both paths"""
+        job_manager, tag_manager, job_tag_manager = managers(db_session)
+        sql = SearchService(job_manager, tag_manager, job_tag_manager)
+        in_memory = SearchService(
+            job_manager,
+            tag_manager,
+            job_tag_manager,
+            loaded_store(db_session, feed),
+        )
+
+        for filters in FILTERS:
+            for sort in (None, *SORTS):
+                params = JobSearchFilter(**filters, limit=3, page=2, sort=sort)
+                assert in_memory.search_jobs(params) == sql.search_jobs(params)
+
+    def test_unsupported_filters_use_sql(self, db_session, jobs, feed):
+        """Test that archive searches bypass the column store"""
+        store = loaded_store(db_session, feed)
+        service = SearchService(*managers(db_session), store)
+
+        assert service._use_column_store(JobSearchFilter(location="Remote"))
+        assert service._use_column_store(JobSearchFilter(query="Engineer"))
+        assert service._use_column_store(JobSearchFilter(tags=["Python"]))
+        assert service._use_column_store(JobSearchFilter(tag_expr="NOT Python"))
+        assert not service._use_column_store(JobSearchFilter(include_archived=True))
@@ -0,0 +1,94 @@
+import json
+import os
+from collections import Counter
+from datetime import date
+
+from app.data.generate_dataset import (
+    generate_dataset,
+    iter_dataset,
+    job_id_for_index,
+    job_id_permutation,
+)
+
+ANCHOR = date(2025, 6, 1)
+
+
+def read_lines(output_dir):
+    """Read every raw JSONL line of a generated dataset"""
+    lines = []
+    for name in sorted(os.listdir(output_dir)):
+        if name.endswith(".jsonl"):
+            with open(os.path.join(output_dir, name)) as f:
+                lines.extend(f.readlines())
+    return lines
+
+
+class TestGenerateDataset:
+    """Test cases for the parallel mock dataset generator"""
+
+    def test_job_ids_are_unique(self):
+        """Test that the job ID permutation never collides"""
+        permutation = job_id_permutation(7)
+        job_ids = [job_id_for_index(i, permutation) for i in range(50_000)]
+
+        assert len(set(job_ids)) == len(job_ids)
+        assert all(len(job_id) == 10 and job_id.isdigit() for job_id in job_ids)
+
+    def test_shards_and_manifest(self, tmp_path):
+        """Test that jobs are split into shards described by the manifest"""
+        manifest = generate_dataset(
+            2500, str(tmp_path), shard_size=1000, workers=1, anchor_date=ANCHOR
+        )
+
+        assert [shard["jobs"] for shard in manifest["shards"]] == [1000, 1000, 500]
+        with open(tmp_path / "manifest.json") as f:
+            assert json.load(f) == manifest
+
+        jobs = list(iter_dataset(str(tmp_path)))
+        assert len(jobs) == 2500
+        assert len({job["job_id"] for job in jobs}) == 2500
+        for job in jobs:
+            assert job["tags"]["role"]
+            assert date.fromisoformat(job["job_posting_date"]) < ANCHOR
+
+    def test_output_is_independent_of_worker_count(self, tmp_path):
+        """Test that the same seed produces identical output in parallel"""
+        serial_dir = tmp_path / "serial"
+        parallel_dir = tmp_path / "parallel"
+
+        generate_dataset(
+            1200, str(serial_dir), seed=3, shard_size=300, workers=1, anchor_date=ANCHOR
+        )
+        generate_dataset(
+            1200,
+            str(parallel_dir),
+            seed=3,
+            shard_size=300,
+            workers=2,
+            anchor_date=ANCHOR,
+        )
+
+        assert read_lines(serial_dir) == read_lines(parallel_dir)
+
+    def test_different_seeds_differ(self, tmp_path):
+        """Test that changing the seed changes the dataset"""
+        generate_dataset(
+            100, str(tmp_path / "a"), seed=1, workers=1, anchor_date=ANCHOR
+        )
+        generate_dataset(
+            100, str(tmp_path / "b"), seed=2, workers=1, anchor_date=ANCHOR
+        )
+
+        assert read_lines(tmp_path / "a") != read_lines(tmp_path / "b")
+
+    def test_popularity_is_skewed(self, tmp_path):
+        """Test that companies and locations follow a Zipf-like distribution"""
+        generate_dataset(5000, str(tmp_path), workers=1, anchor_date=ANCHOR)
+        jobs = list(iter_dataset(str(tmp_path)))
+
+        companies = Counter(job["company_name"] for job in jobs).most_common()
+        locations = Counter(job["job_location"] for job in jobs).most_common()
+
+        # The most popular value is far more common than the median one
+        assert companies[0][1] > 5 * companies[len(companies) // 2][1]
+        assert locations[0][1] > 3 * locations[len(locations) // 2][1]
@@ -0,0 +1,238 @@
+import asyncio
+import json
+
+import pytest
+from app.core.db import Base, get_db
+from app.main import app
+from app.models import Job, JobTag, Tag
+from app.services.ingest import iter_json_array, iter_ndjson
+from fastapi.testclient import TestClient
+
+from .conftest import create_override_get_db, create_test_engine, create_test_session
+
+
+def make_record(job_id, **overrides):
+    """Build a valid ingest record"""
+    record = {
+        "job_id": job_id,
+        "job_position": "Backend Engineer",
+        "job_link": f"https://example.com/{job_id}",
+        "company_name": "TechCorp",
+        "job_location": "Remote",
+        "job_posting_date": "2025-05-01",
+        "tags": {"technology": ["Python", "FastAPI"], "skill": ["Database"]},
+    }
+    record.update(overrides)
+    return record
+
+
+def ndjson(records):
+    """Serialize records as NDJSON"""
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+def parse(parser, payload, chunk_size=7):
+    """Run an async parser over a payload split into small byte chunks"""
+
+    async def chunks():
+        data = payload.encode()
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+
+    async def collect():
+        return [item async for item in parser(chunks())]
+
+    return asyncio.run(collect())
+
+
+@pytest.fixture
+def ingest_client():
+    """Create a test client backed by a fresh database"""
+    engine = create_test_engine("ingest.db")
+    Base.metadata.create_all(bind=engine)
+    testing_session_local = create_test_session(engine)
+    app.dependency_overrides[get_db] = create_override_get_db(testing_session_local)
+
+    db = testing_session_local()
+    try:
+        yield TestClient(app), db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+class TestIngestParsers:
+    """Test cases for the streaming NDJSON and JSON array parsers"""
+
+    def test_ndjson_across_chunk_boundaries(self):
+        """Test that records split across chunks are reassembled"""
+        records = [make_record("P1"), make_record("P2", job_position="Café Ünïcode")]
+
+        parsed = parse(iter_ndjson, ndjson(records) + "\n")
+
+        assert [(index, raw) for index, raw, _ in parsed] == list(enumerate(records))
+
+    def test_ndjson_reports_malformed_lines(self):
+        """Test that a malformed line fails alone"""
+        payload = json.dumps(make_record("P1")) + "\n{not json}\n[1]"
+
+        parsed = parse(iter_ndjson, payload)
+
+        assert parsed[0][2] is None
+        assert parsed[1][2].startswith("Malformed JSON")
+        assert parsed[2][2] == "Record must be a JSON object"
+
+    def test_json_array_across_chunk_boundaries(self):
+        """Test that array elements are decoded incrementally"""
+        records = [make_record(f"P{i}") for i in range(5)]
+
+        parsed = parse(iter_json_array, " \n" + json.dumps(records, indent=2))
+
+        assert [raw for _, raw, _ in parsed] == records
+        assert all(error is None for _, _, error in parsed)
+
+    def test_json_array_errors(self):
+        """Test non-array bodies and truncated arrays"""
+        assert parse(iter_json_array, '{"job_id": "P1"}')[0][2] == (
+            "Request body must be a JSON array"
+        )
+        assert parse(iter_json_array, "[]") == []
+
+        truncated = parse(iter_json_array, json.dumps([make_record("P1")])[:-10])
+        assert truncated[-1][2].startswith("Malformed JSON")
+
+    def test_json_array_separators(self):
+        """Test that elements must be separated by exactly one comma"""
+        first, second = (json.dumps(make_record(f"P{i}")) for i in range(2))
+
+        for payload in (
+            f"[{first}{second}]",
+            f"[{first},,{second}]",
+            f"[,{first}]",
+            f"[{first},]",
+            f"[{first} {second}]",
+        ):
+            parsed = parse(iter_json_array, payload)
+            assert parsed[-1][2].startswith("Malformed JSON"), payload
+            assert all(error is None for _, _, error in parsed[:-1])
+
+        parsed = parse(iter_json_array, f"[ {first} ,\n {second} ]")
+        assert [error for _, _, error in parsed] == [None, None]
+
+
+class TestBulkUpsertEndpoint:
+    """Test cases for POST /api/v1/jobs/bulk"""
+
+    def test_creates_jobs_from_ndjson(self, ingest_client):
+        """Test that NDJSON records are created with their tags"""
+        client, db = ingest_client
+        records = [make_record("B1"), make_record("B2")]
+
+        response = client.post(
+            "/api/v1/jobs/bulk",
+            content=ndjson(records),
+            headers={"content-type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["total"], data["created"], data["updated"]) == (2, 2, 0)
+        assert [r["status"] for r in data["results"]] == ["created", "created"]
+        assert db.query(Job).count() == 2
+        assert db.query(Tag).count() == 3
+        assert db.query(JobTag).count() == 6
+
+        job = client.get("/api/v1/jobs/B1").json()
+        assert sorted(job["tags"]["technology"]) == ["FastAPI", "Python"]
+
+    def test_upserts_by_job_id_from_json_array(self, ingest_client):
+        """Test that re-sent records update jobs and their tags"""
+        client, db = ingest_client
+        client.post("/api/v1/jobs/bulk", json=[make_record("B1")])
+
+        response = client.post(
+            "/api/v1/jobs/bulk",
+            json=[
+                make_record(
+                    "B1", job_position="Staff Engineer", tags={"tool": ["Git"]}
+                ),
+                make_record("B2"),
+            ],
+        )
+
+        data = response.json()
+        assert [r["status"] for r in data["results"]] == ["updated", "created"]
+        assert db.query(Job).count() == 2
+
+        job = client.get("/api/v1/jobs/B1").json()
+        assert job["job_position"] == "Staff Engineer"
+        assert job["tags"] == {"tool": ["Git"]}
+
+    def test_unchanged_records_are_skipped(self, ingest_client):
+        """Test that re-sent identical records are reported as unchanged"""
+        client, db = ingest_client
+        client.post("/api/v1/jobs/bulk", json=[make_record("B1"), make_record("B2")])
+
+        data = client.post(
+            "/api/v1/jobs/bulk",
+            json=[
+                make_record(
+                    "B1",
+                    tags={"skill": ["Database"], "technology": ["FastAPI", "Python"]},
+                ),
+                make_record("B2", job_location="Berlin"),
+            ],
+        ).json()
+
+        assert (data["created"], data["updated"], data["unchanged"]) == (0, 1, 1)
+        assert [r["status"] for r in data["results"]] == ["unchanged", "updated"]
+        assert db.query(JobTag).count() == 6
+
+    def test_reports_invalid_records_individually(self, ingest_client):
+        """Test that invalid records fail without affecting valid ones"""
+        client, db = ingest_client
+        records = [
+            make_record("B1"),
+            make_record("B2", job_posting_date="not-a-date"),
+            make_record("B3", tags={"unknown": ["x"]}),
+            {"job_position": "Missing everything"},
+        ]
+
+        data = client.post("/api/v1/jobs/bulk", json=records).json()
+
+        assert (data["total"], data["created"], data["failed"]) == (4, 1, 3)
+        statuses = {r["index"]: r for r in data["results"]}
+        assert statuses[0]["status"] == "created"
+        assert statuses[1]["job_id"] == "B2"
+        assert any("job_posting_date" in e for e in statuses[1]["errors"])
+        assert statuses[3]["job_id"] is None
+        assert db.query(Job).count() == 1
+
+    def test_repeated_job_id_applies_in_order(self, ingest_client):
+        """Test that a later record for the same job wins"""
+        client, _ = ingest_client
+        records = [
+            make_record("B1", job_position="First"),
+            make_record("B1", job_position="Second"),
+        ]
+
+        data = client.post("/api/v1/jobs/bulk?chunk_size=100", json=records).json()
+
+        assert [r["status"] for r in data["results"]] == ["created", "updated"]
+        assert client.get("/api/v1/jobs/B1").json()["job_position"] == "Second"
+
+    def test_chunked_transactions(self, ingest_client):
+        """Test that records are written across several chunks"""
+        client, db = ingest_client
+        records = [make_record(f"C{i}") for i in range(25)]
+
+        data = client.post("/api/v1/jobs/bulk?chunk_size=10", json=records).json()
+
+        assert data["created"] == 25
+        assert db.query(Job).count() == 25
+
+    def test_chunk_size_is_validated(self, ingest_client):
+        """Test that an out-of-range chunk size is rejected"""
+        client, _ = ingest_client
+        response = client.post("/api/v1/jobs/bulk?chunk_size=0", json=[])
+        assert response.status_code == 422
@@ -0,0 +1,779 @@
+from datetime import date
+
+import pytest
+from app.core import events
+from app.core.slow_queries import explain
+from app.core.tag_expr import parse_tag_expr
+from app.managers.job_manager import (
+    SEARCH_FIND,
+    SEARCH_FIND_ALL,
+    JobChanges,
+    JobManager,
+    _search_statement,
+)
+from app.managers.job_tag_manager import JobTagDiff, JobTagManager
+from app.managers.tag_manager import TagManager
+from app.models import ArchivedJob, ArchivedJobTag, Job, JobTag, Tag
+from app.models.job import compute_content_hash
+from app.models.tag import TagCategory
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from tests.conftest import create_test_db_session, create_test_engine
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session"""
+    engine = create_test_engine("managers.db")
+    yield from create_test_db_session(engine)
+
+
+@pytest.fixture
+def tag_manager(db_session):
+    """Fixture that provides a TagManager instance"""
+    return TagManager(db_session)
+
+
+@pytest.fixture
+def job_tag_manager(db_session):
+    """Fixture that provides a JobTagManager instance"""
+    return JobTagManager(db_session)
+
+
+@pytest.fixture
+def job_and_tags(db_session):
+    """Create one job and a handful of tags. Returns (job ID, tag IDs)"""
+    job = Job(
+        job_id="MGR001",
+        job_position="Backend Engineer",
+        job_link="https://example.com/mgr001",
+        company_name="TechCorp",
+        job_location="Remote",
+        job_posting_date=date.today(),
+    )
+    tags = [Tag(name=f"tag-{i}", category=TagCategory.TECHNOLOGY) for i in range(5)]
+    db_session.add_all([job] + tags)
+    db_session.commit()
+    return job.id, [tag.id for tag in tags]
+
+
+@pytest.fixture
+def statements(db_session):
+    """Record the SQL statements executed through the session's engine"""
+    executed = []
+    engine = db_session.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestTagManagerBulkGetOrCreate:
+    """Test cases for TagManager.bulk_get_or_create"""
+
+    def test_creates_all_new_tags_in_one_statement(self, tag_manager, statements):
+        """Test that new tags are created with a single INSERT"""
+        pairs = [
+            ("python", TagCategory.TECHNOLOGY),
+            ("react", TagCategory.TECHNOLOGY),
+            ("backend", TagCategory.SKILL),
+        ]
+
+        tag_ids = tag_manager.bulk_get_or_create(pairs)
+
+        assert set(tag_ids) == set(pairs)
+        assert len(set(tag_ids.values())) == 3
+        assert len([s for s in statements if s.startswith("INSERT")]) == 1
+        assert not [s for s in statements if s.startswith("SELECT")]
+
+    def test_returns_existing_tags(self, tag_manager, db_session, statements):
+        """Test that existing tags are looked up instead of duplicated"""
+        existing = Tag(name="python", category=TagCategory.TECHNOLOGY)
+        db_session.add(existing)
+        db_session.commit()
+        existing_id = existing.id
+        statements.clear()
+
+        tag_ids = tag_manager.bulk_get_or_create(
+            [("python", TagCategory.TECHNOLOGY), ("docker", TagCategory.TOOL)]
+        )
+
+        assert len([s for s in statements if s.startswith("INSERT")]) == 1
+        assert len([s for s in statements if s.startswith("SELECT")]) == 1
+        assert tag_ids[("python", TagCategory.TECHNOLOGY)] == existing_id
+        assert db_session.query(Tag).count() == 2
+
+    def test_same_name_in_different_categories(self, tag_manager, db_session):
+        """Test that uniqueness is scoped to (name, category)"""
+        tag_ids = tag_manager.bulk_get_or_create(
+            [("Design", TagCategory.SKILL), ("Design", TagCategory.ROLE)]
+        )
+
+        assert len(set(tag_ids.values())) == 2
+        assert db_session.query(Tag).count() == 2
+
+    def test_accepts_category_strings_and_duplicates(self, tag_manager, db_session):
+        """Test that category values are coerced and duplicates collapsed"""
+        tag_ids = tag_manager.bulk_get_or_create(
+            [("python", "technology"), ("python", TagCategory.TECHNOLOGY)]
+        )
+
+        assert list(tag_ids) == [("python", TagCategory.TECHNOLOGY)]
+        assert db_session.query(Tag).count() == 1
+
+    def test_empty_input(self, tag_manager, statements):
+        """Test that no statements are issued for an empty input"""
+        assert tag_manager.bulk_get_or_create([]) == {}
+        assert statements == []
+
+    def test_get_or_create_respects_category(self, tag_manager):
+        """Test that get_or_create does not reuse a tag from another category"""
+        skill = tag_manager.get_or_create("Design", TagCategory.SKILL)
+        role = tag_manager.get_or_create("Design", TagCategory.ROLE)
+
+        assert skill.id != role.id
+        assert tag_manager.get_or_create("Design", TagCategory.SKILL).id == skill.id
+
+
+class TestJobTagManagerInsertRelations:
+    """Test cases for JobTagManager.insert_relations"""
+
+    def test_inserts_without_refresh(
+        self, job_tag_manager, job_and_tags, db_session, statements
+    ):
+        """Test that relations are inserted without per-row SELECTs"""
+        job_id, tag_ids = job_and_tags
+
+        ids = job_tag_manager.insert_relations((job_id, tag_id) for tag_id in tag_ids)
+
+        assert len(ids) == 5
+        assert len([s for s in statements if s.startswith("INSERT")]) == 1
+        assert not [s for s in statements if s.startswith("SELECT")]
+        relations = db_session.query(JobTag).filter(JobTag.job_id == job_id).all()
+        assert sorted(r.id for r in relations) == sorted(ids)
+        assert all(r.created_at is not None for r in relations)
+
+    def test_skips_existing_pairs(self, job_tag_manager, job_and_tags, db_session):
+        """Test that already related pairs are ignored"""
+        job_id, tag_ids = job_and_tags
+        job_tag_manager.insert_relations([(job_id, tag_ids[0])])
+
+        ids = job_tag_manager.insert_relations(
+            [(job_id, tag_ids[0]), (job_id, tag_ids[1]), (job_id, tag_ids[1])]
+        )
+
+        assert len(ids) == 1
+        assert db_session.query(JobTag).count() == 2
+
+    def test_defers_commit(self, job_tag_manager, job_and_tags, db_session):
+        """Test that commit=False leaves the transaction open"""
+        job_id, tag_ids = job_and_tags
+
+        job_tag_manager.insert_relations([(job_id, tag_ids[0])], commit=False)
+        db_session.rollback()
+
+        assert db_session.query(JobTag).count() == 0
+
+    def test_empty_input(self, job_tag_manager, statements):
+        """Test that no statements are issued for an empty input"""
+        assert job_tag_manager.insert_relations([]) == []
+        assert statements == []
+
+
+class TestJobTagManagerUpdateJobTags:
+    """Test cases for diff-based JobTagManager.update_job_tags"""
+
+    @pytest.fixture
+    def published(self):
+        """Collect JOB_TAGS_CHANGED events"""
+        received = []
+        events.subscribe(events.JOB_TAGS_CHANGED, received.extend)
+        yield received
+        events.unsubscribe(events.JOB_TAGS_CHANGED, received.extend)
+
+    def test_writes_only_the_difference(
+        self, job_tag_manager, job_and_tags, db_session, statements
+    ):
+        """Test that unchanged relations are left in place"""
+        job_id, tag_ids = job_and_tags
+        job_tag_manager.insert_relations([(job_id, t) for t in tag_ids[:3]])
+        kept = {
+            r.tag_id: r.id
+            for r in db_session.query(JobTag).filter(JobTag.tag_id.in_(tag_ids[1:3]))
+        }
+        statements.clear()
+
+        diff = job_tag_manager.update_job_tags(job_id, tag_ids[1:4])
+
+        assert diff == JobTagDiff(
+            job_id, added=frozenset({tag_ids[3]}), removed=frozenset({tag_ids[0]})
+        )
+        assert len([s for s in statements if s.startswith("DELETE")]) == 1
+        assert len([s for s in statements if s.startswith("INSERT")]) == 1
+        relations = {r.tag_id: r.id for r in job_tag_manager.find_by_job_id(job_id)}
+        assert set(relations) == set(tag_ids[1:4])
+        assert all(relations[tag_id] == kept[tag_id] for tag_id in kept)
+
+    def test_no_changes_issues_no_writes(
+        self, job_tag_manager, job_and_tags, statements, published
+    ):
+        """Test that an identical tag set is a no-op"""
+        job_id, tag_ids = job_and_tags
+        job_tag_manager.insert_relations([(job_id, t) for t in tag_ids])
+        published.clear()
+        statements.clear()
+
+        diff = job_tag_manager.update_job_tags(job_id, tag_ids)
+
+        assert not diff
+        assert [s for s in statements if s.startswith(("INSERT", "DELETE"))] == []
+        assert published == []
+
+    def test_publishes_diff_after_commit(
+        self, job_tag_manager, job_and_tags, db_session, published
+    ):
+        """Test that the diff is reported only once the transaction commits"""
+        job_id, tag_ids = job_and_tags
+
+        diff = job_tag_manager.update_job_tags(job_id, tag_ids[:2], commit=False)
+        assert published == []
+
+        db_session.commit()
+        assert published == [diff]
+        assert diff.affected_tag_ids == frozenset(tag_ids[:2])
+
+    def test_rollback_discards_diff(
+        self, job_tag_manager, job_and_tags, db_session, published
+    ):
+        """Test that a rolled back update publishes nothing"""
+        job_id, tag_ids = job_and_tags
+
+        job_tag_manager.update_job_tags(job_id, tag_ids[:2], commit=False)
+        db_session.rollback()
+        db_session.commit()
+
+        assert published == []
+        assert job_tag_manager.find_by_job_id(job_id) == []
+
+    def test_clearing_all_tags(self, job_tag_manager, job_and_tags):
+        """Test that an empty tag list removes every relation"""
+        job_id, tag_ids = job_and_tags
+        job_tag_manager.insert_relations([(job_id, t) for t in tag_ids])
+
+        diff = job_tag_manager.update_job_tags(job_id, [])
+
+        assert diff.removed == frozenset(tag_ids)
+        assert job_tag_manager.find_by_job_id(job_id) == []
+
+
+class TestJobManagerBulkUpsert:
+    """Test cases for content-hash change detection in JobManager.bulk_upsert"""
+
+    @pytest.fixture
+    def job_manager(self, db_session):
+        """Fixture that provides a JobManager instance"""
+        return JobManager(db_session)
+
+    @pytest.fixture
+    def published(self):
+        """Collect JOBS_CHANGED events"""
+        received = []
+        events.subscribe(events.JOBS_CHANGED, received.append)
+        yield received
+        events.unsubscribe(events.JOBS_CHANGED, received.append)
+
+    @staticmethod
+    def row(job_id, **overrides):
+        """Build a bulk_upsert row"""
+        row = {
+            "job_id": job_id,
+            "job_position": "Backend Engineer",
+            "job_link": f"https://example.com/{job_id}",
+            "company_name": "TechCorp",
+            "company_profile": None,
+            "job_location": "Remote",
+            "job_posting_date": date(2025, 5, 1),
+            "tags": {"technology": ["Python", "FastAPI"]},
+        }
+        row.update(overrides)
+        return row
+
+    def test_hash_ignores_tag_order(self):
+        """Test that the content hash does not depend on tag ordering"""
+        args = ("Engineer", "TechCorp", "Remote", date(2025, 5, 1))
+
+        assert compute_content_hash(
+            *args, {"technology": ["Python", "Go"], "skill": ["APIs"]}
+        ) == compute_content_hash(
+            *args, {"skill": ["APIs"], "technology": ["Go", "Python"]}
+        )
+        assert compute_content_hash(*args, {}) != compute_content_hash(
+            *args, {"technology": ["Go"]}
+        )
+
+    def test_skips_unchanged_rows(self, job_manager, db_session, statements, published):
+        """Test that resending identical content writes nothing"""
+        first = job_manager.bulk_upsert([self.row("H1"), self.row("H2")])
+        db_session.query(Job).update({Job.updated_at: date(2000, 1, 1)})
+        db_session.commit()
+        published.clear()
+        statements.clear()
+
+        second = job_manager.bulk_upsert(
+            [self.row("H1", tags={"technology": ["FastAPI", "Python"]}), self.row("H2")]
+        )
+
+        assert {job_id: status for job_id, (_, status) in second.items()} == {
+            "H1": "unchanged",
+            "H2": "unchanged",
+        }
+        assert second["H1"][0] == first["H1"][0]
+        assert [s for s in statements if s.startswith(("INSERT", "UPDATE"))] == []
+        assert published == []
+        assert {job.updated_at for job in db_session.query(Job)} == {date(2000, 1, 1)}
+
+    def test_writes_only_changed_rows(self, job_manager, db_session, published):
+        """Test that only new and changed jobs are written and reported"""
+        first = job_manager.bulk_upsert([self.row("H1"), self.row("H2")])
+        db_session.query(Job).update({Job.updated_at: date(2000, 1, 1)})
+        db_session.commit()
+        published.clear()
+
+        result = job_manager.bulk_upsert(
+            [
+                self.row("H1"),
+                self.row("H2", job_location="Berlin"),
+                self.row("H3"),
+            ]
+        )
+
+        assert {job_id: status for job_id, (_, status) in result.items()} == {
+            "H1": "unchanged",
+            "H2": "updated",
+            "H3": "created",
+        }
+        assert published == [
+            JobChanges(
+                created=frozenset({result["H3"][0]}),
+                updated=frozenset({first["H2"][0]}),
+            )
+        ]
+        h1 = db_session.query(Job).filter(Job.job_id == "H1").one()
+        h2 = db_session.query(Job).filter(Job.job_id == "H2").one()
+        assert h1.updated_at == date(2000, 1, 1)
+        assert h2.updated_at != date(2000, 1, 1)
+        assert h2.job_location == "Berlin"
+
+    def test_orm_writes_keep_hash_current(self, job_manager, db_session):
+        """Test that jobs written through the ORM are recognised as unchanged"""
+        job_manager.create(self.row("H1"))
+
+        result = job_manager.bulk_upsert([self.row("H1")])
+
+        assert result["H1"][1] == "unchanged"
+
+
+class TestJobTagPostingDates:
+    """Test cases for the job posting date copied onto job_tags"""
+
+    @pytest.fixture
+    def job_manager(self, db_session):
+        """Fixture that provides a JobManager instance"""
+        return JobManager(db_session)
+
+    @staticmethod
+    def tag_dates(db_session):
+        """Posting dates stored on job_tags, by (job_id, tag_id)"""
+        return {
+            (job_id, tag_id): posting_date
+            for job_id, tag_id, posting_date in db_session.execute(
+                select(JobTag.job_id, JobTag.tag_id, JobTag.job_posting_date)
+            )
+        }
+
+    def test_inserts_copy_the_job_date(self, job_tag_manager, job_and_tags, db_session):
+        """Test that Core and ORM inserts both read the job's posting date"""
+        job_id, tag_ids = job_and_tags
+        job_tag_manager.insert_relations([(job_id, tag_ids[0])])
+        db_session.add(JobTag(job_id=job_id, tag_id=tag_ids[1]))
+        db_session.commit()
+
+        assert self.tag_dates(db_session) == {
+            (job_id, tag_ids[0]): date.today(),
+            (job_id, tag_ids[1]): date.today(),
+        }
+
+    def test_bulk_upsert_moves_tag_dates(
+        self, job_manager, job_tag_manager, db_session
+    ):
+        """Test that a changed posting date is copied to the job's tags"""
+        row = TestJobManagerBulkUpsert.row("P1")
+        pk = job_manager.bulk_upsert([row])["P1"][0]
+        tag = Tag(name="Go", category=TagCategory.TECHNOLOGY)
+        db_session.add(tag)
+        db_session.commit()
+        job_tag_manager.insert_relations([(pk, tag.id)])
+
+        job_manager.bulk_upsert([{**row, "job_posting_date": date(2025, 7, 9)}])
+
+        assert self.tag_dates(db_session) == {(pk, tag.id): date(2025, 7, 9)}
+
+    def test_update_moves_tag_dates(self, job_manager, job_and_tags, db_session):
+        """Test that JobManager.update copies a new posting date to the tags"""
+        job_id, tag_ids = job_and_tags
+        JobTagManager(db_session).insert_relations([(job_id, tag_ids[0])])
+
+        job_manager.update("MGR001", {"job_posting_date": date(2024, 12, 31)})
+
+        assert self.tag_dates(db_session) == {(job_id, tag_ids[0]): date(2024, 12, 31)}
+
+
+class TestJobManagerSearchStatements:
+    """Test cases for the cached search statements in JobManager"""
+
+    @pytest.fixture
+    def job_manager(self, db_session):
+        """Fixture that provides a JobManager instance"""
+        return JobManager(db_session)
+
+    @pytest.fixture
+    def jobs(self, db_session):
+        """Create three jobs sharing two tags. Returns their primary keys"""
+        python = Tag(name="Python", category=TagCategory.TECHNOLOGY)
+        remote = Tag(name="Remote", category=TagCategory.SKILL)
+        jobs = []
+        for i in range(3):
+            job = Job(
+                job_id=f"SRCH{i:03d}",
+                job_position="Backend Engineer" if i < 2 else "Designer",
+                job_link=f"https://example.com/srch{i}",
+                company_name="TechCorp",
+                job_location="Remote",
+                job_posting_date=date(2025, 5, i + 1),
+            )
+            job.tag_relations = [JobTag(tag=python), JobTag(tag=remote)]
+            jobs.append(job)
+        db_session.add_all(jobs)
+        db_session.commit()
+        return [job.id for job in jobs]
+
+    def test_tag_filters_return_each_job_once(self, job_manager, jobs):
+        """Test that jobs matching several tags are returned once, by id"""
+        results = job_manager.find_by_filters(
+            tags=["Python", "Remote"], tag_categories=["technology", "skill"]
+        )
+
+        assert [job.id for job in results] == jobs
+        assert all(len(job.tag_relations) == 2 for job in results)
+        assert (
+            job_manager.count_by_filters(
+                tags=["Python", "Remote"],
+                tag_categories=["technology", "skill"],
+            )
+            == 3
+        )
+
+    def test_filter_values_are_bound_parameters(self, job_manager, jobs, statements):
+        """Test that searches differing only in values share one statement"""
+        first = job_manager.find_by_filters(query="backend", date_from=date(2025, 5, 2))
+        second = job_manager.find_by_filters(query="design", date_from=date(2025, 5, 1))
+
+        assert [job.id for job in first] == [jobs[1]]
+        assert [job.id for job in second] == [jobs[2]]
+        assert statements[0] == statements[1]
+        assert "backend" not in statements[0]
+
+    def test_limit_and_offset(self, job_manager, jobs):
+        """Test that pagination is applied to jobs rather than joined rows"""
+        page = job_manager.find_by_filters(tags=["Python"], limit=2, offset=1)
+
+        assert [job.id for job in page] == jobs[1:]
+        assert all(len(job.tag_relations) == 2 for job in page)
+
+    def test_filters_use_search_indexes(self, job_manager, jobs, db_session):
+        """Test that tag and date filters are planned on their indexes"""
+        captured = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            job_manager.count_by_filters(tag_categories=["technology"])
+            job_manager.count_by_filters(date_from=date(2025, 5, 2))
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        with engine.connect() as conn:
+            tag_plan, date_plan = (" ".join(explain(conn, *c)) for c in captured)
+        assert "ix_tags_category_id" in tag_plan
+        assert "ix_job_tags_tag_id_job_id" in tag_plan
+        assert "ix_jobs_posting_date_id" in date_plan
+
+    def test_sort_orders(self, job_manager, jobs):
+        """Test that each sort order breaks ties by id"""
+        orders = {
+            sort: [job.id for job in job_manager.find_by_filters(sort=sort)]
+            for sort in (None, "newest", "oldest", "company", "relevance")
+        }
+
+        assert orders[None] == jobs
+        assert orders["newest"] == jobs[::-1]
+        assert orders["oldest"] == jobs
+        # Every job has the same company
+        assert orders["company"] == jobs
+        # Without a query, relevance is newest first
+        assert orders["relevance"] == jobs[::-1]
+        with pytest.raises(ValueError):
+            job_manager.find_by_filters(sort="salary")
+
+    def test_company_sort_compares_code_points(self, job_manager, jobs, db_session):
+        """Test that companies sort by code point on every database"""
+        for pk, company in zip(jobs, ["acme", "Zeta", "Éclair"]):
+            db_session.get(Job, pk).company_name = company
+        db_session.commit()
+
+        results = job_manager.find_by_filters(sort="company")
+        assert [job.company_name for job in results] == ["Zeta", "acme", "Éclair"]
+
+        dialect = postgresql.dialect()
+        find, find_all = (
+            str(_search_statement(kind, (), "company").compile(dialect=dialect))
+            for kind in (SEARCH_FIND, SEARCH_FIND_ALL)
+        )
+        assert 'ORDER BY jobs.company_name COLLATE "C", jobs.id' in find
+        assert 'jobs.company_name COLLATE "C"' in find_all
+        assert 'jobs_archive.company_name COLLATE "C"' in find_all
+        for model in (Job, ArchivedJob):
+            (index,) = [
+                index
+                for index in model.__table__.indexes
+                if index.name.endswith("company_name_id")
+            ]
+            assert 'company_name COLLATE "C", id' in str(
+                CreateIndex(index).compile(dialect=dialect)
+            )
+
+    def test_relevance_ranks_position_matches_first(
+        self, job_manager, jobs, db_session
+    ):
+        """Test that position matches precede company and location matches"""
+        designer = db_session.get(Job, jobs[2])
+        designer.company_name = "Engineering Partners"
+        db_session.commit()
+
+        results = job_manager.find_by_filters(query="engineer", sort="relevance")
+        page = job_manager.find_by_filters(
+            query="engineer", sort="relevance", limit=1, offset=2
+        )
+
+        assert [job.id for job in results] == [jobs[1], jobs[0], jobs[2]]
+        assert [job.id for job in page] == [jobs[2]]
+
+    def test_sorts_use_search_indexes(self, job_manager, jobs, db_session):
+        """Test that date and company sorts read a page in index order"""
+        captured = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            for sort in ("newest", "oldest", "company"):
+                job_manager.find_by_filters(sort=sort, limit=2)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        with engine.connect() as conn:
+            newest, oldest, company = (explain(conn, *c) for c in captured)
+        # Only the page's joined tag rows are sorted again
+        assert "SCAN jobs USING INDEX ix_jobs_posting_date_id" in newest
+        assert "SCAN jobs USING INDEX ix_jobs_posting_date_id" in oldest
+        assert "SCAN jobs USING INDEX ix_jobs_company_name_id" in company
+
+    def test_date_range_bounds_the_tag_filter(self, job_manager, jobs, statements):
+        """Test that a date range is also applied to job_tags"""
+        results = job_manager.find_by_filters(
+            tags=["Python"], date_from=date(2025, 5, 2), date_to=date(2025, 5, 2)
+        )
+
+        assert [job.id for job in results] == [jobs[1]]
+        assert "job_tags.job_posting_date >=" in statements[0]
+        assert "job_tags.job_posting_date <=" in statements[0]
+
+    def test_tag_expr(self, job_manager, jobs, db_session):
+        """Test that boolean tag expressions filter on each job's tags"""
+        go = Tag(name="Go", category=TagCategory.TECHNOLOGY)
+        job = db_session.get(Job, jobs[1])
+        job.tag_relations.append(JobTag(tag=go))
+        db_session.commit()
+
+        def found(text):
+            return [
+                job.id
+                for job in job_manager.find_by_filters(tag_expr=parse_tag_expr(text))
+            ]
+
+        assert found("Python AND Go") == [jobs[1]]
+        assert found("Python AND NOT Go") == [jobs[0], jobs[2]]
+        assert found("NOT (Go OR Nothing)") == [jobs[0], jobs[2]]
+        assert found("Go OR Nothing") == [jobs[1]]
+        assert found("Nothing") == []
+        assert (
+            job_manager.count_by_filters(
+                tags=["Go", "Remote"], tag_expr=parse_tag_expr("NOT Go")
+            )
+            == 2
+        )
+
+    def test_tag_expr_compiles_to_semi_joins(self, job_manager, jobs, statements):
+        """Test that tag expressions use EXISTS, without joins or DISTINCT"""
+        job_manager.count_by_filters(tag_expr=parse_tag_expr("Python AND NOT Go"))
+        job_manager.count_by_filters(tag_expr=parse_tag_expr("Remote AND NOT PHP"))
+        job_manager.count_by_filters(tag_expr=parse_tag_expr("Remote OR PHP"))
+
+        assert statements[0] == statements[1]
+        assert statements[0] != statements[2]
+        assert "NOT (EXISTS" in statements[0]
+        assert "DISTINCT" not in statements[0]
+        assert " JOIN " not in statements[0]
+
+
+class TestJobManagerArchive:
+    """Test cases for moving jobs to the archive tier in JobManager"""
+
+    @pytest.fixture
+    def job_manager(self, db_session):
+        """Fixture that provides a JobManager instance"""
+        return JobManager(db_session)
+
+    @pytest.fixture
+    def jobs(self, db_session):
+        """Create four tagged jobs posted in May 2025. Returns their primary keys"""
+        python = Tag(name="Python", category=TagCategory.TECHNOLOGY)
+        jobs = []
+        for i, day in enumerate((3, 1, 2, 20)):
+            job = Job(
+                job_id=f"ARCH{i:03d}",
+                job_position="Backend Engineer",
+                job_link=f"https://example.com/arch{i}",
+                company_name="TechCorp",
+                job_location="Remote",
+                job_posting_date=date(2025, 5, day),
+            )
+            job.tag_relations = [JobTag(tag=python)]
+            jobs.append(job)
+        db_session.add_all(jobs)
+        db_session.commit()
+        return [job.id for job in jobs]
+
+    def test_moves_jobs_and_tags_oldest_first(self, job_manager, jobs, db_session):
+        """Test that a batch moves the oldest jobs, with their tags and ids"""
+        moved = job_manager.archive_before(date(2025, 5, 10), batch_size=2)
+
+        assert moved == [jobs[1], jobs[2]]
+        assert set(db_session.scalars(select(Job.id))) == {jobs[0], jobs[3]}
+        assert set(db_session.scalars(select(JobTag.job_id))) == {jobs[0], jobs[3]}
+        assert set(db_session.scalars(select(ArchivedJob.id))) == set(moved)
+        assert set(db_session.scalars(select(ArchivedJobTag.job_id))) == set(moved)
+
+        assert job_manager.archive_before(date(2025, 5, 10), batch_size=2) == [jobs[0]]
+        assert job_manager.archive_before(date(2025, 5, 10), batch_size=2) == []
+
+    def test_archiving_publishes_deletions(self, job_manager, jobs):
+        """Test that archived jobs are published as deleted from the hot tier"""
+        received = []
+        events.subscribe(events.JOBS_CHANGED, received.append)
+        try:
+            job_manager.archive_before(date(2025, 5, 10))
+        finally:
+            events.unsubscribe(events.JOBS_CHANGED, received.append)
+
+        assert received == [JobChanges(deleted=frozenset(jobs[:3]))]
+
+    def test_searches_default_to_the_hot_tier(self, job_manager, jobs):
+        """Test that archived jobs are only searched with include_archived"""
+        job_manager.archive_before(date(2025, 5, 3))
+
+        hot = job_manager.find_by_filters(tags=["Python"])
+        both = job_manager.find_by_filters(tags=["Python"], include_archived=True)
+
+        assert [job.id for job in hot] == [jobs[0], jobs[3]]
+        assert [job.id for job in both] == jobs
+        assert [type(job) for job in both] == [Job, ArchivedJob, ArchivedJob, Job]
+        assert [tag.tag.name for tag in both[1].tag_relations] == ["Python"]
+        assert job_manager.count_by_filters(tags=["Python"]) == 2
+        assert job_manager.count_by_filters(tags=["Python"], include_archived=True) == 4
+
+    def test_archived_search_pages_and_filters(self, job_manager, jobs):
+        """Test that pagination and date filters span both tiers"""
+        job_manager.archive_before(date(2025, 5, 3))
+
+        page = job_manager.find_by_filters(include_archived=True, limit=2, offset=1)
+        dated = job_manager.find_by_filters(
+            date_to=date(2025, 5, 2), include_archived=True
+        )
+
+        assert [job.id for job in page] == jobs[1:3]
+        assert [job.id for job in dated] == jobs[1:3]
+        assert (
+            job_manager.count_by_filters(
+                date_from=date(2025, 5, 2), include_archived=True
+            )
+            == 3
+        )
+
+    def test_archived_search_sorts(self, job_manager, jobs):
+        """Test that sort orders span both tiers"""
+        job_manager.archive_before(date(2025, 5, 3))
+
+        newest = job_manager.find_by_filters(include_archived=True, sort="newest")
+        oldest = job_manager.find_by_filters(
+            include_archived=True, sort="oldest", limit=2, offset=1
+        )
+
+        assert [job.id for job in newest] == [jobs[3], jobs[0], jobs[2], jobs[1]]
+        assert [job.id for job in oldest] == [jobs[2], jobs[0]]
+
+    def test_find_archived_by_id(self, job_manager, jobs):
+        """Test that archived jobs are found by job_id with their tags"""
+        job_manager.archive_before(date(2025, 5, 2))
+
+        assert job_manager.find_by_id("ARCH001") is None
+        archived = job_manager.find_archived_by_id("ARCH001")
+        assert archived.id == jobs[1]
+        assert archived.archived_at is not None
+        assert [tag.tag.name for tag in archived.tag_relations] == ["Python"]
+
+    def test_reposted_job_supersedes_its_archived_copy(
+        self, job_manager, jobs, db_session
+    ):
+        """Test that re-creating an archived job_id removes the archived copy"""
+        job_manager.archive_before(date(2025, 5, 2))
+
+        results = job_manager.bulk_upsert(
+            [
+                {
+                    "job_id": "ARCH001",
+                    "job_position": "Backend Engineer",
+                    "job_link": "https://example.com/arch1",
+                    "company_name": "TechCorp",
+                    "company_profile": None,
+                    "job_location": "Remote",
+                    "job_posting_date": date(2025, 6, 1),
+                    "tags": None,
+                }
+            ]
+        )
+
+        pk, status = results["ARCH001"]
+        assert status == "created"
+        assert pk > max(jobs)
+        assert job_manager.find_archived_by_id("ARCH001") is None
+        assert db_session.scalars(select(ArchivedJobTag)).all() == []
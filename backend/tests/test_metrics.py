@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+from app.core.metrics import (
+    Counter,
+    Histogram,
+    _registry,
+    instrumented,
+    record_cache_lookup,
+    render_metrics,
+)
+from app.main import app
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def registry():
+    """Remove metrics registered by a test once it finishes"""
+    before = list(_registry)
+    yield
+    _registry[:] = before
+
+
+def metric_lines(name):
+    """Rendered exposition lines for one metric family"""
+    return [line for line in render_metrics().splitlines() if line.startswith(name)]
+
+
+class TestMetricTypes:
+    """Test cases for metric rendering"""
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        """Test that histogram buckets, sum and count render correctly"""
+        histogram = Histogram("test_latency", "Test", ("route",), buckets=(0.1, 1))
+        child = histogram.labels("/a")
+        for value in (0.05, 0.5, 0.5, 5):
+            child.observe(value)
+
+        assert metric_lines("test_latency") == [
+            'test_latency_bucket{route="/a",le="0.1"} 1',
+            'test_latency_bucket{route="/a",le="1"} 3',
+            'test_latency_bucket{route="/a",le="+Inf"} 4',
+            'test_latency_sum{route="/a"} 6.05',
+            'test_latency_count{route="/a"} 4',
+        ]
+
+    def test_counter_and_label_escaping(self, registry):
+        """Test counters and escaping of label values"""
+        counter = Counter("test_total", "Test", ("path",))
+        counter.labels('a"b').inc()
+        counter.labels('a"b').inc(2)
+
+        assert 'test_total{path="a\\"b"} 3.0' in metric_lines("test_total")
+
+    def test_wrong_label_count(self, registry):
+        """Test that label values must match label names"""
+        with pytest.raises(ValueError):
+            Counter("test_labels_total", "Test", ("a", "b")).labels("x")
+
+
+class TestInstrumented:
+    """Test cases for the @instrumented class decorator"""
+
+    def test_times_public_methods_and_sizes_results(self):
+        """Test that sync and async methods are timed and results sized"""
+
+        @instrumented("test")
+        class Sample:
+            def items(self, count):
+                return list(range(count))
+
+            async def fetch(self):
+                return {"a": 1, "b": 2}
+
+            def stream(self):
+                yield 1
+
+            def _private(self):
+                return [1]
+
+        sample = Sample()
+        assert sample.items(3) == [0, 1, 2]
+        assert asyncio.run(sample.fetch()) == {"a": 1, "b": 2}
+        assert list(sample.stream()) == [1]
+
+        rendered = render_metrics()
+        labels = 'layer="test",class="Sample"'
+        assert (
+            f'app_method_duration_seconds_count{{{labels},method="items"}} 1'
+            in rendered
+        )
+        assert (
+            f'app_method_duration_seconds_count{{{labels},method="fetch"}} 1'
+            in rendered
+        )
+        assert f'app_result_size_sum{{{labels},method="items"}} 3.0' in rendered
+        assert f'app_result_size_sum{{{labels},method="fetch"}} 2.0' in rendered
+        assert 'method="stream"' not in rendered
+        assert 'method="_private"' not in rendered
+
+    def test_custom_and_disabled_result_sizes(self):
+        """Test overriding and disabling result sizing per method"""
+
+        @instrumented(
+            "test", result_sizes={"page": lambda r: len(r["items"]), "one": None}
+        )
+        class Paged:
+            def page(self):
+                return {"items": [1, 2], "total": 10}
+
+            def one(self):
+                return {"id": 1}
+
+        Paged().page()
+        Paged().one()
+
+        rendered = render_metrics()
+        assert 'app_result_size_sum{layer="test",class="Paged",method="page"} 2.0' in (
+            rendered
+        )
+        assert 'app_result_size_count{layer="test",class="Paged",method="one"}' not in (
+            rendered
+        )
+
+
+class TestMetricsEndpoint:
+    """Test cases for GET /metrics"""
+
+    def test_exposes_route_and_layer_metrics(self):
+        """Test that a request shows up under its route template and layers"""
+        client = TestClient(app)
+        client.get("/api/v1/tags/categories")
+        record_cache_lookup("test", hit=True)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/api/v1/tags/categories",status="200"}'
+        ) in body
+        assert 'class="TagService",method="get_tag_categories"' in body
+        assert 'class="TagManager",method="find_all_categories"' in body
+        assert 'app_cache_requests_total{cache="test",result="hit"}' in body
+        assert "http_requests_in_flight" in body
+        assert "threadpool_queue_depth" in body
+
+    def test_unmatched_paths_share_a_label(self):
+        """Test that unknown URLs do not create new series"""
+        client = TestClient(app)
+        client.get("/no/such/path/1")
+        client.get("/no/such/path/2")
+
+        body = client.get("/metrics").text
+        assert 'route="unmatched",status="404"' in body
+        assert "/no/such/path" not in body
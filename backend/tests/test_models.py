@@ -5,14 +5,11 @@ from app.core.db import Base
 from app.models.job import Job
 from app.models.job_tag import JobTag
 from app.models.tag import Tag, TagCategory
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from tests.conftest import create_test_engine
 
 # Test database setup
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(
-    SQLALCHEMY_TEST_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_test_engine("models.db")
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -0,0 +1,128 @@
+from datetime import date
+
+import pytest
+from app.core import partitions
+from app.core.partitions import (
+    PartitionMaintainer,
+    add_months,
+    ensure_partitions,
+    is_partitioned,
+    maintain_partitions,
+    month_start,
+    partition_name,
+)
+from app.managers.job_manager import JobManager
+
+from .conftest import create_test_db_session, create_test_engine
+
+
+@pytest.fixture
+def engine():
+    """Create a SQLite test engine"""
+    engine = create_test_engine("partitions.db")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    """Create a test database session"""
+    yield from create_test_db_session(engine)
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Pretend jobs is partitioned, recording where partitions are created"""
+    created = []
+
+    def create_partitions(conn, months):
+        created.append((conn, sorted(months)))
+        return set(), sorted(months)
+
+    monkeypatch.setattr(partitions, "is_partitioned", lambda engine: True)
+    monkeypatch.setattr(partitions, "_create_partitions", create_partitions)
+    monkeypatch.setattr(partitions, "_known_months", partitions.WeakKeyDictionary())
+    return created
+
+
+def job_row(job_id, posting_date):
+    """An upsert row for a job posted on posting_date"""
+    return {
+        "job_id": job_id,
+        "job_position": "Backend Engineer",
+        "job_link": f"https://example.com/{job_id}",
+        "company_name": "TechCorp",
+        "company_profile": None,
+        "job_location": "Remote",
+        "job_posting_date": posting_date,
+    }
+
+
+class TestPartitionNaming:
+    """Test cases for monthly partition arithmetic"""
+
+    def test_month_start(self):
+        """Test that dates map to the first day of their month"""
+        assert month_start(date(2025, 6, 30)) == date(2025, 6, 1)
+
+    def test_add_months_across_years(self):
+        """Test month arithmetic across year boundaries"""
+        assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+        assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+        assert add_months(date(2025, 1, 1), -25) == date(2022, 12, 1)
+
+    def test_partition_name(self):
+        """Test that partition names carry the table and month"""
+        assert partition_name("job_tags", date(2025, 3, 1)) == "job_tags_p2025_03"
+
+
+class TestUnpartitionedDatabase:
+    """Test cases for partition maintenance on unpartitioned databases"""
+
+    def test_sqlite_is_not_partitioned(self, engine):
+        """Test that SQLite is never treated as partitioned"""
+        assert is_partitioned(engine) is False
+
+    def test_maintenance_is_a_no_op(self, engine):
+        """Test that maintenance does nothing without partitions"""
+        assert ensure_partitions(engine, [date(2025, 6, 1)]) == []
+        assert maintain_partitions(engine, retention_months=1) == {
+            "created": [],
+            "detached": [],
+        }
+
+    def test_maintainer_starts_and_stops(self, engine):
+        """Test that the maintenance thread runs once and stops promptly"""
+        maintainer = PartitionMaintainer(engine, interval_seconds=3600)
+        maintainer.start()
+        maintainer.stop()
+
+        assert maintainer._thread is None
+
+
+class TestPartitionCreation:
+    """Test cases for where writers create missing partitions"""
+
+    def test_upsert_after_read_creates_partitions_in_the_session(
+        self, db_session, created
+    ):
+        """Test that a session which has read jobs creates partitions itself"""
+        job_manager = JobManager(db_session)
+        job_manager.bulk_upsert([job_row("P1", date(2025, 5, 1))])
+        assert job_manager.find_by_id("P1")
+
+        # A separate transaction would wait on the session's lock on jobs
+        job_manager.bulk_upsert([job_row("P2", date(2025, 7, 9))], commit=False)
+        assert created[-1] == (db_session.connection(), [date(2025, 7, 1)])
+        db_session.commit()
+        assert job_manager.find_by_id("P2")
+
+    def test_months_created_in_a_transaction_are_checked_again(self, engine, created):
+        """Test that months created in a caller's transaction are not cached"""
+        with engine.connect() as conn:
+            ensure_partitions(conn, [date(2025, 7, 9)])
+            ensure_partitions(conn, [date(2025, 7, 20)])
+        ensure_partitions(engine, [date(2025, 7, 1)])
+        ensure_partitions(engine, [date(2025, 7, 31)])
+
+        assert [months for _, months in created] == [[date(2025, 7, 1)]] * 3
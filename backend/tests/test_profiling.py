@@ -0,0 +1,105 @@
+import json
+import logging
+
+import pytest
+from app.core.profiling import SQLProfilingMiddleware, statement_shape
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from .conftest import create_test_engine
+
+
+@pytest.fixture
+def profiled_client():
+    """Create a small app that runs a given number of queries per request"""
+    engine = create_test_engine("profiling.db")
+    app = FastAPI()
+    app.add_middleware(
+        SQLProfilingMiddleware,
+        slow_request_ms=10_000,
+        max_statements=8,
+        repeated_statements=5,
+    )
+
+    @app.get("/queries/{count}")
+    def run_queries(count: int):
+        with engine.connect() as conn:
+            for i in range(count):
+                conn.execute(text("SELECT :value"), {"value": i})
+        return {"count": count}
+
+    try:
+        yield TestClient(app)
+    finally:
+        engine.dispose()
+
+
+def profile_records(caplog):
+    """Parse the SQL profile log lines"""
+    return [
+        json.loads(record.getMessage())
+        for record in caplog.records
+        if record.name == "app.core.profiling"
+    ]
+
+
+class TestStatementShape:
+    """Test cases for statement normalization"""
+
+    def test_collapses_whitespace_and_in_lists(self):
+        """Test that IN lists of any length share one shape"""
+        assert statement_shape(
+            "SELECT *\n  FROM tags WHERE id IN (?, ?, ?)"
+        ) == statement_shape("SELECT * FROM tags WHERE id IN (?)")
+
+
+class TestSQLProfilingMiddleware:
+    """Test cases for per-request SQL profiling"""
+
+    def test_server_timing_header(self, profiled_client):
+        """Test that statement count and DB time are reported in Server-Timing"""
+        response = profiled_client.get("/queries/2")
+
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        assert timing.startswith("db;dur=")
+        assert 'desc="2 statements"' in timing
+
+    def test_logs_summary(self, profiled_client, caplog):
+        """Test that a normal request is logged at INFO without flags"""
+        with caplog.at_level(logging.INFO, logger="app.core.profiling"):
+            profiled_client.get("/queries/2")
+
+        (record,) = profile_records(caplog)
+        assert record["path"] == "/queries/2"
+        assert record["status"] == 200
+        assert record["statements"] == 2
+        assert record["flags"] == []
+
+    def test_flags_repeated_statements(self, profiled_client, caplog):
+        """Test that repeated statement shapes are flagged as N+1"""
+        with caplog.at_level(logging.INFO, logger="app.core.profiling"):
+            profiled_client.get("/queries/6")
+
+        (record,) = profile_records(caplog)
+        assert record["flags"] == ["n_plus_one"]
+        assert list(record["repeated"].values()) == [6]
+        assert caplog.records[-1].levelno == logging.WARNING
+
+    def test_flags_too_many_statements(self, profiled_client, caplog):
+        """Test that statement-heavy requests are flagged"""
+        with caplog.at_level(logging.INFO, logger="app.core.profiling"):
+            profiled_client.get("/queries/9")
+
+        (record,) = profile_records(caplog)
+        assert "too_many_statements" in record["flags"]
+
+    def test_statements_outside_requests_are_ignored(self, profiled_client):
+        """Test that queries run outside a request are not attributed to one"""
+        engine = create_test_engine("profiling.db")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        response = profiled_client.get("/queries/1")
+        assert 'desc="1 statements"' in response.headers["server-timing"]
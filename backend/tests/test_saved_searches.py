@@ -0,0 +1,327 @@
+from datetime import date
+
+import pytest
+from app.core.db import get_db
+from app.core.tag_expr import parse_tag_expr
+from app.indexes.percolator import PercolatedJob, Percolator, SearchCriteria
+from app.main import app
+from app.managers.job_manager import JobManager
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.saved_search_manager import SavedSearchManager
+from app.managers.tag_manager import TagManager
+from app.models import Job, JobTag, SavedSearch, SavedSearchMatch, Tag
+from app.models.tag import TagCategory
+from app.services.saved_search import PercolatorWorker
+from sqlalchemy.orm import sessionmaker
+from tests.conftest import (
+    FILTERS,
+    create_test_client_with_db,
+    create_test_db_session,
+    create_test_engine,
+)
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session"""
+    engine = create_test_engine("percolator.db")
+    yield from create_test_db_session(engine)
+
+
+@pytest.fixture
+def worker(db_session):
+    """Create a percolator worker on the session's database"""
+    return PercolatorWorker(sessionmaker(bind=db_session.get_bind()), 60)
+
+
+def percolated(i, tags=(), location="Remote", posting_date=date(2025, 5, 1)):
+    """A job for the percolator, tagged with (name, category value) pairs"""
+    return PercolatedJob(
+        i,
+        posting_date,
+        "Data Engineer",
+        "Acme",
+        location,
+        frozenset(tags),
+    )
+
+
+def criteria(filters):
+    """Compiled criteria for filters as the search endpoint takes them"""
+    if "tag_expr" in filters:
+        filters = {**filters, "tag_expr": parse_tag_expr(filters["tag_expr"])}
+    return SearchCriteria.compile(**filters)
+
+
+def assert_matches_sql(db_session, jobs, worker, filter_list):
+    """
+    Save a search per filters, percolate the jobs, and compare each search's
+    matches with the SQL search. Returns the number of matches added.
+    """
+    saved_search_manager = SavedSearchManager(db_session)
+    searches = {
+        saved_search_manager.create({"name": f"Search {i}", **filters}).id: filters
+        for i, filters in enumerate(filter_list)
+    }
+    worker.queue(jobs)
+    added = worker.percolate_pending()
+
+    job_manager = JobManager(db_session)
+    for search_id, filters in searches.items():
+        if "tag_expr" in filters:
+            filters = {**filters, "tag_expr": parse_tag_expr(filters["tag_expr"])}
+        expected = {job.id for job in job_manager.find_by_filters(**filters)}
+        found = set(saved_search_manager.find_matches(search_id, limit=100))
+        assert found == expected, filters
+    return added
+
+
+class TestPercolator:
+    """Test cases for the reverse index of saved searches"""
+
+    def test_candidates_are_filed_by_key(self):
+        """Test that a job only meets the searches filed under its keys"""
+        percolator = Percolator()
+        for i in range(100):
+            percolator.add(i, criteria({"tags": [f"Tag {i}"]}))
+        percolator.add(100, criteria({"location": "Berlin"}))
+        percolator.add(101, criteria({"date_to": date(2025, 4, 1)}))
+        percolator.add(102, criteria({"date_from": date(2025, 4, 1)}))
+        percolator.add(103, criteria({"query": "ab"}))
+
+        job = percolated(1, tags=[("Tag 7", "technology")])
+        assert percolator.candidates(job) == {7, 102, 103}
+        assert percolator.match(job) == [7, 102]
+
+        berlin = percolated(2, location="Berlin, Germany")
+        assert percolator.candidates(berlin) == {100, 102, 103}
+
+    def test_tag_expr_is_filed_by_required_tags(self):
+        """Test that an expression is filed under the names it requires"""
+        percolator = Percolator()
+        percolator.add(1, criteria({"tag_expr": "(a OR b) AND c AND NOT d"}))
+        percolator.add(2, criteria({"tag_expr": "NOT d"}))
+
+        assert percolator.candidates(percolated(1)) == {2}
+        assert percolator.match(percolated(1, tags=[("c", "skill")])) == [2]
+        assert percolator.match(
+            percolated(1, tags=[("a", "skill"), ("c", "skill")])
+        ) == [1, 2]
+        assert (
+            percolator.match(percolated(1, tags=[("c", "skill"), ("d", "skill")])) == []
+        )
+
+    def test_remove(self):
+        """Test that removing a search empties its buckets"""
+        percolator = Percolator()
+        percolator.add(1, criteria({"tags": ["a"], "location": "Berlin"}))
+        percolator.add(2, criteria({"date_to": date(2025, 6, 1)}))
+        percolator.add(3, criteria({}))
+        for search_id in (1, 2, 3):
+            percolator.remove(search_id)
+
+        assert len(percolator) == 0
+        assert not percolator._buckets
+        assert not percolator._ends
+        assert not percolator._unkeyed
+        assert percolator.match(percolated(1, tags=[("a", "skill")])) == []
+
+    def test_add_replaces(self):
+        """Test that adding a search again refiles it"""
+        percolator = Percolator()
+        percolator.add(1, criteria({"tags": ["a"]}))
+        percolator.add(1, criteria({"tags": ["b"]}))
+
+        assert percolator.match(percolated(1, tags=[("a", "skill")])) == []
+        assert percolator.match(percolated(1, tags=[("b", "skill")])) == [1]
+
+
+class TestPercolatorWorker:
+    """Test cases for matching written jobs against saved searches"""
+
+    def test_matches_equal_sql_search(self, db_session, jobs, worker):
+        """Test that each search matches the jobs the SQL search finds"""
+        assert assert_matches_sql(db_session, jobs, worker, FILTERS) > 0
+
+    def test_tags_and_categories_match_one_tag(self, db_session, jobs, worker):
+        """Test that one tag must satisfy both tags and tag_categories"""
+        assert_matches_sql(
+            db_session,
+            jobs,
+            worker,
+            [
+                {"tags": ["Mentoring"], "tag_categories": ["technology"]},
+                {"tags": ["Python"], "tag_categories": ["skill"]},
+                {"tags": ["Python", "Mentoring"], "tag_categories": ["skill"]},
+            ],
+        )
+
+    def test_percolating_again_adds_nothing(self, db_session, jobs, worker):
+        """Test that a job matches a search once"""
+        saved_search_manager = SavedSearchManager(db_session)
+        search = saved_search_manager.create({"name": "Python", "tags": ["Python"]})
+        worker.queue(jobs)
+        added = worker.percolate_pending()
+        worker.queue(jobs)
+
+        assert added == saved_search_manager.count_matches(search.id) == 5
+        assert worker.percolate_pending() == 0
+
+    def test_created_and_tagged_jobs_are_queued(self, db_session, worker):
+        """Test that writes queue jobs, and their new tags are matched"""
+        saved_search_manager = SavedSearchManager(db_session)
+        search = saved_search_manager.create({"name": "Python", "tags": ["Python"]})
+        worker.install()
+        try:
+            job = JobManager(db_session).create(
+                {
+                    "job_id": "PERC001",
+                    "job_position": "Python Developer",
+                    "job_link": "https://example.com/perc001",
+                    "company_name": "Acme",
+                    "job_location": "Remote",
+                    "job_posting_date": date(2025, 5, 1),
+                }
+            )
+            assert worker.percolate_pending() == 0
+
+            tag = TagManager(db_session).create("Python", TagCategory.TECHNOLOGY)
+            JobTagManager(db_session).update_job_tags(job.id, [tag.id])
+            assert worker.percolate_pending() == 1
+        finally:
+            worker.uninstall()
+
+        assert saved_search_manager.find_matches(search.id) == [job.id]
+
+    def test_sync_follows_created_and_deleted_searches(self, db_session, jobs, worker):
+        """Test that the percolator tracks the saved searches table"""
+        saved_search_manager = SavedSearchManager(db_session)
+        first = saved_search_manager.create({"name": "Remote", "location": "remote"})
+        worker.queue(jobs[:1])
+        worker.percolate_pending()
+        assert first.id in worker.percolator
+
+        second = saved_search_manager.create({"name": "Berlin", "location": "berlin"})
+        saved_search_manager.delete(first.id)
+        worker.queue(jobs)
+        worker.percolate_pending()
+
+        assert first.id not in worker.percolator
+        assert len(worker.percolator) == 1
+        assert saved_search_manager.count_matches(first.id) == 0
+        assert saved_search_manager.count_matches(second.id) == 2
+
+    def test_failed_pass_is_retried(self, db_session, jobs, worker):
+        """Test that jobs stay queued when a pass fails"""
+        SavedSearchManager(db_session).create({"name": "All"})
+
+        def fail():
+            raise RuntimeError("database unavailable")
+
+        factory, worker.session_factory = worker.session_factory, fail
+        worker.queue(jobs)
+        with pytest.raises(RuntimeError):
+            worker.percolate_pending()
+
+        worker.session_factory = factory
+        assert worker.percolate_pending() == len(jobs)
+
+
+@pytest.fixture
+def api():
+    """Create a test client and the session factory of its database"""
+    client, _, session_factory = create_test_client_with_db("saved_searches.db")
+    return client, session_factory
+
+
+@pytest.fixture
+def saved_search_jobs(api):
+    """Create three tagged jobs in the database the client is using"""
+    db = next(app.dependency_overrides[get_db]())
+    python = Tag(name="python", category=TagCategory.TECHNOLOGY)
+    react = Tag(name="react", category=TagCategory.TECHNOLOGY)
+    jobs = [
+        Job(
+            job_id=f"SAVED{i:03d}",
+            job_position="Developer",
+            job_link=f"https://example.com/saved{i}",
+            company_name="TechCorp",
+            job_location="Remote",
+            job_posting_date=date(2025, 5, 1 + i),
+        )
+        for i in range(3)
+    ]
+    for job, tags in zip(jobs, ([python], [react], [python, react])):
+        job.tag_relations = [JobTag(tag=tag) for tag in tags]
+    db.add_all(jobs)
+    db.commit()
+    yield [job.id for job in jobs]
+
+    db.query(SavedSearchMatch).delete()
+    db.query(SavedSearch).delete()
+    db.query(JobTag).delete()
+    db.query(Job).delete()
+    db.query(Tag).delete()
+    db.commit()
+
+
+class TestSavedSearchEndpoints:
+    """Test cases for the saved search endpoints"""
+
+    def test_create_get_and_list(self, api, saved_search_jobs):
+        """Test that a saved search is stored with its filters"""
+        client, _ = api
+        response = client.post(
+            "/api/v1/saved-searches",
+            json={"name": "Python jobs", "tag_expr": "python AND NOT react"},
+        )
+        assert response.status_code == 201
+        saved = response.json()
+        assert saved["name"] == "Python jobs"
+        assert saved["tag_expr"] == "python AND NOT react"
+        assert saved["location"] is None
+
+        response = client.get(f"/api/v1/saved-searches/{saved['id']}")
+        assert response.status_code == 200
+        assert response.json() == saved
+        assert client.get("/api/v1/saved-searches").json() == [saved]
+
+    def test_invalid_tag_expr(self, api, saved_search_jobs):
+        """Test that a malformed tag expression is rejected"""
+        client, _ = api
+        response = client.post(
+            "/api/v1/saved-searches", json={"name": "Bad", "tag_expr": "python AND"}
+        )
+        assert response.status_code == 400
+        assert "Invalid tag expression" in response.json()["detail"]
+
+    def test_matches(self, api, saved_search_jobs):
+        """Test that percolated jobs are listed, most recent match first"""
+        client, session_factory = api
+        saved = client.post(
+            "/api/v1/saved-searches", json={"name": "Python", "tags": ["python"]}
+        ).json()
+        worker = PercolatorWorker(session_factory, 60)
+        for pk in saved_search_jobs:
+            worker.queue([pk])
+            worker.percolate_pending()
+
+        response = client.get(
+            f"/api/v1/saved-searches/{saved['id']}/matches", params={"limit": 1}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["pages"] == 2
+        assert [job["job_id"] for job in data["items"]] == ["SAVED002"]
+
+    def test_delete(self, api, saved_search_jobs):
+        """Test that a deleted saved search is gone"""
+        client, _ = api
+        saved = client.post("/api/v1/saved-searches", json={"name": "All"}).json()
+
+        assert client.delete(f"/api/v1/saved-searches/{saved['id']}").status_code == 204
+        assert client.get(f"/api/v1/saved-searches/{saved['id']}").status_code == 404
+        assert client.delete(f"/api/v1/saved-searches/{saved['id']}").status_code == 404
+        response = client.get(f"/api/v1/saved-searches/{saved['id']}/matches")
+        assert response.status_code == 404
@@ -7,11 +7,13 @@ from app.managers.tag_manager import TagManager
 from app.models import Job, Tag
 from app.models.tag import TagCategory
 from app.schemas.job_filter import JobSearchFilter
+from app.services.archive import ArchiveService, ArchiveWorker
 from app.services.search import SearchService
 from tests.conftest import (
     create_job_tag_relations_from_mappings,
     create_test_db_session,
     create_test_engine,
+    create_test_session,
     refresh_objects,
 )
 
@@ -438,3 +440,77 @@ class TestSearchServiceEdgeCases:
         params = JobSearchFilter(limit=10)
         result = search_service.search_jobs(params)
         assert result["pages"] == 1
+
+
+class TestArchiveService:
+    """Test cases for moving expired jobs to the archive tier"""
+
+    @pytest.fixture
+    def archive_service(self, job_manager):
+        """Fixture that provides an ArchiveService instance"""
+        return ArchiveService(job_manager)
+
+    def test_archives_jobs_past_the_age_in_batches(self, archive_service, sample_jobs):
+        """Test that every job older than the age moves, batch by batch"""
+        result = archive_service.archive_expired(max_age_days=0, batch_size=2)
+
+        assert result["cutoff"] == date.today()
+        assert result["archived"] == 3
+        assert result["batches"] == 2
+        assert archive_service.archive_expired(max_age_days=0)["archived"] == 0
+
+    def test_search_defaults_to_the_hot_tier(
+        self, archive_service, search_service, sample_jobs
+    ):
+        """Test that archived jobs are searched only with include_archived"""
+        archive_service.archive_expired(max_age_days=3)
+
+        hot = search_service.search_jobs(JobSearchFilter(tags=["python"]))
+        both = search_service.search_jobs(
+            JobSearchFilter(tags=["python"], include_archived=True)
+        )
+
+        assert [job["job_id"] for job in hot["items"]] == ["JOB001", "JOB005"]
+        assert [job["job_id"] for job in both["items"]] == [
+            "JOB001",
+            "JOB003",
+            "JOB005",
+        ]
+        assert both["total"] == 3
+
+    def test_get_job_by_id_falls_back_to_the_archive(
+        self, archive_service, search_service, sample_jobs
+    ):
+        """Test that archived jobs are found by ID with their tags"""
+        archive_service.archive_expired(max_age_days=3)
+
+        job = search_service.get_job_by_id("JOB003")
+
+        assert job["job_position"] == "Full Stack Engineer"
+        assert job["tags"] == {
+            "technology": ["python", "react"],
+            "skill": ["fullstack"],
+        }
+
+    def test_worker_runs_once_and_stops(self, db_session, sample_jobs):
+        """Test that the archiving thread runs at start and stops promptly"""
+        db_session.add(
+            Job(
+                job_id="JOB006",
+                job_position="COBOL Developer",
+                job_link="https://example.com/job006",
+                company_name="LegacyCorp",
+                job_posting_date=date.today() - timedelta(days=365),
+            )
+        )
+        db_session.commit()
+
+        worker = ArchiveWorker(
+            create_test_session(db_session.get_bind()), interval_seconds=3600
+        )
+        worker.start()
+        worker.stop()
+
+        job_manager = JobManager(db_session)
+        assert job_manager.find_archived_by_id("JOB006") is not None
+        assert job_manager.find_archived_by_id("JOB003") is None
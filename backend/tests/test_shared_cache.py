@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from app.core import events
+from app.core.shared_cache import SharedCache, cache_key
+from app.managers.job_manager import JobChanges
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a shared cache in a temporary directory"""
+    cache = SharedCache(str(tmp_path / "cache" / "responses.sqlite3"), max_entries=10)
+    yield cache
+    cache.uninstall()
+
+
+class TestCacheKey:
+    """Test cases for canonical cache keys"""
+
+    def test_equivalent_parameters_share_a_key(self):
+        """Test that list order and empty values do not change the key"""
+        first = cache_key("search", {"tags": ["python", "aws"], "query": None})
+        second = cache_key("search", {"query": "", "tags": ["aws", "python"]})
+
+        assert first == second
+        assert first.startswith("search:")
+
+    def test_namespaces_and_values_differ(self):
+        """Test that namespace and parameter values are part of the key"""
+        assert cache_key("search", {"page": 1}) != cache_key("job", {"page": 1})
+        assert cache_key("search", {"page": 1}) != cache_key("search", {"page": 2})
+
+
+class TestSharedCache:
+    """Test cases for the generation-invalidated shared cache"""
+
+    def test_miss_then_hit(self, cache):
+        """Test that a computed value is served from the cache afterwards"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return b"value"
+
+        assert cache.get_or_compute("key", compute) == b"value"
+        assert cache.get_or_compute("key", compute) == b"value"
+        assert len(calls) == 1
+
+    def test_instances_share_entries_and_generation(self, cache):
+        """Test that another process's cache on the same file sees the entries"""
+        other = SharedCache(cache.path)
+        try:
+            cache.get_or_compute("key", lambda: b"value")
+
+            assert other.lookup("key") == (b"value", 0)
+            other.bump_generation()
+            assert cache.lookup("key") == (None, 1)
+        finally:
+            other.close()
+
+    def test_values_computed_before_a_bump_are_not_stored(self, cache):
+        """Test that a value computed at an old generation is dropped"""
+        value, generation = cache.lookup("key")
+        cache.bump_generation()
+        cache.store("key", b"stale", generation)
+
+        assert cache.lookup("key") == (None, generation + 1)
+
+    def test_entries_expire(self, cache):
+        """Test that entries older than the TTL are misses"""
+        cache.ttl_seconds = 0.01
+        cache.get_or_compute("key", lambda: b"value")
+        time.sleep(0.02)
+
+        assert cache.lookup("key")[0] is None
+
+    def test_least_recently_used_entries_are_evicted(self, cache):
+        """Test that pruning keeps the most recently used max_entries"""
+        now = time.time()
+        cache._connection().executemany(
+            "INSERT INTO cache_entries VALUES (?, 0, ?, ?, ?)",
+            [(f"key-{i}", b"value", now, now + i) for i in range(15)],
+        )
+        cache.prune()
+
+        assert cache.lookup("key-4")[0] is None
+        assert cache.lookup("key-5")[0] == b"value"
+        assert cache.lookup("key-14")[0] == b"value"
+
+    def test_job_changes_bump_the_generation(self, cache):
+        """Test that an installed cache is invalidated by write events"""
+        cache.install()
+        cache.get_or_compute("key", lambda: b"value")
+
+        events.publish(events.JOBS_CHANGED, JobChanges(created=frozenset({1})))
+
+        assert cache.generation() == 1
+        assert cache.lookup("key")[0] is None
+
+    def test_unusable_cache_computes_every_time(self, tmp_path):
+        """Test that cache errors fall back to computing the value"""
+        directory = tmp_path / "not-a-file"
+        directory.mkdir()
+        cache = SharedCache(str(directory))
+
+        assert cache.get_or_compute("key", lambda: b"value") == b"value"
+        assert cache.lookup("key") == (None, None)
@@ -0,0 +1,303 @@
+from datetime import date
+
+import numpy as np
+import pytest
+from app.core.change_feed import ChangeFeed
+from app.indexes import similar
+from app.indexes.similar import (
+    SimilarJobIndex,
+    SimilarJobIndexWorker,
+    jaccard,
+    job_features,
+    title_features,
+)
+from app.managers.job_manager import JobManager
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.tag_manager import TagManager
+from app.models.tag import TagCategory
+from app.services.search import SearchService
+from sqlalchemy.orm import sessionmaker
+from tests.conftest import create_test_db_session, create_test_engine
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session"""
+    engine = create_test_engine("similar.db")
+    yield from create_test_db_session(engine)
+
+
+@pytest.fixture
+def feed(tmp_path):
+    """Create a change feed following this process's writes"""
+    feed = ChangeFeed(str(tmp_path / "changes.sqlite3"), max_entries=100)
+    feed.install()
+    yield feed
+    feed.uninstall()
+
+
+def managers(db_session):
+    """The managers a similar job index loads through"""
+    return JobManager(db_session), JobTagManager(db_session)
+
+
+def loaded_index(db_session, feed):
+    """A similar job index loaded from the session's database"""
+    index = SimilarJobIndex(feed)
+    index.load(*managers(db_session))
+    return index
+
+
+def features_by_pk(db_session):
+    """The features of every hot job, by primary key"""
+    rows = [row for batch in JobManager(db_session).iter_index_rows() for row in batch]
+    tag_ids = {}
+    for tag_id, job_id in JobTagManager(db_session).find_tag_pairs(
+        row[0] for row in rows
+    ):
+        tag_ids.setdefault(job_id, []).append(tag_id)
+    return {
+        pk: job_features(position, tag_ids.get(pk, ()))
+        for pk, _, position, _, _ in rows
+    }
+
+
+def assert_matches_fresh_load(index, db_session, feed):
+    """Check every job's similar jobs against a newly loaded index"""
+    fresh = loaded_index(db_session, feed)
+    features = features_by_pk(db_session)
+    assert len(index) == len(fresh) == len(features)
+    for pk, job in features.items():
+        found = index.similar(job, limit=20, exclude=pk)
+        assert found == fresh.similar(job, limit=20, exclude=pk)
+        for other, score in found:
+            assert score == pytest.approx(jaccard(job, features[other]))
+
+
+def synthetic(count, seed=7):
+    """Feature arrays of jobs with popular tags and a few dozen titles"""
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, 201)
+    titles = [title_features(f"Title {i} Engineer") for i in range(40)]
+    jobs = []
+    for _ in range(count):
+        tags = rng.choice(
+            200, rng.integers(2, 7), replace=False, p=weights / weights.sum()
+        )
+        values = [tag << 1 for tag in tags.tolist()] + titles[rng.integers(40)]
+        jobs.append(np.unique(np.array(values, dtype=np.uint32)))
+    return jobs
+
+
+def load_synthetic(jobs, feed):
+    """An index of synthetic jobs with primary keys 1..n"""
+    index = SimilarJobIndex(feed)
+    lengths = [len(features) for features in jobs]
+    index.load_features(
+        np.arange(1, len(jobs) + 1, dtype=np.int32),
+        np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+        np.concatenate(jobs),
+        feed.latest(),
+    )
+    return index
+
+
+class TestFeatures:
+    """Test cases for job features and their similarity"""
+
+    def test_tags_and_title_tokens(self):
+        """Test that tags and title tokens are distinct features"""
+        features = job_features("Senior Data Engineer, Data", [3, 1])
+        assert len(features) == 5
+        assert list(features) == sorted(features)
+        assert {2, 6} <= set(features.tolist())
+        assert np.array_equal(
+            job_features("data engineer", []), job_features("Engineer DATA", [])
+        )
+
+    def test_jaccard(self):
+        """Test the Jaccard index of feature arrays"""
+        a = np.array([1, 2, 3, 4], dtype=np.uint32)
+        b = np.array([3, 4, 5], dtype=np.uint32)
+        empty = np.array([], dtype=np.uint32)
+        assert jaccard(a, b) == pytest.approx(2 / 5)
+        assert jaccard(a, a) == 1.0
+        assert jaccard(a, empty) == jaccard(empty, empty) == 0.0
+
+
+class TestSimilarJobIndex:
+    """Test cases for the MinHash LSH similar job index"""
+
+    def test_finds_the_most_similar_jobs(self, feed):
+        """Test that results are exact, ordered, and close to brute force"""
+        jobs = synthetic(3000)
+        index = load_synthetic(jobs, feed)
+
+        found_total = best_total = 0.0
+        for pk in range(1, 3001, 97):
+            found = index.similar(jobs[pk - 1], limit=10, exclude=pk)
+            scores = [score for _, score in found]
+            for other, score in found:
+                assert score == pytest.approx(jaccard(jobs[pk - 1], jobs[other - 1]))
+            assert found == sorted(found, key=lambda match: (-match[1], -match[0]))
+            assert pk not in [other for other, _ in found]
+
+            best = sorted(
+                (
+                    jaccard(jobs[pk - 1], jobs[other])
+                    for other in range(3000)
+                    if other != pk - 1
+                ),
+                reverse=True,
+            )[:10]
+            found_total += sum(scores)
+            best_total += sum(best)
+        assert found_total / best_total > 0.95
+
+    def test_buckets_read_newest_first(self, feed, monkeypatch):
+        """Test that a crowded bucket yields its newest jobs"""
+        monkeypatch.setattr(similar, "MAX_BUCKET_JOBS", 5)
+        job = job_features("Data Engineer", [1, 2])
+        index = load_synthetic([job] * 100, feed)
+
+        assert index.similar(job, limit=10) == [(pk, 1.0) for pk in range(100, 95, -1)]
+
+    def test_no_features(self, feed):
+        """Test that jobs without features are never similar"""
+        empty = np.array([], dtype=np.uint32)
+        index = load_synthetic([empty, job_features("Engineer", [])], feed)
+
+        assert len(index) == 2
+        assert index.similar(empty) == []
+        assert index.similar(job_features("Engineer", [])) == [(2, 1.0)]
+
+    def test_load_matches_fresh_features(self, db_session, jobs, feed):
+        """Test that loading from the database scores every job exactly"""
+        index = loaded_index(db_session, feed)
+        assert index.change_seq == feed.latest()
+        assert_matches_fresh_load(index, db_session, feed)
+
+    def test_catch_up_follows_writes(self, db_session, jobs, feed):
+        """Test that changed, retagged, deleted and created jobs are rehashed"""
+        index = loaded_index(db_session, feed)
+        job_manager, job_tag_manager = managers(db_session)
+        tag_manager = TagManager(db_session)
+
+        job_manager.update("COL001", {"job_position": "Product Manager"})
+        job_tag_manager.update_job_tags(jobs[0], [])
+        job_manager.delete("COL005")
+        created = job_manager.create(
+            {
+                "job_id": "COL100",
+                "job_position": "Platform Engineer",
+                "job_link": "https://example.com/col100",
+                "company_name": "Initech",
+                "job_location": "Lisbon",
+                "job_posting_date": date(2025, 5, 2),
+            }
+        )
+        tool = tag_manager.create("Docker", TagCategory.TOOL)
+        job_tag_manager.update_job_tags(created.id, [tool.id])
+
+        assert index.catch_up(job_manager, job_tag_manager)
+        assert index.change_seq == feed.latest()
+        assert len(index._version.delta) == 3
+        assert_matches_fresh_load(index, db_session, feed)
+
+        twin = job_features("Platform Engineer", [tool.id])
+        assert index.similar(twin, limit=1) == [(created.id, 1.0)]
+
+    def test_compaction(self, db_session, jobs, feed, monkeypatch):
+        """Test that an outgrown delta is merged into the base arrays"""
+        monkeypatch.setattr(similar, "MIN_COMPACT_ROWS", 1)
+        index = loaded_index(db_session, feed)
+        job_manager, job_tag_manager = managers(db_session)
+
+        job_manager.update("COL002", {"job_position": "Staff Engineer"})
+        index.catch_up(job_manager, job_tag_manager)
+        assert len(index._version.delta) == 1
+
+        job_manager.update("COL003", {"job_position": "Staff Engineer"})
+        job_manager.delete("COL006")
+        index.catch_up(job_manager, job_tag_manager)
+        assert len(index._version.delta) == 0
+        assert index._version.live is None
+        assert_matches_fresh_load(index, db_session, feed)
+
+    def test_stale_after_falling_behind_the_feed(self, db_session, jobs, tmp_path):
+        """Test that an index behind the pruned feed stops answering"""
+        feed = ChangeFeed(str(tmp_path / "changes.sqlite3"), max_entries=2)
+        index = loaded_index(db_session, feed)
+        feed.record([jobs[0], jobs[1], jobs[2]])
+        feed.record([jobs[3], jobs[4], jobs[5]])
+
+        assert not index.catch_up(*managers(db_session))
+        assert index.stale
+        feed.close()
+
+    def test_not_loaded(self, feed):
+        """Test that an empty index neither catches up nor looks up"""
+        index = SimilarJobIndex(feed)
+
+        assert not index.loaded
+        assert not index.catch_up(None, None)
+        with pytest.raises(RuntimeError):
+            index.similar(job_features("Engineer", []))
+
+    def test_worker_loads_and_catches_up(self, db_session, jobs, feed):
+        """Test that the worker loads the index, then follows the feed"""
+        index = SimilarJobIndex(feed)
+        worker = SimilarJobIndexWorker(
+            index, sessionmaker(bind=db_session.get_bind()), 60
+        )
+        worker.refresh()
+        assert len(index) == 8
+
+        JobManager(db_session).delete("COL000")
+        worker.refresh()
+        assert len(index) == 7
+
+
+class TestSearchServiceSimilar:
+    """Test cases for similar job lookups through the search service"""
+
+    def test_index_and_sql_agree(self, db_session, jobs, feed):
+        """Test that both paths score jobs alike and agree on close matches"""
+        job_manager, job_tag_manager = managers(db_session)
+        tag_manager = TagManager(db_session)
+        sql = SearchService(job_manager, tag_manager, job_tag_manager)
+        in_memory = SearchService(
+            job_manager,
+            tag_manager,
+            job_tag_manager,
+            similar_index=loaded_index(db_session, feed),
+        )
+
+        for i in (0, 2, 3, 6):
+            job_id = f"COL{i:03d}"
+            expected = sql.get_similar_jobs(job_id, limit=5)
+            found = in_memory.get_similar_jobs(job_id, limit=5)
+            assert found["job_id"] == expected["job_id"] == job_id
+            assert found["items"]
+            assert job_id not in [item["job_id"] for item in found["items"]]
+            # The index may miss dissimilar jobs, and SQL only finds jobs
+            # sharing a tag
+            close = [item for item in expected["items"] if item["similarity"] >= 0.5]
+            assert all(item in found["items"] for item in close)
+            scores = [item["similarity"] for item in found["items"]]
+            assert scores == sorted(scores, reverse=True)
+
+    def test_archived_job(self, db_session, jobs, feed):
+        """Test that an archived job's similar jobs come from the hot tier"""
+        job_manager, job_tag_manager = managers(db_session)
+        job_manager.archive_before(date(2025, 5, 2))
+        service = SearchService(
+            job_manager,
+            TagManager(db_session),
+            job_tag_manager,
+            similar_index=loaded_index(db_session, feed),
+        )
+
+        found = service.get_similar_jobs("COL000", limit=10)["items"]
+        assert found
+        assert "COL000" not in [item["job_id"] for item in found]
@@ -0,0 +1,152 @@
+import importlib
+import json
+
+import pytest
+from app.core.slow_queries import (
+    SlowQueryLog,
+    fingerprint,
+    is_plain_select,
+    slow_query_log,
+)
+from sqlalchemy import text
+
+from .conftest import create_test_engine
+
+
+@pytest.fixture
+def engine():
+    """Create a test engine with one small table"""
+    engine = create_test_engine("slow_queries.db")
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS items"))
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (name) VALUES ('a'), ('b')"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def make_log(tmp_path):
+    """Create installed slow query logs that log every statement"""
+    logs = []
+
+    def make(**kwargs):
+        log = SlowQueryLog(str(tmp_path / "slow.log"), threshold_ms=0, **kwargs)
+        log.install()
+        logs.append(log)
+        return log
+
+    yield make
+    for log in logs:
+        log.uninstall()
+
+
+def entries(log):
+    """Flush a slow query log and parse its entries"""
+    log.flush()
+    with open(log.path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestSlowQueryLog:
+    """Test cases for the slow query log"""
+
+    def test_fingerprint_ignores_in_list_length(self):
+        """Test that statements differing only in IN list size share a fingerprint"""
+        assert fingerprint("SELECT * FROM t WHERE id IN (?, ?)") == fingerprint(
+            "SELECT * FROM t\nWHERE id IN (?)"
+        )
+
+    def test_logs_select_with_parameters_and_plan(self, engine, make_log):
+        """Test that a slow SELECT is written with its parameters and plan"""
+        log = make_log()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT * FROM items WHERE name = :name"), {"name": "a"})
+
+        (entry,) = [e for e in entries(log) if "FROM items" in e["statement"]]
+        assert entry["parameters"] == ["a"]
+        assert entry["occurrences"] == 1
+        assert entry["fingerprint"] == fingerprint(entry["statement"])
+        assert any("items" in line for line in entry["plan"])
+
+    def test_repeats_are_deduplicated(self, engine, make_log):
+        """Test that repeats of a statement shape are written once"""
+        log = make_log()
+        with engine.connect() as conn:
+            for name in ("a", "b", "c"):
+                conn.execute(
+                    text("SELECT * FROM items WHERE name = :name"), {"name": name}
+                )
+
+        assert len([e for e in entries(log) if "FROM items" in e["statement"]]) == 1
+
+    def test_repeats_are_counted_after_relog_interval(self, engine, make_log):
+        """Test that a repeat past the relog interval reports its occurrences"""
+        log = make_log(relog_seconds=0)
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT count(*) FROM items"))
+
+        logged = [e for e in entries(log) if "FROM items" in e["statement"]]
+        assert [e["occurrences"] for e in logged] == [1, 1, 1]
+
+    def test_writes_are_not_explained(self, engine, make_log):
+        """Test that only SELECTs are explained"""
+        log = make_log()
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE items SET name = :name"), {"name": "z"})
+
+        (entry,) = [e for e in entries(log) if e["statement"].startswith("UPDATE")]
+        assert entry["plan"] is None
+        with engine.connect() as conn:
+            names = conn.execute(text("SELECT name FROM items")).scalars().all()
+        assert names == ["z", "z"]
+
+    def test_only_plain_selects_are_explained(self):
+        """Test that locking, writing and WITH statements get no plan"""
+        assert is_plain_select("  select * FROM items WHERE id = ?")
+        assert not is_plain_select("SELECT * FROM items FOR UPDATE")
+        assert not is_plain_select("SELECT * FROM items FOR NO KEY UPDATE")
+        assert not is_plain_select("select * from items for share skip locked")
+        assert not is_plain_select("SELECT * INTO copied FROM items")
+        assert not is_plain_select(
+            "WITH moved AS (DELETE FROM items RETURNING *) SELECT count(*) FROM moved"
+        )
+        assert not is_plain_select("UPDATE items SET name = ?")
+
+    def test_with_statement_is_not_explained(self, engine, make_log):
+        """Test that a slow WITH statement is logged without a plan"""
+        log = make_log()
+        with engine.connect() as conn:
+            conn.execute(
+                text("WITH named AS (SELECT name FROM items) SELECT * FROM named")
+            )
+
+        (entry,) = [e for e in entries(log) if e["statement"].startswith("WITH")]
+        assert entry["plan"] is None
+
+    def test_statements_under_threshold_are_ignored(self, engine, tmp_path):
+        """Test that fast statements are not logged"""
+        log = SlowQueryLog(str(tmp_path / "slow.log"), threshold_ms=60_000)
+        log.install()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            log.flush()
+        finally:
+            log.uninstall()
+
+        assert not (tmp_path / "slow.log").exists()
+
+    def test_installed_by_the_app_lifespan_only(self, tmp_path):
+        """Test that importing the app installs nothing and hooks are idempotent"""
+        importlib.import_module("app.main")
+
+        assert not slow_query_log.installed
+
+        log = SlowQueryLog(str(tmp_path / "slow.log"), threshold_ms=0)
+        log.install()
+        log.install()
+        log.uninstall()
+        log.uninstall()
+        assert not log.installed
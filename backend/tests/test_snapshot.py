@@ -0,0 +1,186 @@
+from datetime import date
+
+import pytest
+from app.indexes.snapshot import IndexSnapshot, build_snapshot
+from app.indexes.tokens import tokenize
+from app.managers.job_manager import JobManager
+from app.managers.job_tag_manager import JobTagManager
+from app.managers.tag_manager import TagManager
+from app.models import Job, JobTag, Tag
+from app.models.tag import TagCategory
+from sqlalchemy.orm import sessionmaker
+from tests.conftest import create_test_db_session, create_test_engine
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session"""
+    engine = create_test_engine("snapshot.db")
+    yield from create_test_db_session(engine)
+
+
+@pytest.fixture
+def jobs(db_session):
+    """Create five jobs, the odd ones tagged Python. Returns their primary keys"""
+    python = Tag(name="Python", category=TagCategory.TECHNOLOGY)
+    remote = Tag(name="Remote", category=TagCategory.SKILL)
+    jobs = []
+    for i in range(5):
+        job = Job(
+            job_id=f"SNAP{i:03d}",
+            job_position="Backend Engineer" if i % 2 else "Data Scientist",
+            job_link=f"https://example.com/snap{i}",
+            company_name="Acme" if i < 3 else "Globex",
+            job_location="Remote" if i else None,
+            job_posting_date=date(2025, 5, 5 - i),
+        )
+        if i % 2:
+            job.tag_relations = [JobTag(tag=python)]
+        db_session.add(job)
+        db_session.flush()
+        jobs.append(job)
+    db_session.add(remote)
+    db_session.commit()
+    return [job.id for job in jobs]
+
+
+def build(db_session, path):
+    """Build a snapshot of the session's database"""
+    return build_snapshot(
+        JobManager(db_session),
+        TagManager(db_session),
+        JobTagManager(db_session),
+        str(path),
+    )
+
+
+class TestTokenize:
+    """Test cases for index tokenization"""
+
+    def test_lowercase_unique_tokens(self):
+        """Test that tokens are lowercase, alphanumeric and deduplicated"""
+        assert tokenize("Senior C++ / Python Engineer, Python") == [
+            "senior",
+            "c",
+            "python",
+            "engineer",
+        ]
+        assert tokenize(None) == []
+
+
+class TestIndexSnapshot:
+    """Test cases for building and mapping search index snapshots"""
+
+    def test_build_statistics(self, db_session, jobs, tmp_path):
+        """Test that the build reports what it wrote"""
+        stats = build(db_session, tmp_path / "snapshots" / "search.snap")
+
+        assert stats["jobs"] == 5
+        assert stats["tags"] == 2
+        assert stats["locations"] == 1
+        assert stats["companies"] == 2
+        assert stats["positions"] == 2
+        assert stats["bytes"] == (tmp_path / "snapshots" / "search.snap").stat().st_size
+
+    def test_posting_lists(self, db_session, jobs, tmp_path):
+        """Test that tag, company, location and token lists hold sorted ids"""
+        build(db_session, tmp_path / "search.snap")
+
+        with IndexSnapshot(str(tmp_path / "search.snap")) as snapshot:
+            python, remote = snapshot.tag_ids()
+            assert len(snapshot) == 5
+            assert list(snapshot.section("ids")) == jobs
+            assert snapshot.tag_ids(names=["Python"]) == [python]
+            assert snapshot.tag_ids(categories=["skill"]) == [remote]
+            assert list(snapshot.tag_postings(python)) == [jobs[1], jobs[3]]
+            assert list(snapshot.tag_postings(remote)) == []
+            assert list(snapshot.company_postings("Globex")) == jobs[3:]
+            assert list(snapshot.location_postings("Remote")) == jobs[1:]
+            assert list(snapshot.token_postings("engineer")) == [jobs[1], jobs[3]]
+            assert list(snapshot.token_postings("acme")) == jobs[:3]
+            assert list(snapshot.token_postings("missing")) == []
+
+    def test_dictionary_codes(self, db_session, jobs, tmp_path):
+        """Test that per-job codes index the string dictionaries"""
+        build(db_session, tmp_path / "search.snap")
+
+        with IndexSnapshot(str(tmp_path / "search.snap")) as snapshot:
+            companies = [
+                snapshot.companies[code] for code in snapshot.section("company_codes")
+            ]
+            assert companies == ["Acme", "Acme", "Acme", "Globex", "Globex"]
+            positions = [
+                snapshot.positions[code] for code in snapshot.section("position_codes")
+            ]
+            assert positions == ["Data Scientist", "Backend Engineer"] * 2 + [
+                "Data Scientist"
+            ]
+            assert snapshot.section("location_codes")[0] == -1
+
+    def test_posted_between(self, db_session, jobs, tmp_path):
+        """Test that date ranges are inclusive and ordered by date then id"""
+        build(db_session, tmp_path / "search.snap")
+
+        with IndexSnapshot(str(tmp_path / "search.snap")) as snapshot:
+            assert list(
+                snapshot.posted_between(date(2025, 5, 2), date(2025, 5, 4))
+            ) == [jobs[3], jobs[2], jobs[1]]
+            assert list(snapshot.posted_between(date_from=date(2025, 5, 5))) == [
+                jobs[0]
+            ]
+            assert len(snapshot.posted_between()) == 5
+
+    def test_rebuild_leaves_open_snapshots_intact(self, db_session, jobs, tmp_path):
+        """Test that a rebuild replaces the file without disturbing readers"""
+        path = tmp_path / "search.snap"
+        build(db_session, path)
+        old = IndexSnapshot(str(path))
+        try:
+            db_session.query(JobTag).delete()
+            db_session.commit()
+            build(db_session, path)
+
+            with IndexSnapshot(str(path)) as new:
+                python = new.tag_ids(names=["Python"])[0]
+                assert list(new.tag_postings(python)) == []
+            assert list(old.tag_postings(python)) == [jobs[1], jobs[3]]
+        finally:
+            old.close()
+
+    def test_writes_during_the_build(self, db_session, jobs, tmp_path, monkeypatch):
+        """Test that postings of jobs and tags created mid-build are left out"""
+        writer = sessionmaker(bind=db_session.get_bind())()
+        iter_tag_postings = JobTagManager.iter_tag_postings
+
+        def write_then_iter(self, batch_size=10000):
+            go = Tag(name="Go", category=TagCategory.TECHNOLOGY)
+            python = writer.query(Tag).filter_by(name="Python").one()
+            job = Job(
+                job_id="SNAP005",
+                job_position="Go Engineer",
+                job_link="https://example.com/snap5",
+                company_name="Acme",
+                job_posting_date=date(2025, 5, 6),
+            )
+            job.tag_relations = [JobTag(tag=python), JobTag(tag=go)]
+            writer.add_all([job, JobTag(job_id=jobs[0], tag=go)])
+            writer.commit()
+            return iter_tag_postings(self, batch_size)
+
+        monkeypatch.setattr(JobTagManager, "iter_tag_postings", write_then_iter)
+        build(db_session, tmp_path / "search.snap")
+        writer.close()
+
+        with IndexSnapshot(str(tmp_path / "search.snap")) as snapshot:
+            assert len(snapshot) == 5
+            assert snapshot.tag_ids(names=["Go"]) == []
+            python = snapshot.tag_ids(names=["Python"])[0]
+            assert list(snapshot.tag_postings(python)) == [jobs[1], jobs[3]]
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a file without the snapshot magic is refused"""
+        path = tmp_path / "search.snap"
+        path.write_bytes(b"\0" * 64)
+
+        with pytest.raises(ValueError):
+            IndexSnapshot(str(path))
@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+from app.core.strings import StringDictionary, companies, positions
+from app.models import Job
+from sqlalchemy import select
+from tests.conftest import create_test_db_session, create_test_engine
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session"""
+    engine = create_test_engine("strings.db")
+    yield from create_test_db_session(engine)
+
+
+class TestStringDictionary:
+    """Test cases for interned string dictionaries"""
+
+    def test_codes_are_dense_and_stable(self):
+        """Test that values get codes in first-seen order, and keep them"""
+        dictionary = StringDictionary("test")
+
+        assert dictionary.encode(["Remote", "Berlin", "Remote", None]) == [0, 1, 0, -1]
+        assert dictionary.code("Paris") == 2
+        assert dictionary.find("Berlin") == 1
+        assert dictionary.find("Madrid") is None
+        assert dictionary.value(2) == "Paris"
+        assert dictionary.value(-1) is None
+        assert dictionary.values == ["Remote", "Berlin", "Paris"]
+        assert "Paris" in dictionary
+        assert len(dictionary) == 3
+
+    def test_intern_returns_the_canonical_object(self):
+        """Test that equal strings intern to one object"""
+        dictionary = StringDictionary("test")
+        first = "".join(["Acme", " Labs"])
+        second = "".join(["Acme", " Labs"])
+
+        assert first is not second
+        assert dictionary.intern(first) is first
+        assert dictionary.intern(second) is first
+        assert dictionary.intern(None) is None
+
+    def test_intern_stops_growing_at_max_interned(self):
+        """Test that values past max_interned are returned as they are"""
+        dictionary = StringDictionary("test", max_interned=1)
+        dictionary.intern("Remote")
+        late = "".join(["Ber", "lin"])
+
+        assert dictionary.intern(late) is late
+        assert "Berlin" not in dictionary
+        # Codes are still assigned on request, for indexes that need them
+        assert dictionary.code("Berlin") == 1
+
+
+class TestInternedString:
+    """Test cases for ORM columns loaded through the shared dictionaries"""
+
+    def test_loaded_rows_share_strings(self, db_session):
+        """Test that every row holding a value holds the same object"""
+        for i in range(3):
+            db_session.add(
+                Job(
+                    job_id=f"STR{i:03d}",
+                    job_position="Platform Engineer",
+                    job_link=f"https://example.com/str{i}",
+                    company_name="Initrode Systems",
+                    job_posting_date=date(2025, 5, 1),
+                )
+            )
+        db_session.commit()
+        db_session.expunge_all()
+
+        jobs = db_session.scalars(select(Job)).all()
+        assert {id(job.company_name) for job in jobs} == {
+            id(companies.intern("Initrode Systems"))
+        }
+        assert len({id(job.job_position) for job in jobs}) == 1
+        assert "Platform Engineer" in positions
+        assert jobs[0].job_location is None
@@ -0,0 +1,161 @@
+import pytest
+from app.core.tag_expr import (
+    MAX_TAG_EXPR_TERMS,
+    And,
+    Not,
+    Or,
+    TagExprError,
+    TagName,
+    matches_tag_expr,
+    parse_tag_expr,
+    plan_tag_expr,
+    required_tags,
+    skeleton,
+    tag_names,
+)
+
+
+class TestParseTagExpr:
+    """Test cases for parsing boolean tag expressions"""
+
+    def test_precedence(self):
+        """Test that NOT binds tighter than AND, and AND tighter than OR"""
+        expr = parse_tag_expr("Python OR Go AND NOT PHP")
+
+        assert expr == Or(
+            (TagName("Python"), And((TagName("Go"), Not(TagName("PHP")))))
+        )
+
+    def test_parentheses_and_flattening(self):
+        """Test that parentheses group and nested nodes of one kind flatten"""
+        expr = parse_tag_expr("(Python AND (AWS OR GCP)) AND NOT (PHP)")
+
+        assert expr == And(
+            (
+                TagName("Python"),
+                Or((TagName("AWS"), TagName("GCP"))),
+                Not(TagName("PHP")),
+            )
+        )
+        assert parse_tag_expr("a AND (b AND c)") == And(
+            (TagName("a"), TagName("b"), TagName("c"))
+        )
+
+    def test_keywords_and_quoted_names(self):
+        """Test that keywords are case-insensitive and quotes make names"""
+        expr = parse_tag_expr('"Machine Learning" and not "and" or C++')
+
+        assert expr == Or(
+            (
+                And((TagName("Machine Learning"), Not(TagName("and")))),
+                TagName("C++"),
+            )
+        )
+
+    def test_double_negation(self):
+        """Test that NOT NOT cancels out"""
+        assert parse_tag_expr("NOT NOT Python") == TagName("Python")
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "   ", "Python AND", "(Python", "Python)", "AND Python", 'Go OR "Rust'],
+    )
+    def test_malformed(self, text):
+        """Test that malformed expressions are rejected"""
+        with pytest.raises(TagExprError):
+            parse_tag_expr(text)
+
+    def test_term_limit(self):
+        """Test that expressions naming too many tags are rejected"""
+        names = [f"tag{i}" for i in range(MAX_TAG_EXPR_TERMS + 1)]
+
+        parse_tag_expr(" OR ".join(names[:-1]))
+        with pytest.raises(TagExprError):
+            parse_tag_expr(" OR ".join(names))
+
+    def test_names_and_skeleton(self):
+        """Test that expressions of one structure share a skeleton"""
+        first = parse_tag_expr("Python AND NOT (Go OR Python)")
+        second = parse_tag_expr("Rust AND NOT (Java OR Rust)")
+
+        assert tag_names(first) == ["Python", "Go"]
+        assert skeleton(first, {"Python": 0, "Go": 1}) == skeleton(
+            second, {"Rust": 0, "Java": 1}
+        )
+
+
+class TestPlanTagExpr:
+    """Test cases for ordering tag expressions by selectivity"""
+
+    counts = {"common": 900, "rare": 5, "medium": 100, "excluded": 300}
+
+    def plan(self, text):
+        return plan_tag_expr(parse_tag_expr(text), self.counts.get, 1000)
+
+    def test_and_runs_most_selective_first(self):
+        """Test that AND intersects small operands first, negations last"""
+        plan, size = self.plan("common AND NOT medium AND rare AND NOT excluded")
+
+        assert plan == And(
+            (
+                TagName("rare"),
+                TagName("common"),
+                Not(TagName("excluded")),
+                Not(TagName("medium")),
+            )
+        )
+        assert size == 5
+
+    def test_or_runs_largest_first(self):
+        """Test that OR operands are ordered largest first"""
+        plan, size = self.plan("rare OR (medium AND common) OR excluded")
+
+        assert plan == Or(
+            (
+                TagName("excluded"),
+                And((TagName("medium"), TagName("common"))),
+                TagName("rare"),
+            )
+        )
+        assert size == 405
+
+    def test_negation_estimate(self):
+        """Test that a negation is estimated as the jobs it keeps"""
+        assert self.plan("NOT common") == (Not(TagName("common")), 100)
+
+
+class TestMatchTagExpr:
+    """Test cases for testing one job's tags against an expression"""
+
+    @pytest.mark.parametrize(
+        "text,names,expected",
+        [
+            ("a AND b", {"a", "b"}, True),
+            ("a AND b", {"a"}, False),
+            ("a OR b", {"b"}, True),
+            ("NOT a", set(), True),
+            ("NOT a", {"a"}, False),
+            ("a AND NOT (b OR c)", {"a", "c"}, False),
+            ("a AND NOT (b OR c)", {"a", "d"}, True),
+        ],
+    )
+    def test_matches(self, text, names, expected):
+        """Test that an expression is evaluated against a set of tag names"""
+        assert matches_tag_expr(parse_tag_expr(text), names) is expected
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            ("a", {"a"}),
+            ("a AND b", {"a"}),
+            ("a OR b", {"a", "b"}),
+            ("(a OR b OR c) AND d", {"d"}),
+            ("(a OR b) AND (c OR NOT d)", {"a", "b"}),
+            ("a OR NOT b", None),
+            ("NOT a", None),
+        ],
+    )
+    def test_required_tags(self, text, expected):
+        """Test the fewest names a matching job must have one of"""
+        required = required_tags(parse_tag_expr(text))
+        assert required == (None if expected is None else frozenset(expected))
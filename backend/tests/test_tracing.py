@@ -0,0 +1,130 @@
+import json
+
+import pytest
+from app.core import tracing
+from app.core.tracing import (
+    InMemoryExporter,
+    JsonFileExporter,
+    start_span,
+    start_trace,
+)
+from app.main import app
+from fastapi.testclient import TestClient
+
+from .conftest import create_test_client_with_db
+
+
+@pytest.fixture
+def exporter():
+    """Trace every request into an in-memory exporter"""
+    previous = tracing.tracer.exporter, tracing.tracer.sample_rate
+    exporter = InMemoryExporter()
+    tracing.tracer.exporter, tracing.tracer.sample_rate = exporter, 1.0
+    yield exporter
+    tracing.tracer.exporter, tracing.tracer.sample_rate = previous
+
+
+def by_name(trace):
+    """Index a trace's spans by name"""
+    return {span["name"]: span for span in trace}
+
+
+class TestSpans:
+    """Test cases for span nesting and export"""
+
+    def test_nested_spans_share_trace(self, exporter):
+        """Test that child spans link to their parents"""
+        with start_trace("root") as root:
+            with start_span("child", kind="test") as child:
+                with start_span("grandchild"):
+                    pass
+
+        (trace,) = exporter.traces
+        spans = by_name(trace)
+        assert spans["child"]["parent_id"] == root.span_id
+        assert spans["grandchild"]["parent_id"] == child.span_id
+        assert spans["child"]["attributes"] == {"kind": "test"}
+        assert {span["trace_id"] for span in trace} == {root.trace_id}
+        assert all(span["duration_ms"] >= 0 for span in trace)
+
+    def test_no_span_without_trace(self, exporter):
+        """Test that spans outside a trace are no-ops"""
+        with start_span("orphan") as span:
+            assert span is None
+        assert list(exporter.traces) == []
+
+    def test_errors_are_recorded(self, exporter):
+        """Test that an exception is recorded on the span"""
+        with pytest.raises(ValueError):
+            with start_trace("root"):
+                with start_span("failing"):
+                    raise ValueError("boom")
+
+        spans = by_name(exporter.traces[0])
+        assert spans["failing"]["error"] == "ValueError: boom"
+        assert spans["root"]["error"] == "ValueError: boom"
+
+    def test_json_file_exporter(self, tmp_path):
+        """Test that the JSON exporter writes one line per trace"""
+        path = tmp_path / "traces" / "traces.jsonl"
+        previous = tracing.tracer.exporter
+        tracing.tracer.exporter = JsonFileExporter(str(path))
+        try:
+            for _ in range(2):
+                with start_trace("root"):
+                    with start_span("child"):
+                        pass
+        finally:
+            tracing.tracer.exporter = previous
+
+        traces = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [[span["name"] for span in trace] for trace in traces] == [
+            ["child", "root"],
+            ["child", "root"],
+        ]
+
+
+class TestTracingMiddleware:
+    """Test cases for request tracing through the app"""
+
+    def test_search_request_spans_all_layers(self, exporter):
+        """Test that a search produces API, service, manager and SQL spans"""
+        client, _, _ = create_test_client_with_db("tracing.db")
+        response = client.get("/api/v1/jobs/search?query=python&tags=django")
+        assert response.status_code == 200
+
+        (trace,) = exporter.traces
+        spans = by_name(trace)
+        root = spans["GET /api/v1/jobs/search"]
+        service = spans["SearchService.search_jobs"]
+        manager = spans["JobManager.find_by_filters"]
+
+        assert root["parent_id"] is None
+        assert root["attributes"]["http.status_code"] == 200
+        assert root["attributes"]["http.route"] == "/api/v1/jobs/search"
+        assert service["parent_id"] == root["span_id"]
+        assert service["attributes"]["search.filters"] == "query+tags"
+        assert service["attributes"]["search.total"] == 0
+        assert manager["parent_id"] == service["span_id"]
+        assert manager["attributes"]["result.size"] == 0
+        statements = [span for span in trace if span["name"] == "db.statement"]
+        assert {span["parent_id"] for span in statements} >= {manager["span_id"]}
+
+    def test_traceparent_continues_trace(self, exporter):
+        """Test that a sampled traceparent header sets the trace and parent"""
+        tracing.tracer.sample_rate = 0.0
+        trace_id, parent_id = "a" * 32, "b" * 16
+
+        TestClient(app).get(
+            "/health", headers={"traceparent": f"00-{trace_id}-{parent_id}-01"}
+        )
+
+        (trace,) = exporter.traces
+        assert trace[0]["trace_id"] == trace_id
+        assert trace[0]["parent_id"] == parent_id
+
+    def test_unsampled_requests_are_not_traced(self, exporter):
+        """Test that nothing is recorded when sampling is off"""
+        tracing.tracer.sample_rate = 0.0
+        TestClient(app).get("/api/v1/tags/categories")
+        assert list(exporter.traces) == []